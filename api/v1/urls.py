@@ -1,9 +1,25 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework.routers import SimpleRouter
 
+from chargepoints.async_views import async_read_urls, async_reads_enabled
+from chargepoints.stream import stream_view
 from chargepoints.views import ChargePointViewSet
 
-router = SimpleRouter(trailing_slash="/?")  # Permitir URLs con o sin barra final
+router = SimpleRouter()
+# Permitir URLs con o sin barra final. SimpleRouter solo acepta True/False en el
+# constructor ("/?" se normaliza a "/"), así que se fija el patrón después.
+router.trailing_slash = "/?"
 router.register(r"chargepoint", ChargePointViewSet, basename="chargepoint")
 
-urlpatterns = [path("", include(router.urls))]
+
+def build_urlpatterns(async_reads: bool) -> list:
+    """Rutas de la v1; con `async_reads`, list/retrieve nativos async (ASGI)."""
+    routes = async_read_urls(router.urls) if async_reads else router.urls
+    return [
+        # Antes del router: `stream` coincidiría con la ruta de detalle `chargepoint/{pk}`.
+        re_path(r"^chargepoint/stream/?$", stream_view, name="chargepoint-stream"),
+        path("", include(routes)),
+    ]
+
+
+urlpatterns = build_urlpatterns(async_reads_enabled())
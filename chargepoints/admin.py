@@ -1,9 +1,31 @@
+from django.conf import settings
 from django.contrib import admin, messages
-from django.utils import timezone
+from django.contrib.admin.views.main import ChangeList
+from django.db import IntegrityError, router, transaction
+from django.forms.models import BaseInlineFormSet
+from django.template.response import TemplateResponse
+from django.urls import reverse
 from django.utils.html import format_html
+from django.utils.text import smart_split, unescape_string_literal
 from django.utils.translation import gettext_lazy as _
 
-from .models import ChargePoint, Connector
+from .deletion import restore, soft_delete
+from .models import ArchivedChargePoint, ArchivedConnector, ChargePoint, Connector
+from .pagination import EstimatedCountPaginator, capped_count, table_estimate
+from .routing import replica_reads
+from .search import get_search_backend
+
+DEFAULTS = {
+    # Recuento estimado, sin total sin filtros y date_hierarchy condicionada
+    "PERFORMANCE_MODE": True,
+    "EXACT_COUNT_THRESHOLD": 10_000,  # por encima, el changelist muestra un recuento estimado
+    "DATE_HIERARCHY_MAX_ROWS": 100_000,  # por encima, sin date_hierarchy
+    "INLINE_MAX_ROWS": 50,  # conectores en el formulario de un ChargePoint
+}
+
+
+def get_options() -> dict:
+    return {**DEFAULTS, **getattr(settings, "CHARGEPOINTS_ADMIN", {})}
 
 
 # ---------------------------
@@ -40,34 +62,66 @@ class SoftDeleteAdminMixin:
 
     @admin.action(description=_("Marcar como eliminado (soft delete)"))
     def action_soft_delete(self, request, queryset):
-        updated = queryset.update(deleted_at=timezone.now())
+        # En cascada y set-based: una UPDATE por modelo (ver chargepoints.deletion)
+        counts = soft_delete(queryset)
         self.message_user(
-            request, _(f"{updated} elemento(s) marcados como eliminados."), messages.SUCCESS
+            request,
+            _(f"{counts.pop(self.model._meta.label)} elemento(s) marcados como eliminados.")
+            + self._cascade_summary(counts),
+            messages.SUCCESS,
         )
 
     @admin.action(description=_("Restaurar elementos eliminados"))
     def action_restore(self, request, queryset):
-        updated = queryset.update(deleted_at=None)
-        self.message_user(request, _(f"{updated} elemento(s) restaurados."), messages.SUCCESS)
+        # Solo revive los dependientes borrados en la misma operación
+        try:
+            with transaction.atomic(using=queryset.db):  # savepoint si ya hay transacción
+                counts = restore(queryset)
+        except IntegrityError:
+            self.message_user(
+                request,
+                _("No se puede restaurar: algún nombre o EVSE ya lo usa un elemento vivo."),
+                messages.ERROR,
+            )
+            return
+        self.message_user(
+            request,
+            _(f"{counts.pop(self.model._meta.label)} elemento(s) restaurados.")
+            + self._cascade_summary(counts),
+            messages.SUCCESS,
+        )
+
+    @staticmethod
+    def _cascade_summary(counts: dict[str, int]) -> str:
+        cascade = ", ".join(f"{n} {label}" for label, n in counts.items() if n)
+        return f" {_('En cascada')}: {cascade}." if cascade else ""
 
     @admin.action(description=_("Borrado físico (usar con cuidado)"))
     def action_hard_delete(self, request, queryset):
-        count = 0
-        for obj in queryset:
-            obj.hard_delete()
-            count += 1
+        # Set-based: un DELETE por modelo (la cascada de Django incluida), no uno por fila
+        count = queryset.hard_delete()[1].get(self.model._meta.label, 0)
         self.message_user(
             request, _(f"{count} elemento(s) borrados físicamente."), messages.WARNING
         )
 
     def get_queryset(self, request):
         """
-        Usar el manager 'all_objects' si existe, para poder filtrar por eliminados.
-        Si no, usar el queryset por defecto.
+        Vivos por defecto (índices parciales "solo vivos"; el total del changelist y el
+        autocompletado no cuentan eliminados). Todos con `?deleted=deleted|all` en el
+        changelist y en las vistas de un objeto (cambio, historial), que deben poder
+        abrir un eliminado para restaurarlo.
         """
-        if hasattr(self.model, "all_objects"):
-            return self.model.all_objects.all()
-        return super().get_queryset(request)
+        if not hasattr(self.model, "all_objects"):
+            return super().get_queryset(request)
+        queryset = self.model.all_objects.all()
+        match = getattr(request, "resolver_match", None)
+        view = match.url_name if match is not None else ""
+        deleted = request.GET.get(SoftDeletedFilter.parameter_name)
+        if view == "autocomplete" or (
+            view.endswith("_changelist") and deleted not in ("deleted", "all")
+        ):
+            return queryset.alive()
+        return queryset
 
     @staticmethod
     def _deleted_badge(obj):
@@ -78,11 +132,110 @@ class SoftDeleteAdminMixin:
     _deleted_badge.short_description = _("Estado")
 
 
+# ---------------------------
+# Búsqueda a través del backend configurado (trigramas en PostgreSQL)
+# ---------------------------
+class SearchBackendAdminMixin:
+    def get_search_results(self, request, queryset, search_term):
+        terms = [
+            unescape_string_literal(t) if t[0] in "\"'" and t[-1] == t[0] else t
+            for t in smart_split(search_term)
+        ]
+        terms = [t for t in terms if t]
+        if not self.search_fields or not terms:
+            return queryset, False
+        # El changelist aplica su propia ordenación después: solo interesa el filtro.
+        backend = get_search_backend(queryset.db)
+        return backend.search(queryset, list(self.search_fields), terms), False
+
+
+# ---------------------------
+# Changelist desde una réplica de lectura (ver chargepoints.routing)
+# ---------------------------
+class ReplicaChangelistMixin:
+    def changelist_view(self, request, extra_context=None):
+        if request.method not in ("GET", "HEAD"):  # acciones y list_editable escriben
+            return super().changelist_view(request, extra_context)
+        with replica_reads():
+            response = super().changelist_view(request, extra_context)
+            # Dentro del ámbito: la plantilla aún consulta (date_hierarchy, filtros...)
+            if isinstance(response, TemplateResponse):
+                response.render()
+        return response
+
+
+# ---------------------------
+# Modo rendimiento del changelist (tablas de millones de filas)
+# ---------------------------
+class NoDateHierarchyChangeList(ChangeList):
+    """ChangeList sin `date_hierarchy`: sus `DISTINCT` por año/mes recorren la tabla."""
+
+    def __init__(
+        self, request, model, list_display, list_display_links, list_filter, _, *args, **kwargs
+    ):
+        super().__init__(
+            request, model, list_display, list_display_links, list_filter, None, *args, **kwargs
+        )
+
+
+class PerformanceAdminMixin:
+    """
+    Con `PERFORMANCE_MODE`: recuento exacto solo hasta `EXACT_COUNT_THRESHOLD` filas
+    (estimado por encima, ver `EstimatedCountPaginator`), sin el segundo `COUNT(*)` del
+    total sin filtros y sin `date_hierarchy` si la tabla supera `DATE_HIERARCHY_MAX_ROWS`.
+    """
+
+    @property
+    def show_full_result_count(self) -> bool:
+        return not get_options()["PERFORMANCE_MODE"]
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        options = get_options()
+        if not options["PERFORMANCE_MODE"]:
+            return super().get_paginator(
+                request, queryset, per_page, orphans, allow_empty_first_page
+            )
+        return EstimatedCountPaginator(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            threshold=options["EXACT_COUNT_THRESHOLD"],
+        )
+
+    def get_changelist(self, request, **kwargs):
+        options = get_options()
+        if (
+            self.date_hierarchy
+            and options["PERFORMANCE_MODE"]
+            and self._larger_than(options["DATE_HIERARCHY_MAX_ROWS"])
+        ):
+            return NoDateHierarchyChangeList
+        return super().get_changelist(request, **kwargs)
+
+    def _larger_than(self, rows: int) -> bool:
+        using = router.db_for_read(self.model)  # la réplica, si el changelist lee de una
+        estimate = table_estimate(self.model, using)
+        if estimate is not None:
+            return estimate > rows
+        return not capped_count(self.model._base_manager.using(using).all(), rows)[1]
+
+
 # ---------------------------
 # Inlines
 # ---------------------------
+class LimitedInlineFormSet(BaseInlineFormSet):
+    """Carga como mucho `INLINE_MAX_ROWS` filas; el resto, en el changelist del modelo."""
+
+    def get_queryset(self):
+        if not hasattr(self, "_queryset"):
+            self._queryset = super().get_queryset()[: get_options()["INLINE_MAX_ROWS"]]
+        return self._queryset
+
+
 class ConnectorInline(admin.TabularInline):
     model = Connector
+    formset = LimitedInlineFormSet
     extra = 0
     fields = ("evse_number", "created_at", "deleted_at")
     readonly_fields = ("created_at", "deleted_at")
@@ -94,11 +247,18 @@ class ConnectorInline(admin.TabularInline):
 # ChargePoint Admin
 # ---------------------------
 @admin.register(ChargePoint)
-class ChargePointAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
-    list_display = ("id", "name", "status", "created_at", "deleted_at", "estado")
+class ChargePointAdmin(
+    ReplicaChangelistMixin,
+    PerformanceAdminMixin,
+    SoftDeleteAdminMixin,
+    SearchBackendAdminMixin,
+    admin.ModelAdmin,
+):
+    # connector_count está desnormalizado: sin COUNT de conectores por fila
+    list_display = ("id", "name", "status", "connector_count", "created_at", "deleted_at", "estado")
     list_filter = ("status", SoftDeletedFilter)
     search_fields = ("name",)
-    readonly_fields = ("created_at", "deleted_at")
+    readonly_fields = ("created_at", "deleted_at", "conectores")
     date_hierarchy = "created_at"
     ordering = ("-created_at", "id")
     list_per_page = 25
@@ -110,12 +270,32 @@ class ChargePointAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
 
     estado.short_description = _("Estado")
 
+    def conectores(self, obj):
+        if obj is None or obj.pk is None:
+            return "-"
+        url = reverse("admin:chargepoints_connector_changelist")
+        return format_html(
+            '<a href="{}?charge_point__id__exact={}">{} {}</a>',
+            url,
+            obj.pk,
+            obj.connector_count,
+            _("conectores activos (listado completo)"),
+        )
+
+    conectores.short_description = _("Conectores")
+
 
 # ---------------------------
 # Connector Admin
 # ---------------------------
 @admin.register(Connector)
-class ConnectorAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
+class ConnectorAdmin(
+    ReplicaChangelistMixin,
+    PerformanceAdminMixin,
+    SoftDeleteAdminMixin,
+    SearchBackendAdminMixin,
+    admin.ModelAdmin,
+):
     list_display = ("id", "evse_number", "charge_point", "created_at", "deleted_at", "estado")
     list_filter = (SoftDeletedFilter,)
     search_fields = ("evse_number", "charge_point__name")
@@ -131,3 +311,42 @@ class ConnectorAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
         return self._deleted_badge(obj)
 
     estado.short_description = _("Estado")
+
+
+# ---------------------------
+# Archivo de borrados antiguos (solo lectura, ver chargepoints.archive)
+# ---------------------------
+class ReadOnlyAdminMixin:
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False  # la purga la hace `archive_deleted --purge-after-days`
+
+
+class ArchivedConnectorInline(ReadOnlyAdminMixin, admin.TabularInline):
+    model = ArchivedConnector
+    extra = 0
+    fields = ("id", "evse_number", "deleted_at", "archived_at")
+    readonly_fields = fields
+
+
+@admin.register(ArchivedChargePoint)
+class ArchivedChargePointAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    list_display = ("id", "name", "status", "deleted_at", "archived_at")
+    list_filter = ("status",)
+    search_fields = ("=id", "name")
+    date_hierarchy = "archived_at"
+    list_per_page = 25
+    inlines = [ArchivedConnectorInline]
+
+
+@admin.register(ArchivedConnector)
+class ArchivedConnectorAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    list_display = ("id", "evse_number", "charge_point_id", "deleted_at", "archived_at")
+    search_fields = ("=id", "evse_number", "=charge_point_id")
+    date_hierarchy = "archived_at"
+    list_per_page = 25
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ChargepointsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "chargepoints"
+
+    def ready(self):
+        # Receptores de `data_changed` (invalidación de la caché de respuestas) y de
+        # `rows_changed` (eventos de /chargepoint/stream)
+        from . import cache, stream  # noqa: F401
@@ -0,0 +1,204 @@
+"""
+Archivado de filas borradas (soft) antiguas.
+
+Las filas borradas se quedan en `chargepoints_chargepoint`/`chargepoints_connector` y
+cada consulta de filas vivas tiene que saltarlas (tabla e índices más grandes).
+`archive_deleted` mueve las que tienen `deleted_at` anterior al corte (retención) a
+`ArchivedConnector`/`ArchivedChargePoint`, por lotes pequeños: cada lote es una
+transacción corta que bloquea como mucho `batch_size` filas. En PostgreSQL cada lote
+es una sola sentencia:
+
+    WITH moved AS (
+        DELETE FROM <tabla> WHERE id IN (<candidatas> LIMIT n FOR UPDATE SKIP LOCKED)
+        RETURNING ...
+    )
+    INSERT INTO <archivo> SELECT ..., now FROM moved
+
+Las filas bloqueadas por otra transacción se saltan y se archivan en otra pasada. En
+otros motores: `INSERT ... SELECT` y `DELETE` por ids en la misma transacción.
+
+Los conectores van primero: un ChargePoint solo se archiva cuando ya no le queda ningún
+conector (vivo o borrado) en la tabla principal. El historial de estados no se toca
+(sin FK física). Los contadores tampoco: solo salen filas borradas, que no cuentan.
+
+Cada lote se confirma al terminar: una ejecución interrumpida (o limitada con
+`max_batches`) se reanuda volviendo a lanzarla; con el mismo `cutoff` no repite trabajo.
+`purge_archived` borra del archivo lo archivado antes de una fecha, también por lotes.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.utils import timezone
+
+from .deletion import cascade_relations
+from .models import ArchivedChargePoint, ArchivedConnector, ChargePoint, Connector
+
+DEFAULTS = {
+    "RETENTION_DAYS": 90,  # antigüedad mínima de `deleted_at` para archivar
+    "BATCH_SIZE": 500,  # filas por lote (y por transacción)
+    "SLEEP_SECONDS": 0.0,  # pausa entre lotes (cede E/S y réplicas a la carga normal)
+}
+
+# (modelo, archivo), hojas primero
+ARCHIVES: tuple[tuple[type[models.Model], type[models.Model]], ...] = (
+    (Connector, ArchivedConnector),
+    (ChargePoint, ArchivedChargePoint),
+)
+
+
+def get_options() -> dict:
+    return {**DEFAULTS, **getattr(settings, "CHARGEPOINTS_ARCHIVE", {})}
+
+
+def cutoff_for(days: int, now: datetime | None = None) -> datetime:
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def candidates(model, cutoff: datetime, using: str = DEFAULT_DB_ALIAS, final: bool = True):
+    """
+    Filas de `model` borradas antes de `cutoff` sin dependientes en la tabla principal.
+    Con `final=False` (dry run) solo cuentan los dependientes que no se archivarían en
+    la misma pasada.
+    """
+    queryset = model.all_objects.using(using).filter(deleted_at__lt=cutoff)
+    for rel in cascade_relations(model):
+        children = rel.related_model.all_objects.using(using).filter(
+            **{rel.field.name: models.OuterRef("pk")}
+        )
+        if not final:
+            children = children.exclude(deleted_at__lt=cutoff)
+        queryset = queryset.filter(~models.Exists(children))
+    return queryset
+
+
+def archive_batch(
+    model, archive, cutoff: datetime, using: str, batch_size: int, after: int = 0
+) -> list[int]:
+    """Mueve un lote (ids mayores que `after`). Devuelve los ids movidos, ordenados."""
+    connection = connections[using]
+    queryset = candidates(model, cutoff, using).filter(pk__gt=after).order_by("pk")
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    with transaction.atomic(using=using):
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        if connection.vendor == "postgresql":
+            return _move_returning(queryset.values("pk")[:batch_size], archive, now, using)
+        ids = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if ids:
+            _move_by_ids(model, archive, ids, now, using)
+        return ids
+
+
+def _sql_names(model, archive, connection) -> tuple[str, str, str, str, list[str]]:
+    """Tablas, pk, `archived_at` y columnas comunes (en el orden del archivo), entrecomillados."""
+    qn = connection.ops.quote_name
+    source = {f.column for f in model._meta.concrete_fields}
+    columns = [f.column for f in archive._meta.concrete_fields if f.column in source]
+    return (
+        qn(model._meta.db_table),
+        qn(archive._meta.db_table),
+        qn(model._meta.pk.column),
+        qn(archive._meta.get_field("archived_at").column),
+        [qn(c) for c in columns],
+    )
+
+
+def _move_returning(queryset, archive, now, using: str) -> list[int]:
+    connection = connections[using]
+    src, dst, pk, archived_at, columns = _sql_names(queryset.model, archive, connection)
+    select, params = queryset.query.get_compiler(using).as_sql()
+    cols = ", ".join(columns)
+    # Idempotente: un id que ya estuviera en el archivo se sobrescribe, no se pierde.
+    overwrite = ", ".join(f"{c} = EXCLUDED.{c}" for c in [*columns, archived_at] if c != pk)
+    sql = (
+        f"WITH moved AS (DELETE FROM {src} WHERE {pk} IN ({select}) RETURNING {cols}) "
+        f"INSERT INTO {dst} ({cols}, {archived_at}) SELECT {cols}, %s FROM moved "
+        f"ON CONFLICT ({pk}) DO UPDATE SET {overwrite} RETURNING {pk}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, now])
+        return sorted(row[0] for row in cursor.fetchall())
+
+
+def _move_by_ids(model, archive, ids: list[int], now, using: str) -> None:
+    connection = connections[using]
+    src, dst, pk, archived_at, columns = _sql_names(model, archive, connection)
+    cols, in_ids = ", ".join(columns), ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {dst} WHERE {pk} IN ({in_ids})", ids)
+        cursor.execute(
+            f"INSERT INTO {dst} ({cols}, {archived_at}) "
+            f"SELECT {cols}, %s FROM {src} WHERE {pk} IN ({in_ids})",
+            [now, *ids],
+        )
+        cursor.execute(f"DELETE FROM {src} WHERE {pk} IN ({in_ids})", ids)
+
+
+def archive_deleted(
+    cutoff: datetime,
+    using: str = DEFAULT_DB_ALIAS,
+    batch_size: int | None = None,
+    sleep: float | None = None,
+    max_batches: int | None = None,
+    progress: Callable[[str, int, int], None] | None = None,
+) -> dict[str, int]:
+    """
+    Archiva por lotes lo borrado antes de `cutoff`, conectores primero. Devuelve las filas
+    movidas por modelo. `progress(label, filas, último_id)` se llama tras cada lote.
+    """
+    options = get_options()
+    batch_size = batch_size or options["BATCH_SIZE"]
+    sleep = options["SLEEP_SECONDS"] if sleep is None else sleep
+    counts = dict.fromkeys((model._meta.label for model, _ in ARCHIVES), 0)
+    batches = 0
+    for model, archive in ARCHIVES:
+        label, after = model._meta.label, 0
+        while max_batches is None or batches < max_batches:
+            ids = archive_batch(model, archive, cutoff, using, batch_size, after)
+            if not ids:
+                break
+            batches += 1
+            counts[label] += len(ids)
+            after = ids[-1]
+            if progress is not None:
+                progress(label, len(ids), after)
+            if len(ids) < batch_size:
+                break
+            if sleep:
+                time.sleep(sleep)
+    return counts
+
+
+def pending(cutoff: datetime, using: str = DEFAULT_DB_ALIAS) -> dict[str, int]:
+    """Filas que archivaría una pasada completa con este corte (dry run)."""
+    return {
+        model._meta.label: candidates(model, cutoff, using, final=False).count()
+        for model, _ in ARCHIVES
+    }
+
+
+def purge_archived(
+    before: datetime,
+    using: str = DEFAULT_DB_ALIAS,
+    batch_size: int | None = None,
+    dry_run: bool = False,
+) -> dict[str, int]:
+    """Borra del archivo lo archivado antes de `before`, por lotes. Filas por modelo."""
+    batch_size = batch_size or get_options()["BATCH_SIZE"]
+    counts = {}
+    for _, archive in ARCHIVES:
+        rows = archive.objects.using(using).filter(archived_at__lt=before)
+        if dry_run:
+            counts[archive._meta.label] = rows.count()
+            continue
+        counts[archive._meta.label] = 0
+        while ids := list(rows.order_by("pk").values_list("pk", flat=True)[:batch_size]):
+            deleted, _ = archive.objects.using(using).filter(pk__in=ids).delete()
+            counts[archive._meta.label] += deleted
+    return counts
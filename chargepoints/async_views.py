@@ -0,0 +1,127 @@
+"""
+Lecturas nativas async de ChargePoint bajo ASGI.
+
+Con `CHARGEPOINTS_ASYNC_READS=True` (activado por defecto en `config.asgi`) las rutas
+de listado y detalle se sirven con vistas `async def`: `GET` ejecuta
+`ChargePointViewSet.alist` / `aretrieve` (ORM async, paginación async) y renderiza el
+envelope en el propio bucle de eventos, sin ocupar un hilo de `sync_to_async` durante
+toda la petición. Los demás métodos (POST, PUT, PATCH, DELETE) delegan en la vista DRF
+síncrona de siempre.
+
+También delegan las lecturas que el camino async no cubre: API navegable (renderer
+distinto de JSON), permisos distintos de `AllowAny` (la autenticación de DRF es
+síncrona), caché de respuestas activa o `CHARGEPOINTS_FAST_READ_PATH=False`.
+
+Bajo WSGI la opción queda desactivada y las rutas son las del router, sin cambios.
+"""
+
+from __future__ import annotations
+
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.urls import URLPattern
+from rest_framework.permissions import AllowAny
+
+from . import routing
+from .cache import get_response_cache
+from .projections import fast_read_path_enabled
+from .renderers import FastJSONRenderer
+
+# Nombres de ruta del router (`<basename>-list` / `<basename>-detail`) -> acción async
+ASYNC_ACTIONS = {"list": "alist", "retrieve": "aretrieve"}
+
+
+def async_reads_enabled() -> bool:
+    return getattr(settings, "CHARGEPOINTS_ASYNC_READS", False)
+
+
+def async_read_urls(patterns: list) -> list:
+    """
+    Sustituye en `patterns` (las rutas de un router DRF) las vistas con acción
+    `list`/`retrieve` en `GET` por su versión async. Las demás rutas no cambian.
+    """
+    result = []
+    for pattern in patterns:
+        actions = getattr(pattern.callback, "actions", None) or {}
+        if isinstance(pattern, URLPattern) and actions.get("get") in ASYNC_ACTIONS:
+            pattern = URLPattern(
+                pattern.pattern,
+                async_read_view(pattern.callback),
+                pattern.default_args,
+                pattern.name,
+            )
+        result.append(pattern)
+    return result
+
+
+def async_read_view(view):
+    """Vista `async def` sobre la vista de un viewset creada con `as_view(actions)`."""
+    sync_view = sync_to_async(view)
+
+    @wraps(view)  # conserva `cls`, `initkwargs`, `actions` (métricas, esquema) y csrf_exempt
+    async def async_view(request, *args, **kwargs):
+        if request.method == "GET":
+            response = await _read(view, request, args, kwargs)
+            if response is not None:
+                return response
+        return await sync_view(request, *args, **kwargs)
+
+    return async_view
+
+
+async def _read(view, django_request, args, kwargs) -> HttpResponse | None:
+    """
+    Reproduce `APIView.dispatch` para `GET` sin E/S síncrona. Devuelve `None` si la
+    petición debe servirla la vista síncrona.
+    """
+    if not fast_read_path_enabled() or get_response_cache().enabled:
+        return None
+
+    self = view.cls(**view.initkwargs)
+    self.action_map = view.actions
+    self.action = view.actions["get"]
+    self.args, self.kwargs = args, kwargs
+    self.headers = self.default_response_headers
+    request = self.initialize_request(django_request, *args, **kwargs)
+    self.request = request
+
+    try:
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        request.accepted_renderer, request.accepted_media_type = self.perform_content_negotiation(
+            request
+        )
+        if not isinstance(request.accepted_renderer, FastJSONRenderer):
+            return None
+        request.version, request.versioning_scheme = self.determine_version(
+            request, *args, **kwargs
+        )
+        if not all(isinstance(p, AllowAny) for p in self.get_permissions()):
+            return None
+        # `perform_authentication` se omite: con AllowAny nada lee `request.user`.
+        self.check_throttles(request)
+        handler = getattr(self, ASYNC_ACTIONS[self.action])
+        with routing.replica_reads(self.action in self.replica_actions):
+            response = await handler(request, *args, **kwargs)
+    except Exception as exc:
+        response = self.handle_exception(exc)
+
+    response = self.finalize_response(request, response, *args, **kwargs)
+    return _rendered(response)
+
+
+def _rendered(response) -> HttpResponse:
+    """
+    Renderiza la respuesta DRF aquí (el envelope es JSON: solo CPU) y la devuelve como
+    `HttpResponse`: Django renderiza en un hilo (`sync_to_async`) las respuestas con
+    `render()` pendiente.
+    """
+    if not hasattr(response, "render"):
+        return response  # p. ej. 304 de `conditional.evaluate`
+    response.render()
+    rendered = HttpResponse(response.content, status=response.status_code)
+    for name, value in response.items():
+        rendered[name] = value
+    return rendered
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from django.db import IntegrityError, transaction
+from django.db.models import prefetch_related_objects
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import ChargePoint
+from .serializers import (
+    BatchChargePointSerializer,
+    BatchOperationSerializer,
+    BatchRequestSerializer,
+    ChargePointSerializer,
+)
+
+OP_CREATE = BatchOperationSerializer.OP_CREATE
+OP_UPDATE = BatchOperationSerializer.OP_UPDATE
+OP_DELETE = BatchOperationSerializer.OP_DELETE
+
+
+class BatchConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "El lote entra en conflicto con escrituras concurrentes."
+    default_code = "conflict"
+
+
+@dataclass
+class BatchItemResult:
+    index: int
+    op: str
+    status: int = status.HTTP_200_OK
+    instance: ChargePoint | None = None
+    errors: dict | None = None
+    serializer: BatchChargePointSerializer | None = field(default=None, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.errors is None
+
+    def fail(self, code: int, errors: dict) -> None:
+        self.status, self.errors = code, errors
+
+    def as_dict(self) -> dict:
+        data = None
+        if self.ok and self.instance is not None and self.op != OP_DELETE:
+            data = ChargePointSerializer(self.instance).data
+        return {
+            "index": self.index,
+            "op": self.op,
+            "status": self.status,
+            "data": data,
+            "errors": self.errors,
+        }
+
+
+def apply_batch(operations: list[dict], mode: str) -> list[BatchItemResult]:
+    """
+    Valida y aplica un lote de operaciones sobre ChargePoint en una única transacción.
+
+    - Una sola consulta para cargar los objetos afectados y otra para la unicidad de `name`
+      (simulada en el orden de las operaciones).
+    - Escritura set-based: `delete()` del queryset (soft), `bulk_update` y `bulk_create`.
+      Si choca con una restricción (cadenas de renombrados que el `UPDATE` único no
+      resuelve, o una escritura concurrente) se repite operación a operación, en orden.
+    - `atomic`: cualquier error invalida el lote completo (ValidationError con los errores
+      por índice; 409 si falla al escribir). `best_effort`: se aplican las operaciones
+      válidas y el resto se devuelve con su error; al escribir, cada operación va en su
+      propio savepoint y un `IntegrityError` solo invalida esa operación (409).
+    """
+    results = [BatchItemResult(index=i, op=op["op"]) for i, op in enumerate(operations)]
+    _validate(operations, results)
+
+    failed = {str(r.index): r.errors for r in results if not r.ok}
+    if failed and mode == BatchRequestSerializer.MODE_ATOMIC:
+        raise ValidationError({"operations": failed})
+
+    valid = [r for r in results if r.ok]
+    try:
+        with transaction.atomic():
+            _apply(valid)
+        return results
+    except IntegrityError:
+        pass
+
+    if mode == BatchRequestSerializer.MODE_ATOMIC:
+        try:
+            with transaction.atomic():
+                for result in valid:
+                    _apply([result])
+        except IntegrityError as exc:
+            raise BatchConflict() from exc
+        return results
+
+    with transaction.atomic():
+        for result in valid:
+            try:
+                with transaction.atomic():
+                    _apply([result])
+            except IntegrityError:
+                result.fail(status.HTTP_409_CONFLICT, {"detail": BatchConflict.default_detail})
+    return results
+
+
+def _validate(operations: list[dict], results: list[BatchItemResult]) -> None:
+    # Objetos afectados por update/delete: una sola consulta (solo vivos)
+    targeted: dict[int, int] = {}
+    for op, result in zip(operations, results, strict=True):
+        if op["op"] == OP_CREATE:
+            continue
+        if op["id"] in targeted:
+            result.fail(status.HTTP_400_BAD_REQUEST, {"id": ["id repetido en el lote."]})
+        else:
+            targeted[op["id"]] = result.index
+    instances = ChargePoint.objects.in_bulk(list(targeted))
+
+    # Validación de campos con el serializer (sin el SELECT de unicidad por elemento)
+    for op, result in zip(operations, results, strict=True):
+        if not result.ok:
+            continue
+        if op["op"] != OP_CREATE:
+            result.instance = instances.get(op["id"])
+            if result.instance is None:
+                result.fail(status.HTTP_404_NOT_FOUND, {"detail": "No encontrado."})
+                continue
+        if op["op"] == OP_DELETE:
+            result.status = status.HTTP_204_NO_CONTENT
+            continue
+
+        ser = BatchChargePointSerializer(
+            result.instance, data=op["data"], partial=op["op"] == OP_UPDATE
+        )
+        if not ser.is_valid():
+            result.fail(status.HTTP_400_BAD_REQUEST, ser.errors)
+            continue
+        result.serializer = ser
+        if op["op"] == OP_CREATE:
+            result.status = status.HTTP_201_CREATED
+
+    _validate_unique_names(results)
+
+
+def _validate_unique_names(results: list[BatchItemResult]) -> None:
+    """
+    Unicidad de `name` para todo el lote con una consulta, simulando el conjunto de
+    nombres en el orden de las operaciones: un borrado o un renombrado anterior libera
+    el nombre para las operaciones siguientes (no para las anteriores).
+    """
+    claims = []
+    for result in results:
+        if not result.ok or result.serializer is None:
+            continue
+        name = result.serializer.validated_data.get("name")
+        if name is not None and (result.instance is None or name != result.instance.name):
+            claims.append(name)
+    if not claims:
+        return
+
+    # nombre -> dueño: pk de un ChargePoint vivo o índice (str) de un alta del lote
+    owners: dict[str, int | str] = dict(
+        ChargePoint.objects.filter(name__in=claims).values_list("name", "id")
+    )
+    current: dict[int, str] = {}
+    for result in results:
+        if result.ok and result.instance is not None:
+            owners[result.instance.name] = result.instance.pk
+            current[result.instance.pk] = result.instance.name
+    renamed: set[str] = set()
+
+    for result in results:
+        if not result.ok:
+            continue
+        if result.op == OP_DELETE:
+            owners.pop(current.pop(result.instance.pk), None)
+            continue
+        name = result.serializer.validated_data.get("name")
+        owner = result.instance.pk if result.instance is not None else str(result.index)
+        if name is None or owners.get(name) == owner:
+            continue
+        if name in owners:
+            message = (
+                "Nombre repetido en el lote."
+                if name in renamed
+                else "Ya existe un ChargePoint con este nombre."
+            )
+            result.fail(status.HTTP_400_BAD_REQUEST, {"name": [message]})
+            continue
+        if result.instance is not None:
+            owners.pop(current[owner], None)
+            current[owner] = name
+        owners[name] = owner
+        renamed.add(name)
+
+
+def _apply(results: list[BatchItemResult]) -> None:
+    # Orden: borrados (liberan nombres), actualizaciones y altas.
+    deletes = [r.instance.pk for r in results if r.op == OP_DELETE]
+    if deletes:
+        ChargePoint.objects.filter(pk__in=deletes).delete()
+
+    updates = [r for r in results if r.op == OP_UPDATE]
+    fields: set[str] = set()
+    for result in updates:
+        for attr, value in result.serializer.validated_data.items():
+            setattr(result.instance, attr, value)
+            fields.add(attr)
+    if updates and fields:
+        ChargePoint.objects.bulk_update([r.instance for r in updates], sorted(fields))
+
+    creates = [r for r in results if r.op == OP_CREATE]
+    if creates:
+        objs = ChargePoint.objects.bulk_create(
+            [ChargePoint(**r.serializer.validated_data) for r in creates]
+        )
+        for result, obj in zip(creates, objs, strict=True):
+            result.instance = obj
+
+    # Conectores para la respuesta en una sola consulta
+    prefetch_related_objects([r.instance for r in updates + creates], "connectors")
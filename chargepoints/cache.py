@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+
+from .metrics import CACHE_EVENTS
+from .signals import data_changed
+
+_MISSING = object()
+
+DEFAULTS = {
+    "ENABLED": False,
+    "BACKEND": "locmem",  # "locmem" (un proceso) | "django" (caché compartida)
+    "ALIAS": "default",  # alias de CACHES para el backend "django"
+    "TTL": 30,
+    "MAX_ENTRIES": 1000,  # solo locmem; en "django" lo gestiona la propia caché
+    "LOCK_TIMEOUT": 5.0,
+    "KEY_PREFIX": "cp:resp",
+}
+
+
+def _initial_generation() -> int:
+    # Un contador que "desaparece" (reinicio, desalojo) nunca vuelve a un valor ya usado.
+    return time.time_ns()
+
+
+class LocMemBackend:
+    """
+    Almacén en memoria del proceso: LRU acotado por `MAX_ENTRIES` con expiración por TTL.
+    Válido solo con un único proceso: las generaciones no se comparten entre workers.
+    """
+
+    def __init__(self, options: dict):
+        self.max_entries = options["MAX_ENTRIES"]
+        self._data: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._mutex = threading.Lock()
+
+    def get(self, key: str):
+        with self._mutex:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float) -> None:
+        with self._mutex:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def get_generation(self, name: str) -> int:
+        with self._mutex:
+            return self._generations.setdefault(name, _initial_generation())
+
+    def bump_generation(self, name: str) -> None:
+        with self._mutex:
+            self._generations[name] = self._generations.get(name, _initial_generation()) + 1
+
+    @contextmanager
+    def lock(self, key: str, timeout: float):
+        with self._mutex:
+            lock = self._locks.setdefault(key, threading.Lock())
+        acquired = lock.acquire(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+                with self._mutex:
+                    self._locks.pop(key, None)
+
+    def wait(self, key: str, timeout: float):
+        with self._mutex:
+            lock = self._locks.get(key)
+        if lock is not None and lock.acquire(timeout=timeout):
+            lock.release()
+        return self.get(key)
+
+    def clear(self) -> None:
+        with self._mutex:
+            self._data.clear()
+
+
+class DjangoCacheBackend:
+    """
+    Backend sobre un alias de `CACHES` (Redis, Memcached...). Datos, generaciones y
+    locks viven en la caché compartida, así que es válido con varios workers.
+    """
+
+    poll_interval = 0.01
+
+    def __init__(self, options: dict):
+        self.cache = caches[options["ALIAS"]]
+        self.prefix = options["KEY_PREFIX"]
+
+    def get(self, key: str):
+        return self.cache.get(key, _MISSING)
+
+    def set(self, key: str, value, ttl: float) -> None:
+        self.cache.set(key, value, timeout=ttl)
+
+    def _gen_key(self, name: str) -> str:
+        return f"{self.prefix}:gen:{name}"
+
+    def get_generation(self, name: str) -> int:
+        key = self._gen_key(name)
+        value = self.cache.get(key)
+        if value is None:
+            self.cache.add(key, _initial_generation(), timeout=None)
+            value = self.cache.get(key)
+        return value
+
+    def bump_generation(self, name: str) -> None:
+        key = self._gen_key(name)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.add(key, _initial_generation(), timeout=None)
+
+    @contextmanager
+    def lock(self, key: str, timeout: float):
+        lock_key = f"{key}:lock"
+        acquired = self.cache.add(lock_key, 1, timeout=timeout)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.cache.delete(lock_key)
+
+    def wait(self, key: str, timeout: float):
+        deadline = time.monotonic() + timeout
+        lock_key = f"{key}:lock"
+        while time.monotonic() < deadline:
+            value = self.get(key)
+            if value is not _MISSING or self.cache.get(lock_key) is None:
+                return value
+            time.sleep(self.poll_interval)
+        return self.get(key)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
+BACKENDS = {"locmem": LocMemBackend, "django": DjangoCacheBackend}
+
+
+class ResponseCache:
+    """
+    Caché de respuestas de lectura (list/retrieve) con invalidación por generación.
+
+    La clave incluye la generación de cada modelo del que depende la respuesta; toda
+    escritura (señal `data_changed`) incrementa la generación de su modelo y las claves
+    anteriores quedan inalcanzables (expiran por TTL/LRU). Con un fallo de caché, solo
+    una petición por clave calcula el valor: el resto espera a que se publique
+    (protección frente a estampidas).
+    """
+
+    def __init__(self, options: dict):
+        self.options = options
+        self.enabled = options["ENABLED"]
+        self.ttl = options["TTL"]
+        self.backend = BACKENDS[options["BACKEND"]](options)
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self.hits = self.misses = self.waits = 0
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "waits": self.waits,
+                "hit_ratio": (self.hits / total) if total else 0.0,
+            }
+
+    def _count(self, attr: str) -> None:
+        with self._stats_lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+        CACHE_EVENTS.labels(attr).inc()
+
+    def make_key(self, namespace: str, parts: dict, models) -> str:
+        generations = ":".join(
+            f"{m._meta.label_lower}={self.backend.get_generation(m._meta.label_lower)}"
+            for m in models
+        )
+        normalized = "&".join(f"{k}={v}" for k, v in sorted(parts.items()))
+        digest = hashlib.sha256(f"{normalized}|{generations}".encode()).hexdigest()
+        return f"{self.options['KEY_PREFIX']}:{namespace}:{digest}"
+
+    def get_or_set(self, key: str, compute):
+        value = self.backend.get(key)
+        if value is not _MISSING:
+            self._count("hits")
+            return value
+
+        self._count("misses")
+        timeout = self.options["LOCK_TIMEOUT"]
+        with self.backend.lock(key, timeout) as acquired:
+            if not acquired:
+                self._count("waits")
+                value = self.backend.wait(key, timeout)
+                if value is not _MISSING:
+                    return value
+            value = compute()
+            self.backend.set(key, value, self.ttl)
+            return value
+
+    def invalidate(self, model) -> None:
+        self.backend.bump_generation(model._meta.label_lower)
+
+
+_response_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        options = {**DEFAULTS, **getattr(settings, "CHARGEPOINTS_RESPONSE_CACHE", {})}
+        _response_cache = ResponseCache(options)
+    return _response_cache
+
+
+@receiver(setting_changed)
+def _reset_response_cache(setting, **kwargs):
+    global _response_cache
+    if setting in {"CHARGEPOINTS_RESPONSE_CACHE", "CACHES"}:
+        _response_cache = None
+
+
+@receiver(data_changed)
+def _invalidate_on_write(sender, using, **kwargs):
+    cache = get_response_cache()
+    if not cache.enabled:
+        return
+    # Inmediato (lecturas dentro de la misma transacción) y al confirmar, para
+    # descartar lo que otra petición haya cacheado con datos previos al commit.
+    cache.invalidate(sender)
+    transaction.on_commit(lambda: cache.invalidate(sender), using=using)
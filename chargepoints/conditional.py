@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import ChargePoint, Connector
+
+
+def detail_validators(queryset, **lookup) -> dict | None:
+    """
+    Validadores de un ChargePoint en una sola consulta agregada. Incluye los conectores
+    (también los borrados, cuyo `updated_at` refleja el soft delete) y su número, que
+    cambia con los borrados físicos. `None` si el objeto no existe.
+    """
+    try:
+        agg = queryset.filter(**lookup).aggregate(**_detail_aggregates())
+    except (TypeError, ValueError, ValidationError):
+        return None  # pk mal formado: get_object() responderá 404
+    return _detail_result(agg)
+
+
+async def adetail_validators(queryset, **lookup) -> dict | None:
+    """Equivalente async de `detail_validators` (vistas ASGI)."""
+    try:
+        agg = await queryset.filter(**lookup).aaggregate(**_detail_aggregates())
+    except (TypeError, ValueError, ValidationError):
+        return None
+    return _detail_result(agg)
+
+
+def _detail_aggregates() -> dict:
+    return {
+        "updated": Max("updated_at"),
+        "connectors_updated": Max("connectors__updated_at"),
+        "connectors": Count("connectors"),
+    }
+
+
+def _detail_result(agg: dict) -> dict | None:
+    if agg["updated"] is None:
+        return None
+    agg["last_modified"] = max(d for d in (agg["updated"], agg["connectors_updated"]) if d)
+    return agg
+
+
+def list_validators() -> dict:
+    """
+    Validadores de un listado: MAX(updated_at) global de ChargePoint y Connector,
+    resueltos por índice (O(log n)) y sin COUNT, para no penalizar la paginación keyset.
+    Cualquier alta, modificación o soft delete los cambia (la fila borrada sigue en la
+    tabla con su `updated_at`); el query string forma parte del ETag en `evaluate`.
+    Los borrados físicos de filas vivas (solo admin/mantenimiento) no se reflejan.
+    """
+    updated = ChargePoint.all_objects.aggregate(m=Max("updated_at"))["m"]
+    connectors_updated = Connector.all_objects.aggregate(m=Max("updated_at"))["m"]
+    return _list_result(updated, connectors_updated)
+
+
+async def alist_validators() -> dict:
+    """Equivalente async de `list_validators` (vistas ASGI)."""
+    updated = (await ChargePoint.all_objects.aaggregate(m=Max("updated_at")))["m"]
+    connectors_updated = (await Connector.all_objects.aaggregate(m=Max("updated_at")))["m"]
+    return _list_result(updated, connectors_updated)
+
+
+def _list_result(updated, connectors_updated) -> dict:
+    return {
+        "updated": updated,
+        "connectors_updated": connectors_updated,
+        "last_modified": max((d for d in (updated, connectors_updated) if d), default=None),
+    }
+
+
+def evaluate(request, validators: dict | None):
+    """
+    Devuelve `(respuesta_304 | None, cabeceras)`. La respuesta 304 se genera antes de
+    serializar nada; las cabeceras se añaden a la respuesta completa en caso contrario.
+    """
+    if validators is None:
+        return None, {}
+
+    fingerprint = repr(
+        (request.get_host(), request.get_full_path(), sorted(validators.items(), key=str))
+    )
+    etag = f'W/"{hashlib.sha256(fingerprint.encode()).hexdigest()[:32]}"'
+    last_modified = validators.get("last_modified")
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    headers = {"ETag": etag}
+    if timestamp is not None:
+        headers["Last-Modified"] = http_date(timestamp)
+
+    not_modified = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+    if not_modified is not None:
+        for name, value in headers.items():
+            not_modified[name] = value
+    return not_modified, headers
@@ -0,0 +1,91 @@
+"""
+Resumen de la flota por estado a partir de `ChargePointStatusCounter` (una fila por
+estado, mantenida en cada escritura) y recálculo desde la tabla real para repararlo,
+junto con el de `ChargePoint.connector_count`.
+"""
+
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import ChargePoint, ChargePointStatusCounter, Connector
+
+
+def status_counts(using: str = "default") -> dict[str, int]:
+    """ChargePoints vivos por estado, leídos de los contadores (sin recorrer la tabla)."""
+    counts = dict.fromkeys(ChargePoint.Status.values, 0)
+    counts.update(ChargePointStatusCounter.objects.using(using).values_list("status", "count"))
+    return counts
+
+
+def actual_counts(using: str = "default") -> dict[str, int]:
+    """Mismo resultado que `status_counts`, con un `GROUP BY status` sobre los vivos."""
+    counts = dict.fromkeys(ChargePoint.Status.values, 0)
+    counts.update(
+        ChargePoint.objects.using(using)
+        .order_by()
+        .values("status")
+        .annotate(n=Count("id"))
+        .values_list("status", "n")
+    )
+    return counts
+
+
+def summary(using: str = "default") -> dict:
+    counts = status_counts(using)
+    return {"total": sum(counts.values()), "by_status": counts}
+
+
+def recount(using: str = "default", dry_run: bool = False) -> dict[str, tuple[int, int]]:
+    """
+    Recalcula los contadores con un agregado real y devuelve las diferencias
+    `{status: (guardado, real)}`. Bloquea primero los contadores: una escritura en curso
+    o bien termina antes (y el agregado la ve) o espera a que se confirme el recálculo y
+    aplica su delta después. Con `dry_run` solo compara.
+    """
+    with transaction.atomic(using=using):
+        counters = ChargePointStatusCounter.objects.using(using)
+        stored = dict.fromkeys(ChargePoint.Status.values, 0)
+        locked = counters.select_for_update().order_by("status")
+        stored.update(locked.values_list("status", "count"))
+        actual = actual_counts(using)
+        actual.update({status: 0 for status in stored if status not in actual})
+        drift = {s: (stored[s], actual[s]) for s in sorted(actual) if stored[s] != actual[s]}
+        if not dry_run:
+            for status, (_, count) in drift.items():
+                counters.update_or_create(status=status, defaults={"count": count})
+    return drift
+
+
+def recount_connectors(using: str = "default", dry_run: bool = False) -> dict[int, tuple[int, int]]:
+    """
+    Igual que `recount` para `connector_count`: compara cada ChargePoint (bloqueado) con
+    sus conectores vivos y devuelve `{charge_point_id: (guardado, real)}`.
+    """
+    alive = (
+        Connector.objects.using(using)
+        .filter(charge_point=OuterRef("pk"))
+        .order_by()
+        .values("charge_point")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    with transaction.atomic(using=using):
+        chargepoints = ChargePoint.all_objects.using(using)
+        rows = (
+            chargepoints.select_for_update()
+            .order_by("pk")
+            .annotate(actual=Coalesce(Subquery(alive), 0))
+            .exclude(connector_count=F("actual"))
+            .values_list("pk", "connector_count", "actual")
+        )
+        drift = {pk: (stored, actual) for pk, stored, actual in rows}
+        if not dry_run:
+            by_count: dict[int, list[int]] = {}
+            for pk, (_, actual) in drift.items():
+                by_count.setdefault(actual, []).append(pk)
+            for count, ids in sorted(by_count.items()):
+                chargepoints.filter(pk__in=ids).update(connector_count=count)
+    return drift
@@ -0,0 +1,88 @@
+"""
+Soft delete y restauración en cascada, set-based.
+
+`soft_delete(queryset)` marca las filas vivas del queryset y, siguiendo las relaciones
+inversas con `on_delete=CASCADE` hacia otros modelos con soft delete (ChargePoint →
+Connector), las filas vivas que dependen de ellas: una sola sentencia `UPDATE` por
+modelo, con independencia del número de filas. Todas las filas de la operación
+comparten `deleted_at` y un identificador de lote (`deletion_batch`).
+
+`restore(queryset)` es la operación simétrica: revive las filas borradas del queryset
+y, en cascada, solo las dependientes borradas en el mismo lote que su padre. Un
+conector borrado antes (por separado) sigue borrado al restaurar su ChargePoint.
+
+Cada nivel se selecciona con una subconsulta sobre el nivel anterior y las sentencias
+se ejecutan de abajo arriba (hojas primero): cuando se actualiza un nivel, la selección
+de su padre aún no ha cambiado. Todo ocurre en una transacción; los contadores y
+`rows_changed` los mantienen `CountedQuerySet.update` y, al borrar,
+`CountedQuerySet.update_alive` (`UPDATE ... RETURNING`, sin lectura previa).
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from django.db import models, transaction
+from django.utils import timezone
+
+
+def soft_delete(queryset, batch: uuid.UUID | None = None, now=None) -> dict[str, int]:
+    """Borra (soft) `queryset` y sus dependientes. Devuelve las filas marcadas por modelo."""
+    values = {
+        "deleted_at": now or timezone.now(),
+        "deletion_batch": batch or uuid.uuid4(),
+    }
+    return _execute(_plan(queryset.alive(), alive=True), values, queryset.db, alive=True)
+
+
+def restore(queryset) -> dict[str, int]:
+    """Restaura `queryset` y los dependientes de su mismo lote. Filas restauradas por modelo."""
+    values = {"deleted_at": None, "deletion_batch": None}
+    return _execute(_plan(queryset.dead(), alive=False), values, queryset.db)
+
+
+def cascade_relations(model) -> list:
+    """Relaciones inversas `CASCADE` hacia modelos con soft delete."""
+    return [
+        rel
+        for rel in model._meta.related_objects
+        if rel.on_delete is models.CASCADE
+        and not rel.many_to_many
+        and _is_soft_deletable(rel.related_model)
+    ]
+
+
+def _is_soft_deletable(model) -> bool:
+    names = {f.name for f in model._meta.concrete_fields}
+    return {"deleted_at", "deletion_batch"} <= names
+
+
+def _plan(queryset, alive: bool, seen: frozenset = frozenset()) -> list:
+    """Querysets a actualizar, del modelo raíz a las hojas."""
+    model = queryset.model
+    plan = [queryset.order_by()]
+    for rel in cascade_relations(model):
+        related = rel.related_model
+        if related in seen or related is model:
+            continue
+        children = related.all_objects.using(queryset.db).filter(
+            **{f"{rel.field.name}__in": queryset.order_by().values("pk")}
+        )
+        if alive:
+            children = children.alive()
+        else:
+            # Solo las borradas en el mismo lote que su padre
+            batch = models.F(f"{rel.field.name}__deletion_batch")
+            children = children.dead().filter(deletion_batch=batch)
+        plan += _plan(children, alive, seen | {model})
+    return plan
+
+
+def _execute(plan: list, values: dict, using: str, alive: bool = False) -> dict[str, int]:
+    counts = dict.fromkeys((q.model._meta.label for q in plan), 0)  # raíz primero
+    with transaction.atomic(using=using, savepoint=False):
+        for queryset in reversed(plan):
+            # Borrado: filas vivas, `update_alive` no necesita leerlas antes (RETURNING)
+            update = queryset.update_alive if alive else queryset.update
+            counts[queryset.model._meta.label] += update(**values)
+    return counts
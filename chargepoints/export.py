@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import csv
+from collections.abc import AsyncIterator, Iterable, Iterator
+
+from asgiref.sync import sync_to_async
+
+from .projections import CHARGEPOINT_FIELDS, chargepoint_rows, project_chargepoints
+from .renderers import FastJSONRenderer
+
+DEFAULT_CHUNK_SIZE = 2000
+
+#: Separador de los `evse_number` en la columna `connectors` del CSV.
+CSV_CONNECTOR_SEPARATOR = "|"
+
+_DONE = object()
+
+
+def iter_chunks(queryset, fieldset=None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[list]:
+    """
+    Recorre el queryset con un cursor de servidor (`iterator(chunk_size)`) y devuelve
+    bloques ya proyectados. Los conectores se cargan con una consulta por bloque, así
+    que la memoria depende de `chunk_size` y no del total de filas.
+    """
+    rows = chargepoint_rows(queryset, fieldset).iterator(chunk_size=chunk_size)
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield project_chargepoints(chunk, using=queryset.db, fieldset=fieldset)
+            chunk = []
+    if chunk:
+        yield project_chargepoints(chunk, using=queryset.db, fieldset=fieldset)
+
+
+def ndjson_stream(chunks: Iterable[list]) -> Iterator[bytes]:
+    """Una línea JSON por ChargePoint (mismo formato que los elementos de `list`)."""
+    renderer = FastJSONRenderer()
+    for items in chunks:
+        yield b"".join(renderer.render(item) + b"\n" for item in items)
+
+
+class _Echo:
+    """Pseudo-fichero para `csv.writer`: devuelve la línea en lugar de escribirla."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def csv_stream(chunks: Iterable[list], fieldset=None) -> Iterator[bytes]:
+    """
+    CSV con cabecera. La columna `connectors` contiene los `evse_number` de los
+    conectores vivos separados por `CSV_CONNECTOR_SEPARATOR`.
+    """
+    columns = list(fieldset) if fieldset is not None else [*CHARGEPOINT_FIELDS, "connectors"]
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns).encode("utf-8")
+    for items in chunks:
+        lines = []
+        for item in items:
+            if "connectors" in item:
+                item["connectors"] = CSV_CONNECTOR_SEPARATOR.join(
+                    c["evse_number"] for c in item["connectors"]
+                )
+            lines.append(writer.writerow([item[column] for column in columns]))
+        yield "".join(lines).encode("utf-8")
+
+
+async def aiter_stream(stream: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    `stream` como iterador async para ASGI: cada bloque se obtiene con `sync_to_async`
+    (hilo de la petición, el del cursor de servidor) y se envía antes de pedir el
+    siguiente. Con un iterador síncrono, `StreamingHttpResponse` bajo ASGI lo consumiría
+    entero (`list`) antes de enviar el primer byte.
+    """
+    pull = sync_to_async(next)
+    try:
+        while (part := await pull(stream, _DONE)) is not _DONE:
+            yield part
+    finally:
+        # Desconexión o fin: cierra el generador (y el cursor) en su hilo.
+        await sync_to_async(stream.close)()
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import django_filters
+
+from .models import ChargePoint
+
+
+class ChargePointFilter(django_filters.FilterSet):
+    """
+    Filtros del listado/exportación. `min_connectors` / `max_connectors` comparan con
+    `connector_count` (conectores vivos, desnormalizado): sin COUNT por petición y con
+    el índice parcial `chargepoint_alive_conn_idx`.
+    """
+
+    min_connectors = django_filters.NumberFilter(
+        field_name="connector_count", lookup_expr="gte", min_value=0
+    )
+    max_connectors = django_filters.NumberFilter(
+        field_name="connector_count", lookup_expr="lte", min_value=0
+    )
+
+    class Meta:
+        model = ChargePoint
+        fields = ["status"]
@@ -0,0 +1,116 @@
+"""
+Particiones mensuales del historial de estados (`ChargePointStatusEvent`) en PostgreSQL.
+
+La tabla padre está particionada por rango de `occurred_at` (`PARTITION BY RANGE`): una
+partición por mes UTC (`<tabla>_AAAAMM`) más una `DEFAULT` que recoge lo que caiga fuera de
+las creadas, para que una inserción nunca falle. Las consultas con rango de fechas solo
+leen las particiones afectadas (partition pruning) y la retención se aplica borrando
+particiones enteras, sin `DELETE` fila a fila. `manage.py history_partitions` crea las
+de los próximos meses (ejecutarlo periódicamente, p. ej. en cron) y borra las antiguas.
+
+En otros motores la tabla es normal y estas funciones no hacen nada.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+
+from django.db import connections
+from django.utils import timezone
+
+from .models import ChargePointStatusEvent
+
+TABLE = ChargePointStatusEvent._meta.db_table
+DEFAULT_MONTHS_AHEAD = 3
+
+
+def month_start(value: date | datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date, table: str = TABLE) -> str:
+    return f"{table}_{month:%Y%m}"
+
+
+def is_partitioned(using: str = "default", table: str = TABLE) -> bool:
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [table]
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(using: str = "default", table: str = TABLE) -> list[tuple[str, date]]:
+    """Particiones mensuales existentes `(nombre, mes)`, ordenadas (sin la `DEFAULT`)."""
+    pattern = re.compile(rf"^{re.escape(table)}_(\d{{4}})(\d{{2}})$")
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(%s)",
+            [table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    months = []
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            months.append((name, date(int(match[1]), int(match[2]), 1)))
+    return sorted(months, key=lambda item: item[1])
+
+
+def ensure_partitions(
+    using: str = "default",
+    months_ahead: int = DEFAULT_MONTHS_AHEAD,
+    start: date | None = None,
+    table: str = TABLE,
+) -> list[str]:
+    """
+    Crea (si faltan) las particiones desde el mes de `start` (hoy por defecto) hasta
+    `months_ahead` meses después. Devuelve las creadas. Falla si la `DEFAULT` ya contiene
+    filas de ese rango: por eso conviene crearlas con antelación.
+    """
+    if not is_partitioned(using, table):
+        return []
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    first = month_start(start or timezone.now())
+    existing = {name for name, _ in list_partitions(using, table)}
+    created = []
+    with connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            month = add_months(first, offset)
+            name = partition_name(month, table)
+            if name in existing:
+                continue
+            # DDL sin parámetros enlazados; los límites son fechas ISO generadas aquí.
+            lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+            cursor.execute(
+                f"CREATE TABLE {qn(name)} PARTITION OF {qn(table)} "
+                f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+            )
+            created.append(name)
+    return created
+
+
+def drop_partitions_before(
+    before: date, using: str = "default", dry_run: bool = False, table: str = TABLE
+) -> list[str]:
+    """Retención: borra las particiones de meses anteriores a `before` (DROP TABLE)."""
+    if not is_partitioned(using, table):
+        return []
+    qn = connections[using].ops.quote_name
+    old = [name for name, month in list_partitions(using, table) if month < month_start(before)]
+    if not dry_run:
+        with connections[using].cursor() as cursor:
+            for name in old:
+                cursor.execute(f"DROP TABLE {qn(name)}")
+    return old
@@ -0,0 +1,487 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .export import CSV_CONNECTOR_SEPARATOR
+from .models import ChargePoint, Connector
+from .signals import send_data_changed
+
+FORMAT_CSV = "csv"
+FORMAT_NDJSON = "ndjson"
+METHOD_COPY = "copy"
+METHOD_ORM = "orm"
+
+NAME_MAX_LENGTH = ChargePoint._meta.get_field("name").max_length
+EVSE_MAX_LENGTH = Connector._meta.get_field("evse_number").max_length
+STATUSES = set(ChargePoint.Status.values)
+DEFAULT_STATUS = ChargePoint._meta.get_field("status").default
+
+
+@dataclass
+class ImportRow:
+    line: int
+    name: str
+    status: str
+    evse_numbers: list[str]
+
+
+@dataclass
+class ImportStats:
+    rows: int = 0
+    errors: int = 0
+    created: int = 0
+    updated: int = 0
+    connectors_created: int = 0
+    connectors_updated: int = 0
+    batches: int = 0
+    last_line: int = 0
+
+    def add(self, counts: dict) -> None:
+        for name, value in counts.items():
+            setattr(self, name, getattr(self, name) + value)
+
+
+# ---------------------------------------------------------------------
+# Lectura en streaming
+# ---------------------------------------------------------------------
+
+
+def detect_format(path: str) -> str:
+    suffix = Path(path).suffix.lower()
+    return FORMAT_CSV if suffix == ".csv" else FORMAT_NDJSON
+
+
+def read_rows(path: str, fmt: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    """
+    Recorre el fichero línea a línea sin cargarlo en memoria. Devuelve
+    `(línea, fila, error)`; las filas ilegibles llegan con `fila=None`.
+
+    Admite el formato de `GET /api/v1/chargepoint/export` (CSV y NDJSON).
+    """
+    with open(path, encoding="utf-8-sig", newline="") as fh:
+        if fmt == FORMAT_CSV:
+            reader = csv.DictReader(fh)
+            for row in reader:
+                yield reader.line_num, row, None
+            return
+        for line_no, line in enumerate(fh, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield line_no, None, f"JSON inválido: {exc}"
+                continue
+            if not isinstance(row, dict):
+                yield line_no, None, "Se esperaba un objeto JSON."
+                continue
+            yield line_no, row, None
+
+
+# ---------------------------------------------------------------------
+# Validación por lotes
+# ---------------------------------------------------------------------
+
+
+def _evse_numbers(value) -> list:
+    if value in (None, ""):
+        return []
+    if isinstance(value, str):
+        return value.split(CSV_CONNECTOR_SEPARATOR)
+    if isinstance(value, list):
+        return [c.get("evse_number") if isinstance(c, dict) else c for c in value]
+    return [value]
+
+
+def _validate_row(line: int, row: dict) -> tuple[ImportRow | None, dict]:
+    errors: dict[str, list[str]] = {}
+
+    name = row.get("name")
+    name = name.strip() if isinstance(name, str) else ""
+    if not name:
+        errors["name"] = ["El nombre no puede estar vacío."]
+    elif len(name) > NAME_MAX_LENGTH:
+        errors["name"] = [f"Máximo {NAME_MAX_LENGTH} caracteres."]
+
+    status = row.get("status") or DEFAULT_STATUS
+    if not isinstance(status, str) or status not in STATUSES:
+        errors["status"] = [f'"{status}" no es una opción válida.']
+
+    evse_numbers = []
+    for evse in _evse_numbers(row.get("connectors")):
+        evse = evse.strip() if isinstance(evse, str) else ""
+        if not evse or len(evse) > EVSE_MAX_LENGTH:
+            errors.setdefault("connectors", []).append(
+                f"evse_number inválido (1..{EVSE_MAX_LENGTH} caracteres)."
+            )
+        elif evse in evse_numbers:
+            errors.setdefault("connectors", []).append(f"evse_number repetido: {evse}.")
+        else:
+            evse_numbers.append(evse)
+
+    if errors:
+        return None, errors
+    return ImportRow(line, name, status, evse_numbers), errors
+
+
+def validate_batch(
+    raw: list[tuple[int, dict | None, str | None]],
+) -> tuple[list[ImportRow], list[dict]]:
+    """
+    Valida un lote completo. Además de las reglas por campo, detecta nombres y
+    `evse_number` repetidos dentro del lote (la unicidad frente a la base de datos
+    se resuelve con el upsert). Devuelve `(filas válidas, informes de error)`.
+    """
+    valid: list[ImportRow] = []
+    failures: list[dict] = []
+    names: set[str] = set()
+    evses: set[str] = set()
+
+    for line, row, error in raw:
+        if row is None:
+            failures.append({"line": line, "row": None, "errors": {"row": [error]}})
+            continue
+        item, errors = _validate_row(line, row)
+        if item is not None:
+            if item.name in names:
+                errors = {"name": ["Nombre repetido en el lote."]}
+            elif evses.intersection(item.evse_numbers):
+                errors = {"connectors": ["evse_number repetido en el lote."]}
+        if errors:
+            failures.append({"line": line, "row": row, "errors": errors})
+            continue
+        names.add(item.name)
+        evses.update(item.evse_numbers)
+        valid.append(item)
+    return valid, failures
+
+
+# ---------------------------------------------------------------------
+# Escritura
+# ---------------------------------------------------------------------
+
+
+class OrmWriter:
+    """
+    Upsert portable (SQLite y resto de motores): una consulta para localizar los
+    existentes por clave natural y escritura con `bulk_update` / `bulk_create`.
+    """
+
+    def __init__(self, using: str):
+        self.using = using
+
+    def write(self, rows: list[ImportRow]) -> dict:
+        now = timezone.now()
+        cps = ChargePoint.objects.using(self.using)
+        existing = {cp.name: cp for cp in cps.filter(name__in=[r.name for r in rows])}
+
+        changed = []
+        for row in rows:
+            cp = existing.get(row.name)
+            if cp is not None and cp.status != row.status:
+                cp.status, cp.updated_at = row.status, now
+                changed.append(cp)
+        if changed:
+            cps.bulk_update(changed, ["status", "updated_at"])
+        new = cps.bulk_create(
+            [ChargePoint(name=r.name, status=r.status) for r in rows if r.name not in existing]
+        )
+        existing.update({cp.name: cp for cp in new})
+
+        wanted = {evse: existing[r.name].pk for r in rows for evse in r.evse_numbers}
+        conns = Connector.objects.using(self.using)
+        current = {c.evse_number: c for c in conns.filter(evse_number__in=list(wanted))}
+        moved = []
+        for evse, cp_id in wanted.items():
+            conn = current.get(evse)
+            if conn is not None and conn.charge_point_id != cp_id:
+                conn.charge_point_id, conn.updated_at = cp_id, now
+                moved.append(conn)
+        if moved:
+            conns.bulk_update(moved, ["charge_point", "updated_at"])
+        created = conns.bulk_create(
+            [
+                Connector(evse_number=evse, charge_point_id=cp_id)
+                for evse, cp_id in wanted.items()
+                if evse not in current
+            ]
+        )
+        return {
+            "created": len(new),
+            "updated": len(changed),
+            "connectors_created": len(created),
+            "connectors_updated": len(moved),
+        }
+
+
+class CopyWriter:
+    """
+    Upsert en PostgreSQL: `COPY FROM STDIN` a una tabla temporal (una fila por
+    conector) y cuatro sentencias set-based contra los índices únicos parciales
+    (`name` y `evse_number` entre vivos).
+    """
+
+    stage = "chargepoint_import_stage"
+
+    def __init__(self, using: str):
+        self.using = using
+        self.connection = connections[using]
+
+    def write(self, rows: list[ImportRow]) -> dict:
+        qn = self.connection.ops.quote_name
+        cp_table, conn_table = qn(ChargePoint._meta.db_table), qn(Connector._meta.db_table)
+        now = timezone.now()
+        stage_rows = (
+            (row.name, row.status, evse) for row in rows for evse in (row.evse_numbers or [None])
+        )
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE {self.stage} (name text, status text, evse text) ON COMMIT DROP"
+            )
+            self._copy(cursor, stage_rows)
+
+            # Estados previos bloqueados (FOR UPDATE) para ajustar los contadores por estado.
+            cursor.execute(
+                f"""
+                WITH s AS (SELECT DISTINCT name, status FROM {self.stage}),
+                old AS (
+                    SELECT cp.id, cp.status FROM {cp_table} AS cp JOIN s ON cp.name = s.name
+                    WHERE cp.deleted_at IS NULL AND cp.status <> s.status
+                    FOR UPDATE OF cp
+                ),
+                changed AS (
+                    UPDATE {cp_table} AS cp SET status = s.status, updated_at = %s
+                    FROM s, old
+                    WHERE cp.id = old.id AND cp.name = s.name
+                    RETURNING cp.id, old.status AS old_status, cp.status AS new_status
+                )
+                SELECT id, old_status, new_status FROM changed
+                """,
+                [now],
+            )
+            # Cambios por fila `(pk, antes, después)`, como los de CountedQuerySet.
+            changes = [(pk, (old, None), (new, None)) for pk, old, new in cursor.fetchall()]
+            updated = len(changes)
+            cursor.execute(
+                f"""
+                WITH inserted AS (
+                    INSERT INTO {cp_table} (name, status, created_at, updated_at, connector_count)
+                    SELECT DISTINCT s.name, s.status, %s::timestamptz, %s::timestamptz, 0
+                    FROM {self.stage} AS s
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM {cp_table} AS cp
+                        WHERE cp.name = s.name AND cp.deleted_at IS NULL
+                    )
+                    ON CONFLICT (name) WHERE deleted_at IS NULL DO NOTHING
+                    RETURNING id, status
+                )
+                SELECT id, status FROM inserted
+                """,
+                [now, now],
+            )
+            inserted = [(pk, None, (status, None)) for pk, status in cursor.fetchall()]
+            changes += inserted
+            created = len(inserted)
+
+            alive_target = f"""
+                FROM {self.stage} AS s
+                JOIN {cp_table} AS cp ON cp.name = s.name AND cp.deleted_at IS NULL
+                WHERE s.evse IS NOT NULL
+            """
+            # Conectores movidos de ChargePoint: origen y destino para connector_count.
+            cursor.execute(
+                f"""
+                WITH t AS (SELECT s.evse, cp.id AS cp_id {alive_target}),
+                old AS (
+                    SELECT c.id, c.charge_point_id FROM {conn_table} AS c
+                    JOIN t ON c.evse_number = t.evse
+                    WHERE c.deleted_at IS NULL AND c.charge_point_id <> t.cp_id
+                    FOR UPDATE OF c
+                ),
+                moved AS (
+                    UPDATE {conn_table} AS c SET charge_point_id = t.cp_id, updated_at = %s
+                    FROM t, old
+                    WHERE c.id = old.id AND c.evse_number = t.evse
+                    RETURNING c.id, old.charge_point_id AS old_cp, c.charge_point_id AS new_cp
+                )
+                SELECT id, old_cp, new_cp FROM moved
+                """,
+                [now],
+            )
+            connector_changes = [
+                (pk, (old, None), (new, None)) for pk, old, new in cursor.fetchall()
+            ]
+            connectors_updated = len(connector_changes)
+            cursor.execute(
+                f"""
+                WITH inserted AS (
+                    INSERT INTO {conn_table} (evse_number, charge_point_id, created_at, updated_at)
+                    SELECT s.evse, cp.id, %s::timestamptz, %s::timestamptz {alive_target}
+                    AND NOT EXISTS (
+                        SELECT 1 FROM {conn_table} AS c
+                        WHERE c.evse_number = s.evse AND c.deleted_at IS NULL
+                    )
+                    ON CONFLICT (evse_number) WHERE deleted_at IS NULL DO NOTHING
+                    RETURNING id, charge_point_id
+                )
+                SELECT id, charge_point_id FROM inserted
+                """,
+                [now, now],
+            )
+            inserted = [(pk, None, (cp_id, None)) for pk, cp_id in cursor.fetchall()]
+            connector_changes += inserted
+            connectors_created = len(inserted)
+            # ON COMMIT DROP no basta si el lote corre dentro de una transacción externa.
+            cursor.execute(f"DROP TABLE {self.stage}")
+
+        # Escritura con SQL directo: contadores, `rows_changed` e invalidación de cachés
+        # como el resto de caminos.
+        ChargePoint.rows_written(changes, self.using)
+        Connector.rows_written(connector_changes, self.using)
+        send_data_changed(ChargePoint, self.using)
+        send_data_changed(Connector, self.using)
+        return {
+            "created": created,
+            "updated": updated,
+            "connectors_created": connectors_created,
+            "connectors_updated": connectors_updated,
+        }
+
+    def _copy(self, cursor, rows) -> None:
+        sql = f"COPY {self.stage} (name, status, evse) FROM STDIN"
+        raw = cursor.cursor
+        if hasattr(raw, "copy"):  # psycopg 3
+            with raw.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+            return
+        # psycopg2
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        raw.copy_expert(f"{sql} WITH (FORMAT csv)", buffer)
+
+
+WRITERS = {METHOD_COPY: CopyWriter, METHOD_ORM: OrmWriter}
+
+
+def get_writer(method: str, using: str):
+    if method == "auto":
+        method = METHOD_COPY if connections[using].vendor == "postgresql" else METHOD_ORM
+    return WRITERS[method](using)
+
+
+# ---------------------------------------------------------------------
+# Checkpoint (reanudación)
+# ---------------------------------------------------------------------
+
+
+def _fingerprint(path: str) -> dict:
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def load_checkpoint(checkpoint_path: str, path: str) -> dict | None:
+    """Devuelve el checkpoint si existe y corresponde al mismo fichero; si no, `None`."""
+    try:
+        with open(checkpoint_path, encoding="utf-8") as fh:
+            data = json.load(fh)
+    except FileNotFoundError:
+        return None
+    if data.get("file") != _fingerprint(path):
+        raise ValueError("El checkpoint corresponde a otro fichero (o el fichero ha cambiado).")
+    return data
+
+
+def save_checkpoint(checkpoint_path: str, path: str, stats: ImportStats) -> None:
+    # Escritura atómica: un fallo a mitad nunca deja un checkpoint corrupto.
+    tmp = f"{checkpoint_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump({"file": _fingerprint(path), "stats": asdict(stats)}, fh)
+    os.replace(tmp, checkpoint_path)
+
+
+# ---------------------------------------------------------------------
+# Orquestación
+# ---------------------------------------------------------------------
+
+
+@dataclass
+class ImportJob:
+    """
+    Importa un fichero CSV/NDJSON por lotes. Cada lote se valida, se escribe en su
+    propia transacción y, tras confirmarse, actualiza el checkpoint; una ejecución
+    interrumpida se reanuda con `resume=True` a partir de la última línea confirmada.
+    El upsert es por clave natural (`name`, `evse_number`), así que repetir un lote es
+    idempotente.
+    """
+
+    path: str
+    fmt: str | None = None
+    batch_size: int = 5000
+    method: str = "auto"
+    using: str = "default"
+    resume: bool = False
+    checkpoint_path: str | None = None
+    errors_path: str | None = None
+    progress: Callable[[ImportStats], None] | None = None
+    stats: ImportStats = field(default_factory=ImportStats)
+
+    def __post_init__(self):
+        self.fmt = self.fmt or detect_format(self.path)
+        self.checkpoint_path = self.checkpoint_path or f"{self.path}.checkpoint"
+        self.errors_path = self.errors_path or f"{self.path}.errors.ndjson"
+
+    def run(self) -> ImportStats:
+        writer = get_writer(self.method, self.using)
+        start_after = 0
+        if self.resume:
+            checkpoint = load_checkpoint(self.checkpoint_path, self.path)
+            if checkpoint is not None:
+                self.stats = ImportStats(**checkpoint["stats"])
+                start_after = self.stats.last_line
+
+        mode = "a" if self.resume and start_after else "w"
+        with open(self.errors_path, mode, encoding="utf-8") as report:
+            batch = []
+            for item in read_rows(self.path, self.fmt):
+                if item[0] <= start_after:
+                    continue
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    self._process(batch, writer, report)
+                    batch = []
+            if batch:
+                self._process(batch, writer, report)
+
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        return self.stats
+
+    def _process(self, batch, writer, report) -> None:
+        rows, failures = validate_batch(batch)
+        if rows:
+            with transaction.atomic(using=self.using):
+                self.stats.add(writer.write(rows))
+
+        for failure in failures:
+            report.write(json.dumps(failure, ensure_ascii=False, default=str) + "\n")
+        report.flush()
+
+        self.stats.rows += len(batch)
+        self.stats.errors += len(failures)
+        self.stats.batches += 1
+        self.stats.last_line = batch[-1][0]
+        save_checkpoint(self.checkpoint_path, self.path, self.stats)
+        if self.progress is not None:
+            self.progress(self.stats)
@@ -0,0 +1,213 @@
+"""
+Instrumentación por petición: número de consultas y tiempo de SQL (`execute_wrapper`),
+tiempo de serialización y de render. Se publica en la cabecera `Server-Timing` y en un
+log estructurado (`chargepoints.instrumentation`), solo para las peticiones muestreadas.
+
+Desactivada (por defecto), el middleware no se instala (`MiddlewareNotUsed`) y `phase()`
+se reduce a leer una `ContextVar`: coste despreciable.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from contextlib import ExitStack, asynccontextmanager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "ENABLED": False,
+    "SAMPLE_RATE": 1.0,  # 0..1: proporción de peticiones instrumentadas
+    "HEADER": True,  # añade `Server-Timing` a la respuesta
+    "LOG": True,  # log estructurado por petición (nivel INFO)
+}
+
+_NULL = nullcontext()
+
+
+def get_options() -> dict:
+    return {**DEFAULTS, **getattr(settings, "CHARGEPOINTS_INSTRUMENTATION", {})}
+
+
+@dataclass
+class RequestTimings:
+    """Acumuladores de una petición (milisegundos)."""
+
+    db_queries: int = 0
+    db_ms: float = 0.0
+    phases: dict[str, float] = field(default_factory=dict)
+
+    def __call__(self, execute, sql, params, many, context):
+        # execute_wrapper: se instala en todas las conexiones durante la petición.
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - start) * 1000
+            self.db_queries += 1
+
+    def add(self, name: str, ms: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + ms
+
+
+@contextmanager
+def wrap_connections(wrapper):
+    """Instala `wrapper` (`execute_wrapper`) en todas las conexiones mientras dure el bloque."""
+    with ExitStack() as stack:
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(wrapper))
+        yield
+
+
+@asynccontextmanager
+async def awrap_connections(wrapper):
+    """
+    `wrap_connections` para un handler async. Las conexiones son por hilo y el ORM de
+    una vista async corre en el hilo de `sync_to_async` (thread_sensitive, uno por
+    petición): los wrappers se instalan y se retiran allí, no en el del event loop.
+    """
+    stack = ExitStack()
+    await sync_to_async(stack.enter_context)(wrap_connections(wrapper))
+    try:
+        yield
+    finally:
+        await sync_to_async(stack.close)()
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("chargepoints_timings", default=None)
+
+
+def phase(name: str):
+    """
+    Context manager que suma a la fase `name` el tiempo transcurrido descontando el SQL
+    ejecutado dentro (p. ej. las consultas perezosas de un serializer van a `db`).
+    Sin petición muestreada en curso no hace nada.
+    """
+    timings = _current.get()
+    if timings is None:
+        return _NULL
+    return _timed(timings, name)
+
+
+@contextmanager
+def _timed(timings: RequestTimings, name: str):
+    start = time.perf_counter()
+    db_before = timings.db_ms
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        timings.add(name, elapsed - (timings.db_ms - db_before))
+
+
+def server_timing(timings: RequestTimings, total_ms: float) -> str:
+    metrics = [f'db;dur={timings.db_ms:.2f};desc="{timings.db_queries} queries"']
+    metrics += [f"{name};dur={ms:.2f}" for name, ms in timings.phases.items()]
+    metrics.append(f"total;dur={total_ms:.2f}")
+    return ", ".join(metrics)
+
+
+class ServerTimingMiddleware:
+    """
+    Mide las peticiones muestreadas: SQL de todas las conexiones, fases marcadas con
+    `phase()` desde las vistas (`serialize`) y el render de las respuestas DRF
+    (`render`, vía `process_template_response` + post-render callback).
+
+    No toca el cuerpo: el envelope `{code,message,data,errors}` no cambia. En respuestas
+    en streaming `total` termina al devolver la respuesta, no al enviar el último byte.
+    Síncrono y async: bajo ASGI el SQL se mide en el hilo donde corre el ORM.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        options = get_options()
+        if not options["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = float(options["SAMPLE_RATE"])
+        self.header = options["HEADER"]
+        self.log = options["LOG"]
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _sampled(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            with wrap_connections(timings):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings, start)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        timings = RequestTimings()
+        # sync_to_async copia el contexto: `phase()` también lo ve en las vistas sync.
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            async with awrap_connections(timings):
+                response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings, start)
+
+    def _finish(self, request, response, timings: RequestTimings, start: float):
+        total_ms = (time.perf_counter() - start) * 1000
+        if self.header:
+            value = server_timing(timings, total_ms)
+            if response.has_header("Server-Timing"):
+                value = f"{response['Server-Timing']}, {value}"
+            response["Server-Timing"] = value
+        if self.log:
+            self._log(request, response, timings, total_ms)
+        return response
+
+    def process_template_response(self, request, response):
+        timings = _current.get()
+        if timings is not None:
+            start = time.perf_counter()
+            response.add_post_render_callback(
+                lambda _: timings.add("render", (time.perf_counter() - start) * 1000)
+            )
+        return response
+
+    @staticmethod
+    def _log(request, response, timings: RequestTimings, total_ms: float) -> None:
+        fields = {
+            "http_method": request.method,
+            "http_path": request.path,
+            "status_code": response.status_code,
+            "db_queries": timings.db_queries,
+            "db_ms": round(timings.db_ms, 2),
+            **{f"{name}_ms": round(ms, 2) for name, ms in timings.phases.items()},
+            "total_ms": round(total_ms, 2),
+        }
+        logger.info(
+            "request %s",
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+            extra=fields,
+        )
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from chargepoints.archive import archive_deleted, cutoff_for, get_options, pending, purge_archived
+
+
+class Command(BaseCommand):
+    help = (
+        "Mueve a las tablas de archivo, por lotes, los ChargePoints y conectores borrados "
+        "(soft) hace más de la retención (conectores primero) y, opcionalmente, purga el "
+        "archivo. Uso: archive_deleted [--older-than-days N | --before FECHA] "
+        "[--batch-size N] [--sleep S] [--max-batches N] [--purge-after-days N] [--dry-run]"
+    )
+
+    def add_arguments(self, parser):
+        options = get_options()
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=options["RETENTION_DAYS"],
+            help=f"Retención: archiva lo borrado hace más de N días. Por defecto "
+            f"{options['RETENTION_DAYS']}.",
+        )
+        parser.add_argument(
+            "--before",
+            help="Corte explícito (ISO 8601) en lugar de --older-than-days; para reanudar "
+            "una ejecución interrumpida con el mismo corte.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=options["BATCH_SIZE"],
+            help=f"Filas por lote y transacción. Por defecto {options['BATCH_SIZE']}.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=options["SLEEP_SECONDS"],
+            help="Segundos de pausa entre lotes (throttling).",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Para tras N lotes (ventanas de mantenimiento); se reanuda relanzando.",
+        )
+        parser.add_argument(
+            "--purge-after-days",
+            type=int,
+            help="Además, borra del archivo lo archivado hace más de N días.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Solo cuenta lo que se archivaría (y purgaría): no escribe.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Alias de la base de datos.",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size debe ser >= 1.")
+        if options["older_than_days"] < 0 or (options["purge_after_days"] or 0) < 0:
+            raise CommandError("Los días deben ser >= 0.")
+        cutoff = self._cutoff(options)
+        self.stdout.write(f"Corte: deleted_at < {cutoff.isoformat()}")
+
+        if options["dry_run"]:
+            for label, count in pending(cutoff, using).items():
+                self.stdout.write(f"  se archivarían {count} {label}")
+        else:
+            self.stdout.write(f"  para reanudar con el mismo corte: --before {cutoff.isoformat()}")
+            counts = archive_deleted(
+                cutoff,
+                using=using,
+                batch_size=options["batch_size"],
+                sleep=options["sleep"],
+                max_batches=options["max_batches"],
+                progress=lambda label, rows, last: self.stdout.write(
+                    f"  {label}: {rows} archivados (hasta id {last})"
+                ),
+            )
+            for label, count in counts.items():
+                self.stdout.write(f"  {count} {label} archivados")
+
+        if options["purge_after_days"] is not None:
+            before = cutoff_for(options["purge_after_days"])
+            counts = purge_archived(
+                before, using=using, batch_size=options["batch_size"], dry_run=options["dry_run"]
+            )
+            verb = "se purgarían" if options["dry_run"] else "purgados"
+            for label, count in counts.items():
+                self.stdout.write(self.style.WARNING(f"  {verb} {count} {label}"))
+        self.stdout.write(self.style.SUCCESS("OK: archivado completado."))
+
+    @staticmethod
+    def _cutoff(options):
+        if not options["before"]:
+            return cutoff_for(options["older_than_days"])
+        value = parse_datetime(options["before"])
+        if value is None:
+            raise CommandError("--before debe ser una fecha ISO 8601.")
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
@@ -1,19 +1,136 @@
 from __future__ import annotations
 
+import multiprocessing
 import random
+import secrets
+import time
+from dataclasses import dataclass, field
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
-from django.utils import timezone
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
 from faker import Faker
 
-from chargepoints.models import ChargePoint, Connector
+from chargepoints.counters import recount
+from chargepoints.models import (
+    ArchivedChargePoint,
+    ArchivedConnector,
+    ChargePoint,
+    ChargePointStatusEvent,
+    Connector,
+)
+from chargepoints.signals import send_data_changed
+
+# Perfiles de escala: número de ChargePoints y procesos por defecto.
+PROFILES = {
+    "10k": {"populate": 10_000, "workers": 1},
+    "100k": {"populate": 100_000, "workers": 2},
+    "1m": {"populate": 1_000_000, "workers": 4},
+    "10m": {"populate": 10_000_000, "workers": 8},
+}
+
+# Distribución sesgada de estados (flota real: la mayoría disponibles).
+SCALE_STATUS_WEIGHTS = {
+    ChargePoint.Status.READY: 60,
+    ChargePoint.Status.CHARGING: 25,
+    ChargePoint.Status.WAITING: 10,
+    ChargePoint.Status.ERROR: 5,
+}
+# Conectores por ChargePoint: lo habitual son 2 (AC doble); pocos sin conectores.
+SCALE_CONNECTOR_WEIGHTS = {0: 3, 1: 17, 2: 55, 3: 10, 4: 15}
+
+
+@dataclass
+class Plan:
+    """Parámetros de generación compartidos por todos los procesos."""
+
+    scale: bool
+    batch_size: int
+    connectors: int | None
+    ratio: float
+    prefix: str = ""
+    status_weights: dict = field(default_factory=dict)
+    connector_weights: dict = field(default_factory=dict)
+
+    def name(self, i: int) -> str:
+        return f"CP-{self.prefix}-{i:08d}" if self.scale else f"CP-{i:03d}"
+
+
+def populate_range(plan: Plan, start: int, stop: int, seed: int | None) -> tuple[int, int, int]:
+    """
+    Genera los ChargePoints `[start, stop)` por lotes de `plan.batch_size`, cada lote en
+    su propia transacción: `bulk_create` de ChargePoints, `bulk_create` de todos sus
+    conectores y soft delete set-based de la proporción pedida.
+    Devuelve `(chargepoints, conectores, soft-deleted)`.
+    """
+    rng = random.Random(seed)
+    faker = Faker()
+    if seed is not None:
+        faker.seed_instance(seed)
+
+    statuses = list(plan.status_weights) or list(ChargePoint.Status.values)
+    status_weights = list(plan.status_weights.values()) or None
+    counts = list(plan.connector_weights) or [0, 1, 2, 3]
+    count_weights = list(plan.connector_weights.values()) or None
+
+    created_cp = created_conn = deleted = 0
+    for offset in range(start, stop, plan.batch_size):
+        end = min(offset + plan.batch_size, stop)
+        size = end - offset
+        batch_statuses = rng.choices(statuses, weights=status_weights, k=size)
+        if plan.connectors is None:
+            batch_counts = rng.choices(counts, weights=count_weights, k=size)
+        else:
+            batch_counts = [plan.connectors] * size
+
+        with transaction.atomic():
+            cps = ChargePoint.objects.bulk_create(
+                [
+                    ChargePoint(name=plan.name(i), status=status)
+                    for i, status in zip(range(offset, end), batch_statuses, strict=True)
+                ]
+            )
+            connectors = [
+                Connector(charge_point_id=cp.pk, evse_number=evse)
+                for i, cp, k in zip(range(offset, end), cps, batch_counts, strict=True)
+                for evse in _evse_numbers(plan, faker, i, k)
+            ]
+            Connector.objects.bulk_create(connectors)
+
+            if plan.ratio > 0:
+                # Redondeo acumulado: el total marcado es round(N * ratio) exacto.
+                k = round((created_cp + len(cps)) * plan.ratio) - deleted
+                sample = [cp.pk for cp in rng.sample(cps, k=k)]
+                if sample:
+                    # Soft delete en cascada: también sus conectores (ver chargepoints.deletion)
+                    ChargePoint.all_objects.filter(id__in=sample).delete()
+                deleted += len(sample)
+
+        created_cp += len(cps)
+        created_conn += len(connectors)
+    return created_cp, created_conn, deleted
+
+
+def _evse_numbers(plan: Plan, faker: Faker, i: int, k: int) -> list[str]:
+    if plan.scale:
+        return [f"EVSE-{plan.prefix}-{i:08d}-{j}" for j in range(k)]
+    return [f"EVSE-{i:03d}-{j:02d}-{faker.bothify(text='??##').upper()}" for j in range(k)]
+
+
+def _worker(args) -> tuple[int, int, int]:
+    # Proceso hijo (fork): conexión propia, nunca la heredada del padre.
+    connections.close_all()
+    try:
+        return populate_range(*args)
+    finally:
+        connections.close_all()
 
 
 class Command(BaseCommand):
     help = (
         "Crea datos demo para ChargePoints/Connectors o limpia la base. "
-        "Uso: --populate N [--connectors M] [--seed S] [--soft-delete-ratio R] | --clean [--force]"
+        "Uso: --populate N [--connectors M] [--seed S] [--soft-delete-ratio R] "
+        "| --profile 10k|100k|1m|10m [--workers W] [--batch-size B] | --clean [--force]"
     )
 
     def add_arguments(self, parser):
@@ -22,6 +139,40 @@ class Command(BaseCommand):
             type=int,
             help="Número de ChargePoints a crear (ej. 20).",
         )
+        parser.add_argument(
+            "--profile",
+            choices=list(PROFILES),
+            default=None,
+            help=(
+                "Perfil de escala para benchmarks (10k, 100k, 1m, 10m). Implica --scale y "
+                "fija --populate y --workers salvo que se indiquen."
+            ),
+        )
+        parser.add_argument(
+            "--scale",
+            action="store_true",
+            help=(
+                "Modo escala: nombres únicos con prefijo, estados sesgados "
+                "(ready 60%%, charging 25%%, waiting 10%%, error 5%%) y conectores realistas."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="ChargePoints por lote (bulk_create + transacción). Por defecto 5000.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Procesos en paralelo (no disponible con SQLite). Por defecto 1.",
+        )
+        parser.add_argument(
+            "--prefix",
+            default=None,
+            help="Prefijo de nombres en modo escala (por defecto aleatorio, evita colisiones).",
+        )
         parser.add_argument(
             "--connectors",
             type=int,
@@ -46,7 +197,7 @@ class Command(BaseCommand):
         parser.add_argument(
             "--clean",
             action="store_true",
-            help="Elimina TODOS los ChargePoints/Connectors (hard delete).",
+            help="Elimina TODOS los ChargePoints/Connectors (TRUNCATE si el motor lo permite).",
         )
         parser.add_argument(
             "--force",
@@ -55,22 +206,24 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
+        profile: str | None = options.get("profile")
         populate: int | None = options.get("populate")
         connectors_count: int | None = options.get("connectors")
         clean: bool = options.get("clean")
         seed: int | None = options.get("seed")
         ratio: float = float(options.get("soft_delete_ratio") or 0.0)
         force: bool = options.get("force")
+        scale: bool = options.get("scale") or profile is not None
+        batch_size: int = options.get("batch_size") or 5000
+        workers: int | None = options.get("workers")
 
-        if not populate and not clean:
-            raise CommandError("Debes indicar --populate N o --clean.")
+        if profile is not None:
+            populate = populate or PROFILES[profile]["populate"]
+            workers = workers or PROFILES[profile]["workers"]
+        workers = workers or 1
 
-        if seed is not None:
-            random.seed(seed)
-            faker = Faker()
-            Faker.seed(seed)
-        else:
-            faker = Faker()
+        if not populate and not clean:
+            raise CommandError("Debes indicar --populate N, --profile P o --clean.")
 
         if clean:
             self._clean_all(force=force)
@@ -82,63 +235,48 @@ class Command(BaseCommand):
             raise CommandError("--connectors debe ser >= 0.")
         if not (0.0 <= ratio <= 1.0):
             raise CommandError("--soft-delete-ratio debe estar entre 0.0 y 1.0.")
+        if batch_size <= 0 or workers <= 0:
+            raise CommandError("--batch-size y --workers deben ser > 0.")
 
-        # -------------------------
-        # Crear datos
-        # -------------------------
-        created_cp_ids: list[int] = []
-        created_cp = 0
-        created_conn = 0
+        plan = Plan(scale=scale, batch_size=batch_size, connectors=connectors_count, ratio=ratio)
+        if scale:
+            plan.prefix = options.get("prefix") or (
+                f"S{seed}" if seed is not None else secrets.token_hex(3).upper()
+            )
+            plan.status_weights = dict(SCALE_STATUS_WEIGHTS)
+            plan.connector_weights = dict(SCALE_CONNECTOR_WEIGHTS)
 
-        self.stdout.write(self.style.WARNING("Iniciando población de datos demo..."))
-        with transaction.atomic():
-            for i in range(populate):
-                name = f"CP-{i:03d}"  # determinista y legible
-                status = random.choice(
-                    [
-                        ChargePoint.Status.READY,
-                        ChargePoint.Status.CHARGING,
-                        ChargePoint.Status.WAITING,
-                        ChargePoint.Status.ERROR,
-                    ]
-                )
-                cp = ChargePoint.objects.create(name=name, status=status)
-                created_cp_ids.append(cp.id)
-                created_cp += 1
+        if len(plan.name(max(populate - 1, 0))) > ChargePoint._meta.get_field("name").max_length:
+            raise CommandError("--prefix demasiado largo para el campo name.")
 
-                k = random.randint(0, 3) if connectors_count is None else connectors_count
-                for j in range(k):
-                    evse = f"EVSE-{i:03d}-{j:02d}-{faker.bothify(text='??##').upper()}"
-                    Connector.objects.create(charge_point=cp, evse_number=evse)
-                    created_conn += 1
+        if workers > 1 and (connection.vendor == "sqlite" or not self._can_fork()):
+            self.stdout.write(self.style.WARNING("--workers ignorado: se usa un solo proceso."))
+            workers = 1
 
         # -------------------------
-        # Soft delete parcial (ratio)
+        # Crear datos
         # -------------------------
-        if created_cp_ids and ratio > 0.0:
-            n = max(0, int(round(len(created_cp_ids) * ratio)))
-            sample_ids = set(random.sample(created_cp_ids, k=n))
-            now = timezone.now()
-
-            with transaction.atomic():  # Idempotencia
-                # Soft-delete chargepoints
-                ChargePoint.all_objects.filter(id__in=sample_ids, deleted_at__isnull=True).update(
-                    deleted_at=now
-                )
-                # Soft-delete connectors asociados
-                Connector.all_objects.filter(
-                    charge_point_id__in=sample_ids, deleted_at__isnull=True
-                ).update(deleted_at=now)
+        self.stdout.write(self.style.WARNING("Iniciando población de datos demo..."))
+        started = time.monotonic()
+        if workers == 1:
+            created_cp, created_conn, deleted = populate_range(plan, 0, populate, seed)
+        else:
+            created_cp, created_conn, deleted = self._populate_parallel(
+                plan, populate, workers, seed
+            )
+        elapsed = time.monotonic() - started
 
+        if deleted:
             self.stdout.write(
                 self.style.WARNING(
-                    f"Marcados como soft-deleted {n} ChargePoints (ratio={ratio:.2f})."
+                    f"Marcados como soft-deleted {deleted} ChargePoints (ratio={ratio:.2f})."
                 )
             )
 
         self.stdout.write(
             self.style.SUCCESS(
-                f"OK: creados {created_cp} ChargePoints y {created_conn} Connectors."
+                f"OK: creados {created_cp} ChargePoints y {created_conn} Connectors "
+                f"en {elapsed:.1f} s ({created_cp / max(elapsed, 1e-9):,.0f} CP/s)."
             )
         )
         self.stdout.write(
@@ -150,11 +288,30 @@ class Command(BaseCommand):
             )
         )
 
-    @transaction.atomic
+    @staticmethod
+    def _can_fork() -> bool:
+        return "fork" in multiprocessing.get_all_start_methods()
+
+    def _populate_parallel(self, plan: Plan, total: int, workers: int, seed: int | None):
+        # Rangos contiguos alineados al tamaño de lote; una semilla derivada por rango.
+        per_worker = -(-total // workers)
+        per_worker = -(-per_worker // plan.batch_size) * plan.batch_size
+        tasks = [
+            (plan, start, min(start + per_worker, total), None if seed is None else seed + n)
+            for n, start in enumerate(range(0, total, per_worker))
+        ]
+        connections.close_all()  # no compartir la conexión del padre con los hijos
+        with multiprocessing.get_context("fork").Pool(len(tasks)) as pool:
+            results = pool.map(_worker, tasks)
+        return tuple(sum(values) for values in zip(*results, strict=True))
+
     def _clean_all(self, force: bool):
         if not force:
             self.stdout.write(
-                self.style.ERROR("⚠️ Vas a borrar TODOS los ChargePoints/Connectors (hard delete).")
+                self.style.ERROR(
+                    "⚠️ Vas a borrar TODOS los ChargePoints/Connectors, su historial y su archivo "
+                    "(hard delete)."
+                )
             )
             self.stdout.write(self.style.ERROR("Reejecuta con --clean --force para confirmar."))
             return
@@ -163,6 +320,24 @@ class Command(BaseCommand):
             self.style.WARNING("Eliminando TODOS los datos de ChargePoints y Connectors...")
         )
 
-        Connector.all_objects.all().hard_delete()
-        ChargePoint.all_objects.all().hard_delete()
+        # sql_flush: TRUNCATE en PostgreSQL, DELETE en motores sin TRUNCATE (SQLite).
+        # El historial y el archivo también (sin FK: sobrevivirían): con las secuencias
+        # reiniciadas, los nuevos ChargePoints reutilizan ids y heredarían el historial y
+        # las filas archivadas de los borrados. En PostgreSQL, TRUNCATE de la tabla
+        # particionada vacía también sus particiones.
+        tables = [
+            Connector._meta.db_table,
+            ChargePoint._meta.db_table,
+            ChargePointStatusEvent._meta.db_table,
+            ArchivedConnector._meta.db_table,
+            ArchivedChargePoint._meta.db_table,
+        ]
+        sql = connection.ops.sql_flush(no_style(), tables, reset_sequences=True)
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                # TRUNCATE falla con eventos de FK diferidos pendientes en la transacción.
+                connection.check_constraints()
+            connection.ops.execute_sql_flush(sql)
+            recount(connection.alias)  # SQL directo: los contadores por estado vuelven a 0
+            send_data_changed(ChargePoint, connection.alias, cascade=True)
         self.stdout.write(self.style.SUCCESS("OK: base limpia."))
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from chargepoints.history import (
+    DEFAULT_MONTHS_AHEAD,
+    drop_partitions_before,
+    ensure_partitions,
+    is_partitioned,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mantenimiento de las particiones mensuales del historial de estados (PostgreSQL): "
+        "crea las de los próximos meses y, opcionalmente, borra las anteriores a una fecha. "
+        "Uso: history_partitions [--months-ahead N] [--drop-before AAAA-MM] [--dry-run]"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=DEFAULT_MONTHS_AHEAD,
+            help=f"Meses por delante del actual a crear. Por defecto {DEFAULT_MONTHS_AHEAD}.",
+        )
+        parser.add_argument(
+            "--drop-before",
+            help="Borra (DROP) las particiones de meses anteriores a AAAA-MM (retención).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Con --drop-before: solo lista las particiones que se borrarían.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Alias de la base de datos.",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if options["months_ahead"] < 0:
+            raise CommandError("--months-ahead debe ser >= 0.")
+        if not is_partitioned(using):
+            self.stdout.write(
+                "El historial no está particionado (solo PostgreSQL): nada que hacer."
+            )
+            return
+
+        for name in ensure_partitions(using, months_ahead=options["months_ahead"]):
+            self.stdout.write(f"  creada {name}")
+
+        if options["drop_before"]:
+            try:
+                before = date.fromisoformat(f"{options['drop_before']}-01")
+            except ValueError as exc:
+                raise CommandError("--drop-before debe tener el formato AAAA-MM.") from exc
+            dropped = drop_partitions_before(before, using, dry_run=options["dry_run"])
+            verb = "se borraría" if options["dry_run"] else "borrada"
+            for name in dropped:
+                self.stdout.write(self.style.WARNING(f"  {verb} {name}"))
+        self.stdout.write(self.style.SUCCESS("OK: particiones al día."))
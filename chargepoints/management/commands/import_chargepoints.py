@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from chargepoints.importer import (
+    FORMAT_CSV,
+    FORMAT_NDJSON,
+    METHOD_COPY,
+    METHOD_ORM,
+    ImportJob,
+    ImportStats,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa ChargePoints/Connectors desde un volcado CSV o NDJSON (formato de "
+        "/api/v1/chargepoint/export) con upsert por nombre y evse_number. "
+        "Uso: import_chargepoints FICHERO [--format csv|ndjson] [--batch-size N] "
+        "[--method auto|copy|orm] [--resume] [--errors FICHERO]"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Fichero CSV o NDJSON a importar.")
+        parser.add_argument(
+            "--format",
+            choices=[FORMAT_CSV, FORMAT_NDJSON],
+            default=None,
+            help="Formato del fichero. Por defecto se deduce de la extensión (.csv o NDJSON).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Filas por lote (validación + transacción). Por defecto 5000.",
+        )
+        parser.add_argument(
+            "--method",
+            choices=["auto", METHOD_COPY, METHOD_ORM],
+            default="auto",
+            help=(
+                "copy: COPY FROM STDIN a tabla temporal + upsert (solo PostgreSQL); "
+                "orm: bulk_create/bulk_update por lotes. auto elige según el motor."
+            ),
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Reanuda desde el último lote confirmado (fichero <path>.checkpoint).",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=None,
+            help="Ruta del checkpoint. Por defecto <path>.checkpoint.",
+        )
+        parser.add_argument(
+            "--errors",
+            default=None,
+            help="Informe de filas rechazadas (NDJSON). Por defecto <path>.errors.ndjson.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Alias de la base de datos destino.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size: int = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size debe ser > 0.")
+
+        job = ImportJob(
+            path=options["path"],
+            fmt=options["format"],
+            batch_size=batch_size,
+            method=options["method"],
+            using=options["database"],
+            resume=options["resume"],
+            checkpoint_path=options["checkpoint"],
+            errors_path=options["errors"],
+            progress=self._progress,
+        )
+        self.started = time.monotonic()
+        self.stdout.write(self.style.WARNING(f"Importando {job.path} ({job.fmt})..."))
+        try:
+            stats = job.run()
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"OK: {stats.rows} filas; ChargePoints creados {stats.created}, "
+                f"actualizados {stats.updated}; Connectors creados {stats.connectors_created}, "
+                f"reasignados {stats.connectors_updated}."
+            )
+        )
+        if stats.errors:
+            self.stdout.write(
+                self.style.ERROR(f"{stats.errors} filas rechazadas: ver {job.errors_path}")
+            )
+
+    def _progress(self, stats: ImportStats) -> None:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        self.stdout.write(
+            f"  lote {stats.batches}: {stats.rows} filas (línea {stats.last_line}), "
+            f"{stats.errors} errores, {stats.rows / elapsed:,.0f} filas/s"
+        )
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from chargepoints.counters import recount, recount_connectors
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula los contadores por estado de /chargepoint/summary y el connector_count "
+        "de cada ChargePoint a partir de las tablas reales (reparación). "
+        "Uso: recount [--check] [--database ALIAS]"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Solo compara: no escribe y termina con error si hay diferencias.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Alias de la base de datos.",
+        )
+
+    def handle(self, *args, **options):
+        check: bool = options["check"]
+        drift = recount(using=options["database"], dry_run=check)
+        connectors = recount_connectors(using=options["database"], dry_run=check)
+        drift.update({f"connector_count[{pk}]": counts for pk, counts in connectors.items()})
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("OK: contadores coherentes."))
+            return
+        for key, (stored, actual) in drift.items():
+            self.stdout.write(self.style.WARNING(f"  {key}: {stored} -> {actual}"))
+        if check:
+            raise CommandError(f"{len(drift)} contador(es) desalineados.")
+        self.stdout.write(self.style.SUCCESS(f"OK: {len(drift)} contador(es) corregidos."))
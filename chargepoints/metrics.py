@@ -0,0 +1,249 @@
+"""
+Métricas Prometheus: latencia por acción del viewset y código de estado, consultas SQL,
+eventos de la caché de respuestas, peticiones en curso, clientes del stream de eventos y
+ChargePoints por estado.
+
+Con varios workers (gunicorn/uvicorn) se usa el modo multiproceso de `prometheus_client`:
+definir `PROMETHEUS_MULTIPROC_DIR` (directorio vacío y compartido por los workers) antes de
+arrancar. Cada proceso escribe sus valores en ficheros mmap y `/metrics` los agrega al
+exponer, sea cual sea el worker que atienda el scrape.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError
+from django.http import Http404, HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from .counters import status_counts
+from .instrumentation import RequestTimings, awrap_connections, wrap_connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "ENABLED": False,
+}
+
+REQUEST_LATENCY = Histogram(
+    "chargepoint_http_request_duration_seconds",
+    "Latencia de las peticiones HTTP por acción y código de estado.",
+    ["action", "method", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "chargepoint_http_requests_in_progress",
+    "Peticiones HTTP en curso.",
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Counter(
+    "chargepoint_db_queries",
+    "Consultas SQL ejecutadas por acción.",
+    ["action"],
+)
+DB_DURATION = Counter(
+    "chargepoint_db_query_duration_seconds",
+    "Tiempo acumulado en SQL por acción.",
+    ["action"],
+)
+CACHE_EVENTS = Counter(
+    "chargepoint_response_cache_events",
+    "Eventos de la caché de respuestas (hit, miss, wait).",
+    ["event"],
+)
+STREAM_SUBSCRIBERS = Gauge(
+    "chargepoint_stream_subscribers",
+    "Clientes conectados a /chargepoint/stream.",
+    multiprocess_mode="livesum",
+)
+STREAM_EVICTIONS = Counter(
+    "chargepoint_stream_evictions",
+    "Clientes de /chargepoint/stream desconectados por no consumir a tiempo.",
+)
+
+
+def get_options() -> dict:
+    return {**DEFAULTS, **getattr(settings, "CHARGEPOINTS_METRICS", {})}
+
+
+# ---------------------------------------------------------------------
+# Gauges por estado (calculados al hacer scrape)
+# ---------------------------------------------------------------------
+
+
+class ChargePointStatusCollector:
+    """
+    `chargepoint_chargepoints{status}`: ChargePoints activos por estado, leídos de los
+    contadores de `/chargepoint/summary` en el proceso que atiende el scrape (un valor
+    global, no por worker). Si la base de datos falla se omite la métrica para que el
+    resto del scrape siga funcionando.
+    """
+
+    def collect(self):
+        family = GaugeMetricFamily(
+            "chargepoint_chargepoints", "ChargePoints activos por estado.", labels=["status"]
+        )
+        try:
+            counts = status_counts()
+        except DatabaseError:
+            logger.warning("No se pudieron leer los ChargePoints por estado.", exc_info=True)
+            return
+        for status, n in counts.items():
+            family.add_metric([status], n)
+        yield family
+
+    def describe(self):
+        return []
+
+
+_scrape_registry = CollectorRegistry(auto_describe=False)
+_scrape_registry.register(ChargePointStatusCollector())
+
+
+def process_registry() -> CollectorRegistry:
+    """Registro con las métricas de proceso: agregado multiproceso si está configurado."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def metrics_view(request):
+    if not get_options()["ENABLED"]:
+        raise Http404
+    output = generate_latest(process_registry()) + generate_latest(_scrape_registry)
+    return HttpResponse(output, content_type=CONTENT_TYPE_LATEST)
+
+
+# ---------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------
+
+
+def action_label(request, view_func) -> str:
+    """`<basename>.<acción>` en viewsets (p. ej. `chargepoint.list`); si no, el view_name."""
+    actions = getattr(view_func, "actions", None)
+    if actions:
+        basename = view_func.initkwargs.get("basename") or view_func.cls.__name__
+        return f"{basename}.{actions.get(request.method.lower(), 'method_not_allowed')}"
+    match = request.resolver_match
+    return match.view_name if match else "unmatched"
+
+
+class _ClosingStream:
+    """
+    Contenido de una respuesta en streaming que llama a `callback` una sola vez al
+    agotarse, cortarse o cerrarse la respuesta (`close()` lo registra Django).
+    """
+
+    def __init__(self, content, callback):
+        self.content = content
+        self.callback = callback
+
+    def close(self):
+        callback, self.callback = self.callback, None
+        if callback is not None:
+            callback()
+
+
+class _SyncClosingStream(_ClosingStream):
+    def __iter__(self):
+        try:
+            yield from self.content
+        finally:
+            self.close()
+
+
+class _AsyncClosingStream(_ClosingStream):
+    async def __aiter__(self):
+        try:
+            async for chunk in self.content:
+                yield chunk
+        finally:
+            self.close()
+
+
+class MetricsMiddleware:
+    """
+    Mide todas las peticiones: latencia, peticiones en curso y consultas/tiempo de SQL
+    (un `execute_wrapper` por conexión). Síncrono y async: bajo ASGI no obliga a pasar
+    cada petición por un hilo. En respuestas en streaming (exportación, SSE) la latencia
+    y "en curso" terminan al cerrarse el stream; el SQL contado es el de la vista.
+    Desactivado, no se instala (`MiddlewareNotUsed`).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not get_options()["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        queries = RequestTimings()
+        REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            with wrap_connections(queries):
+                response = self.get_response(request)
+        except BaseException:
+            REQUESTS_IN_PROGRESS.dec()
+            raise
+        return self._finish(request, response, queries, start)
+
+    async def __acall__(self, request):
+        queries = RequestTimings()
+        REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            async with awrap_connections(queries):
+                response = await self.get_response(request)
+        except BaseException:
+            REQUESTS_IN_PROGRESS.dec()
+            raise
+        return self._finish(request, response, queries, start)
+
+    def _finish(self, request, response, queries: RequestTimings, start: float):
+        action = getattr(request, "_metrics_action", "unmatched")
+        if queries.db_queries:
+            DB_QUERIES.labels(action).inc(queries.db_queries)
+            DB_DURATION.labels(action).inc(queries.db_ms / 1000)
+
+        def observe():
+            REQUESTS_IN_PROGRESS.dec()
+            elapsed = time.perf_counter() - start
+            REQUEST_LATENCY.labels(action, request.method, str(response.status_code)).observe(
+                elapsed
+            )
+
+        if response.streaming:
+            stream = _AsyncClosingStream if response.is_async else _SyncClosingStream
+            response.streaming_content = stream(response.streaming_content, observe)
+        else:
+            observe()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_action = action_label(request, view_func)
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.7 on 2026-10-17 02:13
+#
+# Estrategia de índices para el camino caliente del soft delete: índices parciales
+# WHERE deleted_at IS NULL y unicidad de name/evse_number solo entre filas vivas.
+# Los índices completos sobre status/deleted_at quedan sustituidos por los parciales.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chargepoints", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="chargepoint",
+            options={"ordering": ("-created_at", "id")},
+        ),
+        migrations.AddIndex(
+            model_name="chargepoint",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["status", "-created_at", "id"],
+                name="chargepoint_alive_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="chargepoint",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["-created_at", "id"],
+                name="chargepoint_alive_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="connector",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["charge_point", "id"],
+                name="connector_alive_cp_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="chargepoint",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("name",),
+                name="chargepoint_name_alive_uniq",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="connector",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("evse_number",),
+                name="connector_evse_alive_uniq",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="chargepoint",
+            name="chargepoint_status_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="connector",
+            name="connector_del_idx",
+        ),
+        migrations.AlterField(
+            model_name="chargepoint",
+            name="name",
+            field=models.CharField(max_length=32),
+        ),
+        migrations.AlterField(
+            model_name="connector",
+            name="evse_number",
+            field=models.CharField(max_length=32),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Índices de trigramas (pg_trgm) para el parámetro `search`.
+#
+# Solo PostgreSQL: en otros motores la extensión y los índices se omiten y
+# `chargepoints.search` usa el backend `icontains`. Los índices GIN se crean sobre
+# UPPER(campo), que es la expresión que generan tanto `icontains`/`istartswith`
+# (LIKE) como el operador de similitud `%` del backend de trigramas.
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+TRIGRAM_INDEXES = [
+    ("chargepoint_name_trgm_idx", "chargepoints_chargepoint", "name"),
+    ("connector_evse_trgm_idx", "chargepoints_connector", "evse_number"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+            f"USING gin (UPPER({column}) gin_trgm_ops) WHERE deleted_at IS NULL"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _table, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chargepoints", "0002_alive_partial_indexes"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
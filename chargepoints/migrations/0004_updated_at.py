@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-17 02:21
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_updated_at(apps, schema_editor):
+    # Las filas existentes reciben la fecha de la migración al añadir la columna;
+    # se aproxima con la última fecha conocida (borrado o creación).
+    for name in ("ChargePoint", "Connector"):
+        model = apps.get_model("chargepoints", name)
+        model.objects.using(schema_editor.connection.alias).update(
+            updated_at=Coalesce("deleted_at", "created_at")
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chargepoints", "0003_trigram_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chargepoint",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="connector",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="chargepoint",
+            index=models.Index(fields=["updated_at"], name="chargepoint_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="connector",
+            index=models.Index(fields=["updated_at"], name="connector_updated_idx"),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-17 03:02
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def initial_counts(apps, schema_editor):
+    # Mismo cálculo que `manage.py recount`, con los modelos históricos.
+    ChargePoint = apps.get_model("chargepoints", "ChargePoint")
+    Counter = apps.get_model("chargepoints", "ChargePointStatusCounter")
+    db = schema_editor.connection.alias
+    counts = dict.fromkeys(["ready", "charging", "waiting", "error"], 0)
+    counts.update(
+        ChargePoint.objects.using(db)
+        .filter(deleted_at__isnull=True)
+        .order_by()
+        .values("status")
+        .annotate(n=Count("id"))
+        .values_list("status", "n")
+    )
+    Counter.objects.using(db).bulk_create(
+        [Counter(status=status, count=n) for status, n in counts.items()]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chargepoints", "0004_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChargePointStatusCounter",
+            fields=[
+                ("status", models.CharField(max_length=16, primary_key=True, serialize=False)),
+                ("count", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(initial_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-17 03:08
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def initial_connector_counts(apps, schema_editor):
+    # Conectores vivos por ChargePoint, con una sola UPDATE ... SET = (subconsulta).
+    ChargePoint = apps.get_model("chargepoints", "ChargePoint")
+    Connector = apps.get_model("chargepoints", "Connector")
+    db = schema_editor.connection.alias
+    alive = (
+        Connector.objects.using(db)
+        .filter(charge_point=OuterRef("pk"), deleted_at__isnull=True)
+        .order_by()
+        .values("charge_point")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    ChargePoint.objects.using(db).update(connector_count=Coalesce(Subquery(alive), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chargepoints", "0005_status_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chargepoint",
+            name="connector_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="chargepoint",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["connector_count", "id"],
+                name="chargepoint_alive_conn_idx",
+            ),
+        ),
+        migrations.RunPython(initial_connector_counts, migrations.RunPython.noop),
+    ]
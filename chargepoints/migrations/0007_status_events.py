@@ -0,0 +1,130 @@
+# Generated by Django 5.2.7 on 2026-10-17 03:20
+
+from datetime import UTC, date, datetime
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+TABLE = "chargepoints_chargepointstatusevent"
+MONTHS_AHEAD = 3
+
+
+def _add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def create_table(apps, schema_editor):
+    model = apps.get_model("chargepoints", "ChargePointStatusEvent")
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.create_model(model)
+        return
+    # Tabla particionada por rango mensual de occurred_at. La clave primaria debe incluir
+    # la columna de partición: (id, occurred_at). Mismo esquema que crea `history_partitions`.
+    schema_editor.execute(
+        f"""
+        CREATE TABLE {TABLE} (
+            id bigint GENERATED BY DEFAULT AS IDENTITY,
+            charge_point_id bigint NOT NULL,
+            status varchar(16) NOT NULL,
+            previous_status varchar(16) NOT NULL,
+            occurred_at timestamp with time zone NOT NULL,
+            PRIMARY KEY (id, occurred_at)
+        ) PARTITION BY RANGE (occurred_at)
+        """
+    )
+    schema_editor.execute(
+        f"CREATE INDEX cp_status_event_cp_idx ON {TABLE} "
+        f"(charge_point_id, occurred_at DESC, id DESC)"
+    )
+    schema_editor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+    first = datetime.now(UTC).date().replace(day=1)
+    for offset in range(MONTHS_AHEAD + 1):
+        month = _add_months(first, offset)
+        schema_editor.execute(
+            f"CREATE TABLE {TABLE}_{month:%Y%m} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+
+
+def drop_table(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model("chargepoints", "ChargePointStatusEvent"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chargepoints", "0006_connector_count"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="ChargePointStatusEvent",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "status",
+                            models.CharField(
+                                choices=[
+                                    ("ready", "Ready"),
+                                    ("charging", "Charging"),
+                                    ("waiting", "Waiting"),
+                                    ("error", "Error"),
+                                ],
+                                max_length=16,
+                            ),
+                        ),
+                        (
+                            "previous_status",
+                            models.CharField(
+                                blank=True,
+                                choices=[
+                                    ("ready", "Ready"),
+                                    ("charging", "Charging"),
+                                    ("waiting", "Waiting"),
+                                    ("error", "Error"),
+                                ],
+                                default="",
+                                max_length=16,
+                            ),
+                        ),
+                        (
+                            "occurred_at",
+                            models.DateTimeField(default=django.utils.timezone.now),
+                        ),
+                        (
+                            "charge_point",
+                            models.ForeignKey(
+                                db_constraint=False,
+                                on_delete=django.db.models.deletion.DO_NOTHING,
+                                related_name="status_events",
+                                to="chargepoints.chargepoint",
+                            ),
+                        ),
+                    ],
+                    options={
+                        "ordering": ("-occurred_at", "-id"),
+                        "indexes": [
+                            models.Index(
+                                fields=["charge_point", "-occurred_at", "-id"],
+                                name="cp_status_event_cp_idx",
+                            )
+                        ],
+                    },
+                ),
+            ],
+        ),
+        # Después del estado: `create_table` necesita el modelo en el registro histórico.
+        migrations.RunPython(create_table, drop_table),
+    ]
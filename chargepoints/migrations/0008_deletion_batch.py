@@ -0,0 +1,56 @@
+# Generated by Django 5.2.7 on 2026-10-17 03:49
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Now
+
+
+def cascade_existing_deletes(apps, schema_editor):
+    # Conectores vivos de ChargePoints ya borrados (antes no había cascada): se marcan
+    # con el deleted_at de su ChargePoint, sin lote (restore() no los revive).
+    ChargePoint = apps.get_model("chargepoints", "ChargePoint")
+    Connector = apps.get_model("chargepoints", "Connector")
+    db = schema_editor.connection.alias
+    dead = ChargePoint.objects.using(db).filter(deleted_at__isnull=False)
+    parent_deleted_at = dead.filter(pk=OuterRef("charge_point_id")).values("deleted_at")
+    Connector.objects.using(db).filter(deleted_at__isnull=True, charge_point__in=dead).update(
+        deleted_at=Subquery(parent_deleted_at), updated_at=Now()
+    )
+    dead.exclude(connector_count=0).update(connector_count=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chargepoints", "0007_status_events"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chargepoint",
+            name="deletion_batch",
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="connector",
+            name="deletion_batch",
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="chargepoint",
+            index=models.Index(
+                condition=models.Q(("deletion_batch__isnull", False)),
+                fields=["deletion_batch"],
+                name="chargepoint_del_batch_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="connector",
+            index=models.Index(
+                condition=models.Q(("deletion_batch__isnull", False)),
+                fields=["deletion_batch"],
+                name="connector_del_batch_idx",
+            ),
+        ),
+        migrations.RunPython(cascade_existing_deletes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.7 on 2026-10-17 03:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chargepoints", "0008_deletion_batch"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedChargePoint",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("name", models.CharField(max_length=32)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("ready", "Ready"),
+                            ("charging", "Charging"),
+                            ("waiting", "Waiting"),
+                            ("error", "Error"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("deleted_at", models.DateTimeField()),
+                ("deletion_batch", models.UUIDField(blank=True, null=True)),
+                ("archived_at", models.DateTimeField()),
+            ],
+            options={
+                "ordering": ("-archived_at", "id"),
+                "indexes": [models.Index(fields=["archived_at"], name="archived_cp_archived_idx")],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedConnector",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("evse_number", models.CharField(max_length=32)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("deleted_at", models.DateTimeField()),
+                ("deletion_batch", models.UUIDField(blank=True, null=True)),
+                ("archived_at", models.DateTimeField()),
+                (
+                    "charge_point",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="connectors",
+                        to="chargepoints.archivedchargepoint",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("-archived_at", "id"),
+                "indexes": [
+                    models.Index(fields=["archived_at"], name="archived_conn_archived_idx")
+                ],
+            },
+        ),
+    ]
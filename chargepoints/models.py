@@ -1,8 +1,16 @@
 from __future__ import annotations
 
-from django.db import models
+import uuid
+from collections import Counter
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, models, router, transaction
+from django.db.models.sql import UpdateQuery
 from django.utils import timezone
 
+from . import deletion
+from .signals import rows_changed, send_data_changed
+
 
 class SoftDeleteQuerySet(models.QuerySet):
     def alive(self):
@@ -11,27 +19,61 @@ class SoftDeleteQuerySet(models.QuerySet):
     def dead(self):
         return self.exclude(deleted_at__isnull=True)
 
+    def update(self, **kwargs):
+        # QuerySet.update() no aplica auto_now: se marca updated_at explícitamente
+        # (también cubre bulk_update, que actualiza a través de update()).
+        kwargs.setdefault("updated_at", timezone.now())
+        rows = super().update(**kwargs)
+        send_data_changed(self.model, self.db)
+        return rows
+
+    def update_alive(self, **kwargs):
+        """`update()` restringido a las filas vivas del queryset (soft delete en cascada)."""
+        return self.alive().update(**kwargs)
+
     def delete(self):
-        return super().update(deleted_at=timezone.now())
+        """Soft delete en cascada (ver `chargepoints.deletion`). Devuelve las filas del queryset."""
+        return deletion.soft_delete(self)[self.model._meta.label]
+
+    def restore(self):
+        """Restaura las filas borradas y sus dependientes del mismo lote."""
+        return deletion.restore(self)[self.model._meta.label]
 
     def hard_delete(self):
-        return super().delete()
+        result = super().delete()
+        send_data_changed(self.model, self.db, cascade=True)
+        return result
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        send_data_changed(self.model, self.db)
+        return objs
 
 
 class SoftDeleteManager(models.Manager):
+    queryset_class = SoftDeleteQuerySet
+
     def get_queryset(self):
-        return SoftDeleteQuerySet(self.model, using=self._db).alive()
+        return self.queryset_class(self.model, using=self._db).alive()
 
     def all_with_deleted(self):
-        return SoftDeleteQuerySet(self.model, using=self._db).all()
+        return self.queryset_class(self.model, using=self._db).all()
 
     def dead(self):
-        return SoftDeleteQuerySet(self.model, using=self._db).dead()
+        return self.queryset_class(self.model, using=self._db).dead()
+
+
+ALIVE = models.Q(deleted_at__isnull=True)
+IN_DELETION_BATCH = models.Q(deletion_batch__isnull=False)
 
 
 class SoftDeleteModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
+    # Operación de borrado (soft) en cascada que marcó la fila: `restore()` solo revive
+    # las dependientes borradas en el mismo lote que su padre.
+    deletion_batch = models.UUIDField(null=True, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     objects = SoftDeleteManager()
     all_objects = SoftDeleteQuerySet.as_manager()
@@ -42,41 +84,566 @@ class SoftDeleteModel(models.Model):
             models.Index(fields=["deleted_at"], name="%(class)s_del_idx"),
         ]
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "updated_at" not in update_fields:
+            kwargs["update_fields"] = update_fields = [*update_fields, "updated_at"]
+        if self.deleted_at is None and self.deletion_batch is not None:
+            # Restaurado a mano (deleted_at = None): la fila viva no pertenece a ningún lote.
+            self.deletion_batch = None
+            if update_fields is not None and "deletion_batch" not in update_fields:
+                kwargs["update_fields"] = [*update_fields, "deletion_batch"]
+        super().save(*args, **kwargs)
+        send_data_changed(type(self), self._state.db)
+
     def delete(self, using=None, keep_parents=False):
-        self.deleted_at = timezone.now()
-        self.save(update_fields=["deleted_at"])
+        """Soft delete del objeto y, en cascada, de sus dependientes vivos."""
+        using = using or router.db_for_write(type(self), instance=self)
+        batch, now = uuid.uuid4(), timezone.now()
+        queryset = type(self).all_objects.using(using).filter(pk=self.pk)
+        if deletion.soft_delete(queryset, batch=batch, now=now)[self._meta.label]:
+            self.deleted_at, self.deletion_batch = now, batch
+
+    def restore(self, using=None):
+        """Restaura el objeto y los dependientes borrados en su mismo lote."""
+        using = using or router.db_for_write(type(self), instance=self)
+        queryset = type(self).all_objects.using(using).filter(pk=self.pk)
+        if deletion.restore(queryset)[self._meta.label]:
+            self.deleted_at = self.deletion_batch = None
+
+    def hard_delete(self, using=None, keep_parents=False):
+        result = super().delete(using=using, keep_parents=keep_parents)
+        send_data_changed(type(self), using or self._state.db or "default", cascade=True)
+        return result
+
+
+# ---------------------------
+# Contadores derivados mantenidos en cada escritura
+# ---------------------------
+def tally(rows) -> Counter:
+    """Cuenta por clave las filas `(clave, deleted_at)` vivas."""
+    return Counter(key for key, deleted_at in rows if deleted_at is None)
+
+
+def count_deltas(changes) -> Counter:
+    """Diferencia de filas vivas por clave de una lista de `(pk, antes, después)`."""
+    deltas = tally(after for _, _, after in changes if after is not None)
+    deltas.subtract(tally(before for _, before, _ in changes if before is not None))
+    return deltas
+
+
+class CountedQuerySet(SoftDeleteQuerySet):
+    """
+    Escrituras set-based de un `CountedModel`: las que tocan `counted_field`,
+    `observed_fields` o `deleted_at` leen (y bloquean) antes las filas afectadas y
+    registran cada cambio `(pk, antes, después)` con `model.rows_written`, en la misma
+    transacción.
+    """
+
+    def _tracked(self) -> tuple[str, frozenset]:
+        field = self.model._meta.get_field(self.model.counted_field)
+        fields = {field.name, field.attname, "deleted_at", *self.model.observed_fields}
+        return field.attname, frozenset(fields)
+
+    def update(self, **kwargs):
+        attname, tracked = self._tracked()
+        if not tracked.intersection(kwargs):
+            return super().update(**kwargs)
+        name = self.model.counted_field
+        with transaction.atomic(using=self.db, savepoint=False):
+            rows = list(
+                self.select_for_update().order_by().values_list("pk", attname, "deleted_at")
+            )
+            updated = super().update(**kwargs)
+            if any(hasattr(kwargs.get(f), "resolve_expression") for f in tracked):
+                # Expresiones (p. ej. Case/When de bulk_update): releer el resultado.
+                reread = (
+                    type(self)(self.model, using=self.db)
+                    .filter(pk__in=[pk for pk, _, _ in rows])
+                    .values_list("pk", attname, "deleted_at")
+                )
+                after = {pk: (key, deleted_at) for pk, key, deleted_at in reread}
+            else:
+                value = kwargs.get(attname, kwargs.get(name))
+                value = getattr(value, "pk", value)
+                deleted = kwargs.get("deleted_at")
+                after = {
+                    pk: (
+                        key if value is None and name not in kwargs else value,
+                        deleted if "deleted_at" in kwargs else deleted_at,
+                    )
+                    for pk, key, deleted_at in rows
+                }
+            changes = [(pk, (key, deleted_at), after.get(pk)) for pk, key, deleted_at in rows]
+            self.model.rows_written(changes, self.db)
+        return updated
+
+    def update_alive(self, **kwargs):
+        """
+        `update()` de las filas vivas sin la lectura previa: el estado anterior se conoce
+        (vivas) y `UPDATE ... RETURNING` devuelve las filas marcadas con su clave. Es el
+        camino del soft delete en cascada: una sentencia por nivel en lugar de dos. Solo
+        para valores que no cambian `counted_field` ni `observed_fields`; sin RETURNING
+        (motores distintos de PostgreSQL/SQLite) equivale a `alive().update()`.
+        """
+        connection = connections[self.db]
+        attname, tracked = self._tracked()
+        if (
+            connection.vendor not in ("postgresql", "sqlite")
+            or not connection.features.can_return_columns_from_insert
+            or tracked.intersection(kwargs) - {"deleted_at"}
+        ):
+            return super().update_alive(**kwargs)
+        kwargs.setdefault("updated_at", timezone.now())
+        query = self.alive().query.chain(UpdateQuery)
+        query.add_update_values(kwargs)
+        query.annotations = {}
+        try:
+            sql, params = query.get_compiler(self.db).as_sql()
+        except EmptyResultSet:
+            return 0
+        qn = connection.ops.quote_name
+        returning = (
+            f"{qn(self.model._meta.pk.column)}, {qn(self.model._meta.get_field(attname).column)}"
+        )
+        deleted_at = kwargs.get("deleted_at")
+        with transaction.atomic(using=self.db, savepoint=False):
+            with connection.cursor() as cursor:
+                cursor.execute(f"{sql} RETURNING {returning}", params)
+                rows = cursor.fetchall()
+            changes = [(pk, (key, None), (key, deleted_at)) for pk, key in rows]
+            self.model.rows_written(changes, self.db)
+        send_data_changed(self.model, self.db)
+        return len(rows)
+
+    def hard_delete(self):
+        attname, _ = self._tracked()
+        with transaction.atomic(using=self.db, savepoint=False):
+            rows = list(
+                self.select_for_update().order_by().values_list("pk", attname, "deleted_at")
+            )
+            result = super().hard_delete()
+            changes = [(pk, (key, deleted_at), None) for pk, key, deleted_at in rows]
+            self.model.rows_written(changes, self.db)
+        return result
+
+    def bulk_create(self, objs, *args, **kwargs):
+        if kwargs.get("ignore_conflicts") or kwargs.get("update_conflicts"):
+            raise ValueError("bulk_create con conflictos no mantiene los contadores.")
+        attname, _ = self._tracked()
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            changes = [(o.pk, None, (getattr(o, attname), o.deleted_at)) for o in objs]
+            self.model.rows_written(changes, self.db)
+        return objs
+
+
+class CountedManager(SoftDeleteManager):
+    queryset_class = CountedQuerySet
+
+
+class CountedModel(SoftDeleteModel):
+    """
+    Modelo con soft delete cuyas filas vivas se cuentan por `counted_field` en otra
+    tabla. `save()`/`hard_delete()` de instancia leen con bloqueo el estado previo; los
+    caminos set-based pasan por `CountedQuerySet`. Cada escritura que cambia
+    `counted_field`, `observed_fields` o `deleted_at` emite además `rows_changed` con
+    los cambios por fila.
+
+    Cada subclase que declara `counted_field` define también el classmethod
+    `apply_count_deltas(deltas, using)`: suma `deltas` (`{clave: n}`, en filas vivas)
+    a su tabla de contadores, en la transacción de la escritura. Se comprueba al
+    declarar la clase.
+    """
+
+    counted_field: str
+    observed_fields: tuple[str, ...] = ()
+
+    objects = CountedManager()
+    all_objects = CountedQuerySet.as_manager()
+
+    class Meta(SoftDeleteModel.Meta):
+        abstract = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "counted_field" in cls.__dict__ and not callable(
+            getattr(cls, "apply_count_deltas", None)
+        ):
+            raise TypeError(f"{cls.__name__} declara counted_field sin apply_count_deltas().")
+
+    def save(self, *args, **kwargs):
+        field = self._meta.get_field(self.counted_field)
+        update_fields = kwargs.get("update_fields")
+        tracked = {field.name, field.attname, "deleted_at", *self.observed_fields}
+        if update_fields is not None and not tracked.intersection(update_fields):
+            return super().save(*args, **kwargs)
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            before = None if self._state.adding else self._locked_state(using)
+            super().save(*args, **kwargs)
+            after = (getattr(self, field.attname), self.deleted_at)
+            self.rows_written([(self.pk, before, after)], using)
+
+    @classmethod
+    def rows_written(cls, changes: list[tuple], using: str) -> None:
+        """
+        Cambios `(pk, antes, después)` de una escritura, con `antes`/`después` =
+        `(clave, deleted_at)` o `None` (fila inexistente). Ajusta los contadores y
+        notifica `rows_changed`.
+        """
+        cls.apply_count_deltas(count_deltas(changes), using)
+        rows_changed.send(sender=cls, using=using, changes=changes)
+
+    def _locked_state(self, using: str) -> tuple | None:
+        attname = self._meta.get_field(self.counted_field).attname
+        return (
+            type(self)
+            .all_objects.using(using)
+            .select_for_update()
+            .filter(pk=self.pk)
+            .values_list(attname, "deleted_at")
+            .first()
+        )
 
     def hard_delete(self, using=None, keep_parents=False):
-        return super().delete(using=using, keep_parents=keep_parents)
+        using = using or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            pk, before = self.pk, self._locked_state(using)
+            result = super().hard_delete(using=using, keep_parents=keep_parents)
+            self.rows_written([(pk, before, None)], using)
+        return result
+
 
+# Altas/cambios de estado que se registran en la misma sentencia que los contadores
+# (PostgreSQL); por encima, `bulk_create` aparte.
+MERGED_EVENTS_MAX = 1000
 
-class ChargePoint(SoftDeleteModel):
+
+def apply_status_deltas(deltas: Counter, using: str, events: list | None = None) -> None:
+    """
+    Suma `deltas` a `ChargePointStatusCounter` en una sola sentencia
+    (`SET count = count + CASE status WHEN ... END`) e inserta `events` en el historial.
+    En PostgreSQL ambas van en la misma sentencia (CTE con `UPDATE` e `INSERT`): un
+    cambio de estado cuesta un viaje a la base de datos, no dos. Debe ejecutarse en la
+    misma transacción que la escritura que lo origina.
+    """
+    deltas = {status: delta for status, delta in sorted(deltas.items()) if delta}
+    events = events or []
+    counters = ChargePointStatusCounter.objects.using(using)
+
+    def increment(statuses):
+        delta = models.Case(
+            *(models.When(status=s, then=models.Value(deltas[s])) for s in statuses),
+            default=models.Value(0),
+        )
+        return counters.filter(status__in=statuses).update(count=models.F("count") + delta)
+
+    if deltas and events and connections[using].vendor == "postgresql":
+        if len(events) <= MERGED_EVENTS_MAX:
+            updated = _increment_with_events(deltas, events, using)
+        else:
+            updated = increment(list(deltas))
+            ChargePointStatusEvent.objects.using(using).bulk_create(events)
+    else:
+        updated = increment(list(deltas)) if deltas else 0
+        if events:
+            ChargePointStatusEvent.objects.using(using).bulk_create(events)
+
+    if updated < len(deltas):
+        # Estados sin fila (p. ej. tras vaciar la tabla): se crean y se suman aparte.
+        present = set(counters.filter(status__in=deltas).values_list("status", flat=True))
+        missing = sorted(deltas.keys() - present)
+        counters.bulk_create(
+            [ChargePointStatusCounter(status=s) for s in missing], ignore_conflicts=True
+        )
+        increment(missing)
+
+
+def _increment_with_events(deltas: dict[str, int], events: list, using: str) -> int:
+    """`UPDATE` de los contadores e `INSERT` del historial en una sentencia. Filas sumadas."""
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    counter, event = ChargePointStatusCounter._meta, ChargePointStatusEvent._meta
+    status, count = qn(counter.get_field("status").column), qn(counter.get_field("count").column)
+    columns = ["charge_point", "status", "previous_status", "occurred_at"]
+    whens = " ".join(["WHEN %s THEN %s"] * len(deltas))
+    statuses = ", ".join(["%s"] * len(deltas))
+    rows = ", ".join(["(%s, %s, %s, %s)"] * len(events))
+    sql = (
+        f"WITH counted AS (UPDATE {qn(counter.db_table)} "
+        f"SET {count} = {count} + CASE {status} {whens} ELSE 0 END "
+        f"WHERE {status} IN ({statuses}) RETURNING 1), "
+        f"logged AS (INSERT INTO {qn(event.db_table)} "
+        f"({', '.join(qn(event.get_field(c).column) for c in columns)}) VALUES {rows}) "
+        "SELECT COUNT(*) FROM counted"
+    )
+    params = [value for item in deltas.items() for value in item]
+    params += list(deltas)
+    for e in events:
+        params += [e.charge_point_id, e.status, e.previous_status, e.occurred_at]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()[0]
+
+
+def apply_connector_deltas(deltas: Counter, using: str) -> None:
+    """
+    Suma `deltas` (`{charge_point_id: n}`) a `ChargePoint.connector_count`: una sentencia
+    por valor distinto de delta (normalmente +1..+4 o -1), no una por ChargePoint.
+    """
+    by_delta: dict[int, list[int]] = {}
+    for cp_id, delta in sorted(deltas.items()):
+        if delta:
+            by_delta.setdefault(delta, []).append(cp_id)
+    chargepoints = ChargePoint.all_objects.using(using)
+    for delta, ids in sorted(by_delta.items()):
+        chargepoints.filter(pk__in=ids).update(connector_count=models.F("connector_count") + delta)
+
+
+class ChargePoint(CountedModel):
     class Status(models.TextChoices):
         READY = "ready", "Ready"
         CHARGING = "charging", "Charging"
         WAITING = "waiting", "Waiting"
         ERROR = "error", "Error"
 
-    name = models.CharField(max_length=32, unique=True)
+    name = models.CharField(max_length=32)
     status = models.CharField(max_length=16, choices=Status.choices, default=Status.READY)
+    # Conectores vivos (desnormalizado): lo mantienen las escrituras de Connector.
+    connector_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Resumen por estado (ChargePointStatusCounter); `name` se observa para los eventos
+    # `updated` de /chargepoint/stream.
+    counted_field = "status"
+    observed_fields = ("name",)
 
     class Meta:
+        # Índices parciales "solo vivos" (WHERE deleted_at IS NULL): cubren exactamente
+        # las consultas del API, que siempre pasan por SoftDeleteManager.
         indexes = [
-            models.Index(fields=["status"], name="chargepoint_status_idx"),
+            # MAX(updated_at) para ETag/Last-Modified sin recorrer la tabla
+            models.Index(fields=["updated_at"], name="chargepoint_updated_idx"),
+            models.Index(
+                fields=["status", "-created_at", "id"],
+                name="chargepoint_alive_status_idx",
+                condition=ALIVE,
+            ),
+            models.Index(
+                fields=["-created_at", "id"],
+                name="chargepoint_alive_created_idx",
+                condition=ALIVE,
+            ),
+            # ?min_connectors / ?max_connectors y ordering=connector_count
+            models.Index(
+                fields=["connector_count", "id"],
+                name="chargepoint_alive_conn_idx",
+                condition=ALIVE,
+            ),
+            # restore() por lote (solo filas borradas en cascada)
+            models.Index(
+                fields=["deletion_batch"],
+                name="chargepoint_del_batch_idx",
+                condition=IN_DELETION_BATCH,
+            ),
+        ]
+        constraints = [
+            # Unicidad solo entre vivos: un nombre borrado (soft) puede reutilizarse.
+            # El índice único parcial sirve además para búsquedas/ordenación por nombre.
+            models.UniqueConstraint(
+                fields=["name"], name="chargepoint_name_alive_uniq", condition=ALIVE
+            ),
         ]
         ordering = ("-created_at", "id")
 
     def __str__(self) -> str:
         return f"{self.name} [{self.status}]"
 
+    def save(self, *args, **kwargs):
+        # connector_count lo mantienen los conectores: un save() completo de una
+        # instancia leída antes de que cambiaran no debe pisarlo con su valor antiguo.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name
+                for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != "connector_count"
+            ]
+        super().save(*args, **kwargs)
 
-class Connector(SoftDeleteModel):
-    evse_number = models.CharField(max_length=32, unique=True)
+    @classmethod
+    def apply_count_deltas(cls, deltas: Counter, using: str) -> None:
+        apply_status_deltas(deltas, using)
+
+    @classmethod
+    def rows_written(cls, changes: list[tuple], using: str) -> None:
+        # Contadores e historial juntos: en PostgreSQL, una sola sentencia.
+        apply_status_deltas(count_deltas(changes), using, events=status_events(changes))
+        rows_changed.send(sender=cls, using=using, changes=changes)
+
+
+class ChargePointStatusCounter(models.Model):
+    """
+    Número de ChargePoints vivos por estado, mantenido en la misma transacción que cada
+    escritura (`CountedModel.save/hard_delete` y `CountedQuerySet`). Alimenta
+    `/chargepoint/summary` sin recorrer la tabla. Reparación: `manage.py recount`.
+    Cada estado es una fila: las escrituras concurrentes del mismo estado se serializan
+    en su contador hasta el commit.
+    """
+
+    status = models.CharField(max_length=16, primary_key=True)
+    count = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.status}: {self.count}"
+
+
+class ChargePointStatusEvent(models.Model):
+    """
+    Historial append-only de estados: una fila por alta y por cada cambio de `status`,
+    escrita en la misma transacción que el cambio (`status_events`). En PostgreSQL
+    la tabla está particionada por rango mensual de `occurred_at` (ver
+    `chargepoints.history`); la clave primaria física es `(id, occurred_at)`.
+    """
+
+    # Sin FK física: el historial sobrevive al borrado del ChargePoint y las particiones
+    # no pagan la comprobación de integridad en cada inserción.
+    charge_point = models.ForeignKey(
+        ChargePoint,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="status_events",
+    )
+    status = models.CharField(max_length=16, choices=ChargePoint.Status.choices)
+    # Vacío en el evento de alta.
+    previous_status = models.CharField(
+        max_length=16, choices=ChargePoint.Status.choices, blank=True, default=""
+    )
+    occurred_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # /chargepoint/{id}/history?from=&to= (keyset descendente)
+            models.Index(
+                fields=["charge_point", "-occurred_at", "-id"], name="cp_status_event_cp_idx"
+            ),
+        ]
+        ordering = ("-occurred_at", "-id")
+
+    def __str__(self) -> str:
+        return f"{self.charge_point_id}: {self.previous_status} -> {self.status}"
+
+
+def status_events(changes: list[tuple]) -> list[ChargePointStatusEvent]:
+    """
+    Altas y cambios de estado de `changes` (`(pk, antes, después)` de `rows_written`)
+    como eventos del historial, sin lecturas adicionales. Los inserta
+    `apply_status_deltas` junto con los contadores.
+    """
+    now = timezone.now()
+    return [
+        ChargePointStatusEvent(
+            charge_point_id=pk,
+            status=after[0],
+            previous_status=before[0] if before is not None else "",
+            occurred_at=now,
+        )
+        for pk, before, after in changes
+        if after is not None and (before is None or before[0] != after[0])
+    ]
+
+
+class Connector(CountedModel):
+    evse_number = models.CharField(max_length=32)
     charge_point = models.ForeignKey(
         ChargePoint,
         on_delete=models.CASCADE,
         related_name="connectors",
     )
 
+    # ChargePoint.connector_count
+    counted_field = "charge_point"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at"], name="connector_updated_idx"),
+            # prefetch_related("connectors"): WHERE charge_point_id IN (...) AND deleted_at IS NULL
+            models.Index(
+                fields=["charge_point", "id"],
+                name="connector_alive_cp_idx",
+                condition=ALIVE,
+            ),
+            models.Index(
+                fields=["deletion_batch"],
+                name="connector_del_batch_idx",
+                condition=IN_DELETION_BATCH,
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["evse_number"], name="connector_evse_alive_uniq", condition=ALIVE
+            ),
+        ]
+
     def __str__(self) -> str:
         return f"{self.evse_number} -> {self.charge_point.name}"
+
+    @classmethod
+    def apply_count_deltas(cls, deltas: Counter, using: str) -> None:
+        apply_connector_deltas(deltas, using)
+
+
+# ---------------------------
+# Archivo de filas borradas (manage.py archive_deleted, ver `chargepoints.archive`)
+# ---------------------------
+class ArchivedChargePoint(models.Model):
+    """
+    ChargePoint borrado (soft) que ha salido de la tabla principal pasada la retención.
+    Conserva su id y sus columnas; solo lectura (admin y `/chargepoint/archived/{id}`).
+    """
+
+    id = models.BigIntegerField(primary_key=True)  # el original
+    name = models.CharField(max_length=32)
+    status = models.CharField(max_length=16, choices=ChargePoint.Status.choices)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    deleted_at = models.DateTimeField()
+    deletion_batch = models.UUIDField(null=True, blank=True)
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # Purga del archivo por antigüedad y listado del admin
+            models.Index(fields=["archived_at"], name="archived_cp_archived_idx"),
+        ]
+        ordering = ("-archived_at", "id")
+
+    def __str__(self) -> str:
+        return f"{self.name} [archivado]"
+
+
+class ArchivedConnector(models.Model):
+    """Connector archivado; su ChargePoint puede seguir en la tabla principal (borrado)."""
+
+    id = models.BigIntegerField(primary_key=True)
+    evse_number = models.CharField(max_length=32)
+    # Sin FK física: los conectores se archivan antes que su ChargePoint.
+    charge_point = models.ForeignKey(
+        ArchivedChargePoint,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="connectors",
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    deleted_at = models.DateTimeField()
+    deletion_batch = models.UUIDField(null=True, blank=True)
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["archived_at"], name="archived_conn_archived_idx"),
+        ]
+        ordering = ("-archived_at", "id")
+
+    def __str__(self) -> str:
+        return f"{self.evse_number} [archivado]"
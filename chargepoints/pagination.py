@@ -0,0 +1,472 @@
+from __future__ import annotations
+
+import binascii
+import functools
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Mapping
+from datetime import date, datetime
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, InvalidPage, Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.encoding import force_str
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# ---------------------------------------------------------------------
+# Recuentos acotados / estimados
+# ---------------------------------------------------------------------
+
+DEFAULTS = {
+    # Recuento del listado paginado: "exact" (COUNT(*)), "capped" (COUNT sobre LIMIT n+1)
+    # o "estimated" (acotado y, por encima, estimación del planificador de PostgreSQL)
+    "COUNT": "exact",
+    "EXACT_COUNT_THRESHOLD": 10_000,  # por debajo, el recuento siempre es exacto
+}
+COUNT_MODES = ("exact", "capped", "estimated")
+
+
+def get_options() -> dict:
+    return {**DEFAULTS, **getattr(settings, "CHARGEPOINTS_PAGINATION", {})}
+
+
+def capped_count(queryset, cap: int) -> tuple[int, bool]:
+    """
+    `COUNT` sobre `LIMIT cap + 1`: recorre como mucho `cap + 1` filas. Devuelve
+    `(filas, exacto)`; si hay más de `cap`, `(cap, False)`.
+    """
+    count = queryset.order_by()[: cap + 1].count()
+    return (count, True) if count <= cap else (cap, False)
+
+
+async def acapped_count(queryset, cap: int) -> tuple[int, bool]:
+    count = await queryset.order_by()[: cap + 1].acount()
+    return (count, True) if count <= cap else (cap, False)
+
+
+def planner_estimate(queryset) -> int | None:
+    """Filas estimadas por el planificador de PostgreSQL (`EXPLAIN`); `None` en otros motores."""
+    if connections[queryset.db].vendor != "postgresql":
+        return None
+    return _plan_rows(queryset.order_by().explain(format="json"))
+
+
+async def aplanner_estimate(queryset) -> int | None:
+    if connections[queryset.db].vendor != "postgresql":
+        return None
+    return _plan_rows(await queryset.order_by().aexplain(format="json"))
+
+
+def _plan_rows(explain: str) -> int:
+    return int(json.loads(explain)[0]["Plan"]["Plan Rows"])
+
+
+def table_estimate(model, using: str) -> int | None:
+    """
+    Filas de la tabla de `model` según las estadísticas de PostgreSQL (`reltuples`, sin
+    recorrerla); `None` en otros motores o si la tabla aún no se ha analizado.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return row[0] if row is not None and row[0] >= 0 else None
+
+
+def fast_count(queryset, threshold: int, estimate: bool = True) -> tuple[int, bool]:
+    """
+    Recuento exacto si el queryset tiene como mucho `threshold` filas; si no, la
+    estimación del planificador (nunca por debajo de `threshold`) o, sin ella (u otro
+    motor), el tope. Devuelve `(filas, exacto)`.
+    """
+    count, exact = capped_count(queryset, threshold)
+    if exact or not estimate:
+        return count, exact
+    return max(planner_estimate(queryset) or 0, count), False
+
+
+async def afast_count(queryset, threshold: int, estimate: bool = True) -> tuple[int, bool]:
+    count, exact = await acapped_count(queryset, threshold)
+    if exact or not estimate:
+        return count, exact
+    return max(await aplanner_estimate(queryset) or 0, count), False
+
+
+class EstimatedPage(Page):
+    """
+    Página de un recuento no exacto: hay siguiente mientras la página venga llena (la
+    última página según el recuento no tiene por qué serlo).
+    """
+
+    def has_next(self) -> bool:
+        if self.paginator.count_is_exact:
+            return super().has_next()
+        return len(self.object_list) >= self.paginator.per_page
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    `Paginator` cuyo `count` es exacto hasta `threshold` filas y acotado o estimado por
+    encima (`fast_count`): no ejecuta un `COUNT(*)` completo sobre tablas grandes. Con un
+    recuento no exacto, las páginas más allá de `num_pages` siguen siendo válidas.
+    """
+
+    threshold = 10_000
+    estimate = True
+    count_is_exact = True
+
+    def __init__(self, *args, threshold: int | None = None, estimate: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        if threshold is not None:
+            self.threshold = threshold
+        self.estimate = estimate
+
+    @cached_property
+    def count(self) -> int:
+        if not hasattr(self.object_list, "query"):  # listas: len()
+            return len(self.object_list)
+        count, self.count_is_exact = fast_count(self.object_list, self.threshold, self.estimate)
+        return count
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.count_is_exact or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if self.count_is_exact:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom : bottom + self.per_page], number, self)
+
+    def _get_page(self, *args, **kwargs):
+        return EstimatedPage(*args, **kwargs)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor opaco (keyset / seek method).
+
+    A diferencia de `PageNumberPagination`:
+
+    - Nunca ejecuta `COUNT(*)`.
+    - No usa `OFFSET`: cada página filtra a partir de la última posición vista
+      (`WHERE (created_at, id) "después de" (v1, v2)`), por lo que el coste de la
+      página N no depende de N si existe un índice sobre la ordenación.
+
+    La ordenación se toma del propio queryset (la que deja `OrderingFilter` o la
+    `Meta.ordering` del modelo) y siempre se completa con `id` como desempate,
+    de modo que la posición es única y estable.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_query_description = _("Cursor opaco de paginación (vacío para la primera página).")
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = _("Cursor inválido.")
+    tiebreaker = "id"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self._finish(list(self._page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Equivalente async (vistas ASGI): la misma consulta, iterada con `async for`."""
+        return self._finish([row async for row in self._page_queryset(queryset, request)])
+
+    def _page_queryset(self, queryset, request):
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), "page")
+        self.ordering = self.get_ordering(queryset)
+        self.position, self.reverse = self.decode_cursor(request)
+
+        if self.position is not None:
+            queryset = queryset.filter(self._seek_filter(self.position, self.reverse))
+
+        order_by = list(self.ordering)
+        if self.reverse:
+            order_by = [self._invert(f) for f in self.ordering]
+        return queryset.order_by(*order_by)[: self.page_size + 1]
+
+    def _finish(self, rows: list) -> list:
+        position, reverse = self.position, self.reverse
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.first_position = self._get_position(rows[0]) if rows else position
+        self.last_position = self._get_position(rows[-1]) if rows else position
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": force_str(self.cursor_query_description),
+                "schema": {"type": "string"},
+            }
+        ]
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        return self.encode_cursor(self.last_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_position is None:
+            return None
+        return self.encode_cursor(self.first_position, reverse=True)
+
+    # --------------------------
+    # Ordenación y filtro de búsqueda (seek)
+    # --------------------------
+    def get_ordering(self, queryset) -> tuple[str, ...]:
+        """
+        Devuelve la ordenación efectiva del queryset, terminada en el desempate `id`.
+        """
+        if queryset.query.order_by:
+            ordering = list(queryset.query.order_by)
+        elif queryset.query.default_ordering:
+            ordering = list(queryset.model._meta.ordering)
+        else:
+            ordering = []
+
+        for field in ordering:
+            if not isinstance(field, str) or "__" in field or field.startswith("?"):
+                raise ValueError(f"KeysetPagination no soporta la ordenación {field!r}.")
+
+        names = {f.lstrip("-") for f in ordering}
+        if self.tiebreaker not in names and "pk" not in names:
+            ordering.append(self.tiebreaker)
+        return tuple(ordering)
+
+    def _seek_filter(self, position: list, reverse: bool) -> Q:
+        """
+        Construye `(f1 > v1) OR (f1 = v1 AND f2 > v2) OR ...` respetando el sentido
+        de cada campo. Se añade además la cota redundante `f1 >= v1` para que el
+        planificador pueda usar un index range scan sobre la primera columna.
+        """
+        branches = []
+        for i, field in enumerate(self.ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") != reverse else "gt"
+            equal = {f.lstrip("-"): v for f, v in zip(self.ordering[:i], position[:i], strict=True)}
+            branches.append(Q(**equal, **{f"{name}__{lookup}": position[i]}))
+
+        first = self.ordering[0]
+        bound = "lte" if first.startswith("-") != reverse else "gte"
+        return Q(**{f"{first.lstrip('-')}__{bound}": position[0]}) & reduce(or_, branches)
+
+    @staticmethod
+    def _invert(field: str) -> str:
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def _get_position(self, row) -> list:
+        values = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            value = row[name] if isinstance(row, Mapping) else getattr(row, name)
+            if isinstance(value, datetime | date):
+                value = value.isoformat()
+            values.append(value)
+        return values
+
+    # --------------------------
+    # Codificación del cursor
+    # --------------------------
+    def encode_cursor(self, position: list, reverse: bool) -> str:
+        payload = {"o": list(self.ordering), "p": position}
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        token = urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request) -> tuple[list | None, bool]:
+        """
+        Devuelve `(posición, reverse)`. Un cursor vacío (`?cursor=`) indica la primera página.
+        """
+        token = request.query_params.get(self.cursor_query_param) or ""
+        if not token:
+            return None, False
+
+        try:
+            raw = urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            payload = json.loads(raw)
+            position = payload["p"]
+            ordering = tuple(payload["o"])
+            reverse = bool(payload.get("r", 0))
+        except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+        # El cursor solo es válido para la ordenación con la que se generó.
+        if ordering != self.ordering or not isinstance(position, list):
+            raise NotFound(self.invalid_cursor_message)
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+
+class StatusHistoryPagination(KeysetPagination):
+    """
+    Keyset del historial de estados (`-occurred_at, -id`, ver `cp_status_event_cp_idx`).
+    Páginas más grandes que las del listado: las filas son pequeñas.
+    """
+
+    page_size = 100
+
+
+class ChargePointPagination(PageNumberPagination):
+    """
+    Paginación por defecto del listado de ChargePoints.
+
+    Mantiene `PageNumberPagination` (con `count`) y activa el modo keyset cuando la
+    petición incluye el parámetro `cursor` (p. ej. `?cursor=` para la primera página).
+
+    El `count` es exacto (`COUNT(*)`) salvo que el ajuste `COUNT` o `?count=` pidan
+    `capped` o `estimated` (ver `fast_count`): entonces solo es exacto hasta
+    `EXACT_COUNT_THRESHOLD` filas. `count_is_exact` lo indica en la respuesta.
+    """
+
+    keyset_class = KeysetPagination
+    count_query_param = "count"
+    count_query_description = _(
+        "Recuento del total: exact (COUNT(*)), capped (exacto hasta un umbral, después el "
+        "umbral) o estimated (exacto hasta el umbral, después estimación de PostgreSQL)."
+    )
+    count_mode = "exact"
+
+    @property
+    def django_paginator_class(self):
+        if self.count_mode == "exact":
+            return Paginator
+        return functools.partial(
+            EstimatedCountPaginator,
+            threshold=get_options()["EXACT_COUNT_THRESHOLD"],
+            estimate=self.count_mode == "estimated",
+        )
+
+    def get_count_mode(self, request) -> str:
+        mode = request.query_params.get(self.count_query_param) or get_options()["COUNT"]
+        if mode not in COUNT_MODES:
+            raise ValidationError({self.count_query_param: [f"Debe ser uno de {COUNT_MODES}."]})
+        return mode
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        self.keyset = None
+        self.count_mode = self.get_count_mode(request)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Equivalente async de `paginate_queryset` (vistas ASGI): `COUNT(*)` con `acount()`
+        y la página con `async for`; el resto (validación del número de página, enlaces)
+        es el de `PageNumberPagination`.
+        """
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+        self.keyset = None
+        self.request = request
+        self.count_mode = self.get_count_mode(request)
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # cached_property: sin COUNT síncrono
+        if self.count_mode == "exact":
+            paginator.count, paginator.count_is_exact = await queryset.acount(), True
+        else:
+            paginator.count, paginator.count_is_exact = await afast_count(
+                queryset, paginator.threshold, paginator.estimate
+            )
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg) from exc
+
+        self.page.object_list = [row async for row in self.page.object_list]
+        return self.page.object_list
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        paginator = self.page.paginator
+        return Response(
+            {
+                "count": paginator.count,
+                "count_is_exact": getattr(paginator, "count_is_exact", True),
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_exact"] = {"type": "boolean", "example": True}
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        count = {
+            "name": self.count_query_param,
+            "required": False,
+            "in": "query",
+            "description": force_str(self.count_query_description),
+            "schema": {"type": "string", "enum": list(COUNT_MODES)},
+        }
+        return [
+            *super().get_schema_operation_parameters(view),
+            count,
+            *self.keyset_class().get_schema_operation_parameters(view),
+        ]
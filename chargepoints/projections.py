@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from django.conf import settings
+from rest_framework import serializers
+
+from .models import Connector
+
+# Mismo orden de claves que ChargePointSerializer / ConnectorNestedSerializer
+CHARGEPOINT_FIELDS = ("id", "name", "status", "created_at", "connector_count")
+CONNECTOR_FIELDS = ("id", "evse_number", "deleted_at")
+
+# Campo de DRF reutilizado para formatear fechas exactamente igual que el serializer
+# (zona horaria, DATETIME_FORMAT y sufijo "Z").
+_datetime_field = serializers.DateTimeField()
+
+
+def fast_read_path_enabled() -> bool:
+    return getattr(settings, "CHARGEPOINTS_FAST_READ_PATH", True)
+
+
+def format_datetime(value):
+    return None if value is None else _datetime_field.to_representation(value)
+
+
+def load_columns(queryset, fieldset=None) -> tuple[str, ...]:
+    """
+    Columnas de ChargePoint necesarias para responder con `fieldset`: los campos
+    escalares pedidos, `id` (agrupación de conectores) y los campos de la ordenación
+    (posición de la paginación keyset).
+    """
+    if fieldset is None:
+        fieldset = CHARGEPOINT_FIELDS
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    concrete = {f.name for f in queryset.model._meta.concrete_fields}
+    columns = ["id"]
+    for name in [*fieldset, *(str(f).lstrip("-") for f in ordering)]:
+        if name in concrete and name not in columns:
+            columns.append(name)
+    return tuple(columns)
+
+
+def chargepoint_rows(queryset, fieldset=None):
+    """
+    Proyección `values()` del queryset con las columnas de la respuesta.
+
+    Se conservan las anotaciones (p. ej. `search_rank`) para que la paginación keyset
+    pueda leer la posición de cada fila; el prefetch de conectores se descarta porque
+    lo sustituye `project_chargepoints`.
+    """
+    columns = load_columns(queryset, fieldset)
+    extra = tuple(name for name in queryset.query.annotations if name not in columns)
+    return queryset.prefetch_related(None).values(*columns, *extra)
+
+
+_CONVERTERS = {"created_at": format_datetime}
+
+
+def project_chargepoints(rows, using: str = "default", fieldset=None) -> list[dict]:
+    """
+    Construye la representación de ChargePointSerializer a partir de filas `values()`.
+
+    Los conectores vivos de todas las filas se cargan con una consulta (la misma que
+    haría `prefetch_related("connectors")`) y se agrupan en una sola pasada, sin
+    instanciar modelos ni serializers por objeto; si `fieldset` no incluye
+    `connectors` no se consultan. La salida es idéntica a la del serializer, clave a
+    clave.
+    """
+    fieldset = _default_fieldset(fieldset)
+    rows = list(rows)
+    connectors = _connectors_queryset(rows, using, fieldset)
+    connector_rows = list(connectors) if connectors is not None else []
+    return _project(rows, connector_rows, fieldset)
+
+
+async def aproject_chargepoints(rows: list, using: str = "default", fieldset=None) -> list[dict]:
+    """Equivalente async de `project_chargepoints` (ORM async) para filas ya leídas."""
+    fieldset = _default_fieldset(fieldset)
+    connectors = _connectors_queryset(rows, using, fieldset)
+    connector_rows = [row async for row in connectors] if connectors is not None else []
+    return _project(rows, connector_rows, fieldset)
+
+
+def _default_fieldset(fieldset):
+    return (*CHARGEPOINT_FIELDS, "connectors") if fieldset is None else fieldset
+
+
+def _connectors_queryset(rows: list, using: str, fieldset):
+    """Conectores de `rows` como tuplas `(charge_point_id, *CONNECTOR_FIELDS)`, o `None`."""
+    if "connectors" not in fieldset or not rows:
+        return None
+    ids = list({row["id"]: None for row in rows})
+    queryset = Connector.objects.using(using).filter(charge_point_id__in=ids)
+    return queryset.values_list("charge_point_id", *CONNECTOR_FIELDS)
+
+
+def _project(rows: list, connector_rows: list, fieldset) -> list[dict]:
+    scalar = [(name, _CONVERTERS.get(name)) for name in fieldset if name != "connectors"]
+
+    connectors: dict[int, list[dict]] | None = None
+    if "connectors" in fieldset:
+        connectors = {row["id"]: [] for row in rows}
+        for cp_id, pk, evse_number, deleted_at in connector_rows:
+            connectors[cp_id].append(
+                {"id": pk, "evse_number": evse_number, "deleted_at": format_datetime(deleted_at)}
+            )
+
+    items = []
+    for row in rows:
+        item = {name: convert(row[name]) if convert else row[name] for name, convert in scalar}
+        if connectors is not None:
+            item["connectors"] = connectors[row["id"]]
+        items.append(item)
+    return items
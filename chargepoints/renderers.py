@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from rest_framework.renderers import JSONRenderer
+
+try:  # dependencia opcional
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+# Fechas y dataclasses sin convertir se delegan en el encoder de DRF (formato propio).
+_ORJSON_OPTIONS = (
+    (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS) if orjson else 0
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` que codifica con `orjson` cuando está instalado.
+
+    La salida es idéntica byte a byte a la de `JSONRenderer` con la configuración por
+    defecto de DRF (compacta, UTF-8 sin escapar, `\\u2028`/`\\u2029` escapados). Se
+    delega en `JSONRenderer` cuando no hay `orjson`, cuando se pide indentación
+    (API navegable, `; indent=`) o cuando los datos contienen tipos que `orjson` no
+    codifica igual (cadenas perezosas, fechas, claves no string, `Decimal`...).
+    Única diferencia: un float NaN/Infinity sale como `null` en lugar de error.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if (
+            orjson is None
+            or not (self.compact and self.strict and not self.ensure_ascii)
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, option=_ORJSON_OPTIONS)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    """
+    Un documento JSON por línea (`application/x-ndjson`). Las exportaciones devuelven
+    un `StreamingHttpResponse` y no pasan por `render`; este solo se usa para las
+    respuestas de error (un único objeto JSON).
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        ret = super().render(data, accepted_media_type, renderer_context)
+        return ret + b"\n" if ret else ret
+
+
+class CSVRenderer(FastJSONRenderer):
+    """
+    `text/csv` para las exportaciones (que se emiten en streaming). Los errores se
+    devuelven con el envelope JSON habitual.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
@@ -0,0 +1,268 @@
+"""
+Réplicas de lectura con "read-your-writes".
+
+`ReplicaRouter` (en `DATABASE_ROUTERS`) envía a una réplica solo las lecturas seguras
+marcadas con `replica_reads()`: list/retrieve/summary/history de `ChargePointViewSet`
+(también las vistas async) y el changelist del admin. Todo lo demás va al primario:
+
+- escrituras (`db_for_write`) y lecturas fuera de `replica_reads()`;
+- lecturas dentro de `transaction.atomic` sobre el primario;
+- modelos de apps fuera de `APPS` (sesiones, auth, contenttypes...);
+- lecturas posteriores a una escritura en la misma petición;
+- peticiones de un cliente que ha escrito hace menos de `STICKY_SECONDS`.
+
+La "pegajosidad" la gestiona `ReadYourWritesMiddleware`: tras una petición que escribe
+en el primario responde con la cookie `COOKIE` y la cabecera `HEADER` (instante Unix
+hasta el que leer del primario). Los navegadores devuelven la cookie solos; los
+clientes de la API sin cookies reenvían la cabecera en sus peticiones.
+
+La réplica se elige una vez por petición (todas sus consultas ven la misma réplica):
+aleatoria según `WEIGHT` (`SELECTION="weighted"`) o la de menor retraso
+(`SELECTION="least_lag"`). Con `MAX_LAG_SECONDS` se descartan las réplicas más
+retrasadas; si no queda ninguna, se lee del primario.
+
+Sin réplicas configuradas (`REPLICAS` vacío, por defecto) el router no opina y el
+middleware no se instala: todo va a `default`, como siempre.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.dispatch import receiver
+
+DEFAULTS = {
+    "PRIMARY": DEFAULT_DB_ALIAS,
+    "REPLICAS": {},  # alias de DATABASES -> peso
+    "SELECTION": "weighted",  # "weighted" | "least_lag"
+    "MAX_LAG_SECONDS": None,  # descarta réplicas más retrasadas (None: sin límite)
+    "LAG_CACHE_SECONDS": 1.0,  # cada proceso mide el retraso como mucho una vez por intervalo
+    "STICKY_SECONDS": 5.0,  # lecturas al primario tras escribir
+    "COOKIE": "cp_primary_until",
+    "HEADER": "X-Primary-Until",
+    "APPS": ["chargepoints"],  # apps cuyas lecturas pueden ir a réplicas
+}
+
+# Retraso de una réplica PostgreSQL en segundos (0 si ha aplicado todo lo recibido).
+PG_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+def get_options() -> dict:
+    return {**DEFAULTS, **getattr(settings, "CHARGEPOINTS_REPLICAS", {})}
+
+
+@dataclass
+class RoutingState:
+    """Estado de enrutado de una petición."""
+
+    pinned: bool = False  # el cliente escribió hace poco: todo al primario
+    wrote: bool = False  # esta petición ha escrito en el primario
+    replicas: bool = False  # dentro de `replica_reads()`
+    replica: str | None = None  # réplica elegida (una por petición)
+
+
+_state: ContextVar[RoutingState | None] = ContextVar("chargepoints_routing", default=None)
+
+
+@contextmanager
+def replica_reads(enabled: bool = True):
+    """Marca las lecturas del bloque como seguras para leer de una réplica."""
+    state = _state.get()
+    token = None
+    if state is None:  # sin middleware (p. ej. réplicas sin pegajosidad, tests)
+        state = RoutingState()
+        token = _state.set(state)
+    previous, state.replicas = state.replicas, enabled
+    try:
+        yield
+    finally:
+        state.replicas = previous
+        if token is not None:
+            _state.reset(token)
+
+
+# ---------------------------------------------------------------------
+# Selección de réplica
+# ---------------------------------------------------------------------
+
+_lag_cache: dict[str, tuple[float, float | None]] = {}
+
+
+def replica_lag(alias: str, ttl: float = 1.0) -> float | None:
+    """Retraso de la réplica en segundos (`None` si no responde). Cacheado `ttl` s."""
+    now = time.monotonic()
+    cached = _lag_cache.get(alias)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    connection = connections[alias]
+    lag = 0.0
+    if connection.vendor == "postgresql":
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(PG_LAG_SQL)
+                lag = float(cursor.fetchone()[0])
+        except DatabaseError:
+            lag = None
+    _lag_cache[alias] = (now + ttl, lag)
+    return lag
+
+
+def choose_replica(options: dict) -> str | None:
+    """Réplica para una petición según `SELECTION`; `None` si ninguna es elegible."""
+    replicas = {alias: weight for alias, weight in options["REPLICAS"].items() if weight > 0}
+    max_lag = options["MAX_LAG_SECONDS"]
+    if options["SELECTION"] == "least_lag" or max_lag is not None:
+        lags = {alias: replica_lag(alias, options["LAG_CACHE_SECONDS"]) for alias in replicas}
+        lags = {
+            alias: lag
+            for alias, lag in lags.items()
+            if lag is not None and (max_lag is None or lag <= max_lag)
+        }
+        if options["SELECTION"] == "least_lag":
+            return min(lags, key=lags.get) if lags else None
+        replicas = {alias: replicas[alias] for alias in lags}
+    if not replicas:
+        return None
+    return random.choices(list(replicas), weights=list(replicas.values()))[0]
+
+
+# ---------------------------------------------------------------------
+# Router
+# ---------------------------------------------------------------------
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        options = get_options()
+        if not options["REPLICAS"]:
+            return None
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db  # relaciones de un objeto: su misma base
+
+        primary = options["PRIMARY"]
+        state = _state.get()
+        if (
+            state is None
+            or not state.replicas
+            or state.pinned
+            or state.wrote
+            or model._meta.app_label not in options["APPS"]
+            or connections[primary].in_atomic_block
+        ):
+            return primary
+        if state.replica is None:
+            state.replica = choose_replica(options) or primary
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        options = get_options()
+        if not options["REPLICAS"]:
+            return None
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return options["PRIMARY"]
+
+    def allow_relation(self, obj1, obj2, **hints):
+        options = get_options()
+        databases = {options["PRIMARY"], *options["REPLICAS"]}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+# ---------------------------------------------------------------------
+# Read-your-writes
+# ---------------------------------------------------------------------
+
+
+class ReadYourWritesMiddleware:
+    """
+    Crea el `RoutingState` de cada petición: fija las lecturas al primario si el cliente
+    escribió hace menos de `STICKY_SECONDS` (cookie o cabecera) y, si la petición
+    escribe, devuelve la cookie y la cabecera con el nuevo plazo. Síncrono y async:
+    no obliga a adaptar las vistas async bajo ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        options = get_options()
+        if not options["REPLICAS"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.window = float(options["STICKY_SECONDS"])
+        self.cookie = options["COOKIE"]
+        self.header = options["HEADER"]
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state = RoutingState(pinned=self._pinned(request))
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self._finish(request, response, state)
+
+    async def __acall__(self, request):
+        state = RoutingState(pinned=self._pinned(request))
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self._finish(request, response, state)
+
+    def _pinned(self, request) -> bool:
+        for value in (request.headers.get(self.header), request.COOKIES.get(self.cookie)):
+            try:
+                until = float(value)
+            except (TypeError, ValueError):
+                continue
+            # Un plazo más allá de la ventana no lo ha emitido este servidor: se ignora.
+            now = time.time()
+            if now < until <= now + self.window:
+                return True
+        return False
+
+    def _finish(self, request, response, state: RoutingState):
+        if state.wrote and self.window > 0:
+            until = f"{time.time() + self.window:.3f}"
+            response[self.header] = until
+            response.set_cookie(
+                self.cookie,
+                until,
+                max_age=self.window,
+                httponly=True,
+                samesite="Lax",
+                secure=request.is_secure(),
+            )
+        return response
+
+
+@receiver(setting_changed)
+def _reset_lag_cache(setting, **kwargs):
+    if setting in {"CHARGEPOINTS_REPLICAS", "DATABASES"}:
+        _lag_cache.clear()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from functools import reduce
+from operator import add, and_, or_
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Greatest, Upper
+from django.utils.module_loading import import_string
+from rest_framework.filters import SearchFilter
+
+RANK_ANNOTATION = "search_rank"
+
+
+class BaseSearchBackend:
+    """
+    Backend de búsqueda para el parámetro `search`.
+
+    Un backend recibe el queryset, los campos (`search_fields`) y los términos ya
+    separados, y devuelve el queryset filtrado y anotado con `search_rank`
+    (mayor es más relevante). Cada término debe coincidir en al menos un campo,
+    igual que `SearchFilter` de DRF.
+    """
+
+    #: Bonificación para coincidencias por prefijo (lo que teclean los operadores).
+    prefix_boost = 1.0
+
+    def search(self, queryset, fields: list[str], terms: list[str]):
+        conditions = [reduce(or_, (self.match(field, term) for field in fields)) for term in terms]
+        rank = reduce(add, (self.rank(fields, term) for term in terms))
+        return queryset.filter(reduce(and_, conditions)).annotate(**{RANK_ANNOTATION: rank})
+
+    def match(self, field: str, term: str) -> Q:
+        return Q(**{f"{field}__icontains": term})
+
+    def rank(self, fields: list[str], term: str):
+        prefix = reduce(or_, (Q(**{f"{field}__istartswith": term}) for field in fields))
+        return Case(
+            When(prefix, then=Value(self.prefix_boost)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+
+
+class IContainsSearchBackend(BaseSearchBackend):
+    """
+    Comportamiento clásico (`UPPER(campo) LIKE '%x%'`), válido en cualquier base de datos.
+    El ranking solo distingue coincidencias por prefijo.
+    """
+
+
+class TrigramSearchBackend(BaseSearchBackend):
+    """
+    Búsqueda con `pg_trgm` (solo PostgreSQL).
+
+    Coincide por subcadena (`LIKE`) o por similitud (`%`), ambas servidas por los
+    índices GIN `gin_trgm_ops` sobre `UPPER(campo)` de la migración 0003, y ordena
+    por similitud más la bonificación de prefijo.
+    """
+
+    def match(self, field: str, term: str) -> Q:
+        from django.contrib.postgres.lookups import TrigramSimilar
+
+        return super().match(field, term) | Q(TrigramSimilar(Upper(field), Value(term.upper())))
+
+    def rank(self, fields: list[str], term: str):
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        similarities = [TrigramSimilarity(Upper(F(field)), Value(term.upper())) for field in fields]
+        similarity = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+        return similarity + super().rank(fields, term)
+
+
+def get_search_backend(using: str = "default") -> BaseSearchBackend:
+    """
+    Devuelve el backend configurado en `CHARGEPOINTS_SEARCH_BACKEND`.
+
+    - `"auto"` (por defecto): trigramas en PostgreSQL, `icontains` en el resto.
+    - Ruta importable a una subclase de `BaseSearchBackend`.
+    """
+    path = getattr(settings, "CHARGEPOINTS_SEARCH_BACKEND", "auto")
+    if path == "auto":
+        if connections[using].vendor == "postgresql":
+            return TrigramSearchBackend()
+        return IContainsSearchBackend()
+    return import_string(path)()
+
+
+def search_queryset(queryset, search_fields, terms):
+    """
+    Aplica el backend de búsqueda y ordena por relevancia, manteniendo la ordenación
+    previa del queryset como desempate.
+    """
+    fields = [str(f).lstrip("^=@$") for f in search_fields]
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    queryset = get_search_backend(queryset.db).search(queryset, fields, terms)
+    return queryset.order_by(f"-{RANK_ANNOTATION}", *ordering)
+
+
+class RankedSearchFilter(SearchFilter):
+    """
+    `SearchFilter` que delega en el backend de búsqueda configurado y devuelve los
+    resultados ordenados por relevancia. Un `?ordering=` explícito sigue teniendo
+    prioridad porque `OrderingFilter` se aplica después.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not search_terms:
+            return queryset
+        return search_queryset(queryset, search_fields, search_terms)
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
 from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.validators import UniqueValidator
 
-from .models import ChargePoint, Connector
+from .models import (
+    ArchivedChargePoint,
+    ArchivedConnector,
+    ChargePoint,
+    ChargePointStatusEvent,
+    Connector,
+)
 
 
 class ConnectorNestedSerializer(serializers.ModelSerializer):
@@ -26,21 +34,86 @@ class ConnectorNestedSerializer(serializers.ModelSerializer):
         }
 
 
-class ChargePointSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """
+    Selección de campos de la respuesta (sparse fieldsets).
+
+    - `?fields=id,status`: solo esos campos.
+    - `?expand=connectors`: añade un campo expandible (útil junto a `fields`).
+    - `?omit=connectors`: quita campos de la selección.
+
+    Sin parámetros se devuelven todos los campos, como hasta ahora. El orden de las
+    claves es siempre el de `Meta.fields`.
+    """
+
+    fields_query_param = "fields"
+    expand_query_param = "expand"
+    omit_query_param = "omit"
+    expandable_fields: tuple[str, ...] = ()
+
+    def __init__(self, *args, fieldset=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fieldset is not None:
+            for name in set(self.fields) - set(fieldset):
+                self.fields.pop(name)
+
+    @classmethod
+    def get_fieldset(cls, query_params) -> tuple[str, ...] | None:
+        """
+        Devuelve los campos pedidos (en el orden de `Meta.fields`) o `None` si la
+        petición no restringe nada. Lanza `ValidationError` con nombres desconocidos.
+        """
+        params = {
+            param: names
+            for param in (cls.fields_query_param, cls.expand_query_param, cls.omit_query_param)
+            if (names := cls._split(query_params.get(param)))
+        }
+        if not params:
+            return None
+
+        available = tuple(cls.Meta.fields)
+        allowed = {
+            cls.fields_query_param: set(available),
+            cls.expand_query_param: set(cls.expandable_fields),
+            cls.omit_query_param: set(available),
+        }
+        errors = {
+            param: [f"Campo desconocido: {name}." for name in names if name not in allowed[param]]
+            for param, names in params.items()
+        }
+        errors = {param: messages for param, messages in errors.items() if messages}
+        if errors:
+            raise ValidationError(errors)
+
+        selected = set(params.get(cls.fields_query_param, available))
+        selected |= set(params.get(cls.expand_query_param, ()))
+        selected -= set(params.get(cls.omit_query_param, ()))
+        return tuple(name for name in available if name in selected)
+
+    @staticmethod
+    def _split(value: str | None) -> list[str]:
+        return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+class ChargePointSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer principal para el modelo `ChargePoint`.
     Incluye una representación anidada y de solo lectura de los conectores asociados.
+    Admite selección de campos (`fieldset`, ver `SparseFieldsetMixin`).
 
     """
 
+    expandable_fields = ("connectors",)
+
     connectors = ConnectorNestedSerializer(many=True, read_only=True)
 
     class Meta:
         model = ChargePoint
-        fields = ["id", "name", "status", "created_at", "connectors"]
+        fields = ["id", "name", "status", "created_at", "connector_count", "connectors"]
         extra_kwargs = {
             "id": {"read_only": True},
             "created_at": {"read_only": True},
+            "connector_count": {"read_only": True},
             "connectors": {"read_only": True},
         }
 
@@ -73,6 +146,115 @@ class ChargePointSerializer(serializers.ModelSerializer):
         return value
 
 
+class StatusEventSerializer(serializers.ModelSerializer):
+    """Evento del historial de estados: GET /api/v1/chargepoint/{id}/history."""
+
+    class Meta:
+        model = ChargePointStatusEvent
+        fields = ["id", "status", "previous_status", "occurred_at"]
+        read_only_fields = fields
+
+
+# ---------------------------------------------------------------------
+# Archivo: GET /api/v1/chargepoint/archived/{id}
+# ---------------------------------------------------------------------
+
+
+class ArchivedConnectorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedConnector
+        fields = [
+            "id",
+            "evse_number",
+            "created_at",
+            "updated_at",
+            "deleted_at",
+            "deletion_batch",
+            "archived_at",
+        ]
+        read_only_fields = fields
+
+
+class ArchivedChargePointSerializer(serializers.ModelSerializer):
+    """ChargePoint archivado (ver `chargepoints.archive`) con sus conectores archivados."""
+
+    connectors = ArchivedConnectorSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ArchivedChargePoint
+        fields = [
+            "id",
+            "name",
+            "status",
+            "created_at",
+            "updated_at",
+            "deleted_at",
+            "deletion_batch",
+            "archived_at",
+            "connectors",
+        ]
+        read_only_fields = fields
+
+
+# ---------------------------------------------------------------------
+# Operaciones por lotes: POST /api/v1/chargepoint/batch
+# ---------------------------------------------------------------------
+
+
+class BatchChargePointSerializer(ChargePointSerializer):
+    """
+    Variante de `ChargePointSerializer` para lotes.
+
+    Elimina el `UniqueValidator` de `name` (un SELECT por elemento): la unicidad se
+    comprueba para todo el lote con una sola consulta en `chargepoints.batch`.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        name = fields["name"]
+        name.validators = [v for v in name.validators if not isinstance(v, UniqueValidator)]
+        return fields
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    OP_CREATE = "create"
+    OP_UPDATE = "update"
+    OP_DELETE = "delete"
+
+    op = serializers.ChoiceField(choices=[OP_CREATE, OP_UPDATE, OP_DELETE])
+    id = serializers.IntegerField(required=False, min_value=1)
+    data = serializers.DictField(required=False)
+
+    def validate(self, attrs):
+        op = attrs["op"]
+        if op in {self.OP_UPDATE, self.OP_DELETE} and "id" not in attrs:
+            raise serializers.ValidationError({"id": "Obligatorio para update/delete."})
+        if op in {self.OP_CREATE, self.OP_UPDATE} and "data" not in attrs:
+            raise serializers.ValidationError({"data": "Obligatorio para create/update."})
+        return attrs
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    MODE_ATOMIC = "atomic"
+    MODE_BEST_EFFORT = "best_effort"
+    MAX_OPERATIONS = 1000
+
+    mode = serializers.ChoiceField(
+        choices=[MODE_ATOMIC, MODE_BEST_EFFORT], default=MODE_ATOMIC, required=False
+    )
+    operations = serializers.ListField(
+        child=BatchOperationSerializer(), allow_empty=False, max_length=MAX_OPERATIONS
+    )
+
+
+class BatchItemResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    op = serializers.CharField()
+    status = serializers.IntegerField()
+    data = ChargePointSerializer(allow_null=True)
+    errors = serializers.DictField(allow_null=True)
+
+
 # ---------------------------------------------------------------------
 # Solo para la documentacion de OpenAPI con drf-spectacular)
 # Serializers de envelope para reflejar tu respuesta estándar:
@@ -82,6 +264,7 @@ class ChargePointSerializer(serializers.ModelSerializer):
 
 class PaginationSerializer(serializers.Serializer):
     count = serializers.IntegerField()
+    count_is_exact = serializers.BooleanField()
     next = serializers.CharField(allow_null=True)
     previous = serializers.CharField(allow_null=True)
     results = ChargePointSerializer(many=True)
@@ -99,3 +282,47 @@ class EnvelopeListSerializer(serializers.Serializer):
     message = serializers.CharField()
     data = PaginationSerializer()
     errors = serializers.DictField(allow_null=True)
+
+
+class BatchResultSerializer(serializers.Serializer):
+    mode = serializers.CharField()
+    results = BatchItemResultSerializer(many=True)
+
+
+class EnvelopeBatchSerializer(serializers.Serializer):
+    code = serializers.IntegerField()
+    message = serializers.CharField()
+    data = BatchResultSerializer()
+    errors = serializers.DictField(allow_null=True)
+
+
+class SummarySerializer(serializers.Serializer):
+    total = serializers.IntegerField()
+    by_status = serializers.DictField(child=serializers.IntegerField())
+
+
+class EnvelopeSummarySerializer(serializers.Serializer):
+    code = serializers.IntegerField()
+    message = serializers.CharField()
+    data = SummarySerializer()
+    errors = serializers.DictField(allow_null=True)
+
+
+class HistoryPageSerializer(serializers.Serializer):
+    next = serializers.CharField(allow_null=True)
+    previous = serializers.CharField(allow_null=True)
+    results = StatusEventSerializer(many=True)
+
+
+class EnvelopeHistorySerializer(serializers.Serializer):
+    code = serializers.IntegerField()
+    message = serializers.CharField()
+    data = HistoryPageSerializer()
+    errors = serializers.DictField(allow_null=True)
+
+
+class EnvelopeArchivedSerializer(serializers.Serializer):
+    code = serializers.IntegerField()
+    message = serializers.CharField()
+    data = ArchivedChargePointSerializer()
+    errors = serializers.DictField(allow_null=True)
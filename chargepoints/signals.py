@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from django.db import models
+from django.dispatch import Signal
+
+# Se emite en TODOS los caminos de escritura de los modelos con soft delete:
+# save()/delete()/hard_delete() de instancia y update()/delete()/hard_delete()/
+# bulk_create()/bulk_update() de queryset (que no disparan post_save/post_delete).
+#   sender: la clase del modelo afectado.
+#   using:  alias de la base de datos.
+data_changed = Signal()
+
+# Cambios por fila de los modelos con contadores (`CountedModel`): lo emiten las
+# escrituras que tocan el campo contado, los campos observados o `deleted_at`.
+#   sender:  la clase del modelo.
+#   using:   alias de la base de datos.
+#   changes: lista de `(pk, antes, después)`; `antes`/`después` son `(clave, deleted_at)`
+#            o `None` si la fila no existía / ya no existe.
+rows_changed = Signal()
+
+
+def send_data_changed(model, using: str, cascade: bool = False) -> None:
+    """
+    Notifica un cambio en `model`. Con `cascade=True` notifica también a los modelos
+    relacionados con `on_delete=CASCADE` (borrados físicos).
+    """
+    data_changed.send(sender=model, using=using)
+    if cascade:
+        for rel in model._meta.related_objects:
+            if rel.on_delete is models.CASCADE:
+                data_changed.send(sender=rel.related_model, using=using)
@@ -0,0 +1,440 @@
+"""
+Eventos de ChargePoint en tiempo real (`/api/v1/chargepoint/stream`, Server-Sent Events).
+
+Flujo:
+
+1. Cada escritura de ChargePoint emite `rows_changed` con los cambios por fila; aquí se
+   traducen a eventos `created` / `updated` / `status_changed` / `deleted` y se publican
+   al confirmar la transacción (`on_commit`: un rollback no emite nada).
+2. El backend los reparte: `local` solo dentro del proceso; `postgres` con
+   `NOTIFY`/`LISTEN`, de modo que todos los workers reciben los eventos de todos.
+3. El `Broker` del proceso los entrega a sus suscriptores: una cola acotada por cliente
+   en el event loop de la petición. Un cliente que no consume a tiempo (cola llena) se
+   desconecta con un evento `evicted` en lugar de retener memoria o frenar al resto.
+
+Un suscriptor inactivo es una tarea asyncio esperando en su cola (sin hilo ni conexión a
+la base de datos), así que un worker ASGI mantiene miles de ellos. Requiere servidor ASGI
+(uvicorn, daphne...): con WSGI cada suscriptor ocuparía un hilo.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from functools import partial
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.asgi import ASGIRequest
+from django.core.signals import setting_changed
+from django.db import connections, transaction
+from django.dispatch import receiver
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.utils.module_loading import import_string
+from django.views.decorators.http import require_GET
+
+from .metrics import STREAM_EVICTIONS, STREAM_SUBSCRIBERS
+from .models import ChargePoint
+from .signals import rows_changed
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "ENABLED": False,
+    "BACKEND": "local",  # "local" | "postgres" | ruta a una clase con la misma interfaz
+    "QUEUE_SIZE": 256,  # eventos pendientes por cliente antes de desconectarlo
+    "HEARTBEAT": 15.0,  # segundos entre comentarios keep-alive
+    "RETRY": 5000,  # milisegundos de reconexión sugeridos al cliente (campo `retry:`)
+    "CHANNEL": "chargepoint_events",  # canal de NOTIFY/LISTEN
+    "DATABASE": "default",  # alias de la conexión que escucha (backend postgres)
+}
+
+# Límite de NOTIFY en PostgreSQL: 8000 bytes por payload.
+NOTIFY_PAYLOAD_LIMIT = 7900
+
+
+def get_options() -> dict:
+    return {**DEFAULTS, **getattr(settings, "CHARGEPOINTS_STREAM", {})}
+
+
+# ---------------------------------------------------------------------
+# Eventos
+# ---------------------------------------------------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    type: str
+    id: int
+    status: str
+    previous_status: str | None = None
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        if self.previous_status is None:
+            del data["previous_status"]
+        return data
+
+    def encode(self) -> bytes:
+        """Mensaje SSE: `event: <tipo>` + `data: <json>`."""
+        data = json.dumps(self.as_dict(), separators=(",", ":"))
+        return f"event: {self.type}\ndata: {data}\n\n".encode()
+
+
+def events_from_changes(changes) -> list[Event]:
+    """
+    Eventos de una lista de `(pk, antes, después)` (ver `rows_changed`). Solo cuentan las
+    filas vivas: una restauración es un `created` y un soft delete, un `deleted`.
+    """
+    events = []
+    for pk, before, after in changes:
+        was_alive = before is not None and before[1] is None
+        is_alive = after is not None and after[1] is None
+        if is_alive and not was_alive:
+            events.append(Event("created", pk, after[0]))
+        elif was_alive and not is_alive:
+            events.append(Event("deleted", pk, before[0]))
+        elif is_alive and before[0] != after[0]:
+            events.append(Event("status_changed", pk, after[0], previous_status=before[0]))
+        elif is_alive:
+            events.append(Event("updated", pk, after[0]))
+    return events
+
+
+@receiver(rows_changed, sender=ChargePoint)
+def _publish_on_commit(sender, using, changes, **kwargs):
+    options = get_options()
+    if not options["ENABLED"]:
+        return
+    events = events_from_changes(changes)
+    if events:
+        # `robust`: un fallo al publicar no debe convertir en error una escritura ya
+        # confirmada.
+        transaction.on_commit(partial(get_backend().publish, events, using), using, robust=True)
+
+
+# ---------------------------------------------------------------------
+# Broker en proceso
+# ---------------------------------------------------------------------
+
+EVICTED = object()
+
+
+class Subscription:
+    """
+    Un cliente conectado: filtros y cola acotada, ligada al event loop de su petición.
+    `statuses` también acepta eventos cuyo estado *previo* coincide (un ChargePoint que
+    deja de estar `ready` interesa a quien sigue los `ready`).
+    """
+
+    def __init__(self, broker, loop, statuses: frozenset, ids: frozenset, maxsize: int):
+        self.broker = broker
+        self.loop = loop
+        self.statuses = statuses
+        self.ids = ids
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.evicted = False
+
+    def matches(self, event: Event) -> bool:
+        if self.ids and event.id not in self.ids:
+            return False
+        return not self.statuses or bool({event.status, event.previous_status} & self.statuses)
+
+    def offer(self, events: list[Event]) -> None:
+        """Encola en el loop del cliente; si no cabe, lo desaloja."""
+        if self.evicted:
+            return
+        for event in events:
+            try:
+                self.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._evict()
+                return
+
+    def _evict(self) -> None:
+        self.evicted = True
+        self.broker.unsubscribe(self)
+        STREAM_EVICTIONS.inc()
+        while not self.queue.empty():  # el consumidor ve EVICTED en su siguiente lectura
+            self.queue.get_nowait()
+        self.queue.put_nowait(EVICTED)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    """
+    Reparto de eventos a los suscriptores del proceso. `dispatch` es seguro desde
+    cualquier hilo (vistas síncronas, hilo LISTEN): agrupa por event loop y programa una
+    sola llamada por loop, que filtra y encola para cada suscriptor.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[asyncio.AbstractEventLoop, set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    def subscribe(self, statuses=(), ids=(), maxsize: int = DEFAULTS["QUEUE_SIZE"]):
+        loop = asyncio.get_running_loop()
+        sub = Subscription(self, loop, frozenset(statuses), frozenset(ids), maxsize)
+        with self._lock:
+            self._subscribers.setdefault(loop, set()).add(sub)
+        STREAM_SUBSCRIBERS.inc()
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subscribers.get(sub.loop)
+            if subs is None or sub not in subs:
+                return
+            subs.discard(sub)
+            if not subs:
+                del self._subscribers[sub.loop]
+        STREAM_SUBSCRIBERS.dec()
+
+    def dispatch(self, events: list[Event]) -> None:
+        with self._lock:
+            targets = [(loop, list(subs)) for loop, subs in self._subscribers.items()]
+        for loop, subs in targets:
+            try:
+                loop.call_soon_threadsafe(self._deliver, subs, events)
+            except RuntimeError:  # loop cerrado: sus suscriptores ya no existen
+                for sub in subs:
+                    self.unsubscribe(sub)
+
+    @staticmethod
+    def _deliver(subs: list[Subscription], events: list[Event]) -> None:
+        for sub in subs:
+            matched = [event for event in events if sub.matches(event)]
+            if matched:
+                sub.offer(matched)
+
+
+broker = Broker()
+
+
+# ---------------------------------------------------------------------
+# Backends (reparto entre procesos)
+# ---------------------------------------------------------------------
+
+
+class LocalBackend:
+    """Solo el proceso actual: válido con un único worker."""
+
+    def __init__(self, broker: Broker, options: dict):
+        self.broker = broker
+        self.options = options
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def publish(self, events: list[Event], using: str) -> None:
+        self.broker.dispatch(events)
+
+
+class PostgresBackend(LocalBackend):
+    """
+    `NOTIFY` en la conexión que escribe (al confirmar) y un hilo por proceso con una
+    conexión dedicada en `LISTEN` que entrega al broker local. El propio proceso también
+    recibe sus notificaciones, así que `publish` no reparte localmente. Requiere psycopg 3.
+    """
+
+    listen_timeout = 1.0  # segundos entre comprobaciones de parada
+    reconnect_delay = 1.0
+
+    def __init__(self, broker: Broker, options: dict):
+        super().__init__(broker, options)
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._mutex = threading.Lock()
+
+    def start(self) -> None:
+        with self._mutex:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._ready.clear()
+            self._thread = threading.Thread(
+                target=self._listen_forever, name="chargepoint-stream-listen", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.listen_timeout * 2)
+
+    def wait_ready(self, timeout: float) -> bool:
+        return self._ready.wait(timeout)
+
+    def publish(self, events: list[Event], using: str) -> None:
+        with connections[using].cursor() as cursor:
+            for payload in self._payloads(events):
+                cursor.execute("SELECT pg_notify(%s, %s)", [self.options["CHANNEL"], payload])
+
+    @staticmethod
+    def _payloads(events: list[Event]):
+        """JSON en trozos por debajo del límite de tamaño de NOTIFY."""
+        chunk, size = [], 2
+        for event in events:
+            item = json.dumps(event.as_dict(), separators=(",", ":"))
+            if chunk and size + len(item) + 1 > NOTIFY_PAYLOAD_LIMIT:
+                yield f"[{','.join(chunk)}]"
+                chunk, size = [], 2
+            chunk.append(item)
+            size += len(item) + 1
+        if chunk:
+            yield f"[{','.join(chunk)}]"
+
+    def _connect(self):
+        from psycopg import sql
+
+        wrapper = connections[self.options["DATABASE"]]
+        if wrapper.vendor != "postgresql":
+            raise ImproperlyConfigured("El backend 'postgres' del stream requiere PostgreSQL.")
+        raw = wrapper.get_new_connection(wrapper.get_connection_params())
+        if not hasattr(raw, "notifies"):
+            raise ImproperlyConfigured("El backend 'postgres' del stream requiere psycopg 3.")
+        raw.autocommit = True
+        raw.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.options["CHANNEL"])))
+        return raw
+
+    def _listen_forever(self) -> None:
+        while not self._stop.is_set():
+            try:
+                raw = self._connect()
+            except ImproperlyConfigured:
+                logger.exception("Stream: backend postgres mal configurado.")
+                return
+            except Exception:
+                logger.warning("Stream: no se pudo conectar para LISTEN.", exc_info=True)
+                self._stop.wait(self.reconnect_delay)
+                continue
+            self._ready.set()
+            try:
+                while not self._stop.is_set():
+                    for notify in raw.notifies(timeout=self.listen_timeout):
+                        self.broker.dispatch([Event(**e) for e in json.loads(notify.payload)])
+            except Exception:
+                logger.warning("Stream: conexión LISTEN perdida; reconectando.", exc_info=True)
+                self._stop.wait(self.reconnect_delay)
+            finally:
+                self._ready.clear()
+                raw.close()
+
+
+BACKENDS = {"local": LocalBackend, "postgres": PostgresBackend}
+
+_backend: LocalBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> LocalBackend:
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            options = get_options()
+            name = options["BACKEND"]
+            backend_class = BACKENDS.get(name) or import_string(name)
+            _backend = backend_class(broker, options)
+        return _backend
+
+
+@receiver(setting_changed)
+def _reset_backend(setting, **kwargs):
+    global _backend
+    if setting == "CHARGEPOINTS_STREAM":
+        with _backend_lock:
+            if _backend is not None:
+                _backend.stop()
+            _backend = None
+
+
+# ---------------------------------------------------------------------
+# Vista SSE
+# ---------------------------------------------------------------------
+
+
+def _csv_param(request, name: str) -> list[str]:
+    raw = request.GET.get(name, "")
+    return [value.strip() for value in raw.split(",") if value.strip()]
+
+
+def _error(code: int, message: str, errors: dict) -> JsonResponse:
+    return JsonResponse(
+        {"code": code, "message": message, "data": None, "errors": errors}, status=code
+    )
+
+
+async def _event_stream(options: dict, statuses: list[str], ids: list[int]):
+    # La suscripción se abre al empezar a enviar y se cierra al terminar el generador
+    # (desconexión del cliente, desalojo o cierre del servidor).
+    sub = broker.subscribe(statuses, ids, maxsize=options["QUEUE_SIZE"])
+    heartbeat = options["HEARTBEAT"]
+    try:
+        yield f"retry: {options['RETRY']}\n: connected\n\n".encode()
+        while True:
+            try:
+                item = await asyncio.wait_for(sub.get(), heartbeat)
+            except TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            if item is EVICTED:
+                yield b'event: evicted\ndata: {"reason":"slow_consumer"}\n\n'
+                return
+            yield item.encode()
+    finally:
+        sub.close()
+
+
+@require_GET
+async def stream_view(request):
+    """
+    `GET /api/v1/chargepoint/stream[?status=ready,error][&id=1,2]` como
+    `text/event-stream`. Sin filtros recibe todos los eventos de ChargePoint.
+
+    Bajo WSGI responde 501: Django consumiría el stream async desde un hilo del worker
+    durante toda la conexión.
+    """
+    options = get_options()
+    if not options["ENABLED"]:
+        raise Http404
+    if not isinstance(request, ASGIRequest):
+        return _error(
+            501, "Not Implemented", {"detail": "El stream de eventos requiere un servidor ASGI."}
+        )
+
+    statuses = _csv_param(request, "status")
+    unknown = sorted(set(statuses) - set(ChargePoint.Status.values))
+    if unknown:
+        return _error(
+            400, "Bad Request", {"status": [f"Estado desconocido: {', '.join(unknown)}."]}
+        )
+    try:
+        ids = [int(value) for value in _csv_param(request, "id")]
+    except ValueError:
+        return _error(
+            400, "Bad Request", {"id": ["Debe ser una lista de enteros separados por comas."]}
+        )
+
+    get_backend().start()
+    response = StreamingHttpResponse(
+        _event_stream(options, statuses, ids), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: no acumular el stream
+    return response
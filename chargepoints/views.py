@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, StreamingHttpResponse
+from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
     OpenApiExample,
@@ -7,12 +12,105 @@ from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
 )
-from rest_framework import mixins, status, viewsets
-from rest_framework.permissions import AllowAny
+from rest_framework import mixins, serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import SAFE_METHODS, AllowAny
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 
-from .models import ChargePoint
-from .serializers import ChargePointSerializer
+from . import conditional, counters, instrumentation, routing
+from .batch import apply_batch
+from .cache import get_response_cache
+from .export import DEFAULT_CHUNK_SIZE, aiter_stream, csv_stream, iter_chunks, ndjson_stream
+from .filters import ChargePointFilter
+from .models import ArchivedChargePoint, ChargePoint, ChargePointStatusEvent, Connector
+from .pagination import ChargePointPagination, StatusHistoryPagination
+from .projections import (
+    aproject_chargepoints,
+    chargepoint_rows,
+    fast_read_path_enabled,
+    load_columns,
+    project_chargepoints,
+)
+from .renderers import CSVRenderer, FastJSONRenderer, NDJSONRenderer
+from .search import RankedSearchFilter
+from .serializers import (
+    ArchivedChargePointSerializer,
+    BatchRequestSerializer,
+    ChargePointSerializer,
+    EnvelopeArchivedSerializer,
+    EnvelopeBatchSerializer,
+    EnvelopeHistorySerializer,
+    EnvelopeSummarySerializer,
+    StatusEventSerializer,
+)
+
+FILTER_PARAMETERS = [
+    OpenApiParameter(
+        name="status",
+        location=OpenApiParameter.QUERY,
+        type=OpenApiTypes.STR,
+        description="Filtra por estado (ready|charging|waiting|error)",
+    ),
+    OpenApiParameter(
+        name="min_connectors",
+        location=OpenApiParameter.QUERY,
+        type=OpenApiTypes.INT,
+        description="Solo ChargePoints con al menos N conectores activos",
+    ),
+    OpenApiParameter(
+        name="max_connectors",
+        location=OpenApiParameter.QUERY,
+        type=OpenApiTypes.INT,
+        description="Solo ChargePoints con como mucho N conectores activos",
+    ),
+    OpenApiParameter(
+        name="search",
+        location=OpenApiParameter.QUERY,
+        type=OpenApiTypes.STR,
+        description=(
+            "Búsqueda por nombre ordenada por relevancia "
+            "(trigramas en PostgreSQL, icontains en otros motores)"
+        ),
+    ),
+    OpenApiParameter(
+        name="ordering",
+        location=OpenApiParameter.QUERY,
+        type=OpenApiTypes.STR,
+        description=(
+            "Campos de ordenación: name, created_at, connector_count (usa '-' para descendente)"
+        ),
+    ),
+]
+
+FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        name="fields",
+        location=OpenApiParameter.QUERY,
+        type=OpenApiTypes.STR,
+        description=(
+            "Campos a devolver separados por comas "
+            "(id,name,status,created_at,connector_count,connectors). "
+            "Reduce también las columnas leídas; sin `connectors` no se consultan los conectores."
+        ),
+    ),
+    OpenApiParameter(
+        name="expand",
+        location=OpenApiParameter.QUERY,
+        type=OpenApiTypes.STR,
+        enum=["connectors"],
+        description="Añade los conectores a una selección hecha con `fields`.",
+    ),
+    OpenApiParameter(
+        name="omit",
+        location=OpenApiParameter.QUERY,
+        type=OpenApiTypes.STR,
+        description="Campos a excluir separados por comas (p. ej. `omit=connectors`).",
+    ),
+]
 
 
 @extend_schema_view(
@@ -21,30 +119,23 @@ from .serializers import ChargePointSerializer
         description=("Lista de ChargePoints activos"),
         tags=["chargepoints"],
         parameters=[
+            *FILTER_PARAMETERS,
             OpenApiParameter(
-                name="status",
-                location=OpenApiParameter.QUERY,
-                type=OpenApiTypes.STR,
-                description="Filtra por estado (ready|charging|waiting|error)",
-            ),
-            OpenApiParameter(
-                name="search",
+                name="page",
                 location=OpenApiParameter.QUERY,
-                type=OpenApiTypes.STR,
-                description="Búsqueda por nombre (icontains)",
+                type=OpenApiTypes.INT,
+                description="Número de página (PageNumberPagination)",
             ),
             OpenApiParameter(
-                name="ordering",
+                name="cursor",
                 location=OpenApiParameter.QUERY,
                 type=OpenApiTypes.STR,
-                description="Campos de ordenación: name, created_at (usa '-' para descendente)",
-            ),
-            OpenApiParameter(
-                name="page",
-                location=OpenApiParameter.QUERY,
-                type=OpenApiTypes.INT,
-                description="Número de página (PageNumberPagination)",
+                description=(
+                    "Activa la paginación keyset (sin COUNT ni OFFSET). "
+                    "Vacío para la primera página; después usar los enlaces next/previous."
+                ),
             ),
+            *FIELDSET_PARAMETERS,
         ],
         responses=ChargePointSerializer,
         examples=[
@@ -55,6 +146,7 @@ from .serializers import ChargePointSerializer
                     "name": "CP-001",
                     "status": "ready",
                     "created_at": "2025-01-01T00:00:00Z",
+                    "connector_count": 0,
                     "connectors": [],
                 },
             )
@@ -64,6 +156,7 @@ from .serializers import ChargePointSerializer
         operation_id="chargepoints.retrieve",
         description="Detalle de un ChargePoint.",
         tags=["chargepoints"],
+        parameters=FIELDSET_PARAMETERS,
         responses=ChargePointSerializer,
     ),
     create=extend_schema(
@@ -89,10 +182,128 @@ from .serializers import ChargePointSerializer
     ),
     destroy=extend_schema(
         operation_id="chargepoints.destroy",
-        description="Soft delete (204 sin cuerpo).",
+        description=(
+            "Soft delete (204 sin cuerpo). Sus conectores vivos se borran (soft) en la "
+            "misma operación."
+        ),
         tags=["chargepoints"],
         responses={204: None},
     ),
+    export=extend_schema(
+        operation_id="chargepoints.export",
+        description=(
+            "Exporta todos los ChargePoints activos en streaming (NDJSON o CSV), con los "
+            "mismos filtros que el listado y sin paginación. Memoria constante: cursor de "
+            "servidor y conectores cargados por bloques. En CSV, `connectors` contiene los "
+            "`evse_number` separados por `|`."
+        ),
+        tags=["chargepoints"],
+        parameters=[
+            OpenApiParameter(
+                name="format",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+                enum=["ndjson", "csv"],
+                description="Formato de salida (por defecto ndjson; también vía cabecera Accept).",
+            ),
+            *FILTER_PARAMETERS,
+            *FIELDSET_PARAMETERS,
+        ],
+        responses={
+            (200, NDJSONRenderer.media_type): OpenApiTypes.STR,
+            (200, CSVRenderer.media_type): OpenApiTypes.STR,
+        },
+    ),
+    summary=extend_schema(
+        operation_id="chargepoints.summary",
+        description=(
+            "Número de ChargePoints activos por estado y total. Se lee de contadores "
+            "mantenidos en cada escritura (coste constante, sin recorrer la tabla)."
+        ),
+        tags=["chargepoints"],
+        responses={200: EnvelopeSummarySerializer},
+        examples=[
+            OpenApiExample(
+                "Resumen",
+                response_only=True,
+                value={
+                    "code": 200,
+                    "message": "OK",
+                    "data": {
+                        "total": 10,
+                        "by_status": {"ready": 6, "charging": 2, "waiting": 1, "error": 1},
+                    },
+                    "errors": None,
+                },
+            )
+        ],
+    ),
+    history=extend_schema(
+        operation_id="chargepoints.history",
+        description=(
+            "Historial de estados del ChargePoint (alta y cambios de `status`), del más "
+            "reciente al más antiguo, con paginación por cursor. `from` (incluido) y `to` "
+            "(excluido) acotan `occurred_at`; en PostgreSQL solo se leen las particiones "
+            "mensuales del rango."
+        ),
+        tags=["chargepoints"],
+        parameters=[
+            OpenApiParameter(
+                name="from",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.DATETIME,
+                description="Desde (ISO 8601, incluido)",
+            ),
+            OpenApiParameter(
+                name="to",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.DATETIME,
+                description="Hasta (ISO 8601, excluido)",
+            ),
+            OpenApiParameter(
+                name="cursor",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+                description="Cursor opaco de paginación (vacío para la primera página).",
+            ),
+        ],
+        responses={200: EnvelopeHistorySerializer},
+    ),
+    archived=extend_schema(
+        operation_id="chargepoints.archived",
+        description=(
+            "ChargePoint archivado por `manage.py archive_deleted` (borrado hace más de la "
+            "retención), con sus conectores archivados. 404 si no está en el archivo."
+        ),
+        tags=["chargepoints"],
+        responses={200: EnvelopeArchivedSerializer},
+    ),
+    batch=extend_schema(
+        operation_id="chargepoints.batch",
+        description=(
+            "Aplica un lote de operaciones (create, update parcial, delete soft) en una "
+            "transacción. `mode=atomic` (por defecto) no aplica nada si algún elemento falla "
+            "(400 con errores por índice); `mode=best_effort` aplica los válidos y devuelve "
+            "207 si alguno falla. Cada resultado incluye su propio `status`."
+        ),
+        tags=["chargepoints"],
+        request=BatchRequestSerializer,
+        responses={200: EnvelopeBatchSerializer, 207: EnvelopeBatchSerializer},
+        examples=[
+            OpenApiExample(
+                "Lote mixto",
+                request_only=True,
+                value={
+                    "mode": "atomic",
+                    "operations": [
+                        {"op": "create", "data": {"name": "CP-100", "status": "ready"}},
+                        {"op": "update", "id": 1, "data": {"status": "charging"}},
+                        {"op": "delete", "id": 2},
+                    ],
+                },
+            )
+        ],
+    ),
 )
 class ChargePointViewSet(
     mixins.CreateModelMixin,
@@ -110,22 +321,71 @@ class ChargePointViewSet(
       - PUT    /api/v1/chargepoint/{id}
       - PATCH  /api/v1/chargepoint/{id}
       - DELETE /api/v1/chargepoint/{id}   (soft delete)
+      - POST   /api/v1/chargepoint/batch  (lote create/update/delete)
+      - GET    /api/v1/chargepoint/export (NDJSON/CSV en streaming)
+      - GET    /api/v1/chargepoint/summary (recuento por estado)
+      - GET    /api/v1/chargepoint/{id}/history (historial de estados)
+      - GET    /api/v1/chargepoint/archived/{id} (consulta del archivo)
     """
 
     serializer_class = ChargePointSerializer
+    pagination_class = ChargePointPagination
     permission_classes = [AllowAny]  # En prod IsAuthenticated / permisos
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
 
     # Filtros / búsqueda / ordenación
-    filterset_fields = ["status"]
+    filter_backends = [DjangoFilterBackend, RankedSearchFilter, OrderingFilter]
+    filterset_class = ChargePointFilter
     search_fields = ["name"]
-    ordering_fields = ["created_at", "name"]
+    ordering_fields = ["created_at", "name", "connector_count"]
+
+    read_actions = {"list", "retrieve", "export"}
+    # Lecturas que pueden servirse desde una réplica (ver `chargepoints.routing`). La
+    # exportación no: su stream se consume después de `dispatch`, fuera del ámbito.
+    replica_actions = {"list", "retrieve", "summary", "history", "archived"}
+    export_chunk_size = DEFAULT_CHUNK_SIZE
+
+    def dispatch(self, request, *args, **kwargs):
+        action = self.action_map.get(request.method.lower())
+        safe = request.method in SAFE_METHODS and action in self.replica_actions
+        with routing.replica_reads(safe):
+            return super().dispatch(request, *args, **kwargs)
 
     def get_queryset(self):
         qs = ChargePoint.objects.all()
-        if self.action in {"list", "retrieve"}:
+        if self.action in self.read_actions and self._wants("connectors"):
             qs = qs.prefetch_related("connectors")
         return qs
 
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            # Con la ordenación ya aplicada: sus columnas siguen cargadas (keyset).
+            queryset = queryset.only(*load_columns(queryset, fieldset))
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in self.read_actions:
+            kwargs.setdefault("fieldset", self.get_fieldset())
+        return super().get_serializer(*args, **kwargs)
+
+    # --------------------------
+    # Sparse fieldsets (?fields= / ?expand= / ?omit=)
+    # --------------------------
+    def get_fieldset(self) -> tuple[str, ...] | None:
+        """Campos pedidos en list/retrieve (`None` = todos). 400 si hay nombres desconocidos."""
+        if not hasattr(self, "_fieldset"):
+            request = getattr(self, "request", None)
+            self._fieldset = None
+            if self.action in self.read_actions and request is not None:
+                self._fieldset = ChargePointSerializer.get_fieldset(request.query_params)
+        return self._fieldset
+
+    def _wants(self, field: str) -> bool:
+        fieldset = self.get_fieldset()
+        return fieldset is None or field in fieldset
+
     # --------------------------
     # Envelope helpers
     # --------------------------
@@ -144,24 +404,134 @@ class ChargePointViewSet(
     def _no_content(self) -> Response:
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @staticmethod
+    def _with_headers(response: Response, headers: dict) -> Response:
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    # --------------------------
+    # Caché de lectura
+    # --------------------------
+    def _cached(self, request, compute):
+        """
+        Sirve `compute()` desde la caché de respuestas si está activa. La clave combina
+        acción, ruta (incluye el pk), host (enlaces absolutos de paginación), los query
+        params normalizados y la generación de ChargePoint y Connector.
+        """
+        cache = get_response_cache()
+        if not cache.enabled:
+            return compute()
+        parts = {"action": self.action, "path": request.path, "host": request.get_host()}
+        parts.update({f"q:{k}": ",".join(v) for k, v in request.query_params.lists()})
+        key = cache.make_key("chargepoint", parts, (ChargePoint, Connector))
+        return cache.get_or_set(key, compute)
+
+    # --------------------------
+    # Lectura rápida (values() + proyección, sin ModelSerializer por objeto)
+    # --------------------------
+    def _fast_list_data(self):
+        fieldset = self.get_fieldset()
+        queryset = chargepoint_rows(self.filter_queryset(self.get_queryset()), fieldset)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return project_chargepoints(queryset, using=queryset.db, fieldset=fieldset)
+        data = project_chargepoints(page, using=queryset.db, fieldset=fieldset)
+        return self.get_paginated_response(data).data
+
+    def _fast_retrieve_data(self):
+        fieldset = self.get_fieldset()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = chargepoint_rows(self.filter_queryset(self.get_queryset()), fieldset)
+        row = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(self.request, row)
+        return project_chargepoints([row], using=queryset.db, fieldset=fieldset)[0]
+
+    # --------------------------
+    # Lectura async (ASGI, ver `chargepoints.async_views`)
+    # --------------------------
+    async def alist(self, request, *args, **kwargs) -> Response:
+        """`list` con el ORM async: mismo envelope, validadores y paginación."""
+        self.get_fieldset()
+        not_modified, headers = conditional.evaluate(request, await conditional.alist_validators())
+        if not_modified is not None:
+            return not_modified
+
+        fieldset = self.get_fieldset()
+        queryset = chargepoint_rows(self.filter_queryset(self.get_queryset()), fieldset)
+        page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        rows = page if page is not None else [row async for row in queryset]
+        with instrumentation.phase("serialize"):
+            data = await aproject_chargepoints(rows, using=queryset.db, fieldset=fieldset)
+            if page is not None:
+                data = self.get_paginated_response(data).data
+        return self._with_headers(self._ok(data), headers)
+
+    async def aretrieve(self, request, *args, **kwargs) -> Response:
+        """`retrieve` con el ORM async (`aget`); 404 si no existe o está soft-deleted."""
+        fieldset = self.get_fieldset()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        lookup = {self.lookup_field: kwargs[lookup_url_kwarg]}
+        validators = await conditional.adetail_validators(self.get_queryset(), **lookup)
+        not_modified, headers = conditional.evaluate(request, validators)
+        if not_modified is not None:
+            return not_modified
+
+        queryset = chargepoint_rows(self.filter_queryset(self.get_queryset()), fieldset)
+        try:
+            row = await queryset.aget(**lookup)
+        except (ObjectDoesNotExist, TypeError, ValueError, DjangoValidationError) as exc:
+            raise Http404 from exc
+        self.check_object_permissions(request, row)
+        with instrumentation.phase("serialize"):
+            data = await aproject_chargepoints([row], using=queryset.db, fieldset=fieldset)
+        return self._with_headers(self._ok(data[0]), headers)
+
     # --------------------------
     # CRUD
     # --------------------------
     def list(self, request, *args, **kwargs) -> Response:
-        resp = super().list(request, *args, **kwargs)
-        return self._ok(resp.data)
+        self.get_fieldset()  # valida ?fields/?expand/?omit antes de consultar
+        validators = conditional.list_validators()
+        not_modified, headers = conditional.evaluate(request, validators)
+        if not_modified is not None:
+            return not_modified
+
+        def compute():
+            with instrumentation.phase("serialize"):
+                if fast_read_path_enabled():
+                    return self._fast_list_data()
+                return super(ChargePointViewSet, self).list(request, *args, **kwargs).data
+
+        return self._with_headers(self._ok(self._cached(request, compute)), headers)
 
     def retrieve(self, request, *args, **kwargs) -> Response:
-        instance = self.get_object()  # 404 si no existe o está soft-deleted
-        data = self.get_serializer(instance).data
-        return self._ok(data)
+        self.get_fieldset()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        validators = conditional.detail_validators(
+            self.get_queryset(), **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+        not_modified, headers = conditional.evaluate(request, validators)
+        if not_modified is not None:
+            return not_modified
+
+        def compute():
+            with instrumentation.phase("serialize"):
+                if fast_read_path_enabled():
+                    return self._fast_retrieve_data()
+                instance = self.get_object()  # 404 si no existe o está soft-deleted
+                return self.get_serializer(instance).data
+
+        return self._with_headers(self._ok(self._cached(request, compute)), headers)
 
     def create(self, request, *args, **kwargs) -> Response:
         ser = self.get_serializer(data=request.data)
         ser.is_valid(raise_exception=True)
         self.perform_create(ser)
-        headers = self.get_success_headers(ser.data)  # incluye Location
-        return self._created(ser.data, headers=headers)
+        with instrumentation.phase("serialize"):
+            data = ser.data
+        headers = self.get_success_headers(data)  # incluye Location
+        return self._created(data, headers=headers)
 
     def update(self, request, *args, **kwargs) -> Response:
         """PUT completo (PATCH delega aquí con partial=True)."""
@@ -170,7 +540,9 @@ class ChargePointViewSet(
         ser = self.get_serializer(instance, data=request.data, partial=partial)
         ser.is_valid(raise_exception=True)
         self.perform_update(ser)
-        return self._ok(ser.data, message="Actualizado")
+        with instrumentation.phase("serialize"):
+            data = ser.data
+        return self._ok(data, message="Actualizado")
 
     def partial_update(self, request, *args, **kwargs) -> Response:
         """PATCH parcial."""
@@ -178,7 +550,92 @@ class ChargePointViewSet(
         return self.update(request, *args, **kwargs)
 
     def destroy(self, request, *args, **kwargs) -> Response:
-        """Soft delete: marca deleted_at y devuelve 204 sin body."""
+        """Soft delete en cascada (también sus conectores); 204 sin body."""
         instance = self.get_object()
-        instance.delete()
+        instance.delete()  # ver `chargepoints.deletion`
         return self._no_content()
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        renderer_classes=[NDJSONRenderer, CSVRenderer],
+    )
+    def export(self, request, *args, **kwargs) -> StreamingHttpResponse:
+        """Exportación completa en streaming (ver `chargepoints.export`)."""
+        fieldset = self.get_fieldset()
+        queryset = self.filter_queryset(self.get_queryset())
+        chunks = iter_chunks(queryset, fieldset, chunk_size=self.export_chunk_size)
+
+        renderer = request.accepted_renderer
+        if renderer.format == CSVRenderer.format:
+            stream = csv_stream(chunks, fieldset)
+            content_type = f"{renderer.media_type}; charset={renderer.charset}"
+        else:
+            stream = ndjson_stream(chunks)
+            content_type = renderer.media_type
+        if isinstance(request._request, ASGIRequest):
+            stream = aiter_stream(stream)  # bloque a bloque, sin cargarlo todo en memoria
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="chargepoints.{renderer.format}"'
+        return response
+
+    @action(detail=False, methods=["get"], url_path="summary")
+    def summary(self, request, *args, **kwargs) -> Response:
+        """Recuento por estado desde `ChargePointStatusCounter` (ver `chargepoints.counters`)."""
+        return self._ok(counters.summary(self.get_queryset().db))
+
+    @action(detail=True, methods=["get"], url_path="history")
+    def history(self, request, *args, **kwargs) -> Response:
+        """Historial de estados (ver `ChargePointStatusEvent` y `chargepoints.history`)."""
+        bounds = {name: self._datetime_param(request, name) for name in ("from", "to")}
+        if bounds["from"] and bounds["to"] and bounds["from"] >= bounds["to"]:
+            raise ValidationError({"to": ["Debe ser posterior a `from`."]})
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_queryset()
+        charge_point = get_object_or_404(
+            queryset.only("pk"), **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+        events = ChargePointStatusEvent.objects.using(queryset.db).filter(
+            charge_point_id=charge_point.pk
+        )
+        if bounds["from"]:
+            events = events.filter(occurred_at__gte=bounds["from"])
+        if bounds["to"]:
+            events = events.filter(occurred_at__lt=bounds["to"])
+
+        paginator = StatusHistoryPagination()
+        page = paginator.paginate_queryset(events, request, view=self)
+        data = StatusEventSerializer(page, many=True).data
+        return self._ok(paginator.get_paginated_response(data).data)
+
+    @action(detail=False, methods=["get"], url_path=r"archived/(?P<archived_pk>[0-9]+)")
+    def archived(self, request, archived_pk=None, *args, **kwargs) -> Response:
+        """Consulta del archivo de borrados antiguos (ver `chargepoints.archive`)."""
+        queryset = ArchivedChargePoint.objects.prefetch_related("connectors")
+        instance = get_object_or_404(queryset, pk=archived_pk)
+        return self._ok(ArchivedChargePointSerializer(instance).data)
+
+    @staticmethod
+    def _datetime_param(request, name: str):
+        value = request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            return serializers.DateTimeField().to_internal_value(value)
+        except ValidationError as exc:
+            raise ValidationError({name: exc.detail}) from exc
+
+    @action(detail=False, methods=["post"], url_path="batch")
+    def batch(self, request, *args, **kwargs) -> Response:
+        """Lote transaccional de create/update/delete (ver `chargepoints.batch`)."""
+        ser = BatchRequestSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        mode = ser.validated_data["mode"]
+        results = apply_batch(ser.validated_data["operations"], mode)
+
+        data = {"mode": mode, "results": [r.as_dict() for r in results]}
+        if all(r.ok for r in results):
+            return self._ok(data)
+        return self._ok(data, message="Completado con errores", code=status.HTTP_207_MULTI_STATUS)
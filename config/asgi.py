@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+# Bajo ASGI, list/retrieve con vistas async nativas (chargepoints.async_views).
+os.environ.setdefault("CHARGEPOINTS_ASYNC_READS", "true")
 
 application = get_asgi_application()
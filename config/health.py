@@ -0,0 +1,82 @@
+"""
+Sondas de salud.
+
+- `healthz` (liveness): el proceso responde; no toca dependencias.
+- `readyz` (readiness): cada base de datos configurada responde a `SELECT 1` dentro del
+  presupuesto de latencia (`CHARGEPOINTS_READYZ["LATENCY_BUDGET_MS"]`). Con el pool de
+  psycopg (`OPTIONS["pool"]`) la medida incluye la espera por una conexión libre y se
+  informa del estado del pool (en uso, libres, peticiones en espera). 503 si alguna base
+  falla o supera el presupuesto: el balanceador deja de enviar tráfico a esta instancia.
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.http import JsonResponse
+
+DEFAULTS = {
+    "LATENCY_BUDGET_MS": 250.0,
+}
+
+
+def get_options() -> dict:
+    return {**DEFAULTS, **getattr(settings, "CHARGEPOINTS_READYZ", {})}
+
+
+def pool_stats(alias: str) -> dict | None:
+    """Estado del pool de psycopg del alias (`None` sin pool)."""
+    pool = getattr(connections[alias], "pool", None)
+    if pool is None:
+        return None
+    stats = pool.get_stats()
+    size, idle = stats.get("pool_size", 0), stats.get("pool_available", 0)
+    return {
+        "min": stats.get("pool_min"),
+        "max": stats.get("pool_max"),
+        "size": size,
+        "in_use": size - idle,
+        "idle": idle,
+        "waiting": stats.get("requests_waiting", 0),
+        "connections_opened": stats.get("connections_num", 0),
+    }
+
+
+def check_database(alias: str, budget_ms: float) -> dict:
+    start = time.perf_counter()
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    except DatabaseError as exc:
+        return {"status": "error", "error": exc.__class__.__name__}
+    latency_ms = (time.perf_counter() - start) * 1000
+
+    result = {
+        "status": "ok" if latency_ms <= budget_ms else "slow",
+        "latency_ms": round(latency_ms, 2),
+    }
+    pool = pool_stats(alias)
+    if pool is not None:
+        result["pool"] = pool
+    return result
+
+
+def healthz(_):
+    return JsonResponse({"status": "ok"}, status=200)
+
+
+def readyz(_):
+    budget_ms = float(get_options()["LATENCY_BUDGET_MS"])
+    databases = {alias: check_database(alias, budget_ms) for alias in connections}
+    ready = all(check["status"] == "ok" for check in databases.values())
+    return JsonResponse(
+        {
+            "status": "ready" if ready else "unavailable",
+            "latency_budget_ms": budget_ms,
+            "databases": databases,
+        },
+        status=200 if ready else 503,
+    )
@@ -39,6 +39,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Primero: miden la petición completa (solo se instalan si están habilitados)
+    "chargepoints.metrics.MetricsMiddleware",
+    "chargepoints.instrumentation.ServerTimingMiddleware",
+    # Lecturas al primario tras escribir (solo se instala con réplicas configuradas)
+    "chargepoints.routing.ReadYourWritesMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -68,17 +73,73 @@ TEMPLATES = [
 WSGI_APPLICATION = "config.wsgi.application"
 
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": env("DB_NAME"),
-        "USER": env("DB_USER"),
-        "PASSWORD": env("DB_PASSWORD"),
-        "HOST": env("DB_HOST"),
-        "PORT": env("DB_PORT", default="5432"),
-        "CONN_MAX_AGE": 60,
-        "OPTIONS": {"connect_timeout": 5},
+# DATABASE_URL (opcional) tiene prioridad sobre DB_*; p. ej. sqlite:///bench.sqlite3
+# para ejecutar tests y benchmarks en local sin PostgreSQL.
+if env("DATABASE_URL", default=""):
+    DATABASES = {"default": env.db_url("DATABASE_URL")}
+    DB_REPLICAS = [env.db_url_config(url) for url in env.list("DATABASE_REPLICA_URLS", default=[])]
+else:
+    DB_OPTIONS = {"connect_timeout": 5}
+    # Pool nativo de psycopg 3 (psycopg_pool): conexiones reutilizadas entre peticiones y
+    # hilos, también bajo ASGI. Incompatible con CONN_MAX_AGE (se fuerza a 0).
+    DB_POOL = env.bool("DB_POOL", default=False)
+    if DB_POOL:
+        DB_OPTIONS["pool"] = {
+            "min_size": env.int("DB_POOL_MIN_SIZE", default=2),
+            "max_size": env.int("DB_POOL_MAX_SIZE", default=10),
+            "timeout": env.float("DB_POOL_TIMEOUT", default=10.0),  # espera de una conexión
+        }
+    # Sentencias preparadas en el servidor: requieren parámetros enlazados en el servidor
+    # (DB_SERVER_SIDE_BINDING); la consulta se prepara tras DB_PREPARE_THRESHOLD
+    # ejecuciones en la misma conexión. No usar con PgBouncer en modo transaction.
+    if env.bool("DB_SERVER_SIDE_BINDING", default=False):
+        DB_OPTIONS["server_side_binding"] = True
+    if env("DB_PREPARE_THRESHOLD", default=""):
+        DB_OPTIONS["prepare_threshold"] = env.int("DB_PREPARE_THRESHOLD")
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": env("DB_NAME"),
+            "USER": env("DB_USER"),
+            "PASSWORD": env("DB_PASSWORD"),
+            "HOST": env("DB_HOST"),
+            "PORT": env("DB_PORT", default="5432"),
+            "CONN_MAX_AGE": 0 if DB_POOL else env.int("DB_CONN_MAX_AGE", default=60),
+            "CONN_HEALTH_CHECKS": env.bool("DB_CONN_HEALTH_CHECKS", default=False),
+            "OPTIONS": DB_OPTIONS,
+        }
     }
+    # Réplicas con las mismas credenciales y opciones: DB_REPLICA_HOSTS=host1,host2:5433
+    DB_REPLICAS = []
+    for replica_host in env.list("DB_REPLICA_HOSTS", default=[]):
+        host, _, port = replica_host.partition(":")
+        DB_REPLICAS.append(
+            {
+                **DATABASES["default"],
+                "HOST": host,
+                "PORT": port or DATABASES["default"]["PORT"],
+                "OPTIONS": dict(DB_OPTIONS),
+            }
+        )
+
+# Réplicas de lectura (ver chargepoints.routing): alias replica1..N, pesos de
+# DB_REPLICA_WEIGHTS en el mismo orden (1 por defecto). En tests apuntan a la base de
+# tests del primario (TEST.MIRROR). Las migraciones se aplican solo al primario.
+DB_REPLICA_WEIGHTS = env.list("DB_REPLICA_WEIGHTS", cast=float, default=[])
+DB_REPLICA_WEIGHTS += [1.0] * (len(DB_REPLICAS) - len(DB_REPLICA_WEIGHTS))
+for index, replica in enumerate(DB_REPLICAS, start=1):
+    DATABASES[f"replica{index}"] = {**replica, "TEST": {"MIRROR": "default"}}
+
+DATABASE_ROUTERS = ["chargepoints.routing.ReplicaRouter"]
+CHARGEPOINTS_REPLICAS = {
+    "REPLICAS": {
+        f"replica{index}": weight
+        for index, weight in enumerate(DB_REPLICA_WEIGHTS[: len(DB_REPLICAS)], start=1)
+    },
+    "SELECTION": env("DB_REPLICA_SELECTION", default="weighted"),  # weighted | least_lag
+    "MAX_LAG_SECONDS": env.float("DB_REPLICA_MAX_LAG_SECONDS", default=None),
+    # Tras escribir, el cliente lee del primario durante este plazo (cookie/cabecera)
+    "STICKY_SECONDS": env.float("DB_REPLICA_STICKY_SECONDS", default=5.0),
 }
 
 
@@ -111,12 +172,102 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Backend del parámetro `search`: "auto" (pg_trgm en PostgreSQL, icontains en otros
+# motores) o la ruta a una subclase de chargepoints.search.BaseSearchBackend.
+CHARGEPOINTS_SEARCH_BACKEND = env("CHARGEPOINTS_SEARCH_BACKEND", default="auto")
+
+# Caché de respuestas de list/retrieve con invalidación por escritura.
+# "locmem" solo es coherente con un único proceso; con varios workers usar
+# "django" sobre un alias de CACHES compartido (Redis/Memcached).
+CHARGEPOINTS_RESPONSE_CACHE = {
+    "ENABLED": env.bool("CHARGEPOINTS_CACHE_ENABLED", default=False),
+    "BACKEND": env("CHARGEPOINTS_CACHE_BACKEND", default="locmem"),
+    "ALIAS": env("CHARGEPOINTS_CACHE_ALIAS", default="default"),
+    "TTL": env.int("CHARGEPOINTS_CACHE_TTL", default=30),
+    "MAX_ENTRIES": env.int("CHARGEPOINTS_CACHE_MAX_ENTRIES", default=1000),
+}
+
+# Lectura rápida en list/retrieve: proyección values() sin ModelSerializer por objeto
+# (misma salida byte a byte). Desactivar para volver al camino del serializer.
+CHARGEPOINTS_FAST_READ_PATH = env.bool("CHARGEPOINTS_FAST_READ_PATH", default=True)
+
+# list/retrieve nativos async (ver chargepoints.async_views). `config.asgi` lo activa por
+# defecto; bajo WSGI se mantienen las vistas DRF síncronas.
+CHARGEPOINTS_ASYNC_READS = env.bool("CHARGEPOINTS_ASYNC_READS", default=False)
+
+# `count` del listado paginado (ver chargepoints.pagination): exact | capped | estimated.
+# También por petición con ?count=. Por debajo del umbral el recuento es siempre exacto.
+CHARGEPOINTS_PAGINATION = {
+    "COUNT": env("CHARGEPOINTS_PAGINATION_COUNT", default="exact"),
+    "EXACT_COUNT_THRESHOLD": env.int("CHARGEPOINTS_PAGINATION_COUNT_THRESHOLD", default=10_000),
+}
+
+# Admin para tablas grandes (ver chargepoints.admin.PerformanceAdminMixin): recuento
+# estimado por encima del umbral y sin date_hierarchy en tablas de más de N filas.
+CHARGEPOINTS_ADMIN = {
+    "PERFORMANCE_MODE": env.bool("CHARGEPOINTS_ADMIN_PERFORMANCE_MODE", default=True),
+    "EXACT_COUNT_THRESHOLD": env.int("CHARGEPOINTS_ADMIN_EXACT_COUNT_THRESHOLD", default=10_000),
+    "DATE_HIERARCHY_MAX_ROWS": env.int("CHARGEPOINTS_ADMIN_DATE_HIERARCHY_MAX", default=100_000),
+    "INLINE_MAX_ROWS": env.int("CHARGEPOINTS_ADMIN_INLINE_MAX_ROWS", default=50),
+}
+
+# Archivado de ChargePoints/conectores borrados (manage.py archive_deleted, ver
+# chargepoints.archive): retención, filas por lote/transacción y pausa entre lotes.
+CHARGEPOINTS_ARCHIVE = {
+    "RETENTION_DAYS": env.int("CHARGEPOINTS_ARCHIVE_RETENTION_DAYS", default=90),
+    "BATCH_SIZE": env.int("CHARGEPOINTS_ARCHIVE_BATCH_SIZE", default=500),
+    "SLEEP_SECONDS": env.float("CHARGEPOINTS_ARCHIVE_SLEEP_SECONDS", default=0.0),
+}
+
+# /readyz: 503 si alguna base de datos no responde a SELECT 1 dentro del presupuesto
+# (incluye la espera por una conexión del pool).
+CHARGEPOINTS_READYZ = {
+    "LATENCY_BUDGET_MS": env.float("CHARGEPOINTS_READYZ_LATENCY_BUDGET_MS", default=250.0),
+}
+
+# Instrumentación por petición (consultas, SQL, serialización, render) en la cabecera
+# Server-Timing y en el log `chargepoints.instrumentation`. SAMPLE_RATE: 0..1.
+CHARGEPOINTS_INSTRUMENTATION = {
+    "ENABLED": env.bool("CHARGEPOINTS_TIMING_ENABLED", default=False),
+    "SAMPLE_RATE": env.float("CHARGEPOINTS_TIMING_SAMPLE_RATE", default=1.0),
+    "HEADER": env.bool("CHARGEPOINTS_TIMING_HEADER", default=True),
+    "LOG": env.bool("CHARGEPOINTS_TIMING_LOG", default=True),
+}
+
+# Métricas Prometheus en /metrics. Con varios workers definir PROMETHEUS_MULTIPROC_DIR.
+CHARGEPOINTS_METRICS = {
+    "ENABLED": env.bool("CHARGEPOINTS_METRICS_ENABLED", default=False),
+}
+
+# Eventos de ChargePoint por SSE en /api/v1/chargepoint/stream (requiere ASGI).
+# BACKEND: "local" (un proceso) | "postgres" (NOTIFY/LISTEN entre workers).
+CHARGEPOINTS_STREAM = {
+    "ENABLED": env.bool("CHARGEPOINTS_STREAM_ENABLED", default=False),
+    "BACKEND": env("CHARGEPOINTS_STREAM_BACKEND", default="local"),
+    "QUEUE_SIZE": env.int("CHARGEPOINTS_STREAM_QUEUE_SIZE", default=256),
+    "HEARTBEAT": env.float("CHARGEPOINTS_STREAM_HEARTBEAT", default=15.0),
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "chargepoints.instrumentation": {
+            "handlers": ["console"],
+            "level": env("CHARGEPOINTS_TIMING_LOG_LEVEL", default="INFO"),
+        },
+    },
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "ChargePoint API",
     "VERSION": "1.0.0",
     "DESCRIPTION": "API REST para gestionar ChargePoints y Connectors.",
     "SERVE_INCLUDE_SCHEMA": False,
     "DEFAULT_GENERATE_UNIQUE_SCHEMA_IDS": True,
+    # status / previous_status comparten choices: un único enum en el esquema.
+    "ENUM_NAME_OVERRIDES": {"StatusEnum": "chargepoints.models.ChargePoint.Status"},
 }
 
 
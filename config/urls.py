@@ -1,22 +1,16 @@
 from django.contrib import admin
-from django.http import JsonResponse
 from django.urls import include, path, reverse_lazy
 from django.views.generic import RedirectView
 
-
-def healthz(_):
-    return JsonResponse({"status": "ok"}, status=200)
-
-
-def readyz(_):
-    return JsonResponse({"status": "ready"}, status=200)
-
+from chargepoints.metrics import metrics_view
+from config.health import healthz, readyz
 
 urlpatterns = [
     # Redirige la raíz a la documentación Swagger
     path("", RedirectView.as_view(url=reverse_lazy("swagger-ui"), permanent=False)),
     path("healthz/", healthz, name="healthz"),
     path("readyz/", readyz, name="readyz"),
+    path("metrics", metrics_view, name="metrics"),
     path("admin/", admin.site.urls),
     # Documentación OpenAPI
     path("api/schema/", include("api.schema_urls")),
@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from chargepoints.archive import archive_deleted
+from chargepoints.deletion import soft_delete
+from chargepoints.models import ChargePoint
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+BASE = "/api/v1/chargepoint/"
+
+
+def test_archived_lookup(api):
+    cp = ChargePointFactory(name="CP-OLD")
+    connector = ConnectorFactory(charge_point=cp)
+    soft_delete(ChargePoint.objects.filter(pk=cp.pk), now=timezone.now() - timedelta(days=100))
+    archive_deleted(timezone.now() - timedelta(days=90))
+
+    assert api.get(f"{BASE}{cp.pk}/").status_code == 404
+    res = api.get(f"{BASE}archived/{cp.pk}/")
+    assert res.status_code == 200
+    data = res.json()["data"]
+    assert (data["id"], data["name"]) == (cp.pk, "CP-OLD")
+    assert data["archived_at"] and data["deletion_batch"]
+    assert [c["evse_number"] for c in data["connectors"]] == [connector.evse_number]
+
+
+def test_archived_lookup_not_found(api):
+    cp = ChargePointFactory()
+    res = api.get(f"{BASE}archived/{cp.pk}/")  # vivo: no está en el archivo
+    assert res.status_code == 404
+    assert res.json()["code"] == 404
@@ -0,0 +1,126 @@
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+from chargepoints.views import ChargePointViewSet
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+BASE = "/api/v1/chargepoint/"
+
+
+@pytest.fixture
+def fleet():
+    cps = [ChargePointFactory(name=f"CP-A{i:02d}", status="ready") for i in range(12)]
+    cps[3].status = "error"
+    cps[3].save()
+    for cp in cps[:4]:
+        ConnectorFactory(charge_point=cp)
+    cps[5].delete()
+    return cps
+
+
+@pytest.fixture
+def async_urls(settings):
+    settings.ROOT_URLCONF = "tests.async_urls"
+
+
+def _aget(path: str, **headers):
+    return async_to_sync(AsyncClient().get)(path, headers=headers)
+
+
+def _queries(fn):
+    with CaptureQueriesContext(connection) as ctx:
+        response = fn()
+    return response, len(ctx.captured_queries)
+
+
+QUERIES = [
+    "",
+    "?status=ready",
+    "?search=A1",
+    "?ordering=-created_at",
+    "?ordering=connector_count&page=2",
+    "?fields=id,status",
+    "?cursor=",
+    "?min_connectors=1",
+]
+
+
+def test_list_and_retrieve_match_sync_views(api, fleet, settings):
+    paths = [f"{BASE}{q}" for q in QUERIES] + [f"{BASE}{fleet[0].pk}/", f"{BASE}{fleet[1].pk}/"]
+    paths.append(f"{BASE}{fleet[2].pk}/?fields=name,connectors")
+    expected = [_queries(lambda p=p: api.get(p)) for p in paths]
+
+    settings.ROOT_URLCONF = "tests.async_urls"
+    assert iscoroutinefunction(resolve(BASE).func)
+    for path, (sync_response, sync_queries) in zip(paths, expected, strict=True):
+        response, queries = _queries(lambda p=path: _aget(p))
+        assert response.status_code == 200, path
+        assert response.json() == sync_response.json(), path
+        assert response["ETag"] == sync_response["ETag"], path
+        assert queries == sync_queries, path
+
+
+def test_get_does_not_use_sync_view(async_urls, fleet, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("vista síncrona")
+
+    monkeypatch.setattr(ChargePointViewSet, "list", fail)
+    monkeypatch.setattr(ChargePointViewSet, "retrieve", fail)
+    assert _aget(BASE).status_code == 200
+    assert _aget(f"{BASE}{fleet[0].pk}").status_code == 200
+
+
+def test_errors_keep_the_envelope(async_urls, fleet):
+    for path in (f"{BASE}{fleet[5].pk}/", f"{BASE}999999/", f"{BASE}abc/", f"{BASE}?page=99"):
+        res = _aget(path)
+        assert res.status_code == 404, path
+        assert res.json()["code"] == 404
+
+    res = _aget(f"{BASE}?fields=bogus")
+    assert res.status_code == 400
+    assert res.json()["errors"] is not None
+
+
+def test_conditional_get_returns_304(async_urls, fleet):
+    etag = _aget(f"{BASE}{fleet[0].pk}/")["ETag"]
+    assert _aget(f"{BASE}{fleet[0].pk}/", if_none_match=etag).status_code == 304
+    etag = _aget(BASE)["ETag"]
+    assert _aget(BASE, if_none_match=etag).status_code == 304
+
+
+def test_writes_and_browsable_api_use_sync_views(async_urls, fleet):
+    client = AsyncClient()
+    created = async_to_sync(client.post)(
+        BASE, {"name": "CP-ASYNC", "status": "ready"}, content_type="application/json"
+    )
+    assert created.status_code == 201
+    pk = created.json()["data"]["id"]
+    patched = async_to_sync(client.patch)(
+        f"{BASE}{pk}/", {"status": "error"}, content_type="application/json"
+    )
+    assert patched.json()["data"]["status"] == "error"
+    assert async_to_sync(client.delete)(f"{BASE}{pk}/").status_code == 204
+
+    browsable = _aget(BASE, accept="text/html")
+    assert browsable.status_code == 200
+    assert browsable["Content-Type"].startswith("text/html")
+
+
+def test_response_cache_falls_back_to_sync_view(async_urls, fleet, settings, monkeypatch):
+    settings.CHARGEPOINTS_RESPONSE_CACHE = {"ENABLED": True}
+    calls = []
+    original = ChargePointViewSet.list
+
+    def spy(self, request, *args, **kwargs):
+        calls.append(request.path)
+        return original(self, request, *args, **kwargs)
+
+    monkeypatch.setattr(ChargePointViewSet, "list", spy)
+    assert _aget(BASE).status_code == 200
+    assert calls == [BASE]
@@ -0,0 +1,208 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from chargepoints import batch
+from chargepoints.models import ChargePoint
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/v1/chargepoint/batch"
+
+
+def test_batch_mixed_operations_atomic_ok(api):
+    upd = ChargePointFactory(name="CP-UPD", status="ready")
+    ConnectorFactory(charge_point=upd, evse_number="EVSE-UPD")
+    dele = ChargePointFactory(name="CP-DEL")
+
+    res = api.post(
+        URL,
+        {
+            "operations": [
+                {"op": "create", "data": {"name": " CP-NEW ", "status": "waiting"}},
+                {"op": "update", "id": upd.id, "data": {"status": "charging"}},
+                {"op": "delete", "id": dele.id},
+            ]
+        },
+        format="json",
+    )
+    assert res.status_code == 200
+    body = res.json()
+    assert body["code"] == 200 and body["errors"] is None
+    results = body["data"]["results"]
+    assert [r["status"] for r in results] == [201, 200, 204]
+    assert results[0]["data"]["name"] == "CP-NEW"
+    assert results[1]["data"]["status"] == "charging"
+    assert results[1]["data"]["connectors"][0]["evse_number"] == "EVSE-UPD"
+    assert results[2]["data"] is None
+
+    assert ChargePoint.objects.get(name="CP-NEW").status == "waiting"
+    upd.refresh_from_db()
+    assert upd.status == "charging"
+    assert not ChargePoint.objects.filter(pk=dele.pk).exists()
+    assert ChargePoint.all_objects.filter(pk=dele.pk).exists()  # soft delete
+
+
+def test_batch_atomic_rolls_back_everything_on_error(api):
+    ChargePointFactory(name="CP-TAKEN")
+    res = api.post(
+        URL,
+        {
+            "operations": [
+                {"op": "create", "data": {"name": "CP-OK", "status": "ready"}},
+                {"op": "create", "data": {"name": "CP-TAKEN", "status": "ready"}},
+                {"op": "update", "id": 999999, "data": {"status": "error"}},
+            ]
+        },
+        format="json",
+    )
+    assert res.status_code == 400
+    body = res.json()
+    assert body["data"] is None
+    errors = body["errors"]["operations"]
+    assert set(errors) == {"1", "2"}
+    assert "name" in errors["1"]
+    assert not ChargePoint.objects.filter(name="CP-OK").exists()
+
+
+def test_batch_best_effort_applies_valid_items(api):
+    res = api.post(
+        URL,
+        {
+            "mode": "best_effort",
+            "operations": [
+                {"op": "create", "data": {"name": "CP-A", "status": "ready"}},
+                {"op": "create", "data": {"name": "CP-A", "status": "ready"}},
+                {"op": "create", "data": {"name": "CP-B", "status": "bogus"}},
+            ],
+        },
+        format="json",
+    )
+    assert res.status_code == 207
+    results = res.json()["data"]["results"]
+    assert [r["status"] for r in results] == [201, 400, 400]
+    assert results[1]["errors"]["name"]
+    assert results[2]["errors"]["status"]
+    assert list(ChargePoint.objects.values_list("name", flat=True)) == ["CP-A"]
+
+
+def test_batch_name_freed_by_delete_in_same_batch(api):
+    old = ChargePointFactory(name="CP-SWAP")
+    res = api.post(
+        URL,
+        {
+            "operations": [
+                {"op": "delete", "id": old.id},
+                {"op": "create", "data": {"name": "CP-SWAP", "status": "ready"}},
+            ]
+        },
+        format="json",
+    )
+    assert res.status_code == 200
+    assert ChargePoint.objects.get(name="CP-SWAP").pk != old.pk
+
+
+def test_batch_name_freed_by_earlier_update(api):
+    a = ChargePointFactory(name="A")
+    res = api.post(
+        URL,
+        {
+            "operations": [
+                {"op": "update", "id": a.id, "data": {"name": "Z"}},
+                {"op": "create", "data": {"name": "A", "status": "ready"}},
+            ]
+        },
+        format="json",
+    )
+    assert res.status_code == 200
+    assert [r["status"] for r in res.json()["data"]["results"]] == [200, 201]
+    assert ChargePoint.objects.get(name="Z").pk == a.pk
+    assert ChargePoint.objects.get(name="A").pk != a.pk
+
+
+def test_batch_names_follow_operation_order(api):
+    a = ChargePointFactory(name="A")
+    res = api.post(
+        URL,
+        {
+            "mode": "best_effort",
+            "operations": [
+                {"op": "create", "data": {"name": "A", "status": "ready"}},
+                {"op": "update", "id": a.id, "data": {"name": "Z"}},
+                {"op": "create", "data": {"name": "Z", "status": "ready"}},
+            ],
+        },
+        format="json",
+    )
+    assert res.status_code == 207
+    results = res.json()["data"]["results"]
+    # A aún era de `a` al crear; Z ya es de `a` (renombrado en el lote)
+    assert [r["status"] for r in results] == [400, 200, 400]
+    assert results[0]["errors"]["name"] == ["Ya existe un ChargePoint con este nombre."]
+    assert results[2]["errors"]["name"] == ["Nombre repetido en el lote."]
+
+
+def test_batch_rename_chain_is_applied_in_order(api):
+    x = ChargePointFactory(name="X")
+    y = ChargePointFactory(name="B")
+    res = api.post(
+        URL,
+        {
+            "operations": [
+                {"op": "update", "id": y.id, "data": {"name": "C"}},
+                {"op": "update", "id": x.id, "data": {"name": "B"}},
+            ]
+        },
+        format="json",
+    )
+    assert res.status_code == 200
+    assert dict(ChargePoint.objects.values_list("pk", "name")) == {x.pk: "B", y.pk: "C"}
+
+
+def test_batch_best_effort_integrity_error_fails_only_that_item(api, monkeypatch):
+    # Escritura concurrente: el nombre se ocupa después de validar
+    monkeypatch.setattr(batch, "_validate_unique_names", lambda results: None)
+    ChargePointFactory(name="CP-RACE")
+    res = api.post(
+        URL,
+        {
+            "mode": "best_effort",
+            "operations": [
+                {"op": "create", "data": {"name": "CP-RACE", "status": "ready"}},
+                {"op": "create", "data": {"name": "CP-FINE", "status": "ready"}},
+            ],
+        },
+        format="json",
+    )
+    assert res.status_code == 207
+    results = res.json()["data"]["results"]
+    assert [r["status"] for r in results] == [409, 201]
+    assert results[0]["errors"]["detail"]
+    assert ChargePoint.objects.filter(name="CP-FINE").exists()
+
+    res = api.post(
+        URL,
+        {"operations": [{"op": "create", "data": {"name": "CP-RACE", "status": "ready"}}]},
+        format="json",
+    )
+    assert res.status_code == 409
+
+
+def test_batch_rejects_malformed_operations(api):
+    res = api.post(URL, {"operations": [{"op": "update", "data": {}}]}, format="json")
+    assert res.status_code == 400
+    assert "operations" in res.json()["errors"]
+
+
+def test_batch_query_count_does_not_grow_with_items(api):
+    def run(n, offset):
+        ops = [
+            {"op": "create", "data": {"name": f"CP-{offset + i:04d}", "status": "ready"}}
+            for i in range(n)
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            assert api.post(URL, {"operations": ops}, format="json").status_code == 200
+        return len(ctx.captured_queries)
+
+    assert run(5, 0) == run(50, 100)
@@ -0,0 +1,104 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from chargepoints.models import ChargePoint
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+BASE = "/api/v1/chargepoint/"
+
+
+def test_detail_returns_etag_and_last_modified(api):
+    cp = ChargePointFactory()
+    res = api.get(f"{BASE}{cp.id}/")
+    assert res.status_code == 200
+    assert res["ETag"].startswith('W/"')
+    assert "Last-Modified" in res
+
+
+def test_detail_if_none_match_returns_304_without_serializing(api):
+    cp = ChargePointFactory()
+    ConnectorFactory(charge_point=cp)
+    etag = api.get(f"{BASE}{cp.id}/")["ETag"]
+
+    with CaptureQueriesContext(connection) as ctx:
+        res = api.get(f"{BASE}{cp.id}/", HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 304
+    assert not res.content
+    assert res["ETag"] == etag
+    # Solo la consulta agregada: ni get_object() ni el prefetch de conectores
+    assert len(ctx.captured_queries) == 1
+
+
+def test_detail_etag_changes_on_update_and_connector_delete(api):
+    cp = ChargePointFactory(status="ready")
+    conn = ConnectorFactory(charge_point=cp)
+    etag = api.get(f"{BASE}{cp.id}/")["ETag"]
+
+    api.patch(f"{BASE}{cp.id}/", {"status": "charging"}, format="json")
+    res = api.get(f"{BASE}{cp.id}/", HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    etag = res["ETag"]
+
+    conn.delete()
+    assert api.get(f"{BASE}{cp.id}/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_detail_if_modified_since(api):
+    cp = ChargePointFactory()
+    last_modified = api.get(f"{BASE}{cp.id}/")["Last-Modified"]
+    res = api.get(f"{BASE}{cp.id}/", HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert res.status_code == 304
+
+
+def test_list_validators_run_no_count(api):
+    ChargePointFactory()
+    etag = api.get(f"{BASE}?cursor=")["ETag"]
+    with CaptureQueriesContext(connection) as ctx:
+        assert api.get(f"{BASE}?cursor=", HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert not any("COUNT(" in q["sql"].upper() for q in ctx.captured_queries)
+
+
+def test_list_etag_depends_on_filters_and_changes_on_soft_delete(api):
+    keep = ChargePointFactory(status="ready")
+    gone = ChargePointFactory(status="ready")
+    res = api.get(f"{BASE}?status=ready")
+    etag = res["ETag"]
+    assert api.get(f"{BASE}?status=ready", HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert api.get(f"{BASE}?status=error", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    ChargePoint.objects.filter(pk=gone.pk).delete()
+    res = api.get(f"{BASE}?status=ready", HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert [x["id"] for x in res.json()["data"]["results"]] == [keep.id]
+
+
+def test_list_last_modified_reflects_soft_delete(api):
+    ChargePointFactory()
+    gone = ChargePointFactory()
+    last_modified = api.get(BASE)["Last-Modified"]
+    ChargePoint.objects.filter(pk=gone.pk).update(
+        deleted_at=ChargePoint.objects.get(pk=gone.pk).updated_at.replace(year=2999),
+        updated_at=ChargePoint.objects.get(pk=gone.pk).updated_at.replace(year=2999),
+    )
+    assert api.get(BASE, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 200
+
+
+def test_queryset_update_and_soft_delete_touch_updated_at():
+    cp = ChargePointFactory()
+    before = cp.updated_at
+    ChargePoint.objects.filter(pk=cp.pk).update(status="error")
+    cp.refresh_from_db()
+    assert cp.updated_at > before
+
+    before = cp.updated_at
+    cp.delete()
+    cp.refresh_from_db()
+    assert cp.updated_at > before
+
+
+def test_unknown_or_malformed_pk_still_404(api):
+    assert api.get(f"{BASE}999999/").status_code == 404
+    assert api.get(f"{BASE}abc/").status_code == 404
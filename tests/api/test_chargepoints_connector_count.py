@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from chargepoints.pagination import KeysetPagination
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+BASE = "/api/v1/chargepoint/"
+
+
+@pytest.fixture
+def fleet():
+    """ChargePoints con 0..4 conectores vivos (y uno borrado que no cuenta)."""
+    cps = [ChargePointFactory(name=f"CP-{n}") for n in range(5)]
+    for n, cp in enumerate(cps):
+        ConnectorFactory.create_batch(n, charge_point=cp)
+    ConnectorFactory(charge_point=cps[0]).delete()
+    return cps
+
+
+def _names(res) -> list[str]:
+    assert res.status_code == 200, res.json()
+    return [x["name"] for x in res.json()["data"]["results"]]
+
+
+def test_connector_count_in_representation(api, fleet):
+    data = api.get(f"{BASE}{fleet[3].id}/").json()["data"]
+    assert data["connector_count"] == 3 == len(data["connectors"])
+    assert api.get(f"{BASE}{fleet[0].id}/").json()["data"]["connector_count"] == 0
+
+
+def test_min_and_max_connectors_filters(api, fleet):
+    assert _names(api.get(f"{BASE}?min_connectors=3&ordering=name")) == ["CP-3", "CP-4"]
+    assert _names(api.get(f"{BASE}?max_connectors=1&ordering=name")) == ["CP-0", "CP-1"]
+    res = api.get(f"{BASE}?min_connectors=1&max_connectors=2&ordering=name")
+    assert _names(res) == ["CP-1", "CP-2"]
+
+
+def test_invalid_connector_filters_return_400(api, fleet):
+    assert api.get(f"{BASE}?min_connectors=abc").status_code == 400
+    assert api.get(f"{BASE}?max_connectors=-1").status_code == 400
+
+
+def test_filters_do_not_count_connectors_per_request(api, fleet):
+    with CaptureQueriesContext(connection) as ctx:
+        api.get(f"{BASE}?min_connectors=2&fields=id,connector_count")
+    # Solo el validador MAX(updated_at) del ETag lee la tabla de conectores
+    sql = [q["sql"] for q in ctx.captured_queries if "MAX(" not in q["sql"]]
+    assert not any("chargepoints_connector" in q for q in sql)
+
+
+def test_ordering_by_connector_count_with_cursor(api, fleet, monkeypatch):
+    assert _names(api.get(f"{BASE}?ordering=-connector_count"))[:2] == ["CP-4", "CP-3"]
+
+    monkeypatch.setattr(KeysetPagination, "page_size", 2)
+    counts, url = [], f"{BASE}?ordering=connector_count&cursor="
+    while url:
+        body = api.get(url).json()["data"]
+        counts += [x["connector_count"] for x in body["results"]]
+        url = body["next"]
+    assert counts == [0, 1, 2, 3, 4]
+
+
+def test_connector_writes_update_listing(api, fleet):
+    ConnectorFactory.create_batch(4, charge_point=fleet[0])
+    assert _names(api.get(f"{BASE}?min_connectors=4&ordering=name")) == ["CP-0", "CP-4"]
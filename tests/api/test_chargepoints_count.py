@@ -0,0 +1,76 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+
+from tests.factories import ChargePointFactory
+
+pytestmark = pytest.mark.django_db
+
+BASE = "/api/v1/chargepoint/"
+POSTGRES = connection.vendor == "postgresql"
+
+
+@pytest.fixture
+def fleet(settings):
+    settings.CHARGEPOINTS_PAGINATION = {"EXACT_COUNT_THRESHOLD": 12}
+    cps = ChargePointFactory.create_batch(25, status="ready")
+    for cp in cps[:2]:
+        cp.status = "error"
+        cp.save()
+    return cps
+
+
+def _page(api, query: str) -> dict:
+    res = api.get(f"{BASE}?{query}")
+    assert res.status_code == 200, res.content
+    return res.json()["data"]
+
+
+def test_exact_by_default(api, fleet):
+    data = _page(api, "")
+    assert (data["count"], data["count_is_exact"]) == (25, True)
+
+
+def test_capped_count_keeps_paging_past_the_cap(api, fleet):
+    data = _page(api, "count=capped")
+    assert (data["count"], data["count_is_exact"]) == (12, False)
+    assert "page=2" in data["next"]
+
+    # El recuento dice 2 páginas; la 3 existe igual y es la última (no llena)
+    data = _page(api, "count=capped&page=2")
+    assert len(data["results"]) == 10 and "page=3" in data["next"]
+    data = _page(api, "count=capped&page=3")
+    assert len(data["results"]) == 5 and data["next"] is None
+    assert api.get(f"{BASE}?count=capped&page=0").status_code == 404
+
+
+def test_estimated_count(api, fleet):
+    data = _page(api, "count=estimated")
+    assert not data["count_is_exact"] and data["count"] >= 12
+    if not POSTGRES:
+        assert data["count"] == 12  # sin planificador: el tope
+
+
+def test_small_results_stay_exact(api, fleet):
+    data = _page(api, "count=estimated&status=error")
+    assert (data["count"], data["count_is_exact"]) == (2, True)
+
+
+def test_mode_from_settings_and_validation(api, fleet, settings):
+    settings.CHARGEPOINTS_PAGINATION = {"COUNT": "capped", "EXACT_COUNT_THRESHOLD": 12}
+    assert _page(api, "")["count_is_exact"] is False
+    assert _page(api, "count=exact")["count"] == 25
+
+    res = api.get(f"{BASE}?count=bogus")
+    assert res.status_code == 400
+    assert "count" in res.json()["errors"]
+
+
+def test_async_list_uses_the_same_counts(fleet, settings):
+    settings.ROOT_URLCONF = "tests.async_urls"
+    res = async_to_sync(AsyncClient().get)(f"{BASE}?count=capped&page=3")
+    assert res.status_code == 200, res.content
+    data = res.json()["data"]
+    assert (data["count"], data["count_is_exact"], len(data["results"])) == (12, False, 5)
+    assert data["next"] is None
@@ -0,0 +1,93 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.factories import ChargePointFactory
+
+pytestmark = pytest.mark.django_db
+
+BASE = "/api/v1/chargepoint/"
+
+
+def _walk(api, url):
+    """Recorre todas las páginas siguiendo `next` y devuelve los ids en orden."""
+    ids = []
+    while url:
+        res = api.get(url)
+        assert res.status_code == 200
+        body = res.json()
+        assert body["code"] == 200 and body["errors"] is None
+        assert "count" not in body["data"]
+        ids += [x["id"] for x in body["data"]["results"]]
+        url = body["data"]["next"]
+    return ids
+
+
+def test_cursor_mode_walks_all_pages_without_duplicates(api):
+    for i in range(25):
+        ChargePointFactory(name=f"CP-{i:03d}")
+
+    ids = _walk(api, f"{BASE}?cursor=")
+    assert len(ids) == 25
+    assert len(set(ids)) == 25
+
+    # Mismo orden que el listado paginado clásico (-created_at, id)
+    classic = []
+    for page in (1, 2, 3):
+        classic += [x["id"] for x in api.get(f"{BASE}?page={page}").json()["data"]["results"]]
+    assert ids == classic
+
+
+def test_cursor_mode_previous_link_returns_previous_page(api):
+    for i in range(15):
+        ChargePointFactory(name=f"CP-{i:03d}")
+
+    first = api.get(f"{BASE}?cursor=").json()["data"]
+    assert first["previous"] is None
+    second = api.get(first["next"]).json()["data"]
+    assert second["next"] is None
+    back = api.get(second["previous"]).json()["data"]
+    assert [x["id"] for x in back["results"]] == [x["id"] for x in first["results"]]
+
+
+def test_cursor_mode_composes_with_filters_and_ordering(api):
+    for i in range(12):
+        ChargePointFactory(name=f"AA-{i:02d}", status="ready")
+    ChargePointFactory(name="ZZ-CHARG", status="charging")
+
+    names = []
+    url = f"{BASE}?status=ready&search=AA&ordering=-name&cursor="
+    while url:
+        data = api.get(url).json()["data"]
+        names += [x["name"] for x in data["results"]]
+        url = data["next"]
+    assert names == sorted((f"AA-{i:02d}" for i in range(12)), reverse=True)
+
+
+def test_cursor_mode_runs_no_count_and_no_offset(api):
+    for i in range(12):
+        ChargePointFactory(name=f"CP-{i:03d}")
+    nxt = api.get(f"{BASE}?cursor=").json()["data"]["next"]
+
+    with CaptureQueriesContext(connection) as ctx:
+        res = api.get(nxt)
+    assert res.status_code == 200
+    sql = " ".join(q["sql"].upper() for q in ctx.captured_queries)
+    assert "COUNT(" not in sql
+    assert "OFFSET" not in sql
+
+
+def test_cursor_mode_invalid_token_404_envelope(api):
+    res = api.get(f"{BASE}?cursor=no-es-un-cursor")
+    assert res.status_code == 404
+    body = res.json()
+    assert body["code"] == 404
+    assert body["data"] is None
+
+
+def test_cursor_from_other_ordering_is_rejected(api):
+    for i in range(12):
+        ChargePointFactory(name=f"CP-{i:03d}")
+    nxt = api.get(f"{BASE}?cursor=").json()["data"]["next"]
+    res = api.get(f"{nxt}&ordering=name")
+    assert res.status_code == 404
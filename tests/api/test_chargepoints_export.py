@@ -0,0 +1,112 @@
+import csv
+import io
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from chargepoints import export
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/v1/chargepoint/export"
+
+
+@pytest.fixture
+def fleet():
+    cps = [
+        ChargePointFactory(name=f"EXP-{i:02d}", status="ready" if i % 2 else "error")
+        for i in range(5)
+    ]
+    ConnectorFactory(charge_point=cps[0], evse_number="E-1")
+    ConnectorFactory(charge_point=cps[0], evse_number="E-2")
+    ConnectorFactory(charge_point=cps[1], evse_number="E-3").delete()
+    cps[4].delete()
+    return cps
+
+
+def _body(res) -> str:
+    assert res.streaming
+    return b"".join(res.streaming_content).decode("utf-8")
+
+
+def test_ndjson_export_matches_list_items(api, fleet):
+    res = api.get(f"{URL}?format=ndjson")
+    assert res.status_code == 200
+    assert res["Content-Type"] == "application/x-ndjson"
+    assert 'filename="chargepoints.ndjson"' in res["Content-Disposition"]
+    lines = [json.loads(line) for line in _body(res).splitlines()]
+
+    listed = api.get("/api/v1/chargepoint/?page_size=100").json()["data"]["results"]
+    assert lines[: len(listed)] == listed
+    assert len(lines) == 4  # el borrado no se exporta
+
+
+def test_csv_export_with_header_and_connectors(api, fleet):
+    res = api.get(f"{URL}?format=csv&ordering=name")
+    assert res["Content-Type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(io.StringIO(_body(res))))
+    assert [r["name"] for r in rows] == ["EXP-00", "EXP-01", "EXP-02", "EXP-03"]
+    assert rows[0]["connectors"] in {"E-1|E-2", "E-2|E-1"}
+    assert rows[1]["connectors"] == ""
+
+
+def test_export_honours_filters_and_fields(api, fleet):
+    res = api.get(f"{URL}?format=csv&status=error&fields=id,name")
+    rows = list(csv.reader(io.StringIO(_body(res))))
+    assert rows[0] == ["id", "name"]
+    assert sorted(r[1] for r in rows[1:]) == ["EXP-00", "EXP-02"]
+
+
+def test_export_defaults_to_ndjson_and_accepts_accept_header(api, fleet):
+    assert api.get(URL)["Content-Type"] == "application/x-ndjson"
+    assert api.get(URL, HTTP_ACCEPT="text/csv")["Content-Type"].startswith("text/csv")
+
+
+def test_export_loads_connectors_per_chunk(api, fleet, monkeypatch, django_assert_max_num_queries):
+    from chargepoints.views import ChargePointViewSet
+
+    monkeypatch.setattr(ChargePointViewSet, "export_chunk_size", 2)
+    with django_assert_max_num_queries(1 + 2) as ctx:
+        lines = _body(api.get(URL)).splitlines()
+    assert len(lines) == 4
+    # 1 SELECT de ChargePoints (cursor) + 1 de conectores por bloque de 2
+    assert sum("chargepoints_connector" in q["sql"] for q in ctx.captured_queries) == 2
+
+
+def test_asgi_export_streams_chunk_by_chunk(fleet, monkeypatch):
+    from chargepoints.views import ChargePointViewSet
+
+    monkeypatch.setattr(ChargePointViewSet, "export_chunk_size", 2)
+    projected = []
+    project = export.project_chargepoints
+    monkeypatch.setattr(
+        export,
+        "project_chargepoints",
+        lambda rows, **kwargs: projected.append(len(rows)) or project(rows, **kwargs),
+    )
+
+    async def fetch():
+        res = await AsyncClient().get(f"{URL}?format=ndjson")
+        # Iterador async: ASGIHandler lo envía parte a parte (uno síncrono lo haría `list`)
+        assert res.streaming and res.is_async
+        parts = []
+        async for part in res.streaming_content:
+            parts.append(part)
+            seen = len(projected)
+            if len(parts) == 1:
+                assert seen == 1  # el primer bloque sale antes de leer el segundo
+        return parts
+
+    parts = async_to_sync(fetch)()
+    assert projected == [2, 2]
+    assert len(parts) == 2
+    assert len(b"".join(parts).splitlines()) == 4
+
+
+def test_export_invalid_filter_returns_error_envelope(api, fleet):
+    res = api.get(f"{URL}?status=bogus")
+    assert res.status_code == 400
+    assert json.loads(res.content)["errors"]["status"]
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+
+from chargepoints import renderers
+from chargepoints.models import ChargePoint
+from chargepoints.pagination import ChargePointPagination, KeysetPagination
+from chargepoints.renderers import FastJSONRenderer
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+BASE = "/api/v1/chargepoint/"
+
+
+@pytest.fixture
+def dataset():
+    base = timezone.now().replace(microsecond=123456)
+    names = ["CP-ÁÉÍ", "CP- sep", "cp-alpha", "CP-ALPHA-2", "zeta", "Ωmega"]
+    cps = []
+    for i, name in enumerate(names):
+        cp = ChargePointFactory(name=name, status=["ready", "charging", "error"][i % 3])
+        ChargePoint.all_objects.filter(pk=cp.pk).update(created_at=base - timedelta(minutes=i))
+        for j in range(i % 3):
+            ConnectorFactory(charge_point=cp, evse_number=f"EVSE-{i}-{j}")
+        cps.append(cp)
+    # Un conector borrado no debe aparecer en ninguno de los dos caminos
+    ConnectorFactory(charge_point=cps[1]).delete()
+    return cps
+
+
+def _both(api, settings, url):
+    settings.CHARGEPOINTS_FAST_READ_PATH = False
+    slow = api.get(url)
+    settings.CHARGEPOINTS_FAST_READ_PATH = True
+    with CaptureQueriesContext(connection) as ctx:
+        fast = api.get(url)
+    return slow, fast, ctx
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "",
+        "?page=2",
+        "?status=ready",
+        "?search=alpha",
+        "?ordering=name",
+        "?ordering=-name&status=charging",
+        "?cursor=",
+        "?cursor=&search=cp&ordering=created_at",
+    ],
+)
+def test_list_is_byte_identical(api, settings, monkeypatch, dataset, query):
+    monkeypatch.setattr(ChargePointPagination, "page_size", 4)
+    monkeypatch.setattr(KeysetPagination, "page_size", 4)
+    slow, fast, _ = _both(api, settings, f"{BASE}{query}")
+    assert slow.status_code == fast.status_code == 200
+    assert fast.content == slow.content
+
+
+def test_retrieve_is_byte_identical(api, settings, dataset):
+    for cp in dataset:
+        slow, fast, ctx = _both(api, settings, f"{BASE}{cp.id}/")
+        assert fast.status_code == 200
+        assert fast.content == slow.content
+        # Validadores condicionales + fila + conectores
+        assert len(ctx.captured_queries) == 3
+
+
+def test_retrieve_missing_and_soft_deleted_return_404(api, settings, dataset):
+    dataset[0].delete()
+    for pk in (dataset[0].id, 999999):
+        slow, fast, _ = _both(api, settings, f"{BASE}{pk}/")
+        assert fast.status_code == slow.status_code == 404
+        assert fast.content == slow.content
+
+
+def test_list_uses_one_query_for_connectors(api, settings, dataset):
+    _, fast, ctx = _both(api, settings, f"{BASE}?cursor=")
+    assert fast.status_code == 200
+    connector_queries = [q for q in ctx.captured_queries if "chargepoints_connector" in q["sql"]]
+    # MAX(updated_at) de los validadores + carga agrupada de conectores
+    assert len([q for q in connector_queries if "MAX(" not in q["sql"]]) == 1
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"code": 200, "message": "OK", "data": {"name": "ñandú     😀"}, "errors": None},
+        {"errors": {"name": [ErrorDetail("Obligatorio.", code="required")]}},
+        {"when": datetime(2025, 1, 1, 12, 0, tzinfo=timezone.get_current_timezone())},
+        {1: "clave entera"},
+        [1.5, True, None, "x" * 1000],
+    ],
+)
+def test_fast_renderer_matches_json_renderer(data):
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_fast_renderer_encodes_with_orjson(monkeypatch):
+    # orjson está en requirements.txt: la paridad de arriba cubre su rama, no el fallback
+    assert renderers.orjson is not None
+    calls = []
+    dumps = renderers.orjson.dumps
+    monkeypatch.setattr(
+        renderers.orjson, "dumps", lambda *args, **kwargs: calls.append(1) or dumps(*args, **kwargs)
+    )
+    FastJSONRenderer().render({"code": 200, "data": [1, 2]})
+    assert calls
+
+
+def test_fast_renderer_keeps_indent_for_browsable_api():
+    data = {"a": [1, 2]}
+    context = {"indent": 4}
+    assert FastJSONRenderer().render(data, renderer_context=context) == JSONRenderer().render(
+        data, renderer_context=context
+    )
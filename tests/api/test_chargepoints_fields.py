@@ -0,0 +1,96 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+BASE = "/api/v1/chargepoint/"
+
+
+@pytest.fixture
+def cp():
+    cp = ChargePointFactory(name="CP-FIELDS", status="charging")
+    ConnectorFactory(charge_point=cp, evse_number="EVSE-F1")
+    return cp
+
+
+def _get(api, url):
+    with CaptureQueriesContext(connection) as ctx:
+        res = api.get(url)
+    sql = [q["sql"] for q in ctx.captured_queries if "MAX(" not in q["sql"]]
+    return res, sql
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_fields_restricts_body_and_sql(api, settings, cp, fast):
+    settings.CHARGEPOINTS_FAST_READ_PATH = fast
+    res, sql = _get(api, f"{BASE}?fields=id,status")
+    assert res.status_code == 200
+    assert res.json()["data"]["results"] == [{"id": cp.id, "status": "charging"}]
+    # Sin prefetch de conectores y sin leer `name`
+    assert not any("chargepoints_connector" in q for q in sql)
+    assert not any('"name"' in q for q in sql if "COUNT(" not in q)
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_expand_and_omit_connectors(api, settings, cp, fast):
+    settings.CHARGEPOINTS_FAST_READ_PATH = fast
+    res = api.get(f"{BASE}{cp.id}/?fields=id&expand=connectors")
+    assert res.json()["data"] == {
+        "id": cp.id,
+        "connectors": [
+            {"id": cp.connectors.get().id, "evse_number": "EVSE-F1", "deleted_at": None}
+        ],
+    }
+
+    res, sql = _get(api, f"{BASE}{cp.id}/?omit=connectors")
+    assert list(res.json()["data"]) == ["id", "name", "status", "created_at", "connector_count"]
+    assert not any("chargepoints_connector" in q for q in sql)
+
+
+def test_fieldsets_match_between_fast_and_serializer_paths(api, settings, cp):
+    ChargePointFactory.create_batch(3)
+    for query in [
+        "?fields=name",
+        "?fields=status,id&omit=id",
+        "?fields=connectors",
+        "?cursor=&fields=id",
+    ]:
+        settings.CHARGEPOINTS_FAST_READ_PATH = False
+        slow = api.get(f"{BASE}{query}")
+        settings.CHARGEPOINTS_FAST_READ_PATH = True
+        fast = api.get(f"{BASE}{query}")
+        assert fast.content == slow.content, query
+
+
+def test_cursor_pagination_works_with_sparse_fields(api):
+    ChargePointFactory.create_batch(15)
+    res = api.get(f"{BASE}?cursor=&fields=id")
+    body = res.json()["data"]
+    assert all(list(item) == ["id"] for item in body["results"])
+    second = api.get(body["next"]).json()["data"]
+    ids = {item["id"] for item in body["results"]} | {item["id"] for item in second["results"]}
+    assert len(ids) == 15
+
+
+def test_unknown_fields_return_400(api, cp):
+    res = api.get(f"{BASE}?fields=id,secret&expand=name")
+    assert res.status_code == 400
+    errors = res.json()["errors"]
+    assert errors["fields"] == ["Campo desconocido: secret."]
+    assert errors["expand"] == ["Campo desconocido: name."]
+
+
+def test_empty_fields_param_returns_everything(api, cp):
+    data = api.get(f"{BASE}{cp.id}/?fields=").json()["data"]
+    assert list(data) == ["id", "name", "status", "created_at", "connector_count", "connectors"]
+
+
+def test_schema_documents_fieldset_parameters(api):
+    schema = api.get("/api/schema/?format=json").json()
+    for path in ("/api/v1/chargepoint", "/api/v1/chargepoint/{id}"):
+        operation = next(v for k, v in schema["paths"].items() if k.rstrip("/") == path)["get"]
+        names = {p["name"] for p in operation["parameters"]}
+        assert {"fields", "expand", "omit"} <= names
@@ -0,0 +1,98 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from chargepoints.models import ChargePointStatusEvent
+from chargepoints.pagination import StatusHistoryPagination
+from tests.factories import ChargePointFactory
+
+pytestmark = pytest.mark.django_db
+
+BASE = "/api/v1/chargepoint/"
+T0 = datetime(2025, 3, 1, tzinfo=UTC)
+
+
+def _history(api, pk, query=""):
+    res = api.get(f"{BASE}{pk}/history/{query}")
+    assert res.status_code == 200, res.json()
+    body = res.json()
+    assert body["code"] == 200 and body["errors"] is None
+    return body["data"]
+
+
+@pytest.fixture
+def cp():
+    cp = ChargePointFactory(status="ready")
+    ChargePointStatusEvent.objects.all().delete()
+    statuses = ["ready", "charging", "waiting", "error", "ready", "charging"]
+    ChargePointStatusEvent.objects.bulk_create(
+        ChargePointStatusEvent(
+            charge_point_id=cp.pk,
+            previous_status=statuses[i - 1] if i else "",
+            status=statuses[i],
+            occurred_at=T0 + timedelta(days=10 * i),
+        )
+        for i in range(len(statuses))
+    )
+    return cp
+
+
+def test_history_is_newest_first(api, cp):
+    data = _history(api, cp.pk)
+    assert data["next"] is None and data["previous"] is None
+    assert [(e["previous_status"], e["status"]) for e in data["results"]][:2] == [
+        ("ready", "charging"),
+        ("error", "ready"),
+    ]
+    assert set(data["results"][0]) == {"id", "status", "previous_status", "occurred_at"}
+
+
+def test_history_follows_api_writes(api):
+    pk = api.post(BASE, {"name": "CP-HIST", "status": "ready"}, format="json").json()["data"]["id"]
+    api.patch(f"{BASE}{pk}/", {"status": "error"}, format="json")
+    results = _history(api, pk)["results"]
+    assert [(e["previous_status"], e["status"]) for e in results] == [
+        ("ready", "error"),
+        ("", "ready"),
+    ]
+
+
+def test_history_range_is_half_open(api, cp):
+    query = "?from=2025-03-11T00:00:00Z&to=2025-03-31T00:00:00Z"
+    data = _history(api, cp.pk, query)
+    assert [e["occurred_at"][:10] for e in data["results"]] == ["2025-03-21", "2025-03-11"]
+
+
+def test_history_keyset_walk(api, cp, monkeypatch):
+    monkeypatch.setattr(StatusHistoryPagination, "page_size", 4)
+    first = _history(api, cp.pk)
+    assert len(first["results"]) == 4 and first["previous"] is None
+    second = api.get(first["next"]).json()["data"]
+    assert len(second["results"]) == 2 and second["next"] is None
+    seen = [e["id"] for e in first["results"] + second["results"]]
+    assert seen == sorted(seen, reverse=True)
+
+    back = api.get(second["previous"]).json()["data"]
+    assert back["results"] == first["results"]
+
+
+def test_history_of_unknown_or_deleted_chargepoint_is_404(api, cp):
+    assert api.get(f"{BASE}999999/history/").status_code == 404
+    cp.delete()
+    assert api.get(f"{BASE}{cp.pk}/history/").status_code == 404
+
+
+def test_history_invalid_range_is_400(api, cp):
+    res = api.get(f"{BASE}{cp.pk}/history/?from=ayer")
+    assert res.status_code == 400
+    assert "from" in res.json()["errors"]
+
+    res = api.get(f"{BASE}{cp.pk}/history/?from=2025-04-01T00:00:00Z&to=2025-03-01T00:00:00Z")
+    assert res.status_code == 400
+    assert "to" in res.json()["errors"]
+
+
+def test_history_reads_one_page_in_two_queries(api, cp, django_assert_num_queries):
+    # Existencia del ChargePoint + página de eventos (sin COUNT)
+    with django_assert_num_queries(2):
+        _history(api, cp.pk, "?from=2025-03-01T00:00:00Z")
@@ -0,0 +1,134 @@
+"""
+Réplicas de lectura con dos bases SQLite: la base de tests hace de primario y un fichero
+SQLite migrado aparte, de réplica. Los datos de cada una son distintos a propósito (no
+hay replicación): el nombre devuelto indica de qué base se ha leído.
+"""
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+
+from chargepoints.models import ChargePoint
+from chargepoints.routing import DEFAULTS
+from tests.factories import ChargePointFactory
+
+pytestmark = pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+
+BASE = "/api/v1/chargepoint/"
+REPLICA = "replica"
+COOKIE, HEADER = DEFAULTS["COOKIE"], DEFAULTS["HEADER"]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def replica_db(tmp_path_factory, django_db_setup, django_db_blocker):
+    """Registra y migra el alias `replica` (antes que la base de tests de cada test)."""
+    databases = {DEFAULT_DB_ALIAS: {}, REPLICA: {"ENGINE": "django.db.backends.sqlite3"}}
+    databases[REPLICA]["NAME"] = str(tmp_path_factory.mktemp("replica") / "replica.sqlite3")
+    connections.settings[REPLICA] = connections.configure_settings(databases)[REPLICA]
+    with django_db_blocker.unblock():
+        call_command("migrate", database=REPLICA, run_syncdb=True, verbosity=0)
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+@pytest.fixture
+def replica(settings):
+    settings.CHARGEPOINTS_REPLICAS = {"REPLICAS": {REPLICA: 1}}
+    return REPLICA
+
+
+@pytest.fixture
+def data(replica):
+    primary = ChargePointFactory(name="CP-PRIMARY", status="ready")
+    on_replica = ChargePoint.objects.using(replica).create(name="CP-REPLICA", status="ready")
+    return primary, on_replica
+
+
+def _names(response) -> list[str]:
+    assert response.status_code == 200, response.content
+    return [cp["name"] for cp in response.json()["data"]["results"]]
+
+
+def test_reads_go_to_the_replica(data):
+    primary, on_replica = data
+    api = APIClient()
+    assert _names(api.get(BASE)) == ["CP-REPLICA"]
+    assert _names(api.get(f"{BASE}?cursor=")) == ["CP-REPLICA"]
+    assert api.get(f"{BASE}{on_replica.pk}/").json()["data"]["name"] == "CP-REPLICA"
+    assert api.get(f"{BASE}{on_replica.pk}/history/").status_code == 200
+    assert api.get(f"{BASE}summary/").json()["data"]["total"] == 1
+    assert COOKIE not in api.cookies
+
+
+def test_writes_go_to_the_primary_and_pin_the_client(data):
+    api = APIClient()
+    res = api.post(BASE, {"name": "CP-NEW", "status": "ready"}, format="json")
+    assert res.status_code == 201
+    assert ChargePoint.objects.using(DEFAULT_DB_ALIAS).filter(name="CP-NEW").exists()
+    assert not ChargePoint.objects.using(REPLICA).filter(name="CP-NEW").exists()
+    assert res[HEADER] == api.cookies[COOKIE].value
+    assert api.cookies[COOKIE]["httponly"]
+
+    # La cookie fija sus lecturas al primario; otro cliente sigue leyendo de la réplica
+    assert _names(api.get(f"{BASE}?ordering=name")) == ["CP-NEW", "CP-PRIMARY"]
+    assert _names(APIClient().get(BASE)) == ["CP-REPLICA"]
+
+    # Vencido el plazo, vuelve a la réplica
+    api.cookies[COOKIE] = "1"
+    assert _names(api.get(BASE)) == ["CP-REPLICA"]
+
+
+def test_header_pins_clients_without_cookies(data):
+    primary, _ = data
+    writer = APIClient()
+    res = writer.patch(f"{BASE}{primary.pk}/", {"status": "error"}, format="json")
+    assert res.status_code == 200
+    until = res[HEADER]
+
+    reader = APIClient()
+    assert _names(reader.get(BASE, headers={HEADER: until})) == ["CP-PRIMARY"]
+    # Un plazo que este servidor no puede haber emitido (más allá de la ventana) no cuenta
+    assert _names(reader.get(BASE, headers={HEADER: "99999999999"})) == ["CP-REPLICA"]
+
+
+def test_failed_writes_and_reads_do_not_pin(data):
+    api = APIClient()
+    assert api.post(BASE, {"name": "", "status": "bogus"}, format="json").status_code == 400
+    api.get(BASE)
+    assert COOKIE not in api.cookies
+
+
+def test_sticky_window_is_configurable(data, settings):
+    settings.CHARGEPOINTS_REPLICAS = {"REPLICAS": {REPLICA: 1}, "STICKY_SECONDS": 0}
+    api = APIClient()
+    assert api.post(BASE, {"name": "CP-NEW", "status": "ready"}, format="json").status_code == 201
+    assert COOKIE not in api.cookies
+    assert _names(api.get(BASE)) == ["CP-REPLICA"]
+
+
+def test_async_reads_go_to_the_replica(data, settings):
+    settings.ROOT_URLCONF = "tests.async_urls"
+    res = async_to_sync(AsyncClient().get)(BASE)
+    assert _names(res) == ["CP-REPLICA"]
+
+
+def test_admin_changelist_reads_from_the_replica(data):
+    user = get_user_model().objects.create_superuser("admin", "admin@example.com", "x")
+    client = APIClient()
+    client.force_login(user)
+    res = client.get("/admin/chargepoints/chargepoint/")
+    assert res.status_code == 200
+    content = res.content.decode()
+    assert "CP-REPLICA" in content and "CP-PRIMARY" not in content
+
+    # El formulario de cambio (y sus escrituras) va al primario
+    primary, _ = data
+    res = client.get(f"/admin/chargepoints/chargepoint/{primary.pk}/change/")
+    assert res.status_code == 200
+    assert "CP-PRIMARY" in res.content.decode()
@@ -0,0 +1,142 @@
+import logging
+import re
+import time
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from chargepoints import instrumentation
+from chargepoints.models import ChargePoint
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+BASE = "/api/v1/chargepoint/"
+
+
+def _client(settings, **options):
+    # El middleware lee la configuración al cargarse: un cliente nuevo por ajuste.
+    settings.CHARGEPOINTS_INSTRUMENTATION = {"ENABLED": True, **options}
+    return APIClient()
+
+
+def _metrics(header: str) -> dict[str, dict]:
+    metrics = {}
+    for item in header.split(", "):
+        name, *params = item.split(";")
+        metrics[name] = dict(p.split("=", 1) for p in params)
+    return metrics
+
+
+def test_disabled_by_default_no_header(api):
+    ChargePointFactory()
+    res = api.get(BASE)
+    assert res.status_code == 200
+    assert not res.has_header("Server-Timing")
+
+
+def test_list_server_timing_header(settings):
+    api = _client(settings)
+    for cp in ChargePointFactory.create_batch(3):
+        ConnectorFactory(charge_point=cp)
+
+    with CaptureQueriesContext(connection) as ctx:
+        res = api.get(BASE)
+    assert res.status_code == 200
+
+    metrics = _metrics(res["Server-Timing"])
+    assert list(metrics) == ["db", "serialize", "render", "total"]
+    assert metrics["db"]["desc"] == f'"{len(ctx.captured_queries)} queries"'
+    for values in metrics.values():
+        assert float(values["dur"]) >= 0
+    assert float(metrics["total"]["dur"]) >= float(metrics["db"]["dur"])
+
+
+def test_envelope_unchanged(settings, api):
+    ChargePointFactory.create_batch(2)
+    plain = api.get(BASE)
+    timed = _client(settings).get(BASE)
+    assert timed.content == plain.content
+    assert set(timed.json()) == {"code", "message", "data", "errors"}
+
+
+def test_write_and_error_responses_are_timed(settings):
+    api = _client(settings)
+    res = api.post(BASE, {"name": "CP-T1", "status": "ready"}, format="json")
+    assert res.status_code == 201
+    assert "serialize" in _metrics(res["Server-Timing"])
+
+    res = api.get(f"{BASE}999999/")
+    assert res.status_code == 404
+    assert res.json()["code"] == 404
+    assert "db" in _metrics(res["Server-Timing"])
+
+
+def test_sample_rate_zero_skips_instrumentation(settings):
+    api = _client(settings, SAMPLE_RATE=0)
+    assert not api.get(BASE).has_header("Server-Timing")
+
+
+def test_header_can_be_disabled_keeping_log(settings, caplog):
+    api = _client(settings, HEADER=False)
+    ChargePointFactory()
+    with caplog.at_level(logging.INFO, logger="chargepoints.instrumentation"):
+        res = api.get(f"{BASE}?status=ready")
+    assert not res.has_header("Server-Timing")
+
+    (record,) = caplog.records
+    assert record.http_method == "GET"
+    assert record.http_path == BASE
+    assert record.status_code == 200
+    assert record.db_queries >= 1
+    for attr in ("db_ms", "serialize_ms", "render_ms", "total_ms"):
+        assert isinstance(getattr(record, attr), float)
+    assert re.search(r"db_queries=\d+ db_ms=[\d.]+", record.getMessage())
+
+
+def test_middleware_is_async_capable(settings):
+    settings.CHARGEPOINTS_INSTRUMENTATION = {"ENABLED": True}
+
+    async def get_response(request):
+        return None
+
+    assert iscoroutinefunction(instrumentation.ServerTimingMiddleware(get_response))
+    assert not iscoroutinefunction(instrumentation.ServerTimingMiddleware(lambda r: None))
+
+
+def test_async_views_are_timed(settings):
+    settings.CHARGEPOINTS_INSTRUMENTATION = {"ENABLED": True}
+    settings.ROOT_URLCONF = "tests.async_urls"
+    ChargePointFactory.create_batch(2)
+
+    res = async_to_sync(AsyncClient().get)(BASE)
+    assert res.status_code == 200
+
+    metrics = _metrics(res["Server-Timing"])
+    assert list(metrics) == ["db", "serialize", "total"]
+    # el SQL del ORM async (hilo de sync_to_async) también se cuenta
+    assert int(metrics["db"]["desc"].strip('"').split()[0]) > 0
+
+
+def test_phase_excludes_nested_sql_time():
+    timings = instrumentation.RequestTimings()
+    token = instrumentation._current.set(timings)
+    try:
+        start = time.perf_counter()
+        with connection.execute_wrapper(timings), instrumentation.phase("serialize"):
+            ChargePoint.objects.count()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    finally:
+        instrumentation._current.reset(token)
+    assert timings.db_queries == 1
+    assert timings.phases["serialize"] <= elapsed_ms - timings.db_ms
+
+
+def test_phase_is_noop_without_request():
+    with instrumentation.phase("serialize"):
+        pass
+    assert instrumentation._current.get() is None
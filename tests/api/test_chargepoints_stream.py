@@ -0,0 +1,148 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connection
+from django.test import AsyncClient
+
+from chargepoints import stream
+from chargepoints.models import ChargePoint
+from tests.factories import ChargePointFactory
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/v1/chargepoint/stream"
+
+
+@pytest.fixture
+def enabled(settings):
+    settings.CHARGEPOINTS_STREAM = {"ENABLED": True, "HEARTBEAT": 0.05}
+
+
+def _parse(chunk: bytes) -> dict:
+    fields = dict(line.split(": ", 1) for line in chunk.decode().strip().splitlines())
+    data = json.loads(fields["data"])
+    assert data["type"] == fields["event"]
+    return data
+
+
+async def _next(chunks, timeout: float = 2.0) -> bytes:
+    return await asyncio.wait_for(anext(chunks), timeout)
+
+
+async def _next_event(chunks) -> dict:
+    while (chunk := await _next(chunks)).startswith(b":"):
+        pass  # keep-alive
+    return _parse(chunk)
+
+
+def test_stream_disabled_returns_404(api):
+    assert api.get(URL).status_code == 404
+
+
+def test_invalid_filters_return_400(enabled):
+    get = async_to_sync(AsyncClient().get)
+    res = get(f"{URL}?status=bogus")
+    assert res.status_code == 400
+    assert res.json()["errors"] == {"status": ["Estado desconocido: bogus."]}
+    assert get(f"{URL}?id=1,x").status_code == 400
+
+
+def test_wsgi_request_returns_501(api, enabled):
+    # Bajo WSGI el stream ocuparía un hilo del worker durante toda la conexión
+    res = api.get(URL)
+    assert res.status_code == 501
+    assert not res.streaming
+    body = res.json()
+    assert body["code"] == 501 and body["data"] is None
+    assert body["errors"]["detail"]
+
+
+def test_stream_is_not_the_detail_route(api, enabled):
+    assert api.post(URL).status_code == 405
+
+
+def test_sse_delivers_filtered_events(enabled, django_capture_on_commit_callbacks):
+    cp = ChargePointFactory(status="ready")
+    other = ChargePointFactory(status="ready")
+
+    def write():
+        with django_capture_on_commit_callbacks(execute=True):
+            other.status = "error"
+            other.save()  # filtrado por id: no llega
+            cp.status = "charging"
+            cp.save()
+            ChargePoint.objects.filter(pk=cp.pk).delete()
+
+    async def scenario():
+        response = await AsyncClient().get(f"{URL}?id={cp.pk}&status=ready,charging")
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/event-stream"
+        assert response["Cache-Control"] == "no-cache"
+        chunks = aiter(response.streaming_content)
+        assert (await _next(chunks)).startswith(b"retry: ")
+        assert len(stream.broker) == 1
+
+        await sync_to_async(write)()
+        events = [await _next_event(chunks), await _next_event(chunks)]
+        await chunks.aclose()  # desconexión del cliente
+        return events
+
+    assert async_to_sync(scenario)() == [
+        {"type": "status_changed", "id": cp.pk, "status": "charging", "previous_status": "ready"},
+        {"type": "deleted", "id": cp.pk, "status": "charging"},
+    ]
+    assert len(stream.broker) == 0
+
+
+def test_idle_stream_sends_keep_alive(enabled):
+    async def scenario():
+        response = await AsyncClient().get(URL)
+        chunks = aiter(response.streaming_content)
+        await _next(chunks)
+        keep_alive = await _next(chunks)
+        await chunks.aclose()
+        return keep_alive
+
+    assert async_to_sync(scenario)() == b": keep-alive\n\n"
+
+
+def test_slow_client_receives_evicted(settings):
+    settings.CHARGEPOINTS_STREAM = {"ENABLED": True, "QUEUE_SIZE": 2}
+
+    async def scenario():
+        response = await AsyncClient().get(URL)
+        chunks = aiter(response.streaming_content)
+        await _next(chunks)
+        stream.broker.dispatch([stream.Event("updated", i, "ready") for i in range(3)])
+        return await _next(chunks), len(stream.broker)
+
+    chunk, subscribers = async_to_sync(scenario)()
+    assert chunk.startswith(b"event: evicted\n")
+    assert subscribers == 0
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="NOTIFY/LISTEN solo en PostgreSQL")
+@pytest.mark.django_db(transaction=True)
+def test_postgres_backend_fans_out_across_connections(settings):
+    # Los NOTIFY solo se entregan al confirmar: sin la transacción envolvente del test.
+    settings.CHARGEPOINTS_STREAM = {"ENABLED": True, "BACKEND": "postgres"}
+    backend = stream.get_backend()
+    backend.start()
+    assert backend.wait_ready(5)
+
+    async def scenario():
+        response = await AsyncClient().get(f"{URL}?status=waiting")
+        chunks = aiter(response.streaming_content)
+        await _next(chunks)
+        cp = await sync_to_async(ChargePointFactory)(status="waiting")
+        event = await _next_event(chunks)
+        await chunks.aclose()
+        return cp.pk, event
+
+    try:
+        pk, event = async_to_sync(scenario)()
+    finally:
+        backend.stop()
+    assert event == {"type": "created", "id": pk, "status": "waiting"}
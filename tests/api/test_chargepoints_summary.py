@@ -0,0 +1,67 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.factories import ChargePointFactory
+
+pytestmark = pytest.mark.django_db
+
+BASE = "/api/v1/chargepoint/"
+SUMMARY = f"{BASE}summary/"
+
+
+def _summary(api):
+    res = api.get(SUMMARY)
+    assert res.status_code == 200
+    body = res.json()
+    assert body["code"] == 200 and body["errors"] is None
+    return body["data"]
+
+
+def test_summary_empty(api):
+    assert _summary(api) == {
+        "total": 0,
+        "by_status": {"ready": 0, "charging": 0, "waiting": 0, "error": 0},
+    }
+
+
+def test_summary_reads_counters_in_one_query(api):
+    ChargePointFactory.create_batch(3, status="ready")
+    ChargePointFactory(status="error")
+    with CaptureQueriesContext(connection) as ctx:
+        data = _summary(api)
+    assert len(ctx.captured_queries) == 1
+    assert "GROUP BY" not in ctx.captured_queries[0]["sql"].upper()
+    assert data["total"] == 4
+    assert data["by_status"]["ready"] == 3
+    assert data["by_status"]["error"] == 1
+
+
+def test_summary_follows_api_writes(api):
+    res = api.post(BASE, {"name": "CP-S1", "status": "waiting"}, format="json")
+    cp_id = res.json()["data"]["id"]
+    assert _summary(api)["by_status"]["waiting"] == 1
+
+    api.patch(f"{BASE}{cp_id}/", {"status": "charging"}, format="json")
+    data = _summary(api)
+    assert data["by_status"]["waiting"] == 0
+    assert data["by_status"]["charging"] == 1
+
+    api.delete(f"{BASE}{cp_id}/")
+    assert _summary(api)["total"] == 0
+
+    other = ChargePointFactory(status="ready")
+    api.post(
+        f"{BASE}batch/",
+        {
+            "operations": [
+                {"op": "create", "data": {"name": "CP-S2", "status": "error"}},
+                {"op": "update", "id": other.id, "data": {"status": "error"}},
+            ]
+        },
+        format="json",
+    )
+    assert _summary(api) == {
+        "total": 2,
+        "by_status": {"ready": 0, "charging": 0, "waiting": 0, "error": 2},
+    }
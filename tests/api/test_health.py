@@ -0,0 +1,69 @@
+import pytest
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connection, connections
+
+from config import health
+
+pytestmark = pytest.mark.django_db
+
+
+def test_healthz_does_not_touch_the_database(api, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        res = api.get("/healthz/")
+    assert res.status_code == 200
+    assert res.json() == {"status": "ok"}
+
+
+def test_readyz_checks_every_database(api):
+    res = api.get("/readyz/")
+    assert res.status_code == 200
+    body = res.json()
+    assert body["status"] == "ready"
+    assert body["latency_budget_ms"] == 250.0
+    check = body["databases"][DEFAULT_DB_ALIAS]
+    assert check["status"] == "ok"
+    assert check["latency_ms"] >= 0
+    assert "pool" not in check  # sin OPTIONS["pool"]
+
+
+def test_readyz_over_budget_is_503(api, settings):
+    settings.CHARGEPOINTS_READYZ = {"LATENCY_BUDGET_MS": 0}
+    res = api.get("/readyz/")
+    assert res.status_code == 503
+    body = res.json()
+    assert body["status"] == "unavailable"
+    assert body["databases"][DEFAULT_DB_ALIAS]["status"] == "slow"
+
+
+def test_readyz_database_error_is_503(api, monkeypatch):
+    def broken(*args, **kwargs):
+        raise DatabaseError("sin conexión")
+
+    monkeypatch.setattr(connections[DEFAULT_DB_ALIAS], "cursor", broken)
+    res = api.get("/readyz/")
+    assert res.status_code == 503
+    assert res.json()["databases"][DEFAULT_DB_ALIAS] == {
+        "status": "error",
+        "error": "DatabaseError",
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+def test_readyz_reports_pool_stats(api, monkeypatch):
+    if connection.vendor != "postgresql":
+        pytest.skip("el pool de conexiones es de psycopg (PostgreSQL)")
+
+    db = connections.settings[DEFAULT_DB_ALIAS]
+    connection.close()
+    monkeypatch.setitem(db, "CONN_MAX_AGE", 0)
+    monkeypatch.setitem(db, "OPTIONS", {**db["OPTIONS"], "pool": {"min_size": 1, "max_size": 4}})
+    try:
+        res = api.get("/readyz/")
+        assert res.status_code == 200
+        pool = res.json()["databases"][DEFAULT_DB_ALIAS]["pool"]
+        assert (pool["min"], pool["max"]) == (1, 4)
+        assert pool["in_use"] + pool["idle"] == pool["size"] >= 1
+        assert pool["waiting"] == 0
+        assert health.pool_stats(DEFAULT_DB_ALIAS)["connections_opened"] >= 1
+    finally:
+        connection.close()
+        connection.close_pool()
@@ -0,0 +1,156 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings as django_settings
+from django.test import AsyncClient
+from prometheus_client import REGISTRY, CollectorRegistry, multiprocess
+from rest_framework.test import APIClient
+
+from chargepoints.metrics import MetricsMiddleware
+from tests.factories import ChargePointFactory
+
+pytestmark = pytest.mark.django_db
+
+BASE = "/api/v1/chargepoint/"
+
+
+@pytest.fixture
+def metrics_api(settings):
+    # El middleware lee la configuración al cargarse: cliente creado tras el ajuste.
+    settings.CHARGEPOINTS_METRICS = {"ENABLED": True}
+    return APIClient()
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _scrape(client) -> str:
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res["Content-Type"].startswith("text/plain")
+    return res.content.decode()
+
+
+def test_metrics_disabled_returns_404(api):
+    assert api.get("/metrics").status_code == 404
+
+
+def test_request_latency_labelled_by_action_and_status(metrics_api):
+    ChargePointFactory()
+    labels = {"action": "chargepoint.list", "method": "GET", "status": "200"}
+    before = _sample("chargepoint_http_request_duration_seconds_count", **labels)
+    queries_before = _sample("chargepoint_db_queries_total", action="chargepoint.list")
+
+    assert metrics_api.get(BASE).status_code == 200
+    assert metrics_api.get(f"{BASE}999999/").status_code == 404
+
+    assert _sample("chargepoint_http_request_duration_seconds_count", **labels) == before + 1
+    assert _sample(
+        "chargepoint_http_request_duration_seconds_count",
+        action="chargepoint.retrieve",
+        method="GET",
+        status="404",
+    )
+    assert _sample("chargepoint_db_queries_total", action="chargepoint.list") > queries_before
+    text = _scrape(metrics_api)
+    assert 'chargepoint_http_request_duration_seconds_bucket{action="chargepoint.list"' in text
+    assert "chargepoint_http_requests_in_progress" in text
+
+
+def test_status_gauges(metrics_api):
+    ChargePointFactory.create_batch(2, status="ready")
+    ChargePointFactory(status="error")
+    ChargePointFactory(status="error").delete()
+
+    text = _scrape(metrics_api)
+    assert 'chargepoint_chargepoints{status="ready"} 2.0' in text
+    assert 'chargepoint_chargepoints{status="error"} 1.0' in text
+    assert 'chargepoint_chargepoints{status="charging"} 0.0' in text
+
+
+def test_cache_events(settings, metrics_api):
+    settings.CHARGEPOINTS_RESPONSE_CACHE = {"ENABLED": True}
+    ChargePointFactory()
+    hits = _sample("chargepoint_response_cache_events_total", event="hits")
+    misses = _sample("chargepoint_response_cache_events_total", event="misses")
+
+    metrics_api.get(BASE)
+    metrics_api.get(BASE)
+
+    assert _sample("chargepoint_response_cache_events_total", event="misses") == misses + 1
+    assert _sample("chargepoint_response_cache_events_total", event="hits") == hits + 1
+
+
+def test_middleware_is_async_capable(settings):
+    settings.CHARGEPOINTS_METRICS = {"ENABLED": True}
+
+    async def get_response(request):
+        return None
+
+    assert iscoroutinefunction(MetricsMiddleware(get_response))
+    assert not iscoroutinefunction(MetricsMiddleware(lambda request: None))
+
+
+def test_async_views_are_measured(metrics_api, settings):
+    settings.ROOT_URLCONF = "tests.async_urls"
+    ChargePointFactory()
+    labels = {"action": "chargepoint.list", "method": "GET", "status": "200"}
+    before = _sample("chargepoint_http_request_duration_seconds_count", **labels)
+    queries_before = _sample("chargepoint_db_queries_total", action="chargepoint.list")
+
+    assert async_to_sync(AsyncClient().get)(BASE).status_code == 200
+
+    assert _sample("chargepoint_http_request_duration_seconds_count", **labels) == before + 1
+    assert _sample("chargepoint_db_queries_total", action="chargepoint.list") > queries_before
+    assert _sample("chargepoint_http_requests_in_progress") == 0
+
+
+def test_streaming_latency_is_observed_when_the_stream_closes(metrics_api):
+    ChargePointFactory.create_batch(3)
+    labels = {"action": "chargepoint.export", "method": "GET", "status": "200"}
+    before = _sample("chargepoint_http_request_duration_seconds_count", **labels)
+
+    res = metrics_api.get(f"{BASE}export?format=ndjson")
+    assert res.streaming
+    assert _sample("chargepoint_http_request_duration_seconds_count", **labels) == before
+    assert _sample("chargepoint_http_requests_in_progress") == 1
+
+    assert len(b"".join(res.streaming_content).splitlines()) == 3
+    res.close()
+    assert _sample("chargepoint_http_request_duration_seconds_count", **labels) == before + 1
+    assert _sample("chargepoint_http_requests_in_progress") == 0
+
+
+WORKER = """
+import django
+django.setup()
+from chargepoints.metrics import DB_QUERIES, REQUEST_LATENCY
+REQUEST_LATENCY.labels("chargepoint.list", "GET", "200").observe(0.05)
+DB_QUERIES.labels("chargepoint.list").inc(3)
+"""
+
+
+def test_multiprocess_aggregation(metrics_api, tmp_path, monkeypatch):
+    # Dos "workers" independientes escriben en el directorio compartido.
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    for _ in range(2):
+        subprocess.run(
+            [sys.executable, "-c", WORKER], env=env, cwd=django_settings.BASE_DIR, check=True
+        )
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=str(tmp_path))
+    labels = {"action": "chargepoint.list", "method": "GET", "status": "200"}
+    assert registry.get_sample_value("chargepoint_http_request_duration_seconds_count", labels) == 2
+    assert registry.get_sample_value(
+        "chargepoint_db_queries_total", {"action": "chargepoint.list"}
+    ) == pytest.approx(6)
+
+    # /metrics agrega los ficheros de todos los procesos
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    text = _scrape(metrics_api)
+    assert 'chargepoint_db_queries_total{action="chargepoint.list"} 6.0' in text
@@ -0,0 +1,9 @@
+"""URLconf de los tests con las lecturas async activadas (como bajo `config.asgi`)."""
+
+from django.urls import include, path
+
+from api.v1.urls import build_urlpatterns
+
+urlpatterns = [
+    path("api/v1/", include((build_urlpatterns(async_reads=True), "api_v1"), namespace="api_v1")),
+]
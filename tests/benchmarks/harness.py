@@ -0,0 +1,256 @@
+"""
+Utilidades del benchmark de endpoints: medición (latencia, consultas, memoria),
+informe JSON y comparación con la línea base guardada. También las peticiones directas
+a `WSGIHandler` / `ASGIHandler` de los benchmarks de concurrencia.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import django
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+OUTPUT_DIR = Path(os.environ.get("BENCH_OUTPUT_DIR", "bench-results"))
+
+
+def env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+@dataclass
+class Measurement:
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries: int
+    peak_kb: float
+    iterations: int
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def measure(request, iterations: int, warmup: int = 3) -> Measurement:
+    """
+    Ejecuta `request(i)` (debe devolver la respuesta y comprobar su estado):
+    calentamiento, una pasada con captura de SQL, una con `tracemalloc` y
+    `iterations` pasadas cronometradas. `i` es único en cada llamada, para que las
+    escrituras (create/destroy) no colisionen.
+    """
+    counter = iter(range(10**9))
+    for _ in range(warmup):
+        request(next(counter))
+
+    with CaptureQueriesContext(connection) as ctx:
+        request(next(counter))
+    queries = len(ctx.captured_queries)
+
+    tracemalloc.start()
+    try:
+        request(next(counter))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples = []
+    for _ in range(iterations):
+        i = next(counter)
+        start = time.perf_counter()
+        request(i)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return Measurement(
+        p50_ms=round(percentile(samples, 50), 3),
+        p95_ms=round(percentile(samples, 95), 3),
+        p99_ms=round(percentile(samples, 99), 3),
+        queries=queries,
+        peak_kb=round(peak / 1024, 1),
+        iterations=iterations,
+    )
+
+
+# ---------------------------------------------------------------------
+# Informe y línea base
+# ---------------------------------------------------------------------
+
+
+def report_name() -> str:
+    return f"endpoints-{connection.vendor}.json"
+
+
+def metadata() -> dict:
+    return {
+        "vendor": connection.vendor,
+        "django": django.get_version(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+
+
+def write_results(results: dict[str, Measurement]) -> Path:
+    """Fusiona `results` en el informe de este motor (una clave por tamaño/escenario)."""
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    path = OUTPUT_DIR / report_name()
+    data = {"meta": metadata(), "results": {}}
+    if path.exists():
+        data["results"] = json.loads(path.read_text())["results"]
+    data["results"].update({key: asdict(m) for key, m in results.items()})
+    data["results"] = dict(sorted(data["results"].items()))
+    path.write_text(json.dumps(data, indent=2) + "\n")
+    return path
+
+
+def load_baseline() -> dict:
+    path = BASELINE_DIR / report_name()
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())["results"]
+
+
+def update_baseline(results: dict[str, Measurement]) -> Path:
+    BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+    path = BASELINE_DIR / report_name()
+    stored = load_baseline()
+    stored.update({key: asdict(m) for key, m in results.items()})
+    data = {"meta": metadata(), "results": dict(sorted(stored.items()))}
+    path.write_text(json.dumps(data, indent=2) + "\n")
+    return path
+
+
+def compare(results: dict[str, Measurement], baseline: dict, tolerance: float) -> list[str]:
+    """
+    Devuelve las regresiones frente a la línea base. El número de consultas es
+    determinista y se compara de forma exacta; la latencia (p95) y la memoria se
+    comparan con `tolerance` (p. ej. 1.5 = hasta un 50 % peor) y un margen absoluto
+    para no saltar por ruido en valores pequeños.
+    """
+    problems = []
+    for key, m in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if m.queries > base["queries"]:
+            problems.append(f"{key}: consultas {base['queries']} -> {m.queries}")
+        if m.p95_ms > base["p95_ms"] * tolerance + 2:
+            problems.append(f"{key}: p95 {base['p95_ms']:.2f} ms -> {m.p95_ms:.2f} ms")
+        if m.peak_kb > base["peak_kb"] * tolerance + 256:
+            problems.append(f"{key}: memoria {base['peak_kb']:.0f} KB -> {m.peak_kb:.0f} KB")
+    return problems
+
+
+def format_table(results: dict[str, Measurement], baseline: dict) -> str:
+    lines = [
+        f"{'escenario':<52} {'p50':>8} {'p95':>8} {'p99':>8} {'SQL':>4} {'KB':>8} {'p95 base':>9}"
+    ]
+    for key, m in results.items():
+        base = baseline.get(key, {}).get("p95_ms")
+        base_txt = f"{base:9.2f}" if base is not None else f"{'-':>9}"
+        lines.append(
+            f"{key:<52} {m.p50_ms:8.2f} {m.p95_ms:8.2f} {m.p99_ms:8.2f} "
+            f"{m.queries:4d} {m.peak_kb:8.1f} {base_txt}"
+        )
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------
+# Peticiones contra los manejadores de Django (benchmarks de concurrencia)
+# ---------------------------------------------------------------------
+
+
+def wsgi_get(handler: WSGIHandler, path: str, query: str) -> int:
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SERVER_NAME": "testserver",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "testserver",
+        "REMOTE_ADDR": "127.0.0.1",
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(b""),
+        "wsgi.errors": sys.stderr,
+        "wsgi.version": (1, 0),
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    status = []
+    body = handler(environ, lambda s, headers, exc_info=None: status.append(s))
+    try:
+        b"".join(body)
+    finally:
+        body.close()  # request_finished: como un servidor real
+    return int(status[0].split()[0])
+
+
+async def asgi_get(handler: ASGIHandler, path: str, query: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    sent = False
+    status = []
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()  # el cliente no se desconecta
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await handler(scope, receive, send)
+    return status[0]
+
+
+def close_thread_connections(pool: ThreadPoolExecutor, threads: int) -> None:
+    """
+    Cierra la conexión de cada hilo de `pool` y lo apaga: con `CONN_MAX_AGE` las
+    conexiones seguirían abiertas y con el pool de psycopg, prestadas.
+    """
+    barrier = threading.Barrier(threads)
+
+    def close():
+        connections.close_all()
+        barrier.wait(timeout=30)
+
+    list(pool.map(lambda _: close(), range(threads)))
+    pool.shutdown()
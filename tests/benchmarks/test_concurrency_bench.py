@@ -0,0 +1,142 @@
+"""
+Benchmark de concurrencia del listado y el detalle: WSGI (pool de hilos, como gunicorn
+gthread) frente a ASGI con las vistas DRF síncronas y ASGI con las vistas async nativas
+(`chargepoints.async_views`), con 1, 100 y 1000 clientes concurrentes.
+
+Cada cliente hace `BENCH_CONCURRENCY_REQUESTS` peticiones seguidas contra los
+manejadores reales de Django (`WSGIHandler` / `ASGIHandler`, con todo el middleware),
+sin red de por medio: se mide el coste del servidor de aplicaciones, no del socket.
+La latencia incluye la espera en cola (hilos ocupados o bucle de eventos saturado).
+
+Ejecutar (SQLite o PostgreSQL según la base configurada):
+    DATABASE_URL=sqlite:///bench.sqlite3 pytest -q -s -m slow \
+        tests/benchmarks/test_concurrency_bench.py
+    pytest -q -s -m slow tests/benchmarks/test_concurrency_bench.py  # PostgreSQL
+
+Sin persistencia de conexiones (`CONN_MAX_AGE=0`, lo recomendado bajo ASGI): cada
+petición en curso usa su propia conexión, así que en PostgreSQL el número de clientes
+está limitado por `max_connections` (o por el pool de conexiones si se configura).
+
+Variables:
+    BENCH_CONCURRENCY_CLIENTS   clientes concurrentes (por defecto "1,100,1000")
+    BENCH_CONCURRENCY_REQUESTS  peticiones por cliente (por defecto 3)
+    BENCH_CONCURRENCY_SIZE      ChargePoints en la base (por defecto 1000)
+    BENCH_WSGI_THREADS          hilos del servidor WSGI simulado (por defecto 32)
+
+El informe se escribe en bench-results/concurrency-<motor>.json.
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+
+from chargepoints.management.commands.chargepoints_demo import (
+    SCALE_CONNECTOR_WEIGHTS,
+    SCALE_STATUS_WEIGHTS,
+    Plan,
+    populate_range,
+)
+from chargepoints.models import ChargePoint
+from tests.benchmarks import harness
+
+pytestmark = [pytest.mark.django_db(transaction=True), pytest.mark.benchmark, pytest.mark.slow]
+
+BASE = "/api/v1/chargepoint/"
+CLIENTS = [int(c) for c in os.environ.get("BENCH_CONCURRENCY_CLIENTS", "1,100,1000").split(",")]
+REQUESTS = harness.env_int("BENCH_CONCURRENCY_REQUESTS", 3)
+SIZE = harness.env_int("BENCH_CONCURRENCY_SIZE", 1000)
+WSGI_THREADS = harness.env_int("BENCH_WSGI_THREADS", 32)
+
+# modo -> (URLconf, servidor)
+MODES = {
+    "wsgi": ("config.urls", "wsgi"),
+    "asgi-sync": ("config.urls", "asgi"),
+    "asgi-async": ("tests.async_urls", "asgi"),
+}
+
+
+# ---------------------------------------------------------------------
+# Escenario
+# ---------------------------------------------------------------------
+
+
+def _run(server: str, clients: int, targets: list[tuple[str, str]], pool) -> dict:
+    handler = WSGIHandler() if server == "wsgi" else ASGIHandler()
+    pool = pool if server == "wsgi" else None
+    latencies: list[float] = []
+    statuses: list[int] = []
+
+    async def client(pool, index: int):
+        for n in range(REQUESTS):
+            path, query = targets[(index + n) % len(targets)]
+            start = time.perf_counter()
+            if pool is not None:
+                loop = asyncio.get_running_loop()
+                code = await loop.run_in_executor(pool, harness.wsgi_get, handler, path, query)
+            else:
+                code = await harness.asgi_get(handler, path, query)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses.append(code)
+
+    async def main():
+        start = time.perf_counter()
+        await asyncio.gather(*(client(pool, i) for i in range(clients)))
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(main())
+    assert set(statuses) == {200}, sorted(set(statuses))
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(harness.percentile(latencies, 50), 2),
+        "p95_ms": round(harness.percentile(latencies, 95), 2),
+        "p99_ms": round(harness.percentile(latencies, 99), 2),
+    }
+
+
+def _seed() -> list[int]:
+    plan = Plan(
+        scale=True,
+        batch_size=5000,
+        connectors=None,
+        ratio=0.1,
+        prefix="BENCH",
+        status_weights=dict(SCALE_STATUS_WEIGHTS),
+        connector_weights=dict(SCALE_CONNECTOR_WEIGHTS),
+    )
+    populate_range(plan, 0, SIZE, seed=SIZE)
+    return list(ChargePoint.objects.order_by("id").values_list("id", flat=True)[:50])
+
+
+def test_concurrency_wsgi_vs_asgi(settings, monkeypatch):
+    monkeypatch.setitem(connections.settings[DEFAULT_DB_ALIAS], "CONN_MAX_AGE", 0)
+    ids = _seed()
+    targets = [(BASE, ""), (BASE, "status=ready"), (BASE, "cursor=")]
+    targets += [(f"{BASE}{pk}/", "") for pk in ids[:5]]
+
+    results = {}
+    pool = ThreadPoolExecutor(WSGI_THREADS)  # hilos del servidor WSGI
+    try:
+        for mode, (urlconf, server) in MODES.items():
+            settings.ROOT_URLCONF = urlconf
+            for clients in CLIENTS:
+                results[f"{mode}[clients={clients}]"] = _run(server, clients, targets, pool)
+    finally:
+        harness.close_thread_connections(pool, WSGI_THREADS)
+
+    harness.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    path = harness.OUTPUT_DIR / f"concurrency-{connection.vendor}.json"
+    path.write_text(json.dumps({"meta": harness.metadata(), "results": results}, indent=2) + "\n")
+
+    print(f"\n{'escenario':<28} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for key, r in results.items():
+        print(f"{key:<28} {r['rps']:8.1f} {r['p50_ms']:9.2f} {r['p95_ms']:9.2f} {r['p99_ms']:9.2f}")
+    print(f"informe: {path}")
@@ -0,0 +1,162 @@
+"""
+Benchmark de rotación de conexiones (solo PostgreSQL): el mismo tráfico de lectura
+(listado y detalle) contra `WSGIHandler` con un pool de hilos, con tres
+configuraciones de `DATABASES["default"]`:
+
+- `conn_max_age=0`: una conexión nueva por petición (lo habitual bajo ASGI).
+- `conn_max_age=60`: una conexión persistente por hilo del servidor.
+- `pool`: pool nativo de psycopg (`OPTIONS["pool"]`, `DB_POOL=true`), con y sin
+  sentencias preparadas en el servidor (`server_side_binding` + `prepare_threshold`).
+
+Se cuentan las sesiones que abre PostgreSQL (`pg_stat_database.sessions`) durante cada
+escenario, además de req/s y latencias.
+
+Ejecutar:
+    pytest -q -s -m slow tests/benchmarks/test_connection_churn_bench.py
+
+Variables:
+    BENCH_CHURN_CLIENTS    clientes concurrentes (por defecto 50)
+    BENCH_CHURN_REQUESTS   peticiones por cliente (por defecto 20)
+    BENCH_CHURN_SIZE       ChargePoints en la base (por defecto 1000)
+    BENCH_WSGI_THREADS     hilos del servidor WSGI simulado (por defecto 32)
+    BENCH_POOL_MAX_SIZE    tamaño máximo del pool (por defecto 10)
+
+El informe se escribe en bench-results/connection-churn-postgresql.json.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg
+import pytest
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+
+from chargepoints.management.commands.chargepoints_demo import (
+    SCALE_CONNECTOR_WEIGHTS,
+    SCALE_STATUS_WEIGHTS,
+    Plan,
+    populate_range,
+)
+from chargepoints.models import ChargePoint
+from tests.benchmarks import harness
+
+pytestmark = [pytest.mark.django_db(transaction=True), pytest.mark.benchmark, pytest.mark.slow]
+
+BASE = "/api/v1/chargepoint/"
+CLIENTS = harness.env_int("BENCH_CHURN_CLIENTS", 50)
+REQUESTS = harness.env_int("BENCH_CHURN_REQUESTS", 20)
+SIZE = harness.env_int("BENCH_CHURN_SIZE", 1000)
+WSGI_THREADS = harness.env_int("BENCH_WSGI_THREADS", 32)
+POOL_MAX_SIZE = harness.env_int("BENCH_POOL_MAX_SIZE", 10)
+
+POOL = {"min_size": 2, "max_size": POOL_MAX_SIZE, "timeout": 30}
+
+# escenario -> (CONN_MAX_AGE, OPTIONS adicionales)
+SCENARIOS = {
+    "conn_max_age=0": (0, {}),
+    "conn_max_age=60": (60, {}),
+    "pool": (0, {"pool": POOL}),
+    "pool+prepared": (0, {"pool": POOL, "server_side_binding": True, "prepare_threshold": 2}),
+}
+
+
+def _sessions(stats) -> int:
+    """Sesiones abiertas en la base de tests desde el arranque del servidor."""
+    stats.execute("SELECT pg_stat_clear_snapshot()")
+    row = stats.execute(
+        "SELECT sessions FROM pg_stat_database WHERE datname = current_database()"
+    ).fetchone()
+    return row[0]
+
+
+def _run(targets: list[tuple[str, str]], stats) -> dict:
+    handler = WSGIHandler()
+    pool = ThreadPoolExecutor(WSGI_THREADS)  # hilos del servidor WSGI
+    latencies: list[float] = []
+    statuses: list[int] = []
+
+    def client(index: int):
+        for n in range(REQUESTS):
+            path, query = targets[(index + n) % len(targets)]
+            start = time.perf_counter()
+            statuses.append(harness.wsgi_get(handler, path, query))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    before = _sessions(stats)
+    start = time.perf_counter()
+    try:
+        list(pool.map(client, range(CLIENTS)))
+        elapsed = time.perf_counter() - start
+    finally:
+        harness.close_thread_connections(pool, WSGI_THREADS)
+    opened = _sessions(stats) - before
+    connection.close_pool()
+
+    assert set(statuses) == {200}, sorted(set(statuses))
+    return {
+        "clients": CLIENTS,
+        "requests": len(latencies),
+        "sessions_opened": opened,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(harness.percentile(latencies, 50), 2),
+        "p95_ms": round(harness.percentile(latencies, 95), 2),
+        "p99_ms": round(harness.percentile(latencies, 99), 2),
+    }
+
+
+def _seed() -> list[int]:
+    plan = Plan(
+        scale=True,
+        batch_size=5000,
+        connectors=None,
+        ratio=0.1,
+        prefix="BENCH",
+        status_weights=dict(SCALE_STATUS_WEIGHTS),
+        connector_weights=dict(SCALE_CONNECTOR_WEIGHTS),
+    )
+    populate_range(plan, 0, SIZE, seed=SIZE)
+    return list(ChargePoint.objects.order_by("id").values_list("id", flat=True)[:50])
+
+
+def test_pool_reduces_connection_churn(monkeypatch):
+    if connection.vendor != "postgresql":
+        pytest.skip("pg_stat_database y el pool de psycopg son de PostgreSQL")
+
+    ids = _seed()
+    targets = [(BASE, ""), (BASE, "status=ready"), (BASE, "cursor=")]
+    targets += [(f"{BASE}{pk}/", "") for pk in ids[:5]]
+
+    db = connections.settings[DEFAULT_DB_ALIAS]
+    options = {key: value for key, value in db["OPTIONS"].items() if key != "pool"}
+    stats = psycopg.connect(**connection.get_connection_params(), autocommit=True)
+    connection.close()
+
+    results = {}
+    try:
+        for name, (max_age, extra) in SCENARIOS.items():
+            monkeypatch.setitem(db, "CONN_MAX_AGE", max_age)
+            monkeypatch.setitem(db, "OPTIONS", {**options, **extra})
+            results[name] = _run(targets, stats)
+    finally:
+        stats.close()
+        connection.close()
+        connection.close_pool()
+
+    harness.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    path = harness.OUTPUT_DIR / "connection-churn-postgresql.json"
+    path.write_text(json.dumps({"meta": harness.metadata(), "results": results}, indent=2) + "\n")
+
+    print(f"\n{'escenario':<18} {'sesiones':>9} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for key, r in results.items():
+        print(
+            f"{key:<18} {r['sessions_opened']:9d} {r['rps']:8.1f} "
+            f"{r['p50_ms']:9.2f} {r['p95_ms']:9.2f} {r['p99_ms']:9.2f}"
+        )
+    print(f"informe: {path}")
+
+    requests = CLIENTS * REQUESTS
+    assert results["conn_max_age=0"]["sessions_opened"] >= requests
+    assert results["pool"]["sessions_opened"] <= POOL_MAX_SIZE
+    assert results["pool+prepared"]["sessions_opened"] <= POOL_MAX_SIZE
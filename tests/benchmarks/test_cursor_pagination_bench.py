@@ -0,0 +1,65 @@
+"""
+Benchmark: latencia de la página N en modo keyset frente a PageNumberPagination.
+
+Ejecutar con salida visible:
+    pytest -q -s -m benchmark tests/benchmarks/test_cursor_pagination_bench.py
+"""
+
+import os
+import statistics
+import time
+
+import pytest
+from rest_framework.test import APIClient
+
+from chargepoints.models import ChargePoint
+from chargepoints.pagination import KeysetPagination
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+BASE = "/api/v1/chargepoint/"
+ROWS = int(os.environ.get("BENCH_CURSOR_ROWS", "5000"))
+REPEAT = 7
+
+
+def _median_ms(client, url):
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        res = client.get(url)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert res.status_code == 200
+    return statistics.median(samples)
+
+
+def _cursor_url_at(offset):
+    """Construye el cursor que apunta justo después de la fila `offset`."""
+    row = ChargePoint.objects.order_by("-created_at", "id")[offset]
+    pager = KeysetPagination()
+    pager.base_url = f"http://testserver{BASE}"
+    pager.ordering = ("-created_at", "id")
+    return pager.encode_cursor(pager._get_position(row), reverse=False)
+
+
+def test_keyset_page_latency_is_flat():
+    ChargePoint.objects.bulk_create(
+        [ChargePoint(name=f"BENCH-{i:07d}") for i in range(ROWS)], batch_size=1000
+    )
+    client = APIClient()
+    page_size = KeysetPagination.page_size
+    depths = [1, ROWS // (page_size * 4), ROWS // (page_size * 2), ROWS // page_size - 1]
+
+    results = []
+    for page in depths:
+        offset = (page - 1) * page_size
+        keyset = _median_ms(client, _cursor_url_at(offset - 1) if offset else f"{BASE}?cursor=")
+        classic = _median_ms(client, f"{BASE}?page={page}")
+        results.append((page, keyset, classic))
+
+    print(f"\n{'página':>8} {'keyset ms':>10} {'page ms':>10}  (filas={ROWS})")
+    for page, keyset, classic in results:
+        print(f"{page:>8} {keyset:>10.2f} {classic:>10.2f}")
+
+    shallow, deep = results[0][1], results[-1][1]
+    # Margen amplio: lo que se comprueba es que no crece con N, no un valor absoluto.
+    assert deep < shallow * 3 + 5
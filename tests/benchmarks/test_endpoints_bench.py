@@ -0,0 +1,127 @@
+"""
+Benchmark de los endpoints de ChargePointViewSet: latencia p50/p95/p99, número de
+consultas SQL y memoria asignada (pico de tracemalloc) por escenario y tamaño de dataset.
+
+Ejecutar (SQLite o PostgreSQL según la base configurada):
+    DATABASE_URL=sqlite:///bench.sqlite3 pytest -q -s -m slow tests/benchmarks  # SQLite
+    pytest -q -s -m slow tests/benchmarks                                       # PostgreSQL
+
+Variables:
+    BENCH_SIZES            tamaños de dataset (por defecto "1000,10000")
+    BENCH_ITERATIONS       peticiones cronometradas por escenario (por defecto 30)
+    BENCH_TOLERANCE        factor de regresión admitido en p95/memoria (por defecto 1.5)
+    BENCH_FAIL_ON_LATENCY  1 = fallar también por latencia/memoria (por defecto solo consultas)
+    BENCH_UPDATE_BASELINE  1 = guardar los resultados como nueva línea base
+
+El informe se escribe en bench-results/endpoints-<motor>.json y se compara con
+tests/benchmarks/baselines/endpoints-<motor>.json.
+"""
+
+import itertools
+import os
+
+import pytest
+from rest_framework.test import APIClient
+
+from chargepoints.management.commands.chargepoints_demo import (
+    SCALE_CONNECTOR_WEIGHTS,
+    SCALE_STATUS_WEIGHTS,
+    Plan,
+    populate_range,
+)
+from chargepoints.models import ChargePoint
+from tests.benchmarks import harness
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark, pytest.mark.slow]
+
+BASE = "/api/v1/chargepoint/"
+SIZES = [int(s) for s in os.environ.get("BENCH_SIZES", "1000,10000").split(",")]
+ITERATIONS = harness.env_int("BENCH_ITERATIONS", 30)
+TOLERANCE = harness.env_float("BENCH_TOLERANCE", 1.5)
+
+# Combinaciones de filtro, búsqueda y ordenación del listado
+STATUS = [None, "ready"]
+SEARCH = [None, "0001"]
+ORDERING = [None, "name", "-created_at"]
+
+
+def list_scenarios(size):
+    for status, search, ordering in itertools.product(STATUS, SEARCH, ORDERING):
+        params = {"status": status, "search": search, "ordering": ordering}
+        query = "&".join(f"{k}={v}" for k, v in params.items() if v is not None)
+        name = ",".join(f"{k}={v}" for k, v in params.items() if v is not None) or "default"
+        yield f"list[{name}]", query
+    yield "list[cursor]", "cursor="
+    # Página intermedia: coste del OFFSET frente al modo cursor
+    yield "list[page=middle]", f"page={max(1, size // 25)}"
+    yield "list[fields=id,status]", "fields=id,status"
+
+
+def _seed(size):
+    plan = Plan(
+        scale=True,
+        batch_size=5000,
+        connectors=None,
+        ratio=0.1,
+        prefix="BENCH",
+        status_weights=dict(SCALE_STATUS_WEIGHTS),
+        connector_weights=dict(SCALE_CONNECTOR_WEIGHTS),
+    )
+    populate_range(plan, 0, size, seed=size)
+    return list(ChargePoint.objects.order_by("id").values_list("id", flat=True))
+
+
+def _ok(response, expected=200):
+    assert response.status_code == expected, response.content[:200]
+    return response
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_endpoint_latency(size):
+    client = APIClient()
+    ids = _seed(size)
+    results = {}
+
+    def run(name, request):
+        results[f"{size}/{name}"] = harness.measure(request, ITERATIONS)
+
+    # Lecturas
+    for name, query in list_scenarios(size):
+        run(name, lambda i, q=query: _ok(client.get(f"{BASE}?{q}")))
+    run("retrieve", lambda i: _ok(client.get(f"{BASE}{ids[i % len(ids)]}/")))
+
+    # Escrituras (cada iteración usa su propio objeto)
+    run(
+        "create",
+        lambda i: _ok(
+            client.post(BASE, {"name": f"NEW-{i}", "status": "ready"}, format="json"), 201
+        ),
+    )
+    run(
+        "update",
+        lambda i: _ok(
+            client.patch(
+                f"{BASE}{ids[i % len(ids)]}/",
+                {"status": ["ready", "charging"][i % 2]},
+                format="json",
+            )
+        ),
+    )
+    victims = iter(ids[::-1])
+    run("destroy", lambda i: _ok(client.delete(f"{BASE}{next(victims)}/"), 204))
+
+    baseline = harness.load_baseline()
+    path = harness.write_results(results)
+    print(f"\n{harness.format_table(results, baseline)}\n-> {path}")
+
+    if os.environ.get("BENCH_UPDATE_BASELINE") == "1":
+        print(f"Línea base actualizada: {harness.update_baseline(results)}")
+        return
+
+    problems = harness.compare(results, baseline, TOLERANCE)
+    query_problems = [p for p in problems if "consultas" in p]
+    assert not query_problems, "\n".join(query_problems)
+    if os.environ.get("BENCH_FAIL_ON_LATENCY") == "1":
+        assert not problems, "\n".join(problems)
+    elif problems:
+        print("Regresiones (informativas):\n" + "\n".join(problems))
@@ -0,0 +1,75 @@
+"""
+Benchmark: exportación en streaming de 1M de ChargePoints con memoria acotada.
+
+Ejecutar con salida visible:
+    pytest -q -s -m slow tests/benchmarks/test_export_bench.py
+
+`BENCH_EXPORT_ROWS` ajusta el tamaño (por defecto 1.000.000 filas).
+"""
+
+import os
+import time
+import tracemalloc
+
+import pytest
+from rest_framework.test import APIClient
+
+from chargepoints.models import ChargePoint, Connector
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark, pytest.mark.slow]
+
+URL = "/api/v1/chargepoint/export"
+ROWS = int(os.environ.get("BENCH_EXPORT_ROWS", "1000000"))
+SMALL = 20_000
+INSERT_BATCH = 10_000
+# Margen para el buffer de bloque, el driver y el propio tracemalloc.
+PEAK_LIMIT_MB = 64
+
+
+def _populate(start, stop):
+    for offset in range(start, stop, INSERT_BATCH):
+        end = min(offset + INSERT_BATCH, stop)
+        cps = ChargePoint.objects.bulk_create(
+            [ChargePoint(name=f"EXP-{i:08d}") for i in range(offset, end)]
+        )
+        Connector.objects.bulk_create(
+            [Connector(charge_point=cp, evse_number=f"EVSE-{cp.name}") for cp in cps[::4]]
+        )
+
+
+def _export(client, fmt):
+    """Consume el stream y devuelve (filas, bytes, pico de memoria en MB, segundos)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    res = client.get(f"{URL}?format={fmt}")
+    assert res.status_code == 200
+    lines = size = 0
+    for chunk in res.streaming_content:
+        lines += chunk.count(b"\n")
+        size += len(chunk)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return lines, size, peak / 2**20, elapsed
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_export_memory_is_bounded(fmt):
+    client = APIClient()
+    header = 1 if fmt == "csv" else 0
+
+    _populate(0, SMALL)
+    small_lines, _, small_peak, _ = _export(client, fmt)
+    assert small_lines == SMALL + header
+
+    _populate(SMALL, ROWS)
+    lines, size, peak, elapsed = _export(client, fmt)
+    assert lines == ROWS + header
+
+    print(
+        f"\n{fmt}: filas={ROWS} tamaño={size / 2**20:.1f} MB tiempo={elapsed:.1f} s "
+        f"pico={peak:.1f} MB (con {SMALL} filas: {small_peak:.1f} MB)"
+    )
+    # La memoria no crece con el número de filas
+    assert peak < PEAK_LIMIT_MB
+    assert peak < small_peak * 2 + 8
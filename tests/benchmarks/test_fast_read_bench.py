@@ -0,0 +1,64 @@
+"""
+Benchmark: serialización de ChargePoints con ModelSerializer frente a la proyección
+values() + FastJSONRenderer.
+
+Ejecutar con salida visible:
+    pytest -q -s -m benchmark tests/benchmarks/test_fast_read_bench.py
+"""
+
+import os
+import statistics
+import time
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from chargepoints.models import ChargePoint, Connector
+from chargepoints.projections import chargepoint_rows, project_chargepoints
+from chargepoints.renderers import FastJSONRenderer
+from chargepoints.serializers import ChargePointSerializer
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+ROWS = int(os.environ.get("BENCH_FAST_READ_ROWS", "1000"))
+CONNECTORS = 2
+REPEAT = 5
+
+
+def _median_ms(fn):
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def test_fast_read_path_beats_serializer():
+    cps = ChargePoint.objects.bulk_create(
+        [ChargePoint(name=f"BENCH-{i:07d}") for i in range(ROWS)], batch_size=1000
+    )
+    Connector.objects.bulk_create(
+        [
+            Connector(charge_point=cp, evse_number=f"E{cp.pk}-{j}")
+            for cp in cps
+            for j in range(CONNECTORS)
+        ],
+        batch_size=1000,
+    )
+    envelope = {"code": 200, "message": "OK", "errors": None}
+
+    def classic():
+        data = ChargePointSerializer(
+            ChargePoint.objects.prefetch_related("connectors"), many=True
+        ).data
+        return JSONRenderer().render({**envelope, "data": data})
+
+    def fast():
+        data = project_chargepoints(chargepoint_rows(ChargePoint.objects.all()))
+        return FastJSONRenderer().render({**envelope, "data": data})
+
+    assert fast() == classic()
+    classic_ms, fast_ms = _median_ms(classic), _median_ms(fast)
+    print(f"\nserializer {classic_ms:.1f} ms | fast {fast_ms:.1f} ms (filas={ROWS})")
+    assert fast_ms < classic_ms
@@ -0,0 +1,120 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from chargepoints.admin import NoDateHierarchyChangeList
+from chargepoints.models import ChargePoint, Connector
+from chargepoints.pagination import EstimatedCountPaginator, capped_count, fast_count
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+URL = "/admin/chargepoints/chargepoint/"
+
+
+@pytest.fixture
+def client():
+    client = Client()
+    client.force_login(get_user_model().objects.create_superuser("admin", "a@example.com", "x"))
+    return client
+
+
+def _admin_settings(settings, **overrides):
+    settings.CHARGEPOINTS_ADMIN = {"PERFORMANCE_MODE": True, **overrides}
+
+
+def test_counts_are_exact_below_the_threshold_and_bounded_above():
+    ChargePointFactory.create_batch(8)
+    queryset = ChargePoint.objects.all()
+    assert capped_count(queryset, 10) == (8, True)
+    assert capped_count(queryset, 5) == (5, False)
+    count, exact = fast_count(queryset, 5)
+    assert not exact and count >= 5  # estimación del planificador en PostgreSQL
+
+    paginator = EstimatedCountPaginator(queryset.order_by("pk"), 3, threshold=100)
+    assert (paginator.count, paginator.count_is_exact, paginator.num_pages) == (8, True, 3)
+
+
+def test_changelist_uses_the_estimated_paginator(client, settings):
+    _admin_settings(settings, EXACT_COUNT_THRESHOLD=5)
+    ChargePointFactory.create_batch(8)
+    res = client.get(URL)
+    assert res.status_code == 200
+    cl = res.context["cl"]
+    assert isinstance(cl.paginator, EstimatedCountPaginator)
+    assert not cl.paginator.count_is_exact and cl.full_result_count is None
+
+    settings.CHARGEPOINTS_ADMIN = {"PERFORMANCE_MODE": False}
+    cl = client.get(URL).context["cl"]
+    assert (cl.result_count, cl.full_result_count) == (8, 8)
+
+
+def test_date_hierarchy_is_dropped_on_large_tables(client, settings):
+    ChargePointFactory.create_batch(3)
+    _admin_settings(settings, DATE_HIERARCHY_MAX_ROWS=10)
+    assert client.get(URL).context["cl"].date_hierarchy == "created_at"
+
+    _admin_settings(settings, DATE_HIERARCHY_MAX_ROWS=2)
+    res = client.get(URL)
+    assert isinstance(res.context["cl"], NoDateHierarchyChangeList)
+    assert res.context["cl"].date_hierarchy is None
+
+
+def _changelist_queries(client, rows: int) -> int:
+    for cp in ChargePointFactory.create_batch(rows):
+        ConnectorFactory.create_batch(2, charge_point=cp)
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get(URL).status_code == 200
+    return len(ctx.captured_queries)
+
+
+def test_changelist_queries_do_not_grow_with_rows(client):
+    assert _changelist_queries(client, 2) == _changelist_queries(client, 20)
+
+
+def test_connector_inline_is_limited(client, settings):
+    _admin_settings(settings, INLINE_MAX_ROWS=2)
+    cp = ChargePointFactory()
+    ConnectorFactory.create_batch(5, charge_point=cp)
+    res = client.get(f"{URL}{cp.pk}/change/")
+    assert res.status_code == 200
+    formset = res.context["inline_admin_formsets"][0].formset
+    assert len(formset.forms) == 2
+    assert f"?charge_point__id__exact={cp.pk}" in res.content.decode()
+
+
+def test_hard_delete_is_set_based(client):
+    def hard_delete_queries(rows: int) -> int:
+        ids = [cp.pk for cp in ChargePointFactory.create_batch(rows)]
+        for pk in ids:
+            ConnectorFactory(charge_point_id=pk)
+        data = {"action": "action_hard_delete", "_selected_action": ids}
+        with CaptureQueriesContext(connection) as ctx:
+            assert client.post(URL, data).status_code == 302
+        assert not ChargePoint.all_objects.filter(pk__in=ids).exists()
+        assert not Connector.all_objects.filter(charge_point_id__in=ids).exists()
+        return len(ctx.captured_queries)
+
+    assert hard_delete_queries(3) == hard_delete_queries(30)
+
+
+def test_alive_rows_by_default_but_deleted_objects_stay_reachable(client):
+    alive, dead = ChargePointFactory(name="CP-ALIVE"), ChargePointFactory(name="CP-DEAD")
+    dead.delete()
+
+    cl = client.get(URL).context["cl"]
+    assert "deleted_at" in str(cl.root_queryset.query)  # el filtro "solo vivos" desde el origen
+    assert [cp.pk for cp in cl.result_list] == [alive.pk]
+    assert {cp.pk for cp in client.get(f"{URL}?deleted=all").context["cl"].result_list} == {
+        alive.pk,
+        dead.pk,
+    }
+    assert client.get(f"{URL}{dead.pk}/change/").status_code == 200
+
+    res = client.get(
+        "/admin/autocomplete/",
+        {"app_label": "chargepoints", "model_name": "connector", "field_name": "charge_point"},
+    )
+    assert [r["text"] for r in res.json()["results"]] == [str(alive)]
@@ -0,0 +1,149 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from chargepoints.archive import archive_batch, archive_deleted, pending, purge_archived
+from chargepoints.counters import recount, recount_connectors
+from chargepoints.deletion import soft_delete
+from chargepoints.models import (
+    ArchivedChargePoint,
+    ArchivedConnector,
+    ChargePoint,
+    ChargePointStatusEvent,
+    Connector,
+)
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+NOW = timezone.now()
+CUTOFF = NOW - timedelta(days=90)
+OLD = NOW - timedelta(days=100)
+
+
+def _delete(obj, when=OLD):
+    soft_delete(type(obj).all_objects.filter(pk=obj.pk), now=when)
+
+
+def _chargepoint(connectors: int = 2):
+    cp = ChargePointFactory()
+    ConnectorFactory.create_batch(connectors, charge_point=cp)
+    return cp
+
+
+def _ids(model) -> set[int]:
+    manager = getattr(model, "all_objects", model._default_manager)
+    return set(manager.values_list("pk", flat=True))
+
+
+def test_moves_old_deleted_rows_connectors_first():
+    old, recent, alive = _chargepoint(), _chargepoint(), _chargepoint()
+    _delete(old)
+    _delete(recent, when=NOW - timedelta(days=10))
+    dead_connector = alive.connectors.first()
+    _delete(dead_connector)
+    revived_parent = _chargepoint()
+    _delete(revived_parent)
+    revived = Connector.all_objects.filter(charge_point=revived_parent).first()
+    revived.restore()  # conector vivo de un ChargePoint borrado: el padre no se archiva
+    connectors_before = {c.pk: c for c in Connector.all_objects.filter(charge_point=old)}
+
+    counts = archive_deleted(CUTOFF)
+
+    assert counts == {"chargepoints.Connector": 4, "chargepoints.ChargePoint": 1}
+    assert _ids(ArchivedChargePoint) == {old.pk}
+    assert old.pk not in _ids(ChargePoint) and {recent.pk, revived_parent.pk} <= _ids(ChargePoint)
+    assert dead_connector.pk in _ids(ArchivedConnector)
+    assert revived.pk in _ids(Connector)
+
+    archived = ArchivedChargePoint.objects.get(pk=old.pk)
+    assert (archived.name, archived.deleted_at) == (old.name, OLD)
+    assert archived.deletion_batch is not None and archived.archived_at >= NOW
+    assert {c.pk: c.evse_number for c in archived.connectors.all()} == {
+        pk: c.evse_number for pk, c in connectors_before.items()
+    }
+    # El historial se conserva; los contadores no cambian (solo salen filas borradas)
+    assert ChargePointStatusEvent.objects.filter(charge_point_id=old.pk).exists()
+    assert recount(dry_run=True) == {} and recount_connectors(dry_run=True) == {}
+
+
+def test_batches_can_be_limited_and_resumed():
+    chargepoints = [_chargepoint(connectors=1) for _ in range(5)]
+    for cp in chargepoints:
+        _delete(cp)
+
+    first = archive_deleted(CUTOFF, batch_size=2, max_batches=2)
+    assert first == {"chargepoints.Connector": 4, "chargepoints.ChargePoint": 0}
+
+    second = archive_deleted(CUTOFF, batch_size=2)
+    assert second == {"chargepoints.Connector": 1, "chargepoints.ChargePoint": 5}
+    assert not ChargePoint.all_objects.exists() and not Connector.all_objects.exists()
+    assert archive_deleted(CUTOFF) == {"chargepoints.Connector": 0, "chargepoints.ChargePoint": 0}
+
+
+def _batch_queries(rows: int) -> int:
+    cp = ChargePointFactory()
+    Connector.objects.bulk_create(
+        Connector(charge_point=cp, evse_number=f"EVSE-{cp.pk}-{i}") for i in range(rows)
+    )
+    _delete(cp)
+    with CaptureQueriesContext(connection) as ctx:
+        assert len(archive_batch(Connector, ArchivedConnector, CUTOFF, "default", rows)) == rows
+    return len(ctx.captured_queries)
+
+
+def test_batch_runs_in_constant_queries():
+    assert _batch_queries(200) == _batch_queries(5)
+
+
+def test_dry_run_counts_without_writing(capsys):
+    _delete(_chargepoint())
+    _delete(_chargepoint(), when=NOW)
+    assert pending(CUTOFF) == {"chargepoints.Connector": 2, "chargepoints.ChargePoint": 1}
+
+    call_command("archive_deleted", "--dry-run", "--older-than-days", "90")
+    assert "se archivarían 1 chargepoints.ChargePoint" in capsys.readouterr().out
+    assert not ArchivedChargePoint.objects.exists() and not ArchivedConnector.objects.exists()
+
+
+def test_command_archives_and_purges(capsys):
+    cp = _chargepoint()
+    _delete(cp)
+    call_command("archive_deleted", "--before", CUTOFF.isoformat(), "--batch-size", "1")
+    out = capsys.readouterr().out
+    assert "2 chargepoints.Connector archivados" in out
+    assert _ids(ArchivedChargePoint) == {cp.pk}
+
+    assert purge_archived(NOW, dry_run=True) == {
+        "chargepoints.ArchivedConnector": 0,
+        "chargepoints.ArchivedChargePoint": 0,
+    }
+    call_command("archive_deleted", "--purge-after-days", "0")
+    assert not ArchivedChargePoint.objects.exists() and not ArchivedConnector.objects.exists()
+
+
+def test_command_validates_arguments():
+    with pytest.raises(CommandError):
+        call_command("archive_deleted", "--batch-size", "0")
+    with pytest.raises(CommandError):
+        call_command("archive_deleted", "--before", "ayer")
+
+
+def test_admin_is_read_only_lookup():
+    cp = _chargepoint()
+    _delete(cp)
+    archive_deleted(CUTOFF)
+    client = Client()
+    client.force_login(get_user_model().objects.create_superuser("admin", "a@example.com", "x"))
+
+    res = client.get("/admin/chargepoints/archivedchargepoint/", {"q": cp.pk})
+    assert res.status_code == 200 and cp.name in res.content.decode()
+    res = client.get(f"/admin/chargepoints/archivedchargepoint/{cp.pk}/change/")
+    assert res.status_code == 200
+    assert client.get("/admin/chargepoints/archivedchargepoint/add/").status_code == 403
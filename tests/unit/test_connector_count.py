@@ -0,0 +1,165 @@
+import csv
+import random
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from chargepoints.counters import recount_connectors
+from chargepoints.models import ChargePoint, Connector
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _counts() -> dict[int, int]:
+    return dict(ChargePoint.all_objects.values_list("pk", "connector_count"))
+
+
+def _assert_consistent():
+    assert recount_connectors(dry_run=True) == {}
+
+
+def test_instance_paths_keep_connector_count():
+    cp, other = ChargePointFactory.create_batch(2)
+    conn = ConnectorFactory(charge_point=cp)
+    ConnectorFactory(charge_point=cp)
+    assert _counts() == {cp.pk: 2, other.pk: 0}
+
+    conn.delete()  # soft
+    assert _counts()[cp.pk] == 1
+    conn.deleted_at = None  # restaurar
+    conn.save()
+    assert _counts()[cp.pk] == 2
+
+    conn.charge_point = other  # mover
+    conn.save()
+    assert _counts() == {cp.pk: 1, other.pk: 1}
+    conn.evse_number = "EVSE-RENAMED"
+    conn.save(update_fields=["evse_number"])
+    conn.hard_delete()
+    assert _counts() == {cp.pk: 1, other.pk: 0}
+    _assert_consistent()
+
+
+def test_soft_deleted_connectors_are_not_counted():
+    cp = ChargePointFactory()
+    ConnectorFactory(charge_point=cp).delete()
+    ConnectorFactory(charge_point=cp)
+    Connector.all_objects.dead().hard_delete()
+    cp.refresh_from_db()
+    assert cp.connector_count == 1
+
+
+def test_stale_chargepoint_save_does_not_overwrite_count():
+    cp = ChargePointFactory()
+    ConnectorFactory.create_batch(3, charge_point=cp)
+    cp.status = "error"  # instancia leída antes de crear los conectores
+    cp.save()
+    cp.refresh_from_db()
+    assert (cp.status, cp.connector_count) == ("error", 3)
+
+
+def test_queryset_paths_keep_connector_count():
+    cps = ChargePointFactory.create_batch(3)
+    Connector.objects.bulk_create(
+        [Connector(evse_number=f"E-{i}", charge_point=cps[i % 2]) for i in range(5)]
+    )
+    assert _counts() == {cps[0].pk: 3, cps[1].pk: 2, cps[2].pk: 0}
+
+    Connector.objects.filter(charge_point=cps[0]).delete()
+    assert _counts()[cps[0].pk] == 0
+    Connector.all_objects.filter(charge_point=cps[0]).update(deleted_at=None)
+    assert _counts()[cps[0].pk] == 3
+
+    conns = list(Connector.objects.filter(charge_point=cps[1]))
+    for conn in conns:
+        conn.charge_point = cps[2]
+    Connector.objects.bulk_update(conns, ["charge_point"])
+    assert _counts() == {cps[0].pk: 3, cps[1].pk: 0, cps[2].pk: 2}
+
+    Connector.objects.filter(charge_point=cps[2]).update(charge_point=cps[1])
+    Connector.all_objects.filter(charge_point=cps[0]).hard_delete()
+    assert _counts() == {cps[0].pk: 0, cps[1].pk: 2, cps[2].pk: 0}
+    _assert_consistent()
+
+
+def test_connector_writes_touch_chargepoint_updated_at():
+    # connector_count forma parte de la representación: ETag/caché deben cambiar
+    cp = ChargePointFactory()
+    before = ChargePoint.objects.get(pk=cp.pk).updated_at
+    ConnectorFactory(charge_point=cp)
+    assert ChargePoint.objects.get(pk=cp.pk).updated_at > before
+
+
+def test_demo_and_import_keep_connector_count(tmp_path):
+    call_command(
+        "chargepoints_demo", "--populate", "40", "--seed", "3", "--soft-delete-ratio", "0.25"
+    )
+    _assert_consistent()
+
+    path = tmp_path / "fleet.csv"
+    existing = list(ChargePoint.objects.order_by("id")[:3])
+    moved = Connector.objects.filter(charge_point=existing[0]).first()
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["id", "name", "status", "created_at", "connectors"])
+        writer.writerow(["", existing[1].name, "ready", "", moved.evse_number])
+        writer.writerow(["", "CP-IMP", "ready", "", "IMP-1|IMP-2"])
+    call_command("import_chargepoints", str(path))
+    assert ChargePoint.objects.get(name="CP-IMP").connector_count == 2
+    _assert_consistent()
+
+
+def _random_operation(rng: random.Random, n: int) -> None:
+    cps = list(ChargePoint.objects.values_list("pk", flat=True))
+    alive = list(Connector.objects.values_list("pk", flat=True))
+    dead = list(Connector.all_objects.dead().values_list("pk", flat=True))
+    op = rng.choice(["create", "bulk", "move", "soft", "qs_soft", "restore", "hard", "cp_hard"])
+    if op == "create" or not alive:
+        ConnectorFactory(charge_point_id=rng.choice(cps))
+    elif op == "bulk":
+        Connector.objects.bulk_create(
+            [Connector(evse_number=f"R-{n}-{i}", charge_point_id=rng.choice(cps)) for i in range(3)]
+        )
+    elif op == "move":
+        Connector.objects.filter(pk=rng.choice(alive)).update(charge_point_id=rng.choice(cps))
+    elif op == "soft":
+        Connector.objects.get(pk=rng.choice(alive)).delete()
+    elif op == "qs_soft":
+        Connector.objects.filter(pk__in=rng.sample(alive, min(2, len(alive)))).delete()
+    elif op == "restore" and dead:
+        conn = Connector.all_objects.get(pk=rng.choice(dead))
+        if not Connector.objects.filter(evse_number=conn.evse_number).exists():
+            conn.deleted_at = None
+            conn.save()
+    elif op == "hard":
+        Connector.all_objects.get(pk=rng.choice(alive + dead)).hard_delete()
+    elif op == "cp_hard" and len(cps) > 2:
+        # Cascada: los conectores desaparecen con su ChargePoint
+        ChargePoint.all_objects.get(pk=rng.choice(cps)).hard_delete()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_operations_keep_connector_count_consistent(seed):
+    rng = random.Random(seed)
+    ChargePointFactory.create_batch(6)
+    for n in range(60):
+        _random_operation(rng, n)
+        _assert_consistent()
+
+
+def test_recount_repairs_connector_count():
+    cp = ChargePointFactory()
+    ConnectorFactory.create_batch(2, charge_point=cp)
+    # Escritura fuera del ORM: solo la repara recount
+    with connection.cursor() as cursor:
+        cursor.execute(f"UPDATE {ChargePoint._meta.db_table} SET connector_count = 7")
+
+    with pytest.raises(CommandError):
+        call_command("recount", "--check")
+    assert recount_connectors(dry_run=True) == {cp.pk: (7, 2)}
+    call_command("recount")
+    _assert_consistent()
+    cp.refresh_from_db()
+    assert cp.connector_count == 2
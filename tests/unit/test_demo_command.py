@@ -0,0 +1,125 @@
+from collections import Counter
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from chargepoints.archive import archive_deleted
+from chargepoints.models import (
+    ArchivedChargePoint,
+    ArchivedConnector,
+    ChargePoint,
+    ChargePointStatusEvent,
+    Connector,
+)
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_populate_keeps_classic_names_and_batches(django_assert_max_num_queries):
+    # 25 ChargePoints en lotes de 10: 3 lotes x (CPs + conectores + contadores por estado
+    # + connector_count, una UPDATE por número de conectores 1..3 + historial de estados)
+    # + savepoints
+    with django_assert_max_num_queries(3 * 7 + 3 * 2 + 2):
+        call_command("chargepoints_demo", "--populate", "25", "--batch-size", "10", "--seed", "1")
+    names = sorted(ChargePoint.objects.values_list("name", flat=True))
+    assert names[:3] == ["CP-000", "CP-001", "CP-002"]
+    assert len(names) == 25
+    per_cp = Counter(Connector.objects.values_list("charge_point_id", flat=True))
+    assert max(per_cp.values()) <= 3
+
+
+def test_populate_is_reproducible_with_seed():
+    call_command("chargepoints_demo", "--populate", "30", "--seed", "7")
+    first = list(ChargePoint.objects.order_by("name").values_list("name", "status"))
+    call_command("chargepoints_demo", "--clean", "--force")
+    call_command("chargepoints_demo", "--populate", "30", "--seed", "7")
+    assert list(ChargePoint.objects.order_by("name").values_list("name", "status")) == first
+
+
+def test_scale_mode_skews_status_and_connectors():
+    call_command("chargepoints_demo", "--profile", "10k", "--populate", "2000", "--seed", "3")
+    assert ChargePoint.objects.count() == 2000
+    assert all(n.startswith("CP-S3-") for n in ChargePoint.objects.values_list("name", flat=True))
+
+    statuses = Counter(ChargePoint.objects.values_list("status", flat=True))
+    assert statuses["ready"] > statuses["charging"] > statuses["waiting"] > statuses["error"]
+    per_cp = Counter(Connector.objects.values_list("charge_point_id", flat=True))
+    assert Counter(per_cp.values()).most_common(1)[0][0] == 2
+    assert max(per_cp.values()) == 4
+
+
+def test_scale_mode_runs_do_not_collide():
+    call_command("chargepoints_demo", "--scale", "--populate", "50")
+    call_command("chargepoints_demo", "--scale", "--populate", "50")
+    assert ChargePoint.objects.count() == 100
+
+
+def test_soft_delete_ratio_is_exact_across_batches():
+    call_command(
+        "chargepoints_demo",
+        "--scale",
+        "--populate",
+        "95",
+        "--batch-size",
+        "20",
+        "--connectors",
+        "1",
+        "--soft-delete-ratio",
+        "0.3",
+    )
+    dead = ChargePoint.all_objects.filter(deleted_at__isnull=False)
+    assert dead.count() == round(95 * 0.3)
+    assert Connector.all_objects.filter(charge_point__in=dead, deleted_at__isnull=True).count() == 0
+
+
+def test_clean_requires_force_and_flushes_tables():
+    cp = ChargePointFactory()
+    ConnectorFactory(charge_point=cp)
+    cp.delete()
+
+    call_command("chargepoints_demo", "--clean")
+    assert ChargePoint.all_objects.count() == 1
+
+    call_command("chargepoints_demo", "--clean", "--force")
+    assert ChargePoint.all_objects.count() == 0
+    assert Connector.all_objects.count() == 0
+
+
+def test_clean_flushes_history_so_reused_ids_start_empty(api):
+    cp = ChargePointFactory(status="ready")
+    cp.status = "error"
+    cp.save()
+    call_command("chargepoints_demo", "--clean", "--force")
+    assert not ChargePointStatusEvent.objects.exists()
+
+    new = ChargePointFactory(status="charging")  # secuencia reiniciada: reutiliza ids
+    res = api.get(f"/api/v1/chargepoint/{new.pk}/history/")
+    assert [e["status"] for e in res.json()["data"]["results"]] == ["charging"]
+
+
+def test_clean_flushes_the_archive(api):
+    old = ConnectorFactory(charge_point=ChargePointFactory()).charge_point
+    old.delete()
+    archive_deleted(cutoff=timezone.now())
+    assert api.get(f"/api/v1/chargepoint/archived/{old.pk}/").status_code == 200
+    assert ArchivedConnector.objects.exists()
+
+    call_command("chargepoints_demo", "--clean", "--force")
+    assert not ArchivedChargePoint.objects.exists()
+    assert not ArchivedConnector.objects.exists()
+
+    new = ChargePointFactory()  # secuencia reiniciada: reutiliza ids
+    assert api.get(f"/api/v1/chargepoint/archived/{new.pk}/").status_code == 404
+
+
+@pytest.mark.skipif(connection.vendor == "sqlite", reason="varios procesos requieren PostgreSQL")
+@pytest.mark.django_db(transaction=True)
+def test_workers_split_the_range():
+    call_command(
+        "chargepoints_demo", "--scale", "--populate", "900", "--workers", "3", "--batch-size", "100"
+    )
+    assert ChargePoint.objects.count() == 900
+    assert ChargePoint.objects.values("name").distinct().count() == 900
@@ -0,0 +1,154 @@
+import csv
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from chargepoints.counters import actual_counts, recount_connectors, status_counts
+from chargepoints.importer import OrmWriter
+from chargepoints.models import ChargePoint, Connector
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["id", "name", "status", "created_at", "connectors"])
+        writer.writerows(rows)
+    return str(path)
+
+
+def _write_ndjson(path, items):
+    path.write_text("".join(json.dumps(i) + "\n" if isinstance(i, dict) else i for i in items))
+    return str(path)
+
+
+def test_csv_import_creates_and_reports_errors(tmp_path):
+    path = _write_csv(
+        tmp_path / "fleet.csv",
+        [
+            ["", "CP-A", "ready", "", "E-1|E-2"],
+            ["", "CP-B", "charging", "", ""],
+            ["", "", "ready", "", ""],  # sin nombre
+            ["", "CP-C", "broken", "", ""],  # estado inválido
+            ["", "CP-A", "error", "", ""],  # repetido en el lote
+        ],
+    )
+    call_command("import_chargepoints", path, "--batch-size", "10")
+
+    assert dict(ChargePoint.objects.values_list("name", "status")) == {
+        "CP-A": "ready",
+        "CP-B": "charging",
+    }
+    assert set(Connector.objects.values_list("evse_number", flat=True)) == {"E-1", "E-2"}
+
+    report = [json.loads(line) for line in open(f"{path}.errors.ndjson", encoding="utf-8")]
+    assert [r["line"] for r in report] == [4, 5, 6]
+    assert set(report[1]["errors"]) == {"status"}
+    # Terminada sin fallos: no queda checkpoint
+    assert not (tmp_path / "fleet.csv.checkpoint").exists()
+
+
+def test_ndjson_import_upserts_by_natural_key(tmp_path):
+    cp = ChargePointFactory(name="CP-X", status="ready")
+    other = ChargePointFactory(name="CP-Y")
+    conn = ConnectorFactory(charge_point=other, evse_number="E-9")
+    ChargePointFactory(name="CP-Z").delete()
+
+    path = _write_ndjson(
+        tmp_path / "fleet.ndjson",
+        [
+            {"name": "CP-X", "status": "error", "connectors": [{"evse_number": "E-9"}]},
+            {"name": "CP-Z", "status": "waiting", "connectors": ["E-10"]},
+            "{no es json}\n",
+        ],
+    )
+    call_command("import_chargepoints", path)
+
+    cp.refresh_from_db()
+    conn.refresh_from_db()
+    assert cp.status == "error"
+    assert conn.charge_point_id == cp.id  # reasignado
+    # El CP-Z borrado (soft) no se resucita: se crea uno nuevo
+    assert ChargePoint.all_objects.filter(name="CP-Z").count() == 2
+    assert ChargePoint.objects.get(name="CP-Z").connectors.get().evse_number == "E-10"
+
+
+def test_import_roundtrips_export(api, tmp_path):
+    cp = ChargePointFactory(name="CP-RT", status="charging")
+    ConnectorFactory(charge_point=cp, evse_number="E-RT")
+    body = b"".join(api.get("/api/v1/chargepoint/export?format=ndjson").streaming_content)
+    path = tmp_path / "dump.ndjson"
+    path.write_bytes(body)
+
+    Connector.all_objects.all().hard_delete()
+    ChargePoint.all_objects.all().hard_delete()
+    call_command("import_chargepoints", str(path))
+
+    cp = ChargePoint.objects.get(name="CP-RT")
+    assert cp.status == "charging"
+    assert list(cp.connectors.values_list("evse_number", flat=True)) == ["E-RT"]
+
+
+def test_resume_after_failure(tmp_path, monkeypatch):
+    items = [{"name": f"CP-{i:02d}", "connectors": [f"E-{i:02d}"]} for i in range(10)]
+    items[7]["status"] = "bogus"
+    path = _write_ndjson(tmp_path / "big.ndjson", items)
+
+    original = OrmWriter.write
+    calls = {"n": 0}
+
+    def flaky(self, rows):
+        calls["n"] += 1
+        if calls["n"] == 3:
+            raise RuntimeError("caída simulada")
+        return original(self, rows)
+
+    monkeypatch.setattr(OrmWriter, "write", flaky)
+    with pytest.raises(RuntimeError):
+        call_command("import_chargepoints", path, "--batch-size", "3", "--method", "orm")
+    # Solo los dos primeros lotes confirmados
+    assert ChargePoint.objects.count() == 6
+    checkpoint = json.loads((tmp_path / "big.ndjson.checkpoint").read_text())
+    assert checkpoint["stats"]["last_line"] == 6
+
+    monkeypatch.setattr(OrmWriter, "write", original)
+    call_command("import_chargepoints", path, "--batch-size", "3", "--resume")
+    assert ChargePoint.objects.count() == 9
+    assert Connector.objects.count() == 9
+    report = (tmp_path / "big.ndjson.errors.ndjson").read_text().splitlines()
+    assert [json.loads(r)["line"] for r in report] == [8]
+
+
+def test_resume_rejects_changed_file(tmp_path, monkeypatch):
+    path = _write_ndjson(tmp_path / "f.ndjson", [{"name": "CP-1"}])
+    (tmp_path / "f.ndjson.checkpoint").write_text(
+        json.dumps({"file": {"path": "otro", "size": 0, "mtime": 0}, "stats": {}})
+    )
+    from django.core.management.base import CommandError
+
+    with pytest.raises(CommandError):
+        call_command("import_chargepoints", path, "--resume")
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="COPY solo en PostgreSQL")
+def test_copy_method_upserts(tmp_path):
+    existing = ChargePointFactory(name="CP-PG", status="ready")
+    other = ChargePointFactory(name="CP-OLD")
+    ConnectorFactory(charge_point=other, evse_number="PG-1")  # se mueve a CP-PG
+    path = _write_csv(
+        tmp_path / "pg.csv",
+        [["", "CP-PG", "error", "", "PG-1"], ["", "CP-PG2", "ready", "", "PG-2|PG-3"]],
+    )
+    call_command("import_chargepoints", path, "--method", "copy")
+    existing.refresh_from_db()
+    assert existing.status == "error"
+    assert ChargePoint.objects.get(name="CP-PG2").connectors.count() == 2
+    assert Connector.objects.get(evse_number="PG-1").charge_point_id == existing.id
+    assert status_counts() == actual_counts()
+    assert existing.connector_count == 1
+    assert ChargePoint.objects.get(name="CP-OLD").connector_count == 0
+    assert recount_connectors(dry_run=True) == {}
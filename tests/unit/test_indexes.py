@@ -0,0 +1,86 @@
+import pytest
+from django.db import IntegrityError, connection
+
+from chargepoints.models import ChargePoint, Connector
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+
+# ---------- Unicidad solo entre vivos ----------
+
+
+def test_name_can_be_reused_after_soft_delete():
+    old = ChargePointFactory(name="CP-REUSE")
+    old.delete()
+    new = ChargePoint.objects.create(name="CP-REUSE")
+    assert ChargePoint.all_objects.filter(name="CP-REUSE").count() == 2
+    assert list(ChargePoint.objects.filter(name="CP-REUSE")) == [new]
+
+
+def test_evse_number_unique_only_between_alive_connectors():
+    cp = ChargePointFactory()
+    ConnectorFactory(charge_point=cp, evse_number="EVSE-X").delete()
+    ConnectorFactory(charge_point=cp, evse_number="EVSE-X")
+    with pytest.raises(IntegrityError):
+        Connector.objects.create(charge_point=cp, evse_number="EVSE-X")
+
+
+def test_api_allows_name_of_soft_deleted_chargepoint(api):
+    ChargePointFactory(name="CP-API").delete()
+    res = api.post("/api/v1/chargepoint/", {"name": "CP-API", "status": "ready"}, format="json")
+    assert res.status_code == 201
+
+
+# ---------- Planes de ejecución (EXPLAIN) ----------
+
+
+@pytest.fixture
+def fleet():
+    cps = ChargePoint.objects.bulk_create(
+        [
+            ChargePoint(name=f"CP-{i:05d}", status=ChargePoint.Status.values[i % 4])
+            for i in range(2000)
+        ]
+    )
+    Connector.objects.bulk_create(
+        [
+            Connector(charge_point=cp, evse_number=f"EVSE-{cp.id}-{j}")
+            for cp in cps
+            for j in range(2)
+        ]
+    )
+    dead = [cp.id for cp in cps[::2]]
+    ChargePoint.objects.filter(id__in=dead).delete()
+    Connector.objects.filter(charge_point_id__in=dead).delete()
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE chargepoints_chargepoint")
+            cursor.execute("ANALYZE chargepoints_connector")
+            # Con tablas de test pequeñas el planner prefiere seq scan: se desactiva
+            # solo para comprobar que los índices parciales son utilizables.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+    return cps
+
+
+@pytest.mark.parametrize(
+    "build_qs, index",
+    [
+        (lambda: ChargePoint.objects.all()[:10], "chargepoint_alive_created_idx"),
+        (
+            lambda: ChargePoint.objects.filter(status="ready")[:10],
+            "chargepoint_alive_status_idx",
+        ),
+        (lambda: ChargePoint.objects.order_by("name", "id")[:10], "chargepoint_name_alive_uniq"),
+        (
+            lambda: Connector.objects.filter(charge_point_id__in=[1, 2, 3]),
+            "connector_alive_cp_idx",
+        ),
+    ],
+    ids=["list", "filter_status", "ordering_name", "prefetch_connectors"],
+)
+def test_alive_queries_use_partial_indexes(fleet, build_qs, index):
+    if connection.vendor not in {"postgresql", "sqlite"}:
+        pytest.skip("EXPLAIN solo se verifica en PostgreSQL/SQLite")
+    plan = build_qs().explain()
+    assert index in plan, plan
@@ -0,0 +1,150 @@
+import threading
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from chargepoints.cache import DEFAULTS, ResponseCache, get_response_cache
+from chargepoints.models import ChargePoint, Connector
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+BASE = "/api/v1/chargepoint/"
+
+
+@pytest.fixture(params=["locmem", "django"])
+def response_cache(request, settings):
+    settings.CHARGEPOINTS_RESPONSE_CACHE = {"ENABLED": True, "BACKEND": request.param}
+    cache = get_response_cache()
+    cache.backend.clear()
+    return cache
+
+
+def _queries(api, url):
+    """Devuelve el cuerpo y las consultas ejecutadas, sin contar las de ETag (MAX)."""
+    with CaptureQueriesContext(connection) as ctx:
+        res = api.get(url)
+    assert res.status_code == 200
+    data_queries = [q for q in ctx.captured_queries if "MAX(" not in q["sql"].upper()]
+    return res.json(), len(data_queries)
+
+
+def test_list_is_served_from_cache(api, response_cache):
+    ChargePointFactory(name="CP-1")
+    first, n1 = _queries(api, f"{BASE}?ordering=name")
+    second, n2 = _queries(api, f"{BASE}?ordering=name")
+    assert n1 > 0 and n2 == 0
+    assert first == second
+    assert response_cache.stats()["hits"] == 1
+
+
+def test_query_params_are_part_of_the_key(api, response_cache):
+    ChargePointFactory(name="CP-R", status="ready")
+    ChargePointFactory(name="CP-C", status="charging")
+    ready, _ = _queries(api, f"{BASE}?status=ready")
+    charging, _ = _queries(api, f"{BASE}?status=charging")
+    assert [x["name"] for x in ready["data"]["results"]] == ["CP-R"]
+    assert [x["name"] for x in charging["data"]["results"]] == ["CP-C"]
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda api, cp: api.patch(f"{BASE}{cp.id}/", {"status": "error"}, format="json"),
+        lambda api, cp: api.delete(f"{BASE}{cp.id}/"),
+        lambda api, cp: ChargePoint.objects.filter(pk=cp.pk).update(status="error"),
+        lambda api, cp: ChargePoint.objects.filter(pk=cp.pk).delete(),
+        lambda api, cp: ConnectorFactory(charge_point=cp),
+        lambda api, cp: api.post(
+            f"{BASE}batch", {"operations": [{"op": "delete", "id": cp.id}]}, format="json"
+        ),
+    ],
+    ids=["patch", "destroy", "qs_update", "qs_delete", "connector_create", "batch"],
+)
+def test_every_write_path_invalidates(api, response_cache, write):
+    cp = ChargePointFactory(name="CP-W", status="ready")
+    before, _ = _queries(api, f"{BASE}{cp.id}/")
+    listed, _ = _queries(api, BASE)
+
+    write(api, cp)
+
+    res = api.get(f"{BASE}{cp.id}/")
+    assert res.status_code == 404 or res.json() != before
+    assert api.get(BASE).json() != listed
+
+
+def test_admin_actions_invalidate(api, admin_client, response_cache):
+    cp = ChargePointFactory(name="CP-ADM")
+    _queries(api, BASE)
+    admin_client.post(
+        "/admin/chargepoints/chargepoint/",
+        {"action": "action_soft_delete", "_selected_action": [cp.pk]},
+    )
+    assert api.get(BASE).json()["data"]["results"] == []
+
+
+def test_disabled_cache_always_hits_db(api, settings):
+    settings.CHARGEPOINTS_RESPONSE_CACHE = {"ENABLED": False}
+    ChargePointFactory()
+    _, n1 = _queries(api, BASE)
+    _, n2 = _queries(api, BASE)
+    assert n1 == n2 > 0
+
+
+# ---------- Backend locmem: TTL, LRU y estampidas ----------
+
+
+def _locmem(**options):
+    return ResponseCache({**DEFAULTS, "ENABLED": True, **options})
+
+
+def test_locmem_lru_and_ttl_eviction():
+    cache = _locmem(MAX_ENTRIES=2, TTL=0.05)
+    for key in ("a", "b", "c"):
+        cache.get_or_set(key, lambda k=key: k)
+    calls = []
+    cache.get_or_set("a", lambda: calls.append("a") or "a")  # "a" fue desalojada (LRU)
+    assert calls == ["a"]
+
+    time.sleep(0.06)
+    cache.get_or_set("c", lambda: calls.append("c") or "c")  # expirada por TTL
+    assert calls == ["a", "c"]
+
+
+def test_stampede_protection_computes_once():
+    cache = _locmem()
+    calls = []
+    started = threading.Event()
+
+    def slow():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "value"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_set("k", slow)))
+    leader.start()
+    started.wait()
+    followers = [
+        threading.Thread(target=lambda: results.append(cache.get_or_set("k", slow)))
+        for _ in range(5)
+    ]
+    for t in followers:
+        t.start()
+    for t in [leader, *followers]:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == ["value"] * 6
+    assert cache.stats()["waits"] == 5
+
+
+def test_generation_bump_changes_key():
+    cache = _locmem()
+    key = cache.make_key("ns", {"a": 1}, (ChargePoint, Connector))
+    assert key == cache.make_key("ns", {"a": 1}, (ChargePoint, Connector))
+    cache.invalidate(Connector)
+    assert key != cache.make_key("ns", {"a": 1}, (ChargePoint, Connector))
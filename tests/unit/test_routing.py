@@ -0,0 +1,83 @@
+from collections import Counter
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import router, transaction
+
+from chargepoints import routing
+from chargepoints.models import ChargePoint, Connector
+from chargepoints.routing import DEFAULTS, choose_replica, replica_reads
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+User = get_user_model()
+
+
+@pytest.fixture
+def replicas(settings):
+    # Solo se resuelven alias: ninguna consulta llega a estas bases.
+    settings.CHARGEPOINTS_REPLICAS = {"REPLICAS": {"r1": 1, "r2": 1}}
+
+
+def _options(**overrides) -> dict:
+    return {**DEFAULTS, "REPLICAS": {"r1": 1, "r2": 1}, **overrides}
+
+
+def test_without_replicas_the_router_does_not_decide():
+    with replica_reads():
+        assert router.db_for_read(ChargePoint) == "default"
+        assert routing.ReplicaRouter().db_for_read(ChargePoint) is None
+        assert routing.ReplicaRouter().db_for_write(ChargePoint) is None
+
+
+def test_only_safe_reads_of_chargepoints_go_to_replicas(replicas):
+    assert router.db_for_read(ChargePoint) == "default"  # fuera de replica_reads()
+    with replica_reads():
+        replica = router.db_for_read(ChargePoint)
+        assert replica in {"r1", "r2"}
+        assert router.db_for_read(Connector) == replica  # una réplica por petición
+        assert router.db_for_read(User) == "default"
+        assert router.db_for_write(ChargePoint) == "default"
+    with replica_reads(False):
+        assert router.db_for_read(ChargePoint) == "default"
+
+
+def test_reads_after_a_write_or_inside_atomic_use_the_primary(replicas):
+    with replica_reads():
+        with transaction.atomic():
+            assert router.db_for_read(ChargePoint) == "default"
+        assert router.db_for_read(ChargePoint) != "default"
+        router.db_for_write(ChargePoint)
+        assert router.db_for_read(ChargePoint) == "default"
+
+
+def test_related_reads_follow_the_instance(replicas):
+    cp = ChargePoint(name="CP-1")
+    cp._state.db = "r2"
+    with replica_reads():
+        assert router.db_for_read(Connector, instance=cp) == "r2"
+
+
+def test_weighted_selection_honours_weights():
+    picks = Counter(
+        choose_replica(_options(REPLICAS={"r1": 3, "r2": 1, "r3": 0})) for _ in range(400)
+    )
+    assert set(picks) == {"r1", "r2"}
+    assert picks["r1"] > picks["r2"]
+
+
+def test_least_lag_selection_and_max_lag(monkeypatch):
+    lags = {"r1": 4.0, "r2": 0.5}
+    monkeypatch.setattr(routing, "replica_lag", lambda alias, ttl: lags[alias])
+    assert choose_replica(_options(SELECTION="least_lag")) == "r2"
+
+    lags["r2"] = None  # no responde
+    assert choose_replica(_options(SELECTION="least_lag")) == "r1"
+    assert choose_replica(_options(MAX_LAG_SECONDS=2)) is None  # weighted: ninguna al día
+
+
+def test_replica_lag_is_cached(django_assert_num_queries):
+    routing._lag_cache.clear()
+    assert routing.replica_lag("default", ttl=60) == 0.0  # primario: sin retraso
+    with django_assert_num_queries(0):
+        assert routing.replica_lag("default", ttl=60) == 0.0
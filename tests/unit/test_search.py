@@ -0,0 +1,88 @@
+import pytest
+from django.contrib.admin.sites import site
+from django.test import RequestFactory, override_settings
+
+from chargepoints.models import ChargePoint, Connector
+from chargepoints.search import (
+    IContainsSearchBackend,
+    TrigramSearchBackend,
+    get_search_backend,
+    search_queryset,
+)
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+BASE = "/api/v1/chargepoint/"
+
+
+def test_auto_backend_depends_on_vendor(settings):
+    settings.CHARGEPOINTS_SEARCH_BACKEND = "auto"
+    backend = get_search_backend()
+    from django.db import connection
+
+    expected = TrigramSearchBackend if connection.vendor == "postgresql" else IContainsSearchBackend
+    assert isinstance(backend, expected)
+
+
+@override_settings(CHARGEPOINTS_SEARCH_BACKEND="chargepoints.search.IContainsSearchBackend")
+def test_backend_is_selected_by_setting():
+    assert isinstance(get_search_backend(), IContainsSearchBackend)
+
+
+def test_search_ranks_prefix_matches_first():
+    ChargePointFactory(name="MADRID-NORTE")
+    ChargePointFactory(name="NORTE-01")
+    ChargePointFactory(name="SUR-01")
+
+    qs = search_queryset(ChargePoint.objects.all(), ["name"], ["norte"])
+    names = list(qs.values_list("name", flat=True))
+    assert names[0] == "NORTE-01"
+    assert set(names) == {"NORTE-01", "MADRID-NORTE"}
+
+
+def test_every_term_must_match():
+    ChargePointFactory(name="MADRID-NORTE")
+    ChargePointFactory(name="MADRID-SUR")
+    qs = search_queryset(ChargePoint.objects.all(), ["name"], ["madrid", "sur"])
+    assert list(qs.values_list("name", flat=True)) == ["MADRID-SUR"]
+
+
+def test_api_search_is_ranked_and_explicit_ordering_wins(api):
+    ChargePointFactory(name="X-STATION")
+    ChargePointFactory(name="STATION-B")
+    ChargePointFactory(name="STATION-A")
+
+    ranked = [x["name"] for x in api.get(f"{BASE}?search=station").json()["data"]["results"]]
+    assert set(ranked[:2]) == {"STATION-A", "STATION-B"}
+    assert ranked[-1] == "X-STATION"
+
+    ordered = api.get(f"{BASE}?search=station&ordering=name").json()["data"]["results"]
+    assert [x["name"] for x in ordered] == ["STATION-A", "STATION-B", "X-STATION"]
+
+
+def test_api_search_composes_with_cursor_pagination(api):
+    for i in range(12):
+        ChargePointFactory(name=f"HUB-{i:02d}")
+    ChargePointFactory(name="OTHER")
+
+    names, url = [], f"{BASE}?search=hub&cursor="
+    while url:
+        data = api.get(url).json()["data"]
+        names += [x["name"] for x in data["results"]]
+        url = data["next"]
+    assert sorted(names) == [f"HUB-{i:02d}" for i in range(12)]
+
+
+def test_admin_connector_search_uses_backend():
+    cp = ChargePointFactory(name="CP-ADMIN")
+    ConnectorFactory(charge_point=cp, evse_number="EVSE-ABC-1")
+    ConnectorFactory(charge_point=cp, evse_number="EVSE-XYZ-2")
+
+    model_admin = site._registry[Connector]
+    request = RequestFactory().get("/admin/chargepoints/connector/")
+    qs, may_have_duplicates = model_admin.get_search_results(
+        request, Connector.all_objects.all(), "abc"
+    )
+    assert not may_have_duplicates
+    assert list(qs.values_list("evse_number", flat=True)) == ["EVSE-ABC-1"]
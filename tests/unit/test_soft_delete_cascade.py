@@ -0,0 +1,152 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from chargepoints.counters import recount, recount_connectors
+from chargepoints.deletion import cascade_relations, restore, soft_delete
+from chargepoints.models import ChargePoint, Connector
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _alive(model) -> set[int]:
+    return set(model.objects.values_list("pk", flat=True))
+
+
+def _assert_consistent():
+    assert recount(dry_run=True) == {}
+    assert recount_connectors(dry_run=True) == {}
+
+
+@pytest.fixture
+def fleet():
+    cps = ChargePointFactory.create_batch(3)
+    connectors = {cp.pk: ConnectorFactory.create_batch(2, charge_point=cp) for cp in cps}
+    return cps, connectors
+
+
+def test_cascade_follows_soft_deletable_cascade_relations():
+    assert [rel.related_model for rel in cascade_relations(ChargePoint)] == [Connector]
+    assert cascade_relations(Connector) == []
+
+
+def test_instance_delete_cascades_in_one_batch(fleet):
+    (cp, other, _), connectors = fleet
+    cp.delete()
+    assert cp.deleted_at is not None and cp.deletion_batch is not None
+
+    rows = Connector.all_objects.filter(charge_point=cp).values_list("deleted_at", "deletion_batch")
+    assert set(rows) == {(cp.deleted_at, cp.deletion_batch)}
+    assert _alive(Connector) == {c.pk for c in connectors[other.pk] + connectors[fleet[0][2].pk]}
+    _assert_consistent()
+
+    # Los EVSE de los conectores borrados quedan libres
+    ConnectorFactory(charge_point=other, evse_number=connectors[cp.pk][0].evse_number)
+
+
+def test_restore_only_revives_rows_of_the_same_batch(fleet):
+    (cp, _, _), connectors = fleet
+    earlier, later = connectors[cp.pk]
+    earlier.delete()  # borrado antes, por separado
+    cp.delete()
+
+    cp.restore()
+    assert cp.deleted_at is None and cp.deletion_batch is None
+    assert set(cp.connectors.values_list("pk", flat=True)) == {later.pk}
+    assert Connector.all_objects.get(pk=earlier.pk).deleted_at is not None
+    assert not ChargePoint.all_objects.filter(deletion_batch__isnull=False, pk=cp.pk).exists()
+    _assert_consistent()
+
+
+def test_restoring_a_child_does_not_revive_its_parent_or_siblings(fleet):
+    (cp, _, _), connectors = fleet
+    cp.delete()
+    child = Connector.all_objects.get(pk=connectors[cp.pk][0].pk)
+    child.restore()
+    assert _alive(Connector) & {c.pk for c in connectors[cp.pk]} == {child.pk}
+    assert cp.pk not in _alive(ChargePoint)
+
+
+def test_queryset_delete_and_restore_report_counts(fleet):
+    cps, _ = fleet
+    queryset = ChargePoint.objects.filter(pk__in=[cps[0].pk, cps[1].pk])
+    assert soft_delete(queryset) == {"chargepoints.ChargePoint": 2, "chargepoints.Connector": 4}
+    assert soft_delete(ChargePoint.all_objects.filter(pk=cps[0].pk)) == {
+        "chargepoints.ChargePoint": 0,  # ya borrado
+        "chargepoints.Connector": 0,
+    }
+    assert ChargePoint.all_objects.filter(pk__in=[cps[0].pk, cps[1].pk]).restore() == 2
+    assert len(_alive(Connector)) == 6
+    assert restore(ChargePoint.all_objects.all()) == {
+        "chargepoints.ChargePoint": 0,
+        "chargepoints.Connector": 0,
+    }
+    _assert_consistent()
+
+
+def test_manual_restore_clears_the_batch(fleet):
+    (cp, _, _), _ = fleet
+    cp.delete()
+    cp.deleted_at = None
+    cp.save(update_fields=["deleted_at"])
+    assert ChargePoint.objects.get(pk=cp.pk).deletion_batch is None
+
+
+def _delete_queries(connectors: int) -> int:
+    cp = ChargePointFactory()
+    Connector.objects.bulk_create(
+        Connector(charge_point=cp, evse_number=f"EVSE-{cp.pk}-{i}") for i in range(connectors)
+    )
+    with CaptureQueriesContext(connection) as ctx:
+        cp.delete()
+    assert not cp.connectors.exists()
+    return len(ctx.captured_queries)
+
+
+def test_delete_runs_in_queries_per_model_not_per_row():
+    assert _delete_queries(10_000) == _delete_queries(10)
+
+
+def test_delete_marks_each_level_without_reading_it_first(fleet):
+    (cp, _, _), _ = fleet
+    with CaptureQueriesContext(connection) as ctx:
+        cp.delete()
+    sql = [q["sql"] for q in ctx.captured_queries]
+    # UPDATE ... RETURNING de conectores y ChargePoint + connector_count + contador por estado
+    assert len(sql) == 4
+    assert not [s for s in sql if s.startswith("SELECT")]
+    assert sum("RETURNING" in s for s in sql) == 2
+    _assert_consistent()
+
+
+def test_api_destroy_cascades(api, fleet):
+    (cp, _, _), connectors = fleet
+    assert api.delete(f"/api/v1/chargepoint/{cp.pk}/").status_code == 204
+    assert not {c.pk for c in connectors[cp.pk]} & _alive(Connector)
+
+
+def test_admin_actions_cascade(fleet):
+    (cp, other, _), connectors = fleet
+    client = Client()
+    client.force_login(get_user_model().objects.create_superuser("admin", "a@example.com", "x"))
+    url = "/admin/chargepoints/chargepoint/"
+
+    res = client.post(url, {"action": "action_soft_delete", "_selected_action": [cp.pk]})
+    assert res.status_code == 302
+    assert not {c.pk for c in connectors[cp.pk]} & _alive(Connector)
+
+    ChargePointFactory(name=cp.name)  # el nombre ya lo usa otro ChargePoint vivo
+    # Restaurar: el changelist debe incluir los eliminados
+    dead = f"{url}?deleted=deleted"
+    res = client.post(dead, {"action": "action_restore", "_selected_action": [cp.pk]}, follow=True)
+    assert "No se puede restaurar" in res.content.decode()
+    assert cp.pk not in _alive(ChargePoint)
+
+    other.delete()
+    res = client.post(dead, {"action": "action_restore", "_selected_action": [other.pk]})
+    assert res.status_code == 302
+    assert {c.pk for c in connectors[other.pk]} <= _alive(Connector)
+    _assert_consistent()
@@ -0,0 +1,188 @@
+import csv
+import random
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from chargepoints.batch import apply_batch
+from chargepoints.counters import actual_counts, recount, status_counts
+from chargepoints.models import ChargePoint, ChargePointStatusCounter, CountedModel
+from tests.factories import ChargePointFactory
+
+pytestmark = pytest.mark.django_db
+
+STATUSES = ChargePoint.Status.values
+
+
+def _assert_consistent():
+    assert status_counts() == actual_counts()
+
+
+def test_instance_paths_keep_counters():
+    cp = ChargePointFactory(status="ready")
+    assert status_counts()["ready"] == 1
+
+    cp.status = "error"
+    cp.save()
+    cp.name = "CP-RENAMED"
+    cp.save(update_fields=["name"])
+    assert status_counts()["error"] == 1
+    assert status_counts()["ready"] == 0
+
+    cp.delete()  # soft
+    assert status_counts()["error"] == 0
+    cp.deleted_at = None  # restaurar
+    cp.save()
+    assert status_counts()["error"] == 1
+    cp.hard_delete()
+    _assert_consistent()
+    assert sum(status_counts().values()) == 0
+
+
+def test_soft_deleted_rows_are_not_counted():
+    cp = ChargePointFactory(status="ready")
+    cp.delete()
+    assert sum(status_counts().values()) == 0
+    ChargePoint.all_objects.filter(pk=cp.pk).update(status="error")
+    assert sum(status_counts().values()) == 0
+    _assert_consistent()
+
+
+def test_bulk_update_with_expressions():
+    cps = ChargePointFactory.create_batch(4, status="ready")
+    for cp, status in zip(cps, ["charging", "waiting", "error", "ready"], strict=True):
+        cp.status = status
+    ChargePoint.objects.bulk_update(cps, ["status"])
+    assert status_counts() == {"ready": 1, "charging": 1, "waiting": 1, "error": 1}
+
+
+def test_bulk_create_with_conflicts_is_rejected():
+    with pytest.raises(ValueError):
+        ChargePoint.objects.bulk_create([ChargePoint(name="CP-X")], ignore_conflicts=True)
+
+
+def test_counted_model_requires_apply_count_deltas():
+    with pytest.raises(TypeError, match="apply_count_deltas"):
+
+        class Uncounted(CountedModel):
+            counted_field = "status"
+
+            class Meta:
+                app_label = "chargepoints"
+
+
+def test_missing_counter_rows_are_recreated():
+    ChargePointStatusCounter.objects.all().delete()
+    ChargePointFactory.create_batch(2, status="waiting")
+    assert status_counts()["waiting"] == 2
+    _assert_consistent()
+
+
+def test_admin_actions_keep_counters(admin_client):
+    cps = ChargePointFactory.create_batch(3, status="charging")
+    url = "/admin/chargepoints/chargepoint/"
+    selected = [cp.pk for cp in cps[:2]]
+    admin_client.post(url, {"action": "action_soft_delete", "_selected_action": selected})
+    assert status_counts()["charging"] == 1
+    # Los eliminados solo aparecen (y se pueden seleccionar) con el filtro ?deleted=
+    restore = {"action": "action_restore", "_selected_action": selected[:1]}
+    admin_client.post(f"{url}?deleted=deleted", restore)
+    assert status_counts()["charging"] == 2
+    hard = {"action": "action_hard_delete", "_selected_action": selected}
+    admin_client.post(f"{url}?deleted=all", hard)
+    _assert_consistent()
+
+
+def test_demo_and_import_keep_counters(tmp_path):
+    call_command(
+        "chargepoints_demo", "--populate", "40", "--seed", "3", "--soft-delete-ratio", "0.25"
+    )
+    _assert_consistent()
+
+    path = tmp_path / "fleet.csv"
+    existing = ChargePoint.objects.order_by("id")[:5]
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["id", "name", "status", "created_at", "connectors"])
+        writer.writerows(["", cp.name, "error", "", ""] for cp in existing)
+        writer.writerows(["", f"CP-IMP-{i}", "waiting", "", ""] for i in range(5))
+    call_command("import_chargepoints", str(path))
+    _assert_consistent()
+
+    call_command("chargepoints_demo", "--clean", "--force")
+    assert sum(status_counts().values()) == 0
+    _assert_consistent()
+
+
+def _random_operation(rng: random.Random, n: int) -> None:
+    alive = list(ChargePoint.objects.values_list("pk", flat=True))
+    dead = list(ChargePoint.all_objects.dead().values_list("pk", flat=True))
+    op = rng.choice(
+        ["create", "save", "qs_update", "bulk_update", "soft", "qs_soft", "restore", "hard",
+         "qs_hard", "batch"]
+    )  # fmt: skip
+    if op == "create" or not alive:
+        ChargePointFactory(status=rng.choice(STATUSES))
+    elif op == "save":
+        cp = ChargePoint.objects.get(pk=rng.choice(alive))
+        cp.status = rng.choice(STATUSES)
+        cp.save()
+    elif op == "qs_update":
+        ChargePoint.objects.filter(status=rng.choice(STATUSES)).update(status=rng.choice(STATUSES))
+    elif op == "bulk_update":
+        cps = list(ChargePoint.objects.filter(pk__in=rng.sample(alive, min(3, len(alive)))))
+        for cp in cps:
+            cp.status = rng.choice(STATUSES)
+        ChargePoint.objects.bulk_update(cps, ["status"])
+    elif op == "soft":
+        ChargePoint.objects.get(pk=rng.choice(alive)).delete()
+    elif op == "qs_soft":
+        ChargePoint.objects.filter(pk__in=rng.sample(alive, min(2, len(alive)))).delete()
+    elif op == "restore" and dead:
+        ChargePoint.all_objects.filter(pk=rng.choice(dead)).update(deleted_at=None)
+    elif op == "hard":
+        ChargePoint.all_objects.get(pk=rng.choice(alive + dead)).hard_delete()
+    elif op == "qs_hard" and dead:
+        ChargePoint.all_objects.filter(pk__in=dead[:2]).hard_delete()
+    elif op == "batch":
+        apply_batch(
+            [
+                {"op": "create", "data": {"name": f"CP-B{n}", "status": rng.choice(STATUSES)}},
+                {"op": "update", "id": rng.choice(alive), "data": {"status": rng.choice(STATUSES)}},
+            ],
+            "best_effort",
+        )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_operations_keep_counters_consistent(seed):
+    rng = random.Random(seed)
+    ChargePointFactory.create_batch(10, status=rng.choice(STATUSES))
+    for n in range(60):
+        _random_operation(rng, n)
+        _assert_consistent()
+
+
+def test_recount_command_repairs_drift():
+    ChargePointFactory.create_batch(3, status="ready")
+    ChargePointStatusCounter.objects.filter(status="ready").update(count=99)
+    ChargePointStatusCounter.objects.filter(status="error").delete()
+
+    with pytest.raises(CommandError):
+        call_command("recount", "--check")
+    assert status_counts()["ready"] == 99  # --check no escribe
+
+    call_command("recount")
+    _assert_consistent()
+    assert recount() == {}
+    call_command("recount", "--check")
+
+
+def test_recount_after_direct_sql():
+    ChargePointFactory.create_batch(2, status="ready")
+    # Escritura fuera del ORM: solo la repara recount
+    with connection.cursor() as cursor:
+        cursor.execute(f"UPDATE {ChargePoint._meta.db_table} SET status = 'error'")
+    assert recount() == {"error": (0, 2), "ready": (2, 0)}
+    _assert_consistent()
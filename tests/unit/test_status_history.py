@@ -0,0 +1,186 @@
+import csv
+from datetime import UTC, date, datetime, time
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from chargepoints import history
+from chargepoints.batch import apply_batch
+from chargepoints.counters import actual_counts, status_counts
+from chargepoints.models import ChargePoint, ChargePointStatusCounter, ChargePointStatusEvent
+from tests.factories import ChargePointFactory
+
+pytestmark = pytest.mark.django_db
+
+POSTGRES_ONLY = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="Particiones solo en PostgreSQL"
+)
+
+
+@pytest.fixture
+def partitioned():
+    if not history.is_partitioned():
+        pytest.skip("Tabla creada sin migraciones (--nomigrations): sin particiones")
+
+
+def _events(cp) -> list[tuple[str, str]]:
+    qs = ChargePointStatusEvent.objects.filter(charge_point_id=cp.pk).order_by("id")
+    return list(qs.values_list("previous_status", "status"))
+
+
+# ---------------------------------------------------------------------
+# Escritura del historial desde todas las rutas
+# ---------------------------------------------------------------------
+
+
+def test_instance_writes_record_status_changes():
+    cp = ChargePointFactory(status="ready")
+    cp.status = "charging"
+    cp.save()
+    cp.name = "CP-RENAMED"  # sin cambio de estado: sin evento
+    cp.save()
+    cp.status = "charging"
+    cp.save(update_fields=["status"])
+    cp.delete()
+    assert _events(cp) == [("", "ready"), ("ready", "charging")]
+
+
+def test_queryset_writes_record_status_changes():
+    cps = ChargePoint.objects.bulk_create([ChargePoint(name=f"CP-H{i}") for i in range(3)])
+    ChargePoint.objects.filter(pk__in=[cps[0].pk, cps[1].pk]).update(status="error")
+    cps[1].status, cps[2].status = "waiting", "ready"
+    ChargePoint.objects.bulk_update(cps[1:], ["status"])
+    assert _events(cps[0]) == [("", "ready"), ("ready", "error")]
+    assert _events(cps[1]) == [("", "ready"), ("ready", "error"), ("error", "waiting")]
+    assert _events(cps[2]) == [("", "ready")]
+
+
+def _update_queries(n: int) -> list[str]:
+    cps = ChargePoint.objects.bulk_create([ChargePoint(name=f"CP-B{n}-{i}") for i in range(n)])
+    with CaptureQueriesContext(connection) as ctx:
+        ChargePoint.objects.filter(pk__in=[cp.pk for cp in cps]).update(status="charging")
+    return [q["sql"] for q in ctx.captured_queries]
+
+
+def test_bulk_update_inserts_history_in_one_query():
+    # Sin SELECT por fila: las mismas consultas para 5 que para 50 filas, y un único INSERT.
+    _update_queries(1)  # crea las filas de contadores que falten
+    few, many = _update_queries(5), _update_queries(50)
+    assert len(few) == len(many)
+    inserts = [sql for sql in many if "chargepointstatusevent" in sql]
+    assert len(inserts) == 1 and "INSERT INTO" in inserts[0]
+    assert ChargePointStatusEvent.objects.filter(previous_status="ready").count() == 56
+
+
+@POSTGRES_ONLY
+def test_history_and_counters_share_one_statement():
+    # Filas de contadores ya creadas (--nomigrations no las siembra)
+    ChargePointStatusCounter.objects.bulk_create(
+        [ChargePointStatusCounter(status=s) for s in ChargePoint.Status.values],
+        ignore_conflicts=True,
+    )
+    cp = ChargePointFactory(status="ready")
+    cp.status = "error"
+    with CaptureQueriesContext(connection) as ctx:
+        cp.save()
+    touching = [
+        q["sql"]
+        for q in ctx.captured_queries
+        if "chargepointstatusevent" in q["sql"] or "chargepointstatuscounter" in q["sql"]
+    ]
+    assert len(touching) == 1
+    assert "chargepointstatusevent" in touching[0] and "chargepointstatuscounter" in touching[0]
+    assert _events(cp) == [("", "ready"), ("ready", "error")]
+    assert status_counts() == actual_counts()
+
+
+def test_batch_and_import_record_status_changes(tmp_path):
+    cp = ChargePointFactory(status="ready", name="CP-IMP-1")
+    apply_batch([{"op": "update", "id": cp.pk, "data": {"status": "waiting"}}], "atomic")
+
+    path = tmp_path / "fleet.csv"
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["id", "name", "status", "created_at", "connectors"])
+        writer.writerow(["", cp.name, "error", "", ""])
+        writer.writerow(["", "CP-IMP-2", "charging", "", ""])
+    call_command("import_chargepoints", str(path))
+
+    assert _events(cp) == [("", "ready"), ("ready", "waiting"), ("waiting", "error")]
+    assert _events(ChargePoint.objects.get(name="CP-IMP-2")) == [("", "charging")]
+
+
+def test_history_survives_hard_delete():
+    cp = ChargePointFactory(status="ready")
+    pk = cp.pk
+    cp.hard_delete()
+    assert ChargePointStatusEvent.objects.filter(charge_point_id=pk).count() == 1
+
+
+# ---------------------------------------------------------------------
+# Particiones
+# ---------------------------------------------------------------------
+
+
+def test_month_helpers():
+    assert history.add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert history.add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+    assert history.partition_name(date(2025, 3, 1), "t") == "t_202503"
+
+
+def test_command_is_noop_without_partitioning():
+    if connection.vendor == "postgresql":
+        pytest.skip("En PostgreSQL la tabla está particionada")
+    call_command("history_partitions", "--drop-before", "2020-01")
+
+
+def test_command_validates_arguments():
+    with pytest.raises(CommandError):
+        call_command("history_partitions", "--months-ahead", "-1")
+
+
+@POSTGRES_ONLY
+def test_history_table_is_partitioned(partitioned):
+    assert history.is_partitioned()
+    current = history.partition_name(history.month_start(date.today()))
+    assert current in {name for name, _ in history.list_partitions()}
+
+
+@POSTGRES_ONLY
+def test_ensure_and_drop_partitions():
+    table = "tmp_status_history"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {table} (id bigint, occurred_at timestamptz NOT NULL) "
+            "PARTITION BY RANGE (occurred_at)"
+        )
+    created = history.ensure_partitions(months_ahead=2, start=date(2025, 11, 15), table=table)
+    assert created == [f"{table}_202511", f"{table}_202512", f"{table}_202601"]
+    assert history.ensure_partitions(months_ahead=2, start=date(2025, 11, 1), table=table) == []
+
+    assert history.drop_partitions_before(date(2026, 1, 1), dry_run=True, table=table) == [
+        f"{table}_202511",
+        f"{table}_202512",
+    ]
+    assert len(history.list_partitions(table=table)) == 3
+    history.drop_partitions_before(date(2025, 12, 1), table=table)
+    assert [name for name, _ in history.list_partitions(table=table)] == [
+        f"{table}_202512",
+        f"{table}_202601",
+    ]
+
+
+@POSTGRES_ONLY
+def test_range_query_prunes_partitions(partitioned):
+    cp = ChargePointFactory()
+    month = history.month_start(date.today())
+    start = datetime.combine(month, time(), tzinfo=UTC)
+    end = datetime.combine(history.add_months(month, 1), time(), tzinfo=UTC)
+    qs = ChargePointStatusEvent.objects.filter(
+        charge_point_id=cp.pk, occurred_at__gte=start, occurred_at__lt=end
+    )
+    plan = qs.explain()
+    assert history.partition_name(month) in plan
+    assert f"{history.TABLE}_default" not in plan
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from django.db import transaction
+from prometheus_client import REGISTRY
+
+from chargepoints import stream
+from chargepoints.models import ChargePoint
+from chargepoints.stream import EVICTED, Broker, Event, PostgresBackend, events_from_changes
+from tests.factories import ChargePointFactory, ConnectorFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class RecordingBackend(stream.LocalBackend):
+    """Backend de prueba: guarda lo publicado en lugar de repartirlo."""
+
+    def __init__(self, broker, options):
+        super().__init__(broker, options)
+        self.published = []
+
+    def publish(self, events, using):
+        self.published.extend(events)
+
+
+@pytest.fixture
+def published(settings, monkeypatch):
+    settings.CHARGEPOINTS_STREAM = {"ENABLED": True}
+    backend = RecordingBackend(stream.broker, stream.get_options())
+    monkeypatch.setattr(stream, "get_backend", lambda: backend)
+    return backend.published
+
+
+def _types(events):
+    return [(e.type, e.id, e.status, e.previous_status) for e in events]
+
+
+# ---------------------------------------------------------------------
+# Eventos a partir de las escrituras
+# ---------------------------------------------------------------------
+
+
+def test_instance_writes_emit_events(published, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        cp = ChargePointFactory(status="ready")
+        cp.status = "charging"
+        cp.save()
+        cp.name = "CP-RENAMED"
+        cp.save(update_fields=["name"])
+        cp.delete()
+        cp.deleted_at = None
+        cp.save()
+        pk = cp.pk
+        cp.hard_delete()
+    assert _types(published) == [
+        ("created", pk, "ready", None),
+        ("status_changed", pk, "charging", "ready"),
+        ("updated", pk, "charging", None),
+        ("deleted", pk, "charging", None),
+        ("created", pk, "charging", None),  # restauración
+        ("deleted", pk, "charging", None),
+    ]
+
+
+def test_queryset_writes_emit_events(published, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        cps = ChargePoint.objects.bulk_create([ChargePoint(name=f"CP-Q{i}") for i in range(3)])
+        ChargePoint.objects.filter(pk=cps[0].pk).update(status="error")
+        cps[1].status = "waiting"
+        ChargePoint.objects.bulk_update(cps[1:], ["status"])
+        ChargePoint.objects.filter(pk=cps[2].pk).delete()
+        ChargePoint.all_objects.filter(pk=cps[2].pk).update(status="error")  # borrado: nada
+    ids = [cp.pk for cp in cps]
+    assert _types(published) == [
+        *[("created", pk, "ready", None) for pk in ids],
+        ("status_changed", ids[0], "error", "ready"),
+        ("status_changed", ids[1], "waiting", "ready"),
+        ("updated", ids[2], "ready", None),
+        ("deleted", ids[2], "ready", None),
+    ]
+
+
+def test_connector_writes_do_not_emit_chargepoint_events(
+    published, django_capture_on_commit_callbacks
+):
+    cp = ChargePointFactory()
+    with django_capture_on_commit_callbacks(execute=True):
+        ConnectorFactory(charge_point=cp)
+    assert published == []
+
+
+def test_rolled_back_writes_emit_nothing(published, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with pytest.raises(RuntimeError), transaction.atomic():
+            ChargePointFactory()
+            raise RuntimeError
+    assert callbacks == [] and published == []
+
+
+def test_disabled_stream_registers_no_callbacks(settings, django_capture_on_commit_callbacks):
+    settings.CHARGEPOINTS_STREAM = {"ENABLED": False}
+    with django_capture_on_commit_callbacks() as callbacks:
+        ChargePointFactory()
+    assert callbacks == []
+
+
+def test_backend_is_pluggable_by_path(settings):
+    settings.CHARGEPOINTS_STREAM = {"BACKEND": "chargepoints.stream.PostgresBackend"}
+    assert type(stream.get_backend()) is PostgresBackend
+    settings.CHARGEPOINTS_STREAM = {"BACKEND": "local"}
+    assert type(stream.get_backend()) is stream.LocalBackend
+
+
+def test_events_from_changes_ignores_dead_rows():
+    changes = [(1, ("ready", "2025-01-01"), ("error", "2025-01-01")), (2, None, None)]
+    assert events_from_changes(changes) == []
+
+
+# ---------------------------------------------------------------------
+# Broker
+# ---------------------------------------------------------------------
+
+
+def _drain(sub) -> list:
+    items = []
+    while not sub.queue.empty():
+        items.append(sub.queue.get_nowait())
+    return items
+
+
+def test_broker_filters_by_status_and_id():
+    async def scenario():
+        broker = Broker()
+        everything = broker.subscribe()
+        ready = broker.subscribe(statuses=["ready"])
+        only_two = broker.subscribe(ids=[2])
+        broker.dispatch(
+            [
+                Event("created", 1, "ready"),
+                Event("status_changed", 2, "error", previous_status="ready"),
+                Event("updated", 3, "charging"),
+            ]
+        )
+        await asyncio.sleep(0)
+        return [[e.id for e in _drain(s)] for s in (everything, ready, only_two)]
+
+    assert asyncio.run(scenario()) == [[1, 2, 3], [1, 2], [2]]
+
+
+def test_slow_consumer_is_evicted():
+    def evictions():
+        return REGISTRY.get_sample_value("chargepoint_stream_evictions_total") or 0.0
+
+    async def scenario():
+        broker = Broker()
+        slow = broker.subscribe(maxsize=2)
+        fast = broker.subscribe(maxsize=10)
+        broker.dispatch([Event("updated", i, "ready") for i in range(3)])
+        await asyncio.sleep(0)
+        assert await slow.get() is EVICTED
+        broker.dispatch([Event("updated", 9, "ready")])
+        await asyncio.sleep(0)
+        return slow.queue.empty(), len(broker), [e.id for e in _drain(fast)]
+
+    before = evictions()
+    assert asyncio.run(scenario()) == (True, 1, [0, 1, 2, 9])
+    assert evictions() == before + 1
+
+
+def test_dispatch_from_another_thread():
+    async def scenario():
+        broker = Broker()
+        sub = broker.subscribe()
+        thread = threading.Thread(target=broker.dispatch, args=([Event("created", 7, "ready")],))
+        thread.start()
+        event = await asyncio.wait_for(sub.get(), 1)
+        thread.join()
+        sub.close()
+        return event.id, len(broker)
+
+    assert asyncio.run(scenario()) == (7, 0)
+
+
+def test_thousands_of_idle_subscribers():
+    async def scenario():
+        broker = Broker()
+        subs = [broker.subscribe(ids=[i]) for i in range(5000)]
+        broker.dispatch([Event("status_changed", 4321, "error", previous_status="ready")])
+        await asyncio.sleep(0)
+        received = [i for i, sub in enumerate(subs) if not sub.queue.empty()]
+        for sub in subs:
+            sub.close()
+        return received, len(broker)
+
+    assert asyncio.run(scenario()) == ([4321], 0)
+
+
+def test_notify_payloads_stay_under_limit():
+    events = [Event("status_changed", i, "charging", previous_status="ready") for i in range(500)]
+    payloads = list(PostgresBackend._payloads(events))
+    assert len(payloads) > 1
+    assert all(len(p.encode()) <= stream.NOTIFY_PAYLOAD_LIMIT for p in payloads)
+    assert [Event(**e) for p in payloads for e in json.loads(p)] == events